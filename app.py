@@ -8,9 +8,22 @@ import time
 
 # Kendi modüllerimizi import ediyoruz
 from modules.data_fetcher import BISTDataFetcher
-from modules.technical_analysis import TechnicalAnalyzer
+from modules.technical_analysis import TechnicalAnalyzer, build_analyzer
 from modules.alert_system import AlertSystem
-from modules.config import BIST_SYMBOLS, INDICATORS_CONFIG
+from modules.correlation import RollingCorrelation, close_panel
+from modules.relative_strength import IndexBenchmark
+from modules.symbols import get_registry
+from modules.memory_cache import get_cache
+from modules.indicator_cache import get_indicator_cache
+from modules.config import (BIST_SYMBOLS, INDICATORS_CONFIG, INDICATOR_CACHE_CONFIG, MEMORY_CACHE_CONFIG,
+                            QUOTE_STREAM_CONFIG, SIGNAL_INDICATORS, TIMEFRAMES)
+
+# Korelasyon sekmesinde varsayılan olarak seçili hisseler (bankacılık)
+DEFAULT_CORRELATION_SYMBOLS = ["AKBNK.IS", "GARAN.IS", "ISCTR.IS", "HALKB.IS", "VAKBN.IS"]
+
+# Göreceli güç karşılaştırmasında kullanılan endeks ve yenilenme süresi (saniye)
+BENCHMARK_INDEX = "XU100.IS"
+BENCHMARK_MAX_AGE = 900
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -56,11 +69,18 @@ def main():
     # Sidebar
     st.sidebar.title("⚙️ Ayarlar")
     
-    # Hisse seçimi
+    # Hisse seçimi: arama kutusu boşsa popüler hisseler, doluysa dizinde önek araması
+    registry = get_registry()
+    query = st.sidebar.text_input("🔎 Hisse Ara", placeholder="Kod veya şirket adı")
+    symbol_options = registry.search(query, limit=50) if query else list(BIST_SYMBOLS.keys())
+    if not symbol_options:
+        st.sidebar.warning("Eşleşen hisse bulunamadı")
+        symbol_options = list(BIST_SYMBOLS.keys())
+    
     selected_symbol = st.sidebar.selectbox(
         "📊 Hisse Seçin",
-        options=list(BIST_SYMBOLS.keys()),
-        format_func=lambda x: f"{x} - {BIST_SYMBOLS[x]}"
+        options=symbol_options,
+        format_func=lambda x: f"{x} - {registry.name(x)}"
     )
     
     # Zaman aralığı seçimi
@@ -69,15 +89,6 @@ def main():
         ["1mo", "3mo", "6mo", "1y", "2y"]
     )
     
-    # İndikatör seçimi
-    st.sidebar.subheader("📈 İndikatörler")
-    selected_indicators = {}
-    for indicator, config in INDICATORS_CONFIG.items():
-        selected_indicators[indicator] = st.sidebar.checkbox(
-            config["name"], 
-            value=config["default"]
-        )
-    
     # Alert ayarları
     st.sidebar.subheader("🚨 Alert Ayarları")
     enable_alerts = st.sidebar.checkbox("Alertleri Aktifleştir", value=True)
@@ -89,87 +100,292 @@ def main():
             default=["Desktop"]
         )
     
-    # Ana içerik
+    render_cache_stats()
+    
+    analysis_tab, correlation_tab = st.tabs(["📊 Analiz", "🔗 Korelasyon"])
+    
+    with analysis_tab:
+        render_analysis(selected_symbol, time_period)
+    
+    with correlation_tab:
+        render_correlation(time_period)
+
+def render_cache_stats():
+    """Paylaşılan önbelleğin bellek kullanımını ve isabet oranını gösterir"""
+    stats = get_cache().stats()
+    with st.sidebar.expander("🧠 Önbellek"):
+        st.progress(min(stats['usage'], 1.0),
+                    text=f"{stats['bytes'] / 2**20:.1f} / {stats['max_bytes'] / 2**20:.0f} MB")
+        st.caption(f"Kayıt: {stats['entries']} · İsabet: %{stats['hit_rate'] * 100:.0f} "
+                   f"({stats['hits']}/{stats['hits'] + stats['misses']}) · Atılan: {stats['evictions']}")
+
+def load_data(symbol, period):
+    """
+    Hisse verisini oturumlar arası paylaşılan önbellekten döndürür
+    
+    Returns:
+        Tuple: (OHLCV verisi veya None, veri çekici)
+    """
+    fetcher = BISTDataFetcher()
+    # Kapalı piyasada çekilen veri bir sonraki seans açılışına kadar geçerlidir
+    df = get_cache().get_or_compute(('data', symbol, period, "1d"),
+                                    lambda: fetcher.get_stock_data(symbol, period=period),
+                                    ttl=fetcher.calendar.cache_ttl(MEMORY_CACHE_CONFIG['ttl']))
+    return df, fetcher
+
+def data_key(symbol, period, df):
+    """Verinin sürümünü de içeren önbellek anahtarı (yeni bar gelince değişir)"""
+    return (symbol, period, "1d", len(df), df.index[-1])
+
+def indicator_cache():
+    """Yeniden başlatmalar arasında kalıcı indikatör önbelleği (kapalıysa None)"""
+    return get_indicator_cache() if INDICATOR_CACHE_CONFIG['enabled'] else None
+
+def load_analyzer(symbol, period, df):
+    """Sinyal indikatörleri hesaplanmış, oturumlar arası paylaşılan analiz nesnesi"""
+    key = (symbol, period, "1d")
+    return get_cache().get_or_compute(('analysis',) + data_key(symbol, period, df),
+                                      lambda: build_analyzer(df, SIGNAL_INDICATORS, key=key,
+                                                                         indicator_cache=indicator_cache()))
+
+def load_indicators(symbol, period, df, names):
+    """
+    Seçili indikatörlerin serileri
+    
+    Her indikatör ayrı önbellek kaydıdır; seçim değişince sadece yeni
+    açılan indikatör hesaplanır.
+    
+    Returns:
+        Dict: Seri adı -> Series (örn. bollinger için bb_upper, bb_middle, bb_lower)
+    """
+    def compute(name):
+        analyzer = TechnicalAnalyzer(df, indicator_cache=indicator_cache())
+        analyzer.add_indicator(name)
+        return analyzer.indicators
+    
+    series = {}
+    for name in names:
+        series.update(get_cache().get_or_compute(('indicator',) + data_key(symbol, period, df) + (name,),
+                                                 lambda name=name: compute(name)))
+    return series
+
+def show_data_error(fetcher):
+    """Veri yüklenemediğinde nedenini gösterir"""
+    # Kaynak erişilemiyorsa kullanıcı tekrar denemesi gerektiğini bilsin
+    error = fetcher.last_error
+    if error is not None and error.retryable:
+        st.error(f"Veri kaynağına ulaşılamıyor, biraz sonra tekrar deneyin. ({error.error})")
+    else:
+        st.error("Veri yüklenemedi!")
+
+def render_analysis(selected_symbol, time_period):
+    """
+    Seçili hissenin analiz sekmesini çizer
+    
+    Sayfa bağımsız yenilenen parçalardan (fragment) oluşur: grafik,
+    sinyal, güncel bilgiler ve indikatör değerleri. Bir parçadaki etkileşim
+    (örn. indikatör seçimi) sadece o parçayı yeniden çalıştırır; veri ve
+    analiz paylaşılan önbellekten okunur.
+    """
+    # Veri parçalardan önce bir kez yüklenir; parçalar aynı önbellek kaydını okur
+    try:
+        with st.spinner("Veriler yükleniyor..."):
+            df, fetcher = load_data(selected_symbol, time_period)
+    except Exception as e:
+        st.error(f"Hata oluştu: {str(e)}")
+        return
+    
     col1, col2, col3 = st.columns([2, 1, 1])
     
     with col1:
-        st.subheader(f"📊 {selected_symbol} - {BIST_SYMBOLS[selected_symbol]}")
-        
-        # Veri çekme ve analiz
-        try:
-            with st.spinner("Veriler yükleniyor..."):
-                fetcher = BISTDataFetcher()
-                df = fetcher.get_stock_data(selected_symbol, period=time_period)
-                
-                if df is not None and not df.empty:
-                    analyzer = TechnicalAnalyzer(df)
-                    
-                    # Teknik indikatörleri hesapla
-                    for indicator, enabled in selected_indicators.items():
-                        if enabled:
-                            analyzer.add_indicator(indicator)
-                    
-                    # Ana grafik
-                    fig = create_chart(df, analyzer, selected_indicators)
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Al-Sat sinyali hesapla
-                    alert_system = AlertSystem()
-                    signal = alert_system.generate_signal(analyzer)
-                    
-                    # Sinyal gösterimi
-                    signal_color = "buy-signal" if signal == "AL" else "sell-signal" if signal == "SAT" else "hold-signal"
-                    st.markdown(f'<div class="{signal_color}">🎯 Sinyal: {signal}</div>', unsafe_allow_html=True)
-                    
-                else:
-                    st.error("Veri yüklenemedi!")
-                    
-        except Exception as e:
-            st.error(f"Hata oluştu: {str(e)}")
+        st.subheader(f"📊 {selected_symbol} - {get_registry().name(selected_symbol)}")
+        if df is None or df.empty:
+            show_data_error(fetcher)
+            return
+        render_chart_panel(selected_symbol, time_period)
+        render_signal_badge(selected_symbol, time_period)
     
     with col2:
-        st.subheader("📈 Güncel Bilgiler")
-        if 'df' in locals() and df is not None:
-            latest = df.iloc[-1]
-            prev = df.iloc[-2]
-            
-            change = latest['Close'] - prev['Close']
-            change_pct = (change / prev['Close']) * 100
-            
-            st.metric(
-                label="Son Fiyat",
-                value=f"₺{latest['Close']:.2f}",
-                delta=f"{change:.2f} ({change_pct:.2f}%)"
-            )
-            
-            st.metric(
-                label="Hacim",
-                value=f"{latest['Volume']:,.0f}"
-            )
-            
-            st.metric(
-                label="En Yüksek",
-                value=f"₺{latest['High']:.2f}"
-            )
-            
+        render_price_panel(selected_symbol, time_period)
+    
+    with col3:
+        render_indicator_values(selected_symbol, time_period)
+
+@st.fragment
+def render_chart_panel(selected_symbol, time_period):
+    """Grafik ve grafiğe ait seçimler; seçim değişince sadece bu parça yenilenir"""
+    df, fetcher = load_data(selected_symbol, time_period)
+    if df is None or df.empty:
+        return
+    
+    try:
+        with st.popover("📈 İndikatörler"):
+            selected_indicators = {
+                indicator: st.checkbox(config["name"], value=config["default"], key=f"indicator_{indicator}")
+                for indicator, config in INDICATORS_CONFIG.items()
+            }
+            compare_index = st.checkbox("📉 XU100 ile Karşılaştır", value=False, key="compare_index")
+            show_levels = st.checkbox("📊 Hacim Profili Seviyeleri", value=False, key="show_levels")
+        
+        enabled_indicators = [name for name, enabled in selected_indicators.items() if enabled]
+        indicators = load_indicators(selected_symbol, time_period, df, enabled_indicators)
+        analyzer = load_analyzer(selected_symbol, time_period, df)
+        
+        # Endeks serisi tüm hisseler için bir kez çekilir
+        benchmark = None
+        if compare_index:
+            benchmark = IndexBenchmark.shared(BENCHMARK_INDEX, period=time_period,
+                                              fetcher=fetcher, max_age=BENCHMARK_MAX_AGE)
+            if benchmark.data is None:
+                st.warning("Endeks verisi yüklenemedi!")
+                benchmark = None
+        
+        fig = create_chart(df, analyzer, selected_indicators, benchmark, show_levels, indicators)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        if benchmark is not None:
+            metrics = benchmark.metrics(df['Close']).iloc[0]
+            rs_col, beta_col = st.columns(2)
+            rs_col.metric(label="Göreceli Güç (XU100)", value=f"{metrics['rs']:.1f}",
+                          delta=f"{metrics['rs'] - 100:.1f}")
+            beta_col.metric(label="Beta", value=f"{metrics['beta']:.2f}" if pd.notna(metrics['beta']) else "N/A")
+        
+        # Günlük, haftalık ve aylık indikatör değerleri tek seriden; istenince hesaplanır
+        if enabled_indicators and st.toggle("⏱️ Çoklu Zaman Dilimi", key="show_timeframes"):
+            summary_table = get_cache().get_or_compute(
+                ('timeframes',) + data_key(selected_symbol, time_period, df) + (tuple(enabled_indicators),),
+                lambda: TechnicalAnalyzer(df).timeframe_summary(enabled_indicators))
+            summary_table = summary_table.rename(columns=lambda tf: TIMEFRAMES[tf]["name"])
+            st.dataframe(summary_table.round(2), use_container_width=True)
+    
+    except Exception as e:
+        st.error(f"Hata oluştu: {str(e)}")
+
+@st.fragment
+def render_signal_badge(selected_symbol, time_period):
+    """Al-sat sinyali; grafik seçimlerinden bağımsızdır, sadece veri değişince değişir"""
+    df, _ = load_data(selected_symbol, time_period)
+    if df is None or df.empty:
+        return
+    analyzer = load_analyzer(selected_symbol, time_period, df)
+    signal = AlertSystem().generate_signal(analyzer)
+    
+    # Sinyal gösterimi
+    signal_color = "buy-signal" if signal == "AL" else "sell-signal" if signal == "SAT" else "hold-signal"
+    st.markdown(f'<div class="{signal_color}">🎯 Sinyal: {signal}</div>', unsafe_allow_html=True)
+
+@st.fragment(run_every=QUOTE_STREAM_CONFIG['poll_interval'])
+def render_price_panel(selected_symbol, time_period):
+    """
+    Güncel fiyat bilgileri; seans içinde zamanlayıcıyla kendi kendine yenilenir
+    
+    Piyasa kapalıyken son bar gösterilir ve fiyat sorgusu yapılmaz.
+    """
+    st.subheader("📈 Güncel Bilgiler")
+    df, fetcher = load_data(selected_symbol, time_period)
+    if df is None or len(df) < 2:
+        return
+    
+    latest = df.iloc[-1]
+    prev = df.iloc[-2]
+    price, volume, high, low = latest['Close'], latest['Volume'], latest['High'], latest['Low']
+    previous_close = prev['Close']
+    
+    quote = fetcher.get_quote(selected_symbol) if fetcher.calendar.is_open() else None
+    if quote and quote['current_price']:
+        price, volume = quote['current_price'], quote['volume']
+        high, low = quote['day_high'] or high, quote['day_low'] or low
+        previous_close = quote['previous_close'] or previous_close
+        st.caption(f"🟢 Seans açık · {datetime.fromtimestamp(quote['timestamp']).strftime('%H:%M:%S')}")
+    else:
+        st.caption(f"🔴 Piyasa kapalı · Açılış: {fetcher.calendar.next_open().strftime('%d.%m %H:%M')}")
+    
+    change = price - previous_close
+    change_pct = (change / previous_close) * 100
+    
+    st.metric(
+        label="Son Fiyat",
+        value=f"₺{price:.2f}",
+        delta=f"{change:.2f} ({change_pct:.2f}%)"
+    )
+    
+    st.metric(
+        label="Hacim",
+        value=f"{volume:,.0f}"
+    )
+    
+    st.metric(
+        label="En Yüksek",
+        value=f"₺{high:.2f}"
+    )
+    
+    st.metric(
+        label="En Düşük",
+        value=f"₺{low:.2f}"
+    )
+
+@st.fragment
+def render_indicator_values(selected_symbol, time_period):
+    """Sinyali oluşturan indikatörlerin son değerleri"""
+    st.subheader("🎯 İndikatör Değerleri")
+    df, _ = load_data(selected_symbol, time_period)
+    if df is None or df.empty:
+        return
+    
+    indicator_values = load_analyzer(selected_symbol, time_period, df).get_latest_indicators()
+    for indicator, value in indicator_values.items():
+        if indicator in INDICATORS_CONFIG:
             st.metric(
-                label="En Düşük",
-                value=f"₺{latest['Low']:.2f}"
+                label=INDICATORS_CONFIG[indicator]["name"],
+                value=f"{value:.2f}" if value else "N/A"
             )
+
+def render_correlation(time_period):
+    """Korelasyon ısı haritası sekmesini çizer"""
+    st.subheader("🔗 Hisse Korelasyonları")
     
-    with col3:
-        st.subheader("🎯 İndikatör Değerleri")
-        if 'analyzer' in locals():
-            indicator_values = analyzer.get_latest_indicators()
-            for indicator, value in indicator_values.items():
-                if selected_indicators.get(indicator, False):
-                    st.metric(
-                        label=INDICATORS_CONFIG[indicator]["name"],
-                        value=f"{value:.2f}" if value else "N/A"
-                    )
+    registry = get_registry()
+    symbols = st.multiselect(
+        "Hisseler",
+        options=registry.symbols(),
+        default=DEFAULT_CORRELATION_SYMBOLS,
+        format_func=lambda x: f"{x} - {registry.name(x)}"
+    )
+    window = st.slider("Pencere (bar)", min_value=10, max_value=120, value=60, step=5)
+    
+    if len(symbols) < 2:
+        st.info("Korelasyon için en az iki hisse seçin.")
+        return
+    
+    # Her hisse için ayrı veri çekildiği için hesaplama isteğe bağlıdır
+    if not st.checkbox("Korelasyonları hesapla", value=False):
+        return
+    
+    with st.spinner("Veriler yükleniyor..."):
+        fetcher = BISTDataFetcher()
+        prices = close_panel(fetcher.get_multiple_stocks(symbols, period=time_period))
+    
+    if prices.shape[1] < 2 or len(prices) < 3:
+        st.error("Korelasyon için yeterli veri yüklenemedi!")
+        return
+    
+    window = min(window, len(prices) - 1)
+    engine = RollingCorrelation.from_prices(prices, window=window, min_periods=max(2, window // 2))
+    
+    st.plotly_chart(create_correlation_heatmap(engine.correlation()), use_container_width=True)
+    
+    pairs = pd.DataFrame(engine.top_pairs(5), columns=["Hisse 1", "Hisse 2", "Korelasyon"])
+    st.markdown("**En çok birlikte hareket eden çiftler**")
+    st.dataframe(pairs.round(3), use_container_width=True, hide_index=True)
 
-def create_chart(df, analyzer, selected_indicators):
-    """Grafik oluşturur"""
+def create_chart(df, analyzer, selected_indicators, benchmark=None, show_levels=False, indicators=None):
+    """
+    Grafik oluşturur; benchmark verilirse endeks fiyat grafiğine ölçeklenerek eklenir
+    
+    `indicators` verilirse indikatör serileri analiz nesnesi yerine buradan okunur.
+    """
+    if indicators is None:
+        indicators = analyzer.indicators
     fig = make_subplots(
         rows=3, cols=1,
         shared_xaxes=True,
@@ -196,7 +412,7 @@ def create_chart(df, analyzer, selected_indicators):
         fig.add_trace(
             go.Scatter(
                 x=df.index,
-                y=analyzer.indicators.get('sma_20'),
+                y=indicators.get('sma_20'),
                 name="SMA 20",
                 line=dict(color='blue', width=1)
             ),
@@ -207,7 +423,7 @@ def create_chart(df, analyzer, selected_indicators):
         fig.add_trace(
             go.Scatter(
                 x=df.index,
-                y=analyzer.indicators.get('sma_50'),
+                y=indicators.get('sma_50'),
                 name="SMA 50",
                 line=dict(color='red', width=1)
             ),
@@ -216,8 +432,8 @@ def create_chart(df, analyzer, selected_indicators):
     
     # Bollinger Bands
     if selected_indicators.get('bollinger', False):
-        bb_upper = analyzer.indicators.get('bb_upper')
-        bb_lower = analyzer.indicators.get('bb_lower')
+        bb_upper = indicators.get('bb_upper')
+        bb_lower = indicators.get('bb_lower')
         if bb_upper is not None and bb_lower is not None:
             fig.add_trace(
                 go.Scatter(
@@ -239,6 +455,30 @@ def create_chart(df, analyzer, selected_indicators):
                 row=1, col=1
             )
     
+    # Endeks, ilk kapanışı hissenin ilk kapanışına eşitlenerek çizilir
+    if benchmark is not None:
+        index_close = benchmark.align(df.index)
+        first_valid = index_close.first_valid_index()
+        if first_valid is not None:
+            fig.add_trace(
+                go.Scatter(
+                    x=df.index,
+                    y=index_close / index_close[first_valid] * df['Close'][first_valid],
+                    name=f"{benchmark.index} (ölçekli)",
+                    line=dict(color='orange', width=1, dash='dot')
+                ),
+                row=1, col=1
+            )
+    
+    # Hacim profili düğümleri; fiyata en yakın destek ve direnç belirgin çizilir
+    if show_levels:
+        support, resistance = analyzer.calculate_support_resistance()
+        for level in analyzer.volume_profile().nodes():
+            if level not in (support, resistance):
+                fig.add_hline(y=level, line_dash="dot", line_color="lightgray", line_width=1, row=1, col=1)
+        fig.add_hline(y=support, line_dash="dash", line_color="green", annotation_text="Destek", row=1, col=1)
+        fig.add_hline(y=resistance, line_dash="dash", line_color="red", annotation_text="Direnç", row=1, col=1)
+    
     # Hacim grafiği
     fig.add_trace(
         go.Bar(
@@ -252,7 +492,7 @@ def create_chart(df, analyzer, selected_indicators):
     
     # RSI
     if selected_indicators.get('rsi', False):
-        rsi = analyzer.indicators.get('rsi')
+        rsi = indicators.get('rsi')
         if rsi is not None:
             fig.add_trace(
                 go.Scatter(
@@ -275,5 +515,23 @@ def create_chart(df, analyzer, selected_indicators):
     
     return fig
 
+def create_correlation_heatmap(corr):
+    """Korelasyon matrisinden ısı haritası oluşturur"""
+    fig = go.Figure(
+        go.Heatmap(
+            z=corr.values,
+            x=corr.columns,
+            y=corr.index,
+            zmin=-1,
+            zmax=1,
+            colorscale="RdBu",
+            text=corr.round(2).values,
+            texttemplate="%{text}",
+            hovertemplate="%{y} / %{x}: %{z:.2f}<extra></extra>"
+        )
+    )
+    fig.update_layout(height=600, yaxis_autorange="reversed")
+    return fig
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
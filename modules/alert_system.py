@@ -151,7 +151,7 @@ class AlertSystem:
     def _volume_signal(self, analyzer) -> Optional[str]:
         """Volume analizine göre sinyal üretir"""
         current_volume = analyzer.data['Volume'].iloc[-1]
-        avg_volume = analyzer.data['Volume'].tail(20).mean()
+        avg_volume = analyzer.average_volume(20)
         
         current_price = analyzer.data['Close'].iloc[-1]
         prev_price = analyzer.data['Close'].iloc[-2]
@@ -249,7 +249,7 @@ class AlertSystem:
         
         # Volume spike alertleri
         current_volume = analyzer.data['Volume'].iloc[-1]
-        avg_volume = analyzer.data['Volume'].tail(20).mean()
+        avg_volume = analyzer.average_volume(20)
         
         if current_volume > avg_volume * ALERT_CONFIG['volume_spike_multiplier']:
             alerts.append({
@@ -274,7 +274,66 @@ class AlertSystem:
             })
         
         return alerts
-    
+
+    def check_rule_alerts(self, rules, panel) -> List[Dict]:
+        """
+        Kullanıcı tanımlı kuralları tüm evrende kontrol eder
+
+        Args:
+            rules: rules.RuleSet objesi
+            panel: rules.Panel objesi (örn. Panel.from_analyzers ile)
+
+        Returns:
+            List[Dict]: Tetiklenen alertler (hisse ve kural adıyla)
+        """
+        alerts = []
+        for match in rules.triggered(panel):
+            alerts.append({
+                'type': 'rule',
+                'message': f"{match['symbol']}: '{match['rule']}' kuralı tetiklendi ({match['text']})",
+                'timestamp': datetime.now(),
+                'symbol': match['symbol'],
+                'rule': match['rule']
+            })
+        return alerts
+
+    def check_level_alerts(self, book, quotes: List[Dict]) -> List[Dict]:
+        """
+        Fiyat seviyesi defterindeki hedef ve stop loss alertlerini kontrol eder
+
+        Her fiyat için sadece önceki fiyatla arasında kalan seviyeler
+        bulunur; tetiklenen alertler defterden silinir.
+
+        Args:
+            book: price_alerts.PriceAlertBook objesi
+            quotes: Anlık fiyatlar (symbol ve current_price anahtarlı, örn. QuotePoller olayları)
+
+        Returns:
+            List[Dict]: Tetiklenen alertler
+        """
+        alerts = []
+        for quote in quotes:
+            # Fiyatı olmayan sorgular (0 veya None) seviye kesişimi sayılmaz
+            price = quote.get('current_price')
+            if not price or not np.isfinite(price) or price <= 0:
+                continue
+            for match in book.update(quote['symbol'], price):
+                if match['direction'] == 'above':
+                    alert_type, message = 'price_target', f"Hedef fiyat {match['level']:.2f} TL ulaşıldı!"
+                else:
+                    alert_type, message = 'stop_loss', f"Stop loss {match['level']:.2f} TL tetiklendi!"
+                alerts.append({
+                    'type': alert_type,
+                    'message': f"{match['symbol']}: {message} Güncel: {match['price']:.2f} TL",
+                    'timestamp': datetime.now(),
+                    'price': match['price'],
+                    'symbol': match['symbol'],
+                    'level': match['level'],
+                    'alert_id': match['id'],
+                    'note': match['note']
+                })
+        return alerts
+
     def send_email_alert(self, alert: Dict, recipient_email: str, smtp_config: Dict) -> bool:
         """
         Email alert gönderir
@@ -374,7 +433,7 @@ class AlertSystem:
         
         # Volume analizi
         current_volume = analyzer.data['Volume'].iloc[-1]
-        avg_volume = analyzer.data['Volume'].tail(20).mean()
+        avg_volume = analyzer.average_volume(20)
         volume_ratio = current_volume / avg_volume
         
         if volume_ratio > 1.5:
@@ -0,0 +1,351 @@
+"""
+JSON API servisi
+
+Analiz sonuçlarını (özet, al-sat sinyali, indikatör serileri) Streamlit
+sayfası olmadan diğer sistemlere sunar. Starlette ile asenkron çalışır;
+veri çekme ve hesaplama thread havuzunda yapılır.
+
+Uç noktalar:
+    GET /health                                  durum ve önbellek istatistikleri
+    GET /symbols/{hisse}/summary?period=1y       analiz özeti ve sinyal
+    GET /symbols/{hisse}/signal?period=1y        sinyal, sinyal gücü ve alertler
+    GET /symbols/{hisse}/indicators?names=rsi,macd&period=1y
+                                                 indikatör serileri (parça parça gönderilir)
+    GET /universe?index=XU030&period=1y          evrendeki hisselerin rapor satırları
+    GET /universe?symbols=THYAO,GARAN
+
+Her yanıt, girdi barlarının içerik özetinden (veri sürümü) türetilen bir
+ETag taşır. İstemci son ETag'i `If-None-Match` ile gönderirse veri
+değişmediyse gövde hesaplanmadan 304 döner. Yanıt gövdeleri veri
+sürümüne göre önbellekte tutulur; yeni bar gelince anahtar kendiliğinden
+değişir. orjson yüklüyse NumPy dizileri kopyalanmadan serileştirilir.
+"""
+
+import json
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from .alert_system import AlertSystem
+from .batch_analysis import analyze_frame
+from .config import (API_CONFIG, INDICATORS_CONFIG, INDICATOR_CACHE_CONFIG, MEMORY_CACHE_CONFIG,
+                     SIGNAL_INDICATORS, TIME_PERIODS)
+from .data_fetcher import BISTDataFetcher
+from .indicator_cache import IndicatorCache, fingerprint, get_indicator_cache
+from .memory_cache import LRUCache, get_cache
+from .symbols import get_registry, to_symbol
+from .technical_analysis import TechnicalAnalyzer, build_analyzer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MEDIA_TYPE = "application/json"
+
+def _plain(value):
+    """NumPy ve pandas değerlerini standart JSON tiplerine çevirir (NaN -> null)"""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            return np.where(np.isfinite(value), value, None).tolist()
+        return _plain(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _default(value):
+    """orjson'un doğrudan serileştirmediği tipler"""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value).__name__}")
+
+def dumps(value) -> bytes:
+    """
+    Değeri JSON baytlarına çevirir
+
+    NumPy dizileri ve skalerleri desteklenir; NaN ve sonsuz değerler null
+    olarak yazılır.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_plain(value), ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+def make_etag(*parts) -> str:
+    """Yanıtı belirleyen parçalardan (uç nokta, parametreler, veri sürümü) ETag"""
+    text = "|".join(str(part) for part in parts)
+    return '"' + hashlib.blake2b(text.encode(), digest_size=12).hexdigest() + '"'
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """`If-None-Match` başlığı ETag'i içeriyorsa True (zayıf karşılaştırma)"""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+def _array_chunks(values, chunk_rows: int) -> Iterator[bytes]:
+    """Dizinin JSON elemanlarını (köşeli parantezsiz) parça parça üretir"""
+    for start in range(0, len(values), chunk_rows):
+        body = dumps(values[start:start + chunk_rows])[1:-1]
+        yield body if start == 0 else b"," + body
+
+def stream_series(meta: Dict, timestamps: List[str], series: Dict[str, np.ndarray],
+                  chunk_rows: int = API_CONFIG['chunk_rows']) -> Iterator[bytes]:
+    """
+    İndikatör serisi yanıtını bellekte tek parça oluşturmadan üretir
+
+    Çıktı: {...meta, "rows": n, "index": [...], "series": {"rsi": [...], ...}}
+
+    Args:
+        meta: Başlık alanları
+        timestamps: Bar zamanları (ISO 8601)
+        series: Seri adı -> değerler
+        chunk_rows: Tek parçadaki satır sayısı
+    """
+    head = dumps(dict(meta, rows=len(timestamps)))
+    yield head[:-1] + b',"index":['
+    yield from _array_chunks(timestamps, chunk_rows)
+    yield b'],"series":{'
+    for position, (name, values) in enumerate(series.items()):
+        yield (b"," if position else b"") + dumps(name) + b":["
+        yield from _array_chunks(values, chunk_rows)
+        yield b"]"
+    yield b"}}"
+
+class AnalysisService:
+    """
+    API yanıtlarını üreten katman (HTTP'den bağımsız)
+
+    Önbellek anahtarları veri sürümünü içerir; aynı veri için eşzamanlı
+    gelen istekler hesaplamayı paylaşır.
+    """
+
+    def __init__(self, source=None, cache: Optional[LRUCache] = None,
+                 indicator_cache: Optional[IndicatorCache] = None):
+        """
+        Args:
+            source: Veri kaynağı (None ise varsayılan kaynak, bkz. `set_default_source`)
+            cache: Bellek önbelleği (None ise süreç genelindeki önbellek)
+            indicator_cache: Diskteki indikatör önbelleği (None ise konfigürasyona göre)
+        """
+        self.source = source
+        self.cache = cache if cache is not None else get_cache()
+        if indicator_cache is None and INDICATOR_CACHE_CONFIG['enabled']:
+            indicator_cache = get_indicator_cache()
+        self.indicator_cache = indicator_cache
+        self.alert_system = AlertSystem()
+
+    def load(self, symbol: str, period: str) -> Tuple[Optional[pd.DataFrame], BISTDataFetcher, Optional[str]]:
+        """
+        Hisse verisini ve sürümünü döndürür
+
+        Veri anahtarı arayüzdekiyle aynıdır; paylaşılan bellek açıksa
+        (`MEMORY_CACHE_CONFIG['shared']`) uygulama süreçleriyle paylaşılır.
+
+        Returns:
+            Tuple: (OHLCV verisi veya None, veri çekici, veri sürümü)
+        """
+        fetcher = BISTDataFetcher(source=self.source)
+        df = self.cache.get_or_compute(('data', symbol, period, "1d"),
+                                       lambda: fetcher.get_stock_data(symbol, period=period),
+                                       ttl=fetcher.calendar.cache_ttl(MEMORY_CACHE_CONFIG['ttl']))
+        if df is None or df.empty:
+            return None, fetcher, None
+        return df, fetcher, fingerprint(df, len(df))
+
+    def analyzer(self, symbol: str, period: str, df: pd.DataFrame, version: str) -> TechnicalAnalyzer:
+        """Sinyal indikatörleri hesaplanmış analiz nesnesi"""
+        return self.cache.get_or_compute(('api', 'analysis', symbol, period, version),
+                                         lambda: build_analyzer(df, SIGNAL_INDICATORS, key=(symbol, period, version),
+                                                                indicator_cache=self.indicator_cache))
+
+    def summary(self, symbol: str, period: str, df: pd.DataFrame, version: str) -> bytes:
+        """`generate_summary` ve al-sat sinyali"""
+        def render():
+            analyzer = self.analyzer(symbol, period, df, version)
+            return dumps({'symbol': symbol, 'period': period, 'version': version, 'date': df.index[-1],
+                          'signal': self.alert_system.generate_signal(analyzer),
+                          'summary': analyzer.generate_summary()})
+        return self.cache.get_or_compute(('api', 'summary', symbol, period, version), render)
+
+    def signal(self, symbol: str, period: str, df: pd.DataFrame, version: str) -> bytes:
+        """Al-sat sinyali, sinyal gücü ve teknik alertler"""
+        def render():
+            analyzer = self.analyzer(symbol, period, df, version)
+            return dumps({'symbol': symbol, 'period': period, 'version': version, 'date': df.index[-1],
+                          'price': df['Close'].iloc[-1],
+                          'signal': self.alert_system.generate_signal(analyzer),
+                          'strength': self.alert_system.get_signal_strength(analyzer),
+                          'alerts': self.alert_system.check_technical_alerts(analyzer)})
+        return self.cache.get_or_compute(('api', 'signal', symbol, period, version), render)
+
+    def series(self, symbol: str, period: str, df: pd.DataFrame, version: str,
+               names: List[str]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """
+        İndikatör serileri
+
+        Her indikatör ayrı önbellek kaydıdır; seçim değişince sadece yeni
+        indikatör hesaplanır.
+
+        Returns:
+            Tuple: (bar zamanları, seri adı -> float64 dizi)
+        """
+        def compute(name):
+            analyzer = TechnicalAnalyzer(df, indicator_cache=self.indicator_cache)
+            analyzer.add_indicator(name)
+            return {output: values.to_numpy(dtype=np.float64) for output, values in analyzer.indicators.items()}
+
+        timestamps = self.cache.get_or_compute(('api', 'index', symbol, period, version),
+                                               lambda: [ts.isoformat() for ts in df.index])
+        series = {}
+        for name in names:
+            series.update(self.cache.get_or_compute(('api', 'indicator', symbol, period, version, name),
+                                                    lambda name=name: compute(name)))
+        return timestamps, series
+
+    def report_row(self, symbol: str, period: str, df: pd.DataFrame, version: str) -> Dict:
+        """Toplu analizdeki düz rapor satırı"""
+        return self.cache.get_or_compute(('api', 'row', symbol, period, version),
+                                         lambda: analyze_frame(symbol, df, SIGNAL_INDICATORS, self.alert_system,
+                                                               indicator_cache=self.indicator_cache))
+
+    def universe(self, symbols: List[str], period: str, frames: Dict[str, Tuple[pd.DataFrame, str]],
+                 version: str, missing: List[str]) -> bytes:
+        """Evrendeki hisselerin rapor satırları"""
+        def render():
+            rows = [self.report_row(symbol, period, df, symbol_version)
+                    for symbol, (df, symbol_version) in frames.items()]
+            return dumps({'period': period, 'version': version, 'rows': rows, 'missing': missing})
+        return self.cache.get_or_compute(('api', 'universe', tuple(symbols), period, version), render)
+
+def _headers(etag: str) -> Dict[str, str]:
+    # İstemci her istekte ETag ile doğrulama yapar; değişmeyen veri için 304 döner
+    return {'ETag': etag, 'Cache-Control': "no-cache"}
+
+def _period(request: Request) -> str:
+    period = request.query_params.get('period', API_CONFIG['period'])
+    if period not in TIME_PERIODS:
+        raise HTTPException(400, f"Desteklenmeyen zaman aralığı: {period} (mevcut: {', '.join(TIME_PERIODS)})")
+    return period
+
+def _check_etag(request: Request, etag: str) -> None:
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        raise HTTPException(304, headers=_headers(etag))
+
+async def _http_error(request: Request, exc: HTTPException) -> Response:
+    """Hataları JSON olarak döndürür"""
+    if exc.status_code == 304:
+        return Response(status_code=304, headers=exc.headers)
+    return Response(dumps({'error': exc.detail}), status_code=exc.status_code,
+                    media_type=MEDIA_TYPE, headers=exc.headers)
+
+def create_app(source=None, cache: Optional[LRUCache] = None,
+               indicator_cache: Optional[IndicatorCache] = None) -> Starlette:
+    """
+    API uygulamasını oluşturur
+
+    Args:
+        source: Veri kaynağı (örn. `OfflineSource()`; None ise varsayılan kaynak)
+        cache: Bellek önbelleği (None ise süreç genelindeki önbellek)
+        indicator_cache: Diskteki indikatör önbelleği (None ise konfigürasyona göre)
+
+    Returns:
+        Starlette: ASGI uygulaması (`uvicorn.run(create_app())`)
+    """
+    service = AnalysisService(source, cache, indicator_cache)
+
+    async def load(request: Request, kind: str, *params) -> Tuple[str, str, pd.DataFrame, str, str]:
+        """Hisse verisini yükler; veri değişmediyse 304 ile sonlandırır"""
+        period = _period(request)
+        symbol = to_symbol(request.path_params['symbol'])
+        df, fetcher, version = await run_in_threadpool(service.load, symbol, period)
+        if df is None:
+            error = fetcher.last_error
+            if error is not None and error.retryable:
+                raise HTTPException(503, f"Veri kaynağına ulaşılamıyor: {error.error}")
+            raise HTTPException(404, f"Veri bulunamadı: {symbol}")
+
+        etag = make_etag(kind, symbol, period, version, *params)
+        _check_etag(request, etag)
+        return symbol, period, df, version, etag
+
+    async def health(request: Request) -> Response:
+        return Response(dumps({'status': "ok", 'cache': service.cache.stats()}), media_type=MEDIA_TYPE)
+
+    async def summary(request: Request) -> Response:
+        symbol, period, df, version, etag = await load(request, 'summary')
+        body = await run_in_threadpool(service.summary, symbol, period, df, version)
+        return Response(body, media_type=MEDIA_TYPE, headers=_headers(etag))
+
+    async def signal(request: Request) -> Response:
+        symbol, period, df, version, etag = await load(request, 'signal')
+        body = await run_in_threadpool(service.signal, symbol, period, df, version)
+        return Response(body, media_type=MEDIA_TYPE, headers=_headers(etag))
+
+    async def indicators(request: Request) -> Response:
+        names = [name for name in request.query_params.get('names', "").split(",") if name] or SIGNAL_INDICATORS
+        unknown = [name for name in names if name not in INDICATORS_CONFIG]
+        if unknown:
+            raise HTTPException(400, f"Bilinmeyen indikatör: {', '.join(unknown)}")
+
+        symbol, period, df, version, etag = await load(request, 'indicators', tuple(names))
+        timestamps, series = await run_in_threadpool(service.series, symbol, period, df, version, names)
+        meta = {'symbol': symbol, 'period': period, 'version': version}
+        return StreamingResponse(stream_series(meta, timestamps, series), media_type=MEDIA_TYPE,
+                                 headers=_headers(etag))
+
+    async def universe(request: Request) -> Response:
+        period = _period(request)
+        index = request.query_params.get('index')
+        codes = request.query_params.get('symbols')
+        if codes:
+            symbols = [to_symbol(code) for code in codes.split(",") if code.strip()]
+        elif index:
+            registry = get_registry()
+            symbols = registry.symbols(index=index)
+            if not symbols:
+                raise HTTPException(400, f"Endekste hisse bulunamadı: {index} (mevcut: {', '.join(registry.indices())})")
+        else:
+            raise HTTPException(400, "symbols veya index parametresi gerekli")
+
+        # Hisseler thread havuzunda eşzamanlı yüklenir
+        loaded = await asyncio.gather(*(run_in_threadpool(service.load, symbol, period) for symbol in symbols))
+        frames = {symbol: (df, version) for symbol, (df, _, version) in zip(symbols, loaded) if df is not None}
+        missing = [symbol for symbol in symbols if symbol not in frames]
+
+        version = make_etag(*(f"{symbol}:{symbol_version}" for symbol, (_, symbol_version) in frames.items()),
+                            *missing).strip('"')
+        etag = make_etag('universe', tuple(symbols), period, version)
+        _check_etag(request, etag)
+        body = await run_in_threadpool(service.universe, symbols, period, frames, version, missing)
+        return Response(body, media_type=MEDIA_TYPE, headers=_headers(etag))
+
+    routes = [
+        Route("/health", health),
+        Route("/symbols/{symbol}/summary", summary),
+        Route("/symbols/{symbol}/signal", signal),
+        Route("/symbols/{symbol}/indicators", indicators),
+        Route("/universe", universe),
+    ]
+    app = Starlette(routes=routes, exception_handlers={HTTPException: _http_error})
+    app.state.service = service
+    return app
@@ -0,0 +1,195 @@
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Iterator
+
+import pandas as pd
+
+from .config import INDICATORS_CONFIG
+from .data_cache import open_cache
+from .data_fetcher import BISTDataFetcher
+from .history_store import HistoryStore
+from .indicator_cache import IndicatorCache
+from .technical_analysis import TechnicalAnalyzer, indicator_outputs
+from .alert_system import AlertSystem
+from .relative_strength import IndexBenchmark
+from .chart_patterns import PATTERN_NAMES
+
+def default_indicators() -> List[str]:
+    """Konfigürasyonda varsayılan olarak açık olan indikatörleri döndürür"""
+    return [name for name, config in INDICATORS_CONFIG.items() if config['default']]
+
+def _to_float(value) -> float:
+    """Değeri float'a çevirir, geçersizse NaN döndürür"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def analyze_frame(symbol: str, df: pd.DataFrame, indicators: List[str],
+                  alert_system: Optional[AlertSystem] = None,
+                  benchmark: Optional[IndexBenchmark] = None,
+                  indicator_cache: Optional[IndicatorCache] = None) -> Dict:
+    """
+    Tek bir hissenin analizini düz bir rapor satırına çevirir
+
+    Tüm satırlar aynı sütunlara sahiptir; eksik değerler NaN olarak yazılır.
+
+    Args:
+        symbol: Hisse kodu
+        df: OHLCV verileri
+        indicators: Hesaplanacak indikatörler
+        alert_system: AlertSystem objesi
+        benchmark: Karşılaştırma endeksi (verilirse rs, beta ve alpha sütunları eklenir)
+        indicator_cache: Diskteki indikatör önbelleği
+
+    Returns:
+        Dict: Rapor satırı
+    """
+    alert_system = alert_system or AlertSystem()
+
+    analyzer = TechnicalAnalyzer(df, indicator_cache=indicator_cache)
+    for indicator in indicators:
+        analyzer.add_indicator(indicator)
+
+    summary = analyzer.generate_summary()
+    trend = summary['trend_strength']
+    latest = summary['latest_indicators']
+    strength = alert_system.get_signal_strength(analyzer)
+    alerts = alert_system.check_technical_alerts(analyzer)
+
+    row = {
+        'symbol': symbol,
+        'date': pd.Timestamp(df.index[-1]).isoformat(),
+        'bars': len(df),
+        'current_price': _to_float(summary['current_price']),
+        'price_change': _to_float(summary['price_change']),
+        'support_level': _to_float(summary['support_level']),
+        'resistance_level': _to_float(summary['resistance_level']),
+        'point_of_control': _to_float(summary['point_of_control']),
+        'volume_spike': bool(summary['volume_spike']),
+        'adx': _to_float(trend['adx']),
+        'price_trend': _to_float(trend['price_trend']),
+        'volume_trend': _to_float(trend['volume_trend']),
+        'trend_direction': trend['trend_direction'],
+    }
+
+    for pattern in PATTERN_NAMES:
+        row[f'pattern_{pattern}'] = bool(summary['chart_patterns'].get(pattern, False))
+
+    for column in indicator_outputs(indicators):
+        row[column] = _to_float(latest.get(column))
+
+    if benchmark is not None:
+        metrics = benchmark.metrics(df['Close'].rename(symbol)).iloc[0]
+        for key in ['rs', 'beta', 'alpha']:
+            row[key] = _to_float(metrics[key])
+
+    row['signal'] = alert_system.generate_signal(analyzer)
+    for key in ['overall', 'trend', 'momentum', 'volume']:
+        row[f'strength_{key}'] = _to_float(strength[key])
+    row['alert_count'] = len(alerts)
+    row['alerts'] = ",".join(alert['type'] for alert in alerts)
+
+    return row
+
+# Worker süreçlerinde bir kez oluşturulan nesneler
+_worker_state = {}
+
+def _init_worker(cache_dir: Optional[str], offline: bool, period: str,
+                 interval: str, indicators: List[str],
+                 benchmark_data: Optional[tuple] = None,
+                 history_dir: Optional[str] = None, indicator_dir: Optional[str] = None,
+                 cache_max_age: Optional[float] = None) -> None:
+    """Worker sürecini hazırlar"""
+    cache = open_cache(cache_dir, offline, cache_max_age) if cache_dir else None
+    # Depo dosyaları tüm worker'larda aynı sayfa önbelleğinden okunur
+    history = HistoryStore(history_dir) if history_dir else None
+    _worker_state['fetcher'] = BISTDataFetcher(cache=cache, offline=offline, history=history)
+    _worker_state['alert_system'] = AlertSystem()
+    _worker_state['period'] = period
+    _worker_state['interval'] = interval
+    _worker_state['indicators'] = indicators
+    _worker_state['indicator_cache'] = IndicatorCache(indicator_dir) if indicator_dir else None
+    # Endeks serisi ana süreçte bir kez çekilir, her worker'a bir kez aktarılır
+    _worker_state['benchmark'] = None
+    if benchmark_data is not None:
+        index, data = benchmark_data
+        _worker_state['benchmark'] = IndexBenchmark(index, period, interval, data=data)
+
+def _analyze_symbol(symbol: str) -> Optional[Dict]:
+    """Worker içinde tek bir hisseyi çeker ve analiz eder"""
+    state = _worker_state
+    df = state['fetcher'].get_stock_data(symbol, period=state['period'], interval=state['interval'])
+    if df is None or df.empty:
+        return None
+
+    try:
+        return analyze_frame(symbol, df, state['indicators'], state['alert_system'],
+                             state['benchmark'], state['indicator_cache'])
+    except Exception as e:
+        print(f"Analiz hatası {symbol}: {str(e)}")
+        return None
+
+def iter_batch(symbols: List[str], period: str = "1y", interval: str = "1d",
+               indicators: Optional[List[str]] = None, workers: Optional[int] = None,
+               cache_dir: Optional[str] = None, offline: bool = False,
+               benchmark: Optional[str] = None, history_dir: Optional[str] = None,
+               indicator_dir: Optional[str] = None,
+               cache_max_age: Optional[float] = None) -> Iterator[Dict]:
+    """
+    Hisseleri tüm çekirdeklerde paralel analiz eder ve satırları
+    tamamlandıkça üretir
+
+    Aynı anda en fazla `workers * 2` iş kuyrukta bekler; sonuçlar
+    bellekte biriktirilmez.
+
+    Args:
+        symbols: Hisse kodları
+        period: Zaman aralığı
+        interval: Veri aralığı
+        indicators: İndikatörler (None ise varsayılanlar)
+        workers: Süreç sayısı (None ise çekirdek sayısı)
+        cache_dir: Veri önbelleği klasörü
+        offline: True ise sadece önbellekteki veriler kullanılır
+        benchmark: Göreceli güç, beta ve alfa için karşılaştırma endeksi (örn: XU100.IS)
+        history_dir: Memory-map geçmiş deposu klasörü
+        indicator_dir: Diskteki indikatör önbelleği klasörü
+        cache_max_age: Seans içinde çekilen verilerin önbellekte geçerlilik
+            süresi (saniye, None ise konfigürasyondaki; çevrimdışı modda süresiz)
+
+    Yields:
+        Dict: Rapor satırı
+    """
+    indicators = indicators if indicators is not None else default_indicators()
+    workers = workers or os.cpu_count() or 1
+
+    benchmark_data = None
+    if benchmark:
+        cache = open_cache(cache_dir, offline, cache_max_age) if cache_dir else None
+        history = HistoryStore(history_dir) if history_dir else None
+        fetcher = BISTDataFetcher(cache=cache, offline=offline, history=history)
+        data = IndexBenchmark(benchmark, period, interval, fetcher=fetcher).data
+        if data is None:
+            raise ValueError(f"Endeks verisi yüklenemedi: {benchmark}")
+        benchmark_data = (benchmark, data)
+
+    initargs = (cache_dir, offline, period, interval, indicators, benchmark_data, history_dir, indicator_dir,
+                cache_max_age)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        pending = set()
+
+        for symbol in symbols:
+            pending.add(executor.submit(_analyze_symbol, symbol))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    row = future.result()
+                    if row is not None:
+                        yield row
+
+        for future in wait(pending).done:
+            row = future.result()
+            if row is not None:
+                yield row
@@ -0,0 +1,337 @@
+"""
+Vektörize grafik deseni tespiti
+
+Desenler tüm geçmiş üzerinde tek geçişte bulunur:
+
+1. Tepe ve dipler (pivotlar) kayan pencere ile vektörize olarak çıkarılır.
+2. Pivotlar tepe/dip sırayla değişen bir salınım (swing) serisine indirgenir;
+   art arda gelen aynı türden pivotların en uç olanı tutulur.
+3. Her desen, salınım serisinin ardışık pencereleri üzerinde dizi
+   işlemleriyle aranır (örn. çift tepe için 3, omuz-baş-omuz için 5 salınım).
+   Üçgen ve bayrakta trend çizgileri pivotlara en küçük kareler ile oturtulur.
+
+Her desen bulunduğu bar aralığıyla döner; iç içe geçen aynı desenler tek
+kayıtta birleştirilir.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Optional, Tuple
+
+from .config import PATTERN_CONFIG
+
+PATTERN_NAMES = ['double_top', 'double_bottom', 'head_shoulders', 'triangle', 'flag']
+
+# Desen sonuç tablosunun sütunları
+PATTERN_COLUMNS = ['pattern', 'direction', 'start', 'end', 'level']
+
+PEAK = 1
+VALLEY = -1
+
+def _strict_extrema(values: np.ndarray, order: int, sign: int) -> np.ndarray:
+    """Her iki yanındaki `order` bardan kesin büyük (sign=1) / küçük (sign=-1) noktalar"""
+    if len(values) < 2 * order + 1:
+        return np.empty(0, dtype=np.int64)
+    windows = sliding_window_view(values * sign, 2 * order + 1)
+    center = windows[:, order]
+    mask = (center > windows[:, :order].max(axis=1)) & (center > windows[:, order + 1:].max(axis=1))
+    return np.flatnonzero(mask) + order
+
+def find_pivots(high: np.ndarray, low: np.ndarray, order: int = PATTERN_CONFIG['order']) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tepe ve dip noktalarını bulur
+
+    Bir bar, her iki yanındaki `order` barın en yükseğinden yüksekse tepe,
+    en düşüğünden düşükse diptir. Son `order` bar henüz doğrulanmadığı için
+    pivot olamaz.
+
+    Args:
+        high: Yüksek fiyatlar
+        low: Düşük fiyatlar
+        order: Pivotun her iki yanında bakılan bar sayısı
+
+    Returns:
+        Tuple: (tepe indeksleri, dip indeksleri)
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    return _strict_extrema(high, order, PEAK), _strict_extrema(low, order, VALLEY)
+
+def swing_points(high: np.ndarray, low: np.ndarray,
+                 order: int = PATTERN_CONFIG['order']) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tepe ve diplerin sırayla değiştiği salınım serisini oluşturur
+
+    Art arda gelen aynı türden pivotlardan sadece en uç olanı (en yüksek tepe
+    veya en düşük dip) tutulur.
+
+    Args:
+        high: Yüksek fiyatlar
+        low: Düşük fiyatlar
+        order: Pivotun her iki yanında bakılan bar sayısı
+
+    Returns:
+        Tuple: (bar indeksleri, fiyatlar, türler) — tür tepe için 1, dip için -1
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    peaks, valleys = find_pivots(high, low, order)
+
+    index = np.concatenate([peaks, valleys])
+    price = np.concatenate([high[peaks], low[valleys]])
+    kind = np.concatenate([np.full(len(peaks), PEAK), np.full(len(valleys), VALLEY)])
+    if len(index) == 0:
+        return index, price, kind
+
+    sort = np.argsort(index, kind='stable')
+    index, price, kind = index[sort], price[sort], kind[sort]
+
+    # Aynı türden ardışık pivotlar bir grup; her grubun en uç noktası seçilir
+    group = np.concatenate([[0], np.cumsum(kind[1:] != kind[:-1])])
+    ranked = np.lexsort((-price * kind, group))
+    first = np.concatenate([[0], np.flatnonzero(np.diff(group[ranked])) + 1])
+    keep = np.sort(ranked[first])
+    return index[keep], price[keep], kind[keep]
+
+def _empty() -> Dict[str, np.ndarray]:
+    """Boş desen kayıtları"""
+    return _records('', np.zeros(0, dtype=bool), np.zeros(0, dtype=object), *([np.zeros(0)] * 3))
+
+def _records(pattern: str, mask: np.ndarray, direction: np.ndarray, start: np.ndarray,
+             end: np.ndarray, level: np.ndarray) -> Dict[str, np.ndarray]:
+    """Eşleşen pencerelerden desen kayıtları (sütun -> dizi) oluşturur"""
+    return {
+        'pattern': np.full(int(mask.sum()), pattern, dtype=object),
+        'direction': np.asarray(direction, dtype=object)[mask],
+        'start': start[mask].astype(np.int64),
+        'end': end[mask].astype(np.int64),
+        'level': level[mask].astype(np.float64),
+    }
+
+def _concat(records: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Desen kayıtlarını birleştirir"""
+    return {column: np.concatenate([record[column] for record in records]) for column in PATTERN_COLUMNS}
+
+def _line_fit(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Her satırdaki noktalara en küçük kareler doğrusu oturtur
+
+    Returns:
+        Tuple: (eğim, kesişim, en büyük mutlak sapma)
+    """
+    x_mean = x.mean(axis=1, keepdims=True)
+    y_mean = y.mean(axis=1, keepdims=True)
+    dx = x - x_mean
+    slope = (dx * (y - y_mean)).sum(axis=1) / (dx * dx).sum(axis=1)
+    intercept = y_mean[:, 0] - slope * x_mean[:, 0]
+    error = np.abs(y - (intercept[:, None] + slope[:, None] * x)).max(axis=1)
+    return slope, intercept, error
+
+def double_tops_bottoms(index: np.ndarray, price: np.ndarray, kind: np.ndarray,
+                        config: Dict = PATTERN_CONFIG) -> Dict[str, np.ndarray]:
+    """
+    Çift tepe ve çift dip desenleri
+
+    Tepe-dip-tepe (veya dip-tepe-dip) üçlüsünde iki uç birbirine
+    `double_tolerance` oranında yakın ve aradaki dip (tepe) en az
+    `double_min_depth` oranında derinse desen oluşur. Seviye boyun çizgisidir.
+    """
+    if len(index) < 3:
+        return _empty()
+    first, middle, last = price[:-2], price[1:-1], price[2:]
+    lead = kind[:-2]
+    mean = (first + last) / 2
+    extreme = np.where(lead == PEAK, np.minimum(first, last), np.maximum(first, last))
+    mask = ((np.abs(first - last) <= config['double_tolerance'] * mean)
+            & (lead * (extreme - middle) >= config['double_min_depth'] * mean)
+            & (index[2:] - index[:-2] <= config['max_bars']))
+
+    tops = _records('double_top', mask & (lead == PEAK), np.full(len(lead), 'bearish'),
+                    index[:-2], index[2:], middle)
+    bottoms = _records('double_bottom', mask & (lead == VALLEY), np.full(len(lead), 'bullish'),
+                       index[:-2], index[2:], middle)
+    return _concat([tops, bottoms])
+
+def head_and_shoulders(index: np.ndarray, price: np.ndarray, kind: np.ndarray,
+                       config: Dict = PATTERN_CONFIG) -> Dict[str, np.ndarray]:
+    """
+    Omuz-baş-omuz ve ters omuz-baş-omuz desenleri
+
+    Beş salınımda (omuz, boyun, baş, boyun, omuz) baş her iki omuzdan en az
+    `head_margin` oranında uçta, omuzlar ve boyun noktaları kendi aralarında
+    `shoulder_tolerance` oranında yakın olmalıdır. Tepe ile başlayan desen
+    düşüş (bearish), dip ile başlayan ters desen yükseliş (bullish) işaretidir.
+    Seviye boyun çizgisinin ortalamasıdır.
+    """
+    if len(index) < 5:
+        return _empty()
+    windows = sliding_window_view(price, 5)
+    left, neck_left, head, neck_right, right = windows.T
+    lead = kind[:-4]
+    tolerance = config['shoulder_tolerance']
+
+    shoulders = np.where(lead == PEAK, np.maximum(left, right), np.minimum(left, right))
+    inner = np.where(lead == PEAK, np.minimum(left, right), np.maximum(left, right))
+    necks = np.where(lead == PEAK, np.maximum(neck_left, neck_right), np.minimum(neck_left, neck_right))
+    mask = ((lead * (head - shoulders) >= config['head_margin'] * shoulders)
+            & (np.abs(left - right) <= tolerance * (left + right) / 2)
+            & (np.abs(neck_left - neck_right) <= tolerance * (neck_left + neck_right) / 2)
+            & (lead * (inner - necks) > 0)
+            & (index[4:] - index[:-4] <= config['max_bars']))
+
+    direction = np.where(lead == PEAK, 'bearish', 'bullish')
+    return _records('head_shoulders', mask, direction, index[:-4], index[4:], (neck_left + neck_right) / 2)
+
+def triangles(index: np.ndarray, price: np.ndarray, kind: np.ndarray,
+              config: Dict = PATTERN_CONFIG) -> Dict[str, np.ndarray]:
+    """
+    Daralan üçgen desenleri (yükselen, alçalan, simetrik)
+
+    Altı salınımdaki üç tepeye ve üç dibe ayrı trend çizgileri oturtulur.
+    Üst çizgi düşen veya yatay, alt çizgi yükselen veya yatay olmalı (ikisi
+    birden yatay olamaz), pivotlar çizgilere `fit_tolerance` oranında yakın
+    olmalı ve bant en az `min_contraction` oranında daralmalıdır. Yükselen
+    üçgen yükseliş, alçalan üçgen düşüş, simetrik üçgen nötr işaretidir.
+    Seviye son barda üst çizginin değeridir.
+    """
+    if len(index) < 6:
+        return _empty()
+    x = sliding_window_view(index, 6).astype(np.float64)
+    y = sliding_window_view(price, 6)
+    lead_peak = kind[:-5] == PEAK
+    upper_cols = np.where(lead_peak[:, None], [0, 2, 4], [1, 3, 5])
+    lower_cols = np.where(lead_peak[:, None], [1, 3, 5], [0, 2, 4])
+    rows = np.arange(len(x))[:, None]
+
+    scale = y.mean(axis=1)
+    upper_slope, upper_intercept, upper_error = _line_fit(x[rows, upper_cols], y[rows, upper_cols])
+    lower_slope, lower_intercept, lower_error = _line_fit(x[rows, lower_cols], y[rows, lower_cols])
+    upper_slope, lower_slope = upper_slope / scale, lower_slope / scale
+
+    start, end = x[:, 0], x[:, -1]
+    width_start = (upper_intercept + upper_slope * scale * start) - (lower_intercept + lower_slope * scale * start)
+    width_end = (upper_intercept + upper_slope * scale * end) - (lower_intercept + lower_slope * scale * end)
+
+    flat = config['flat_slope']
+    upper_flat = np.abs(upper_slope) <= flat
+    lower_flat = np.abs(lower_slope) <= flat
+    mask = ((upper_slope <= flat) & (lower_slope >= -flat) & ~(upper_flat & lower_flat)
+            & (upper_error <= config['fit_tolerance'] * scale)
+            & (lower_error <= config['fit_tolerance'] * scale)
+            & (width_end > 0) & (width_end <= (1 - config['min_contraction']) * width_start)
+            & (end - start <= config['max_bars']))
+
+    direction = np.where(upper_flat, 'bullish', np.where(lower_flat, 'bearish', 'neutral'))
+    level = upper_intercept + upper_slope * scale * end
+    return _records('triangle', mask, direction, index[:-5], index[5:], level)
+
+def flags(index: np.ndarray, price: np.ndarray, kind: np.ndarray,
+          config: Dict = PATTERN_CONFIG) -> Dict[str, np.ndarray]:
+    """
+    Bayrak desenleri
+
+    Beş salınımda ilk hareket direktir: en fazla `pole_max_bars` barda en az
+    `pole_min_move` oranında güçlü bir yükseliş (düşüş). Sonraki dört salınım
+    direğe ters veya yatay eğimli, paralel iki çizgi arasında kalan dar bir
+    kanal oluşturmalı ve direğin en fazla `flag_max_retrace` oranını geri
+    almalıdır. Seviye direğin ucudur.
+    """
+    if len(index) < 5:
+        return _empty()
+    x = sliding_window_view(index, 5).astype(np.float64)
+    y = sliding_window_view(price, 5)
+    side = kind[1:-3]  # Direğin ucunun türü: tepe ise boğa bayrağı
+    pole = y[:, 1] - y[:, 0]
+
+    scale = y[:, 1:].mean(axis=1)
+    outer_slope = (y[:, 3] - y[:, 1]) / (x[:, 3] - x[:, 1]) / scale
+    inner_slope = (y[:, 4] - y[:, 2]) / (x[:, 4] - x[:, 2]) / scale
+    retrace = side * (y[:, 1] - np.where(side == PEAK, y[:, 1:].min(axis=1), y[:, 1:].max(axis=1)))
+
+    flat = config['flat_slope']
+    mask = ((side * pole >= config['pole_min_move'] * y[:, 0])
+            & (x[:, 1] - x[:, 0] <= config['pole_max_bars'])
+            & (side * outer_slope <= flat) & (side * inner_slope <= flat)
+            & (np.abs(outer_slope - inner_slope) <= config['parallel_tolerance'])
+            & (retrace <= config['flag_max_retrace'] * np.abs(pole))
+            & (x[:, 4] - x[:, 1] <= config['flag_max_bars']))
+
+    direction = np.where(side == PEAK, 'bullish', 'bearish')
+    return _records('flag', mask, direction, index[:-4], index[4:], y[:, 1])
+
+def merge_overlaps(records: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Aynı desen ve yöndeki iç içe geçen kayıtları birleştirir
+
+    Birleşen kayıt ilk kaydın başlangıcını, en geç bitişi ve son kaydın
+    seviyesini alır.
+    """
+    if len(records['start']) == 0:
+        return records
+    kind = np.unique(records['pattern'] + ':' + records['direction'], return_inverse=True)[1]
+    order = np.lexsort((records['end'], records['start'], kind))
+    kind, start, end = kind[order], records['start'][order], records['end'][order]
+
+    # Gruplar sıralı olduğundan (grup, bitiş) tek dizide birikimli maksimumla
+    # her kaydın önündeki kayıtların en geç bitişi bulunur
+    span = end.max() + 1
+    reach = np.maximum.accumulate(kind * span + end) - kind * span
+    overlaps = (kind[1:] == kind[:-1]) & (start[1:] <= reach[:-1])
+    first = np.flatnonzero(np.concatenate([[True], ~overlaps]))
+    last = np.concatenate([first[1:], [len(order)]]) - 1
+
+    return {
+        'pattern': records['pattern'][order][first],
+        'direction': records['direction'][order][first],
+        'start': start[first],
+        'end': np.maximum.reduceat(end, first),
+        'level': records['level'][order][last],
+    }
+
+def find_patterns(high: np.ndarray, low: np.ndarray, order: int = PATTERN_CONFIG['order'],
+                  index: Optional[pd.Index] = None, config: Dict = PATTERN_CONFIG) -> pd.DataFrame:
+    """
+    Tüm geçmişteki grafik desenlerini bulur
+
+    Args:
+        high: Yüksek fiyatlar
+        low: Düşük fiyatlar
+        order: Pivotun her iki yanında bakılan bar sayısı
+        index: Bar tarihleri (verilirse başlangıç ve bitiş tarihleri eklenir)
+        config: Desen eşikleri
+
+    Returns:
+        DataFrame: Bitiş barına göre sıralı desenler; pattern, direction,
+            start, end, level (+ start_date, end_date) sütunları. start/end
+            desenin ilk ve son pivotunun bar konumudur
+    """
+    swings = swing_points(high, low, order)
+    records = merge_overlaps(_concat([
+        double_tops_bottoms(*swings, config=config),
+        head_and_shoulders(*swings, config=config),
+        triangles(*swings, config=config),
+        flags(*swings, config=config),
+    ]))
+    order = np.lexsort((records['start'], records['end']))
+    patterns = pd.DataFrame({column: records[column][order] for column in PATTERN_COLUMNS})
+
+    if index is not None:
+        patterns['start_date'] = index[patterns['start'].to_numpy()]
+        patterns['end_date'] = index[patterns['end'].to_numpy()]
+    return patterns
+
+def recent_patterns(patterns: pd.DataFrame, length: int, lookback: int = PATTERN_CONFIG['lookback']) -> Dict[str, bool]:
+    """
+    Son `lookback` bar içinde tamamlanan desenleri işaretler
+
+    Args:
+        patterns: `find_patterns` sonucu
+        length: Serideki bar sayısı
+        lookback: Geriye bakış periyodu
+
+    Returns:
+        Dict: Desen adı -> son barlarda bulunduysa True
+    """
+    found = set(patterns.loc[patterns['end'] >= length - lookback, 'pattern'])
+    return {name: name in found for name in PATTERN_NAMES}
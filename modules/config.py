@@ -1,6 +1,6 @@
 # BIST Teknik Analiz Uygulaması Konfigürasyonu
 
-# En popüler BIST hisseleri
+# En popüler BIST hisseleri (tüm evren için modules/symbols.py)
 BIST_SYMBOLS = {
     "THYAO.IS": "Türk Hava Yolları",
     "TUPRS.IS": "Tüpraş",
@@ -18,7 +18,7 @@ BIST_SYMBOLS = {
     "ASELS.IS": "Aselsan",
     "TOASO.IS": "Tofaş",
     "SISE.IS": "Şişe Cam",
-    "KOZAL.IS": "Koton",
+    "KOZAL.IS": "Koza Altın İşletmeleri",
     "MGROS.IS": "Migros",
     "FROTO.IS": "Ford Otosan",
     "SAHOL.IS": "Sabancı Holding",
@@ -26,7 +26,7 @@ BIST_SYMBOLS = {
     "PGSUS.IS": "Pegasus",
     "EKGYO.IS": "Emlak Konut GYO",
     "VESTL.IS": "Vestel",
-    "KOZAA.IS": "Koza Altın",
+    "KOZAA.IS": "Koza Anadolu Metal Madencilik",
     "ENKAI.IS": "Enka İnşaat",
     "TAVHL.IS": "TAV Havalimanları",
     "ULKER.IS": "Ülker",
@@ -94,6 +94,37 @@ INDICATORS_CONFIG = {
     }
 }
 
+# İndikatör hesaplama motoru: "native" (NumPy çekirdekleri, desteklenmeyen
+# girdilerde otomatik olarak ta'ya düşer) veya "ta"
+INDICATOR_BACKEND = "native"
+
+# Grafik deseni tespiti eşikleri (oranlar fiyata göredir)
+PATTERN_CONFIG = {
+    "order": 5,  # Pivotun her iki yanında bakılan bar sayısı
+    "lookback": 50,  # Son kaç barda tamamlanan desenler "güncel" sayılır
+    "max_bars": 120,  # Bir desenin en uzun süresi (bar)
+    "double_tolerance": 0.02,  # Çift tepe/dipte iki ucun en fazla farkı
+    "double_min_depth": 0.03,  # Çift tepe/dipte aradaki geri çekilmenin en az derinliği
+    "head_margin": 0.02,  # Başın omuzlardan en az farkı
+    "shoulder_tolerance": 0.05,  # Omuzlar ve boyun noktaları arasındaki en fazla fark
+    "flat_slope": 0.0005,  # Bar başına bu orandan az eğimli çizgi yatay sayılır
+    "fit_tolerance": 0.015,  # Pivotların trend çizgisinden en fazla sapması
+    "min_contraction": 0.3,  # Üçgende bandın en az daralma oranı
+    "pole_min_move": 0.08,  # Bayrak direğinin en az hareketi
+    "pole_max_bars": 20,  # Bayrak direğinin en uzun süresi (bar)
+    "parallel_tolerance": 0.002,  # Bayrak kanalı çizgilerinin en fazla eğim farkı (bar başına)
+    "flag_max_retrace": 0.5,  # Bayrağın direkten en fazla geri alabileceği oran
+    "flag_max_bars": 40,  # Bayrak kanalının en uzun süresi (bar)
+}
+
+# Hacim profili destek/direnç ayarları
+VOLUME_PROFILE_CONFIG = {
+    "bins": 40,  # Fiyat kutusu sayısı
+    "window": 120,  # Profildeki bar sayısı (None ise tüm geçmiş)
+    "node_threshold": 1.0,  # Düğüm için ortalama kutu hacminin en az katı
+    "margin": 0.05,  # Kutu aralığının fiyat aralığına göre genişletme oranı
+}
+
 # Alert konfigürasyonu
 ALERT_CONFIG = {
     "rsi_oversold": 30,
@@ -103,6 +134,26 @@ ALERT_CONFIG = {
     "update_interval": 300,  # Saniye (5 dakika)
 }
 
+# Anlık fiyat akışı konfigürasyonu
+QUOTE_STREAM_CONFIG = {
+    "poll_interval": 15,  # Saniye
+    "max_workers": 8,  # Eşzamanlı sorgu sayısı
+    "queue_size": 1000,  # Abone başına kuyruk kapasitesi
+    "bar_interval": 60,  # Intraday bar süresi (saniye)
+    "max_bars": 500,  # Hisse başına saklanan bar sayısı
+}
+
+# Dış veri kaynağı (Yahoo Finance) bağlantı ayarları
+UPSTREAM_CONFIG = {
+    "retries": 3,  # İlk denemeden sonraki en fazla tekrar sayısı
+    "backoff_base": 0.5,  # İlk bekleme üst sınırı (saniye), her denemede iki katına çıkar
+    "backoff_max": 8.0,  # En uzun bekleme (saniye)
+    "timeout": 10,  # İstek zaman aşımı (saniye)
+    "pool_size": 20,  # Sunucu başına açık tutulan bağlantı sayısı
+    "failure_threshold": 5,  # Devre kesicinin açılması için art arda hata sayısı
+    "reset_timeout": 30,  # Açık devrenin tekrar denenmesi için bekleme (saniye)
+}
+
 # Grafik renkleri
 CHART_COLORS = {
     "green": "#00ff00",
@@ -115,6 +166,16 @@ CHART_COLORS = {
     "cyan": "#00ffff"
 }
 
+# Çoklu zaman dilimi analizi: zaman dilimi -> pandas periyot kodu
+TIMEFRAMES = {
+    "1d": {"name": "Günlük", "period": "D"},
+    "1wk": {"name": "Haftalık", "period": "W-FRI"},
+    "1mo": {"name": "Aylık", "period": "M"}
+}
+
+# Al-sat sinyalini besleyen indikatörler (arayüz ve API aynı seti kullanır)
+SIGNAL_INDICATORS = ["sma_20", "sma_50", "rsi", "macd", "bollinger"]
+
 # Zaman aralıkları
 TIME_PERIODS = {
     "1d": "1 Gün",
@@ -128,4 +189,47 @@ TIME_PERIODS = {
     "10y": "10 Yıl",
     "ytd": "Yıl Başından İtibaren",
     "max": "Maksimum"
-} 
\ No newline at end of file
+} 
+
+# Oturumlar arası paylaşılan bellek önbelleği ayarları
+MEMORY_CACHE_CONFIG = {
+    "max_bytes": 256 * 1024 * 1024,  # Bellek bütçesi (bayt), aşılınca en eski kayıtlar atılır
+    "ttl": 300,  # Kayıtların geçerlilik süresi (saniye)
+    "shared": False,  # True ise veriler aynı makinedeki diğer uygulama süreçleriyle paylaşılır
+}
+
+# Diskteki veri önbelleği ayarları (batch ve export komutları)
+DATA_CACHE_CONFIG = {
+    "max_age": 900,  # Seans içinde çekilen verilerin geçerlilik süresi (saniye)
+}
+
+# Borsa İstanbul pay piyasası seans saatleri (yerel saat)
+MARKET_CALENDAR_CONFIG = {
+    "timezone": "Europe/Istanbul",
+    "open": "10:00",  # Sürekli işlemlerin başlangıcı
+    "close": "18:00",  # Kapanış
+    "half_day_close": "12:30",  # Arife günlerinde kapanış
+}
+
+# Diskte kalıcı indikatör önbelleği ayarları
+INDICATOR_CACHE_CONFIG = {
+    "root": ".cache/indicators",  # Önbellek klasörü
+    "enabled": True,  # Uygulama hesaplanan indikatörleri diske yazar
+    "tolerance": 1e-10,  # Yeni barlar eklenirken üssel ortalamalarda kabul edilen başlangıç etkisi
+    "max_age_days": 30,  # Bu süre kullanılmayan kayıtlar silinir
+}
+
+# JSON API servisi ayarları
+API_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8000,
+    "period": "1y",  # Varsayılan zaman aralığı
+    "chunk_rows": 5000,  # Seri yanıtlarında tek parçada gönderilen satır sayısı
+}
+
+# Yük testi ayarları
+LOAD_TEST_CONFIG = {
+    "results": ".cache/loadtest/results.jsonl",  # Sonuçların eklendiği dosya
+    "regression_threshold": 0.2,  # Önceki koşuya göre bu orandan fazla kötüleşme gerileme sayılır
+    "timeout": 120,  # Streamlit sayfasının tek çalıştırmada en fazla süresi (saniye)
+}
@@ -0,0 +1,245 @@
+"""
+Bölünme ve temettü düzeltmeleri
+
+Fiyat verileri düzeltilmemiş (ham) barlar olarak saklanır; bölünme ve
+temettüler ayrı bir şirket işlemleri tablosunda tutulur. Düzeltilmiş seriler
+okuma sırasında kümülatif çarpanlarla yerel olarak hesaplanır. Yeni bir
+bölünme veya temettü sadece tabloyu değiştirir; geçmiş barlar yeniden
+indirilmez.
+
+Tablo sütunları:
+    dividend: Hisse başına ham temettü (işlem tarihindeki pay adedine göre)
+    split: Bölünme oranı (2:1 bölünme için 2.0)
+
+Çarpanlar:
+    İşlem tarihinden önceki barlar, bölünmede 1 / oran, temettüde
+    1 - temettü / önceki kapanış ile çarpılır (Yahoo "Adj Close" ile aynı).
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+ACTION_COLUMNS = ['dividend', 'split']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+# yfinance `history(actions=True)` sütunları -> tablo sütunları
+YAHOO_COLUMNS = {'Dividends': 'dividend', 'Stock Splits': 'split'}
+
+def empty_actions() -> pd.DataFrame:
+    """Boş şirket işlemleri tablosu"""
+    return pd.DataFrame({column: pd.Series(dtype=np.float64) for column in ACTION_COLUMNS},
+                        index=pd.DatetimeIndex([], name='Date'))
+
+def _clean(actions: pd.DataFrame) -> pd.DataFrame:
+    """Eksik değerleri doldurur, etkisiz satırları atar ve tarihe göre sıralar"""
+    actions = actions.reindex(columns=ACTION_COLUMNS).astype(np.float64)
+    actions['dividend'] = actions['dividend'].fillna(0.0)
+    # Oranı 0 veya 1 olan bölünme etkisizdir (yfinance işlem yoksa 0 yazar)
+    actions['split'] = actions['split'].where(actions['split'] > 0, 1.0).fillna(1.0)
+    actions = actions[(actions['dividend'] != 0) | (actions['split'] != 1)]
+    actions = actions[~actions.index.duplicated(keep='last')]
+    actions.index.name = 'Date'
+    return actions.sort_index()
+
+def _align(dates: pd.DatetimeIndex, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """İşlem tarihlerini bar indeksinin saat dilimine getirir"""
+    dates = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        return dates.tz_localize(index.tz) if dates.tz is None else dates.tz_convert(index.tz)
+    return dates.tz_localize(None) if dates.tz is None else dates.tz_convert('UTC').tz_localize(None)
+
+def split_factors(dates: pd.DatetimeIndex, actions: pd.DataFrame) -> np.ndarray:
+    """
+    Her tarihten sonra gerçekleşen bölünmelerin oranları çarpımı
+
+    Args:
+        dates: Tarihler
+        actions: Şirket işlemleri
+
+    Returns:
+        ndarray: Tarihler için kümülatif bölünme oranı (sonrasında bölünme yoksa 1)
+    """
+    splits = actions['split'][actions['split'] != 1]
+    if splits.empty or len(dates) == 0:
+        return np.ones(len(dates))
+    split_dates = _align(splits.index, pd.DatetimeIndex(dates))
+    # Sondan kümülatif çarpım: suffix[k] = k. ve sonraki bölünmelerin çarpımı
+    suffix = np.append(np.cumprod(splits.to_numpy()[::-1])[::-1], 1.0)
+    return suffix[np.searchsorted(split_dates, dates, side='right')]
+
+def from_yahoo(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    yfinance işlem verisini ham şirket işlemleri tablosuna çevirir
+
+    Yahoo temettüleri sonraki bölünmelere göre düzeltilmiş verir; tabloya
+    işlem tarihindeki pay adedine göre ham tutar yazılır. Böylece sonradan
+    gelen bölünmeler eski kayıtları değiştirmez.
+
+    Args:
+        history: `Ticker.history(actions=True)` sonucu veya `Ticker.actions`
+
+    Returns:
+        DataFrame: Şirket işlemleri tablosu
+    """
+    present = {column: name for column, name in YAHOO_COLUMNS.items() if column in history.columns}
+    if not present:
+        return empty_actions()
+    actions = _clean(history[list(present)].rename(columns=present))
+    if not actions.empty:
+        actions['dividend'] = actions['dividend'] * split_factors(actions.index, actions)
+    return actions
+
+def merge_actions(current: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+    """İki tabloyu birleştirir; aynı tarihli kayıtlarda yeni tablo geçerlidir"""
+    if current is None or current.empty:
+        return _clean(new)
+    if new.empty:
+        return current
+    new = new.set_axis(_align(new.index, current.index))
+    return _clean(pd.concat([current[~current.index.isin(new.index)], new]))
+
+def adjustment_factors(index: pd.DatetimeIndex, close: np.ndarray, actions: pd.DataFrame,
+                       dividends: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ham barlar için kümülatif fiyat ve hacim çarpanları
+
+    Her işlem, tarihindeki ilk barın konumuna bir çarpan yazar; bir barın
+    çarpanı kendisinden sonraki tüm işlem çarpanlarının çarpımıdır (sondan
+    kümülatif çarpım).
+
+    Args:
+        index: Bar tarihleri (artan sıralı)
+        close: Ham kapanış fiyatları
+        actions: Şirket işlemleri
+        dividends: False ise sadece bölünme düzeltmesi yapılır
+
+    Returns:
+        Tuple: (fiyat çarpanı, hacim çarpanı) dizileri
+    """
+    rows = len(index)
+    if actions is None or actions.empty or rows == 0:
+        return np.ones(rows), np.ones(rows)
+
+    dates = _align(actions.index, index)
+    positions = np.searchsorted(index, dates, side='left')
+    # Konum 0'daki işlemler önceki bar olmadığı için etkisizdir, konum n dizinin dışındadır
+    valid = (positions > 0) & (positions < rows)
+    positions = positions[valid]
+    split = actions['split'].to_numpy()[valid]
+
+    events = np.ones(rows + 1)
+    np.multiply.at(events, positions, 1.0 / split)
+    volume_events = np.ones(rows + 1)
+    np.multiply.at(volume_events, positions, split)
+
+    if dividends:
+        previous = np.asarray(close, dtype=np.float64)[positions - 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = 1.0 - actions['dividend'].to_numpy()[valid] / previous
+        np.multiply.at(events, positions, np.where(np.isfinite(ratio) & (ratio > 0), ratio, 1.0))
+
+    price = np.cumprod(events[:0:-1])[::-1]
+    volume = np.cumprod(volume_events[:0:-1])[::-1]
+    return price, volume
+
+def adjust(raw: pd.DataFrame, actions: Optional[pd.DataFrame], dividends: bool = True) -> pd.DataFrame:
+    """
+    Ham barlardan düzeltilmiş OHLCV verisi üretir
+
+    Args:
+        raw: Ham OHLCV verileri
+        actions: Şirket işlemleri (None veya boşsa veri kopyalanmadan döner)
+        dividends: False ise sadece bölünme düzeltmesi yapılır
+
+    Returns:
+        DataFrame: Düzeltilmiş OHLCV verileri
+    """
+    if actions is None or actions.empty or raw.empty:
+        return raw
+    price, volume = adjustment_factors(raw.index, raw['Close'].to_numpy(), actions, dividends)
+    adjusted = raw.copy()
+    for column in PRICE_COLUMNS:
+        if column in adjusted.columns:
+            adjusted[column] = raw[column].to_numpy(dtype=np.float64) * price
+    if 'Volume' in adjusted.columns:
+        adjusted['Volume'] = raw['Volume'].to_numpy(dtype=np.float64) * volume
+    return adjusted
+
+def unadjust_splits(bars: pd.DataFrame, actions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bölünmeye göre düzeltilmiş barları ham barlara çevirir
+
+    Yahoo `auto_adjust=False` ile de fiyatları bölünmeye göre düzeltilmiş
+    verir; saklamadan önce bu düzeltme geri alınır.
+    """
+    factor = split_factors(bars.index, actions)
+    if (factor == 1).all():
+        return bars
+    raw = bars.copy()
+    for column in PRICE_COLUMNS:
+        if column in raw.columns:
+            raw[column] = bars[column].to_numpy(dtype=np.float64) * factor
+    if 'Volume' in raw.columns:
+        raw['Volume'] = bars['Volume'].to_numpy(dtype=np.float64) / factor
+    return raw
+
+class ActionBook:
+    """
+    Hisse bazında şirket işlemleri tablolarını saklar
+
+    `root` verilirse tablolar `<root>/<HİSSE>.pkl` dosyalarında tutulur,
+    verilmezse sadece bellekte.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Tablo klasörü (None ise sadece bellek)
+        """
+        self.root = root
+        self._tables: Dict[str, pd.DataFrame] = {}
+        if root is not None:
+            os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.root, f"{name}.pkl")
+
+    def get(self, symbol: str) -> pd.DataFrame:
+        """Hissenin şirket işlemleri (kayıt yoksa boş tablo)"""
+        if symbol not in self._tables and self.root is not None:
+            try:
+                self._tables[symbol] = pd.read_pickle(self._path(symbol))
+            except (OSError, EOFError, ValueError):
+                pass
+        return self._tables.get(symbol, empty_actions())
+
+    def update(self, symbol: str, actions: pd.DataFrame) -> bool:
+        """
+        Yeni işlemleri tabloya ekler
+
+        Args:
+            symbol: Hisse kodu
+            actions: Şirket işlemleri (örn. `from_yahoo` sonucu)
+
+        Returns:
+            bool: Tablo değiştiyse True (düzeltilmiş seriler yeniden hesaplanmalı)
+        """
+        current = self.get(symbol)
+        merged = merge_actions(current, actions)
+        if len(merged) == len(current) and merged.index.equals(current.index) \
+                and np.allclose(merged.to_numpy(), current.to_numpy()):
+            return False
+
+        self._tables[symbol] = merged
+        if self.root is not None:
+            path = self._path(symbol)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                merged.to_pickle(tmp_path)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Şirket işlemleri yazma hatası {symbol}: {str(e)}")
+        return True
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+def close_panel(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Hisse verilerinden kapanış fiyatı paneli oluşturur
+
+    Args:
+        frames: Hisse kodu -> OHLCV DataFrame
+
+    Returns:
+        DataFrame: Satırlar tarih, sütunlar hisse
+    """
+    if not frames:
+        return pd.DataFrame()
+    return pd.DataFrame({symbol: df['Close'] for symbol, df in frames.items()}).sort_index()
+
+class RollingCorrelation:
+    """
+    Evrenin kayan pencere kovaryans ve korelasyon matrislerini tutar
+
+    Her hisse çifti için pencere içindeki toplamlar (Σx, Σx², Σxy, n)
+    saklanır. Yeni bir bar eklendiğinde yeni satırın dış çarpımı eklenir,
+    pencereden çıkan satırınki çıkarılır; böylece her güncelleme tam
+    yeniden hesaplama yerine tek bir O(N²) matris işlemidir.
+
+    Eksik değerler (NaN) çift bazında dışlanır; sonuçlar pandas'ın
+    `DataFrame.corr()` / `cov()` çift bazlı davranışıyla aynıdır.
+    """
+
+    def __init__(self, symbols: List[str], window: int = 60, min_periods: Optional[int] = None,
+                 rebuild_every: int = 1000):
+        """
+        Args:
+            symbols: Hisse kodları (matris sırası)
+            window: Pencere uzunluğu (bar)
+            min_periods: Bir çift için gereken en az ortak gözlem (None ise window)
+            rebuild_every: Kayan nokta hatası birikmesin diye toplamların bu
+                kadar güncellemede bir pencereden yeniden hesaplanma sıklığı
+        """
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_periods = min_periods if min_periods is not None else window
+        self.rebuild_every = rebuild_every
+
+        n = len(self.symbols)
+        self._buffer = np.full((window, n), np.nan)
+        self._position = 0
+        self._filled = 0
+        self._updates = 0
+        self._last_prices = None
+
+        self._count = np.zeros((n, n))
+        self._sum_x = np.zeros((n, n))
+        self._sum_xx = np.zeros((n, n))
+        self._sum_xy = np.zeros((n, n))
+
+    @classmethod
+    def from_prices(cls, prices: pd.DataFrame, window: int = 60, **kwargs) -> 'RollingCorrelation':
+        """
+        Fiyat panelinin son penceresinden motoru oluşturur
+
+        Args:
+            prices: Satırlar tarih, sütunlar hisse olan fiyat paneli
+            window: Pencere uzunluğu
+            **kwargs: Diğer yapıcı argümanları
+
+        Returns:
+            RollingCorrelation: Hazır motor
+        """
+        engine = cls(list(prices.columns), window=window, **kwargs)
+        returns = prices.pct_change(fill_method=None).iloc[1:].to_numpy(dtype=np.float64)
+        engine._load(returns[-window:])
+        engine._last_prices = prices.iloc[-1].to_numpy(dtype=np.float64)
+        return engine
+
+    def _load(self, rows: np.ndarray) -> None:
+        """Tamponu verilen satırlarla doldurur ve toplamları toplu hesaplar"""
+        self._buffer[:] = np.nan
+        count = len(rows)
+        self._buffer[:count] = rows
+        self._position = count % self.window
+        self._filled = count
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Toplamları tampondaki satırlardan matris çarpımıyla yeniden hesaplar"""
+        valid = np.isfinite(self._buffer)
+        x = np.where(valid, self._buffer, 0.0)
+        v = valid.astype(np.float64)
+        self._count = v.T @ v
+        self._sum_x = x.T @ v
+        self._sum_xx = (x * x).T @ v
+        self._sum_xy = x.T @ x
+
+    def _accumulate(self, row: np.ndarray, sign: float) -> None:
+        """Tek bir satırın katkısını toplamlara ekler veya çıkarır"""
+        valid = np.isfinite(row)
+        if not valid.any():
+            return
+        x = np.where(valid, row, 0.0)
+        v = valid.astype(np.float64)
+        self._count += sign * np.outer(v, v)
+        self._sum_x += sign * np.outer(x, v)
+        self._sum_xx += sign * np.outer(x * x, v)
+        self._sum_xy += sign * np.outer(x, x)
+
+    def update(self, returns) -> None:
+        """
+        Yeni bir getiri satırı ekler
+
+        Args:
+            returns: Hisse sırasına göre getiriler (dizi, liste veya
+                hisse kodu indeksli Series); eksikler NaN olabilir
+        """
+        row = self._as_row(returns)
+
+        if self._filled == self.window:
+            self._accumulate(self._buffer[self._position], -1.0)
+        else:
+            self._filled += 1
+
+        self._buffer[self._position] = row
+        self._accumulate(row, 1.0)
+        self._position = (self._position + 1) % self.window
+
+        self._updates += 1
+        if self.rebuild_every and self._updates % self.rebuild_every == 0:
+            self._rebuild()
+
+    def update_prices(self, prices) -> None:
+        """
+        Yeni bir fiyat satırı ekler; getiriler bir önceki fiyat satırına göre hesaplanır
+
+        Args:
+            prices: Hisse sırasına göre fiyatlar
+        """
+        row = self._as_row(prices)
+        if self._last_prices is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.update(row / self._last_prices - 1.0)
+        # Eksik fiyattan sonraki getiri de eksik sayılır (pct_change ile aynı)
+        self._last_prices = row
+
+    def _as_row(self, values) -> np.ndarray:
+        if isinstance(values, pd.Series):
+            values = values.reindex(self.symbols)
+        row = np.asarray(values, dtype=np.float64)
+        if row.shape != (len(self.symbols),):
+            raise ValueError(f"Satır uzunluğu {len(self.symbols)} olmalıdır")
+        return row
+
+    def covariance(self, ddof: int = 1) -> pd.DataFrame:
+        """
+        Çift bazlı kovaryans matrisi
+
+        Returns:
+            DataFrame: Hisse x hisse kovaryans matrisi
+        """
+        n = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (self._sum_xy - self._sum_x * self._sum_x.T / n) / (n - ddof)
+        cov[n < max(self.min_periods, ddof + 1)] = np.nan
+        return pd.DataFrame(cov, index=self.symbols, columns=self.symbols)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Çift bazlı Pearson korelasyon matrisi
+
+        Returns:
+            DataFrame: Hisse x hisse korelasyon matrisi
+        """
+        n = self._count
+        sum_y = self._sum_x.T
+        sum_yy = self._sum_xx.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            numerator = n * self._sum_xy - self._sum_x * sum_y
+            denominator = np.sqrt((n * self._sum_xx - self._sum_x ** 2) * (n * sum_yy - sum_y ** 2))
+            corr = np.clip(numerator / denominator, -1.0, 1.0)
+        corr[n < max(self.min_periods, 2)] = np.nan
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def top_pairs(self, k: int = 10, ascending: bool = False) -> List[Tuple[str, str, float]]:
+        """
+        En yüksek (veya en düşük) korelasyonlu hisse çiftlerini döndürür
+
+        Args:
+            k: Çift sayısı
+            ascending: True ise en düşük korelasyonlular
+
+        Returns:
+            List[Tuple]: (hisse1, hisse2, korelasyon) listesi
+        """
+        corr = self.correlation().to_numpy()
+        rows, cols = np.triu_indices(len(self.symbols), k=1)
+        values = corr[rows, cols]
+        valid = np.isfinite(values)
+        rows, cols, values = rows[valid], cols[valid], values[valid]
+
+        order = np.argsort(values if ascending else -values)[:k]
+        return [(self.symbols[rows[i]], self.symbols[cols[i]], float(values[i])) for i in order]
@@ -0,0 +1,95 @@
+import os
+import re
+import time
+import pandas as pd
+from typing import Optional
+
+class DataCache:
+    """OHLCV verilerini diskte saklayan önbellek"""
+
+    def __init__(self, cache_dir: str = ".cache/bist", max_age: Optional[float] = None, calendar=None):
+        """
+        Args:
+            cache_dir: Önbellek klasörü
+            max_age: Kayıtların seans içindeki geçerlilik süresi (saniye)
+            calendar: İşlem takvimi (MarketCalendar, None ise BIST takvimi).
+                Piyasa kapalıyken yazılan kayıtlar bir sonraki seans açılışına
+                kadar, seans içinde yazılanlar `max_age` (None ise seans
+                kapanışına) kadar geçerlidir. False ise takvim kullanılmaz;
+                kayıtlar `max_age` (None ise süresiz) geçerlidir
+        """
+        from .market_calendar import get_calendar
+
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.calendar = None if calendar is False else calendar or get_calendar()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, symbol: str, period: str, interval: str) -> str:
+        """Önbellek dosyasının yolunu döndürür"""
+        key = re.sub(r'[^A-Za-z0-9._-]', '_', f"{symbol}_{period}_{interval}")
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, symbol: str, period: str = "1y", interval: str = "1d") -> Optional[pd.DataFrame]:
+        """
+        Önbellekteki veriyi döndürür
+
+        Args:
+            symbol: Hisse kodu
+            period: Zaman aralığı
+            interval: Veri aralığı
+
+        Returns:
+            DataFrame: Kayıt yoksa veya süresi dolmuşsa None
+        """
+        path = self._path(symbol, period, interval)
+        try:
+            written = os.path.getmtime(path)
+            if self.calendar is not None:
+                if time.time() >= self.calendar.expires_at(written, self.max_age):
+                    return None
+            elif self.max_age is not None and time.time() - written > self.max_age:
+                return None
+            return pd.read_pickle(path)
+        except (OSError, EOFError, ValueError):
+            return None
+
+    def set(self, symbol: str, period: str, interval: str, df: pd.DataFrame) -> None:
+        """
+        Veriyi önbelleğe yazar
+
+        Args:
+            symbol: Hisse kodu
+            period: Zaman aralığı
+            interval: Veri aralığı
+            df: OHLCV verileri
+        """
+        path = self._path(symbol, period, interval)
+        # Önce geçici dosyaya yazılır; paralel okuyan süreçler yarım dosya görmez
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Önbellek yazma hatası {symbol}: {str(e)}")
+
+def open_cache(cache_dir: str, offline: bool = False, max_age: Optional[float] = None) -> DataCache:
+    """
+    Komut satırı işleri için veri önbelleği
+
+    Çevrimdışı modda kayıtlar süresizdir; aksi halde BIST takvimine göre
+    piyasa kapalıyken çekilen veriler bir sonraki seans açılışına, seans
+    içinde çekilenler `max_age` saniye boyunca geçerlidir.
+
+    Args:
+        cache_dir: Önbellek klasörü
+        offline: Sadece önbellek kullanılıyorsa True
+        max_age: Seans içi geçerlilik süresi (None ise konfigürasyondaki)
+
+    Returns:
+        DataCache: Önbellek
+    """
+    if offline:
+        return DataCache(cache_dir, calendar=False)
+    from .config import DATA_CACHE_CONFIG
+    return DataCache(cache_dir, max_age=max_age if max_age is not None else DATA_CACHE_CONFIG['max_age'])
@@ -1,19 +1,128 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import requests
+import os
 import time
+import threading
 from typing import Optional, Dict, List
+from .config import UPSTREAM_CONFIG
+from .corporate_actions import ActionBook, adjust, from_yahoo, unadjust_splits
+from .data_cache import DataCache
+from .history_store import HistoryStore
+from .market_calendar import MarketCalendar, get_calendar
+from .memory_cache import get_cache
+from .singleflight import SingleFlight
+from .upstream import FetchResult, call_upstream, shared_session, STATUS_NO_DATA, STATUS_ERROR
+
+# yfinance ağır bir modüldür; sadece analiz yapan worker'lar
+# bunları hiç yüklemesin diye ilk kullanımda import edilirler.
+def _yfinance():
+    """yfinance modülünü ilk kullanımda yükler"""
+    import yfinance as yf
+    # Hatalar yutulmasın ki "veri yok" ile "kaynak erişilemez" ayırt edilebilsin
+    if hasattr(yf, 'config'):
+        yf.config.debug.hide_exceptions = False
+    return yf
+
+def _history_options() -> Dict:
+    """Eski yfinance sürümlerinde hatalar `raise_errors` ile açılır"""
+    return {} if hasattr(_yfinance(), 'config') else {'raise_errors': True}
+
+# Saklanan bar sütunları; yfinance'in döndürdüğü diğer sütunlar (Dividends,
+# Stock Splits, Adj Close) ada göre ayrılır
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Aynı (hisse, periyot, aralık) için eşzamanlı indirmeler süreç genelinde birleştirilir
+_fetch_flight = SingleFlight()
+
+# `source` verilmeyen çekicilerin kullandığı Ticker fabrikası (None ise yfinance)
+_default_source = None
+
+def set_default_source(source) -> None:
+    """
+    Süreç genelinde varsayılan veri kaynağını değiştirir
+
+    Yük testleri ve yerel çalıştırmada uygulama ve servisler ağ yerine
+    `OfflineSource` kullansın diye çağrılır. `BIST_DATA_SOURCE=offline`
+    ortam değişkeni de aynı etkiyi yapar.
+
+    Args:
+        source: Hisse kodu alıp Ticker benzeri nesne döndüren fonksiyon (None ise yfinance)
+    """
+    global _default_source
+    _default_source = source
+
+def default_source():
+    """Varsayılan veri kaynağı (yfinance için None)"""
+    global _default_source
+    if _default_source is None and os.environ.get("BIST_DATA_SOURCE") == "offline":
+        from .offline_source import OfflineSource
+        _default_source = OfflineSource()
+    return _default_source
 
 class BISTDataFetcher:
     """Borsa İstanbul verilerini çeken sınıf"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+    def __init__(self, cache: Optional[DataCache] = None, offline: bool = False,
+                 history: Optional[HistoryStore] = None, actions: Optional[ActionBook] = None,
+                 calendar: Optional[MarketCalendar] = None, source=None):
+        """
+        Args:
+            cache: Disk önbelleği (isteğe bağlı)
+            offline: True ise sadece önbellekteki veriler kullanılır
+            history: Memory-map geçmiş deposu (isteğe bağlı). Verilirse
+                depodaki hisseler kopyalanmadan buradan okunur, ağdan
+                çekilen veriler depoya eklenir
+            actions: Şirket işlemleri tabloları. Verilmezse önbellek veya
+                geçmiş deposu klasöründe `actions/` altında tutulur
+            calendar: İşlem takvimi (None ise BIST takvimi)
+            source: Hisse kodu alıp Ticker benzeri nesne döndüren fonksiyon
+                (örn. OfflineSource). None ise varsayılan kaynak (yfinance)
+        """
+        self.cache = cache
+        self.offline = offline
+        self.history = history
+        if actions is None:
+            root = cache.cache_dir if cache is not None else history.root if history is not None else None
+            actions = ActionBook(os.path.join(root, "actions") if root is not None else None)
+        self.actions = actions
+        self.calendar = calendar or get_calendar()
+        self.source = source if source is not None else default_source()
+        self._local = threading.local()
+    
+    @property
+    def session(self):
+        """Tüm dış isteklerin paylaştığı bağlantı havuzlu oturum"""
+        return shared_session()
+    
+    @property
+    def last_error(self) -> Optional[FetchResult]:
+        """
+        Bu thread'deki son başarısız çağrının sonucu
+        
+        None döndüren metotlardan sonra "veri yok" (no_data) ile "kaynak
+        erişilemez" (upstream_down, circuit_open) durumlarını ayırt etmek
+        için kullanılır.
+        """
+        return getattr(self._local, 'last_error', None)
+    
+    def _ticker(self, symbol: str):
+        """Paylaşılan oturumu kullanan yfinance Ticker nesnesi (veya kaynağın Ticker'ı)"""
+        if self.source is not None:
+            return self.source(symbol)
+        return _yfinance().Ticker(symbol, session=self.session)
+    
+    def _call(self, symbol: str, function, label: str) -> FetchResult:
+        """
+        Dış kaynak çağrısını tekrar denemeler ve devre kesiciyle yapar
+        
+        Başarısız sonuç `last_error` olarak saklanır ve yazdırılır.
+        """
+        result = call_upstream(function, symbol=symbol)
+        self._local.last_error = None if result.ok else result
+        if not result.ok:
+            print(f"{label} {symbol}: [{result.status}] {result.error}")
+        return result
     
     def get_stock_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> Optional[pd.DataFrame]:
         """
@@ -25,77 +134,261 @@ class BISTDataFetcher:
             interval: Veri aralığı (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
         
         Returns:
-            DataFrame: OHLCV verileri
+            DataFrame: OHLCV verileri (hata nedeni için `last_error`)
+        """
+        return self.fetch_stock_data(symbol, period, interval).data
+    
+    def fetch_stock_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> FetchResult:
+        """
+        Hisse verilerini çeker ve sonucu durumuyla birlikte döndürür
+        
+        Args:
+            symbol: Hisse kodu (örn: "THYAO.IS")
+            period: Zaman aralığı
+            interval: Veri aralığı
+        
+        Returns:
+            FetchResult: `data` OHLCV verileri; `status` ok, no_data,
+                upstream_down, circuit_open veya error
+        """
+        # Aynı veriyi isteyen eşzamanlı çağrılar (Streamlit oturumları,
+        # thread'ler) tek indirmeyi bekler; dönen DataFrame paylaşılır
+        key = (symbol, period, interval, self.offline, self.source)
+        result = _fetch_flight.do(key, lambda: self._fetch_stock_data(symbol, period, interval))
+        self._local.last_error = None if result.ok else result
+        return result
+    
+    def _fetch_stock_data(self, symbol: str, period: str, interval: str) -> FetchResult:
+        """Veriyi yerel kaynaklardan veya Yahoo Finance'den çeker"""
+        local = self._get_local(symbol, period, interval)
+        if local is not None:
+            return FetchResult(local, symbol=symbol)
+        
+        if self.offline:
+            return self._fail(symbol, STATUS_NO_DATA, "Önbellekte veri yok")
+        
+        result = self._download(symbol, period, interval)
+        if not result.ok:
+            return result
+        
+        raw = result.data
+        if self.cache is not None:
+            self.cache.set(symbol, period, interval, raw)
+        if self.history is not None:
+            self.history.append(symbol, raw, interval, raw=True)
+        
+        return FetchResult(self.adjusted(symbol, raw), symbol=symbol, attempts=result.attempts)
+    
+    def get_raw_data(self, symbol: str, period: str = "1y", interval: str = "1d",
+                     start=None, end=None) -> Optional[pd.DataFrame]:
         """
+        Düzeltilmemiş (ham) barları Yahoo Finance'den çeker
+        
+        Bar verisindeki bölünme ve temettüler şirket işlemleri tablosuna
+        eklenir. Geçmiş deposu gibi kalıcı kayıtlar için kullanılır.
+        
+        Args:
+            symbol: Hisse kodu
+            period: Zaman aralığı
+            interval: Veri aralığı
+            start: Verilirse `period` yerine bu zamandan itibaren çekilir
+                (eksik barları doldurmak için)
+            end: Verilirse bu zamana kadar (hariç) çekilir; `start` ile birlikte
+                geçmişteki bir boşluğu doldurmak için
+        
+        Returns:
+            DataFrame: Ham OHLCV verileri (hata nedeni için `last_error`)
+        """
+        result = self._download(symbol, period, interval, start, end)
+        self._local.last_error = None if result.ok else result
+        return result.data
+    
+    def _download(self, symbol: str, period: str, interval: str, start=None, end=None) -> FetchResult:
+        """Ham barları ve şirket işlemlerini indirir; işlemleri tabloya ekler"""
+        span = {'period': period} if start is None else {'start': start}
+        if end is not None:
+            span['end'] = end
+        options = _history_options() if self.source is None else {}
+        result = self._call(
+            symbol,
+            lambda: self._ticker(symbol).history(interval=interval, auto_adjust=False, actions=True,
+                                                 timeout=UPSTREAM_CONFIG['timeout'], **span, **options),
+            "Veri çekme hatası"
+        )
+        if not result.ok:
+            return result
+        
         try:
-            # Yahoo Finance kullanarak veri çek
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=interval)
+            df = result.data
             
             if df.empty:
-                print(f"Veri bulunamadı: {symbol}")
-                return None
+                return self._fail(symbol, STATUS_NO_DATA, "Veri bulunamadı")
             
-            # Sütun isimlerini düzenle
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+            # Sütunlar ada göre seçilir; işlem sütunları ayrı tabloya gider
+            missing = [col for col in BAR_COLUMNS if col not in df.columns]
+            if missing:
+                return self._fail(symbol, STATUS_ERROR, f"Eksik sütunlar {missing}")
+            actions = from_yahoo(df)
+            self.actions.update(symbol, actions)
+            df = df[BAR_COLUMNS]
             
             # NaN değerleri temizle
             df = df.dropna()
             
             # Veri tiplerini kontrol et
-            for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
+            for col in BAR_COLUMNS:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
             
-            # Son veriyi kontrol et
-            if len(df) < 50:  # En az 50 gün veri olsun
-                print(f"Yetersiz veri: {symbol} - {len(df)} kayıt")
-                return None
+            # Son veriyi kontrol et (eksik bar doldururken kısa aralık beklenir)
+            if start is None and len(df) < 50:  # En az 50 gün veri olsun
+                return self._fail(symbol, STATUS_NO_DATA, f"Yetersiz veri - {len(df)} kayıt")
             
-            return df
+            # Yahoo fiyatları bölünmeye göre düzeltilmiş verir; ham fiyatlar saklanır
+            raw = unadjust_splits(df, self.actions.get(symbol))
+            raw.attrs['raw'] = True
+            return FetchResult(raw, symbol=symbol, attempts=result.attempts)
             
         except Exception as e:
-            print(f"Veri çekme hatası {symbol}: {str(e)}")
-            return None
+            return self._fail(symbol, STATUS_ERROR, f"Veri işleme hatası: {str(e)}")
+    
+    def adjusted(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ham barları hissenin şirket işlemleriyle düzeltir
+        
+        Ham olarak işaretlenmemiş veriler (eski önbellek kayıtları) olduğu
+        gibi döner.
+        """
+        if not df.attrs.get('raw'):
+            return df
+        adjusted = adjust(df, self.actions.get(symbol))
+        if adjusted is df:
+            adjusted = df.copy(deep=False)
+        adjusted.attrs = {}
+        return adjusted
+    
+    def update_actions(self, symbol: str) -> bool:
+        """
+        Hissenin bölünme ve temettülerini yeniler
+        
+        Sadece işlem listesi indirilir; saklanan ham barlar değişmez,
+        düzeltilmiş seriler sonraki okumada yeni çarpanlarla hesaplanır.
+        
+        Returns:
+            bool: Yeni işlem eklendiyse True
+        """
+        result = self._call(symbol, lambda: self._ticker(symbol).actions, "Şirket işlemleri hatası")
+        if not result.ok or result.data is None:
+            return False
+        return self.actions.update(symbol, from_yahoo(result.data))
+    
+    def _fail(self, symbol: str, status: str, message: str) -> FetchResult:
+        """Başarısız sonucu kaydeder, yazdırır ve döndürür"""
+        print(f"{message}: {symbol}")
+        result = FetchResult(status=status, error=message, symbol=symbol)
+        self._local.last_error = result
+        return result
+    
+    def _get_local(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """Veriyi önbellekten veya geçmiş deposundan döndürür, yoksa None"""
+        if self.cache is not None:
+            cached = self.cache.get(symbol, period, interval)
+            if cached is not None:
+                return self.adjusted(symbol, cached)
+        
+        if self.history is not None:
+            stored = self.history.read_period(symbol, period, interval)
+            if stored is not None and not stored.empty:
+                return self.adjusted(symbol, stored)
+        
+        return None
     
     def get_real_time_data(self, symbol: str) -> Optional[Dict]:
         """
         Gerçek zamanlı veri çeker
         
+        Piyasa kapalıyken fiyatlar değişmez; sonuç bir sonraki seans
+        açılışına kadar süreç önbelleğinden döner.
+        
         Args:
             symbol: Hisse kodu
             
         Returns:
-            Dict: Anlık veriler
+            Dict: Anlık veriler (`market_open` piyasanın açık olup olmadığı)
         """
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+        if self.calendar.is_open():
+            return self._real_time_data(symbol)
+        return get_cache().get_or_compute(('real_time', symbol), lambda: self._real_time_data(symbol),
+                                          ttl=self.calendar.seconds_until_open())
+    
+    def _real_time_data(self, symbol: str) -> Optional[Dict]:
+        """`ticker.info` ile anlık verileri çeker"""
+        result = self._call(symbol, lambda: self._ticker(symbol).info, "Gerçek zamanlı veri hatası")
+        if not result.ok:
+            return None
+        info = result.data
+        
+        # Güncel fiyat bilgileri
+        current_data = {
+            'symbol': symbol,
+            'current_price': info.get('currentPrice', 0),
+            'previous_close': info.get('previousClose', 0),
+            'open': info.get('open', 0),
+            'day_high': info.get('dayHigh', 0),
+            'day_low': info.get('dayLow', 0),
+            'volume': info.get('volume', 0),
+            'market_cap': info.get('marketCap', 0),
+            'pe_ratio': info.get('forwardPE', 0),
+            'change': 0,
+            'change_percent': 0,
+            'market_open': self.calendar.is_open()
+        }
+        
+        # Değişim hesapla
+        if current_data['previous_close'] > 0:
+            current_data['change'] = current_data['current_price'] - current_data['previous_close']
+            current_data['change_percent'] = (current_data['change'] / current_data['previous_close']) * 100
+        
+        return current_data
+    
+    def get_quote(self, symbol: str) -> Optional[Dict]:
+        """
+        Hafif anlık fiyat bilgisi çeker
+        
+        `ticker.info` yerine sadece fiyat alanlarını içeren `fast_info`
+        kullanılır; sık yapılan sorgularda (quote polling) tercih edilmelidir.
+        
+        Args:
+            symbol: Hisse kodu
             
-            # Güncel fiyat bilgileri
-            current_data = {
+        Returns:
+            Dict: Anlık fiyat verileri
+        """
+        def fetch():
+            # fast_info alanları erişildiğinde yüklenir; hepsi tekrar deneme kapsamında okunur
+            fast_info = self._ticker(symbol).fast_info
+            return {
                 'symbol': symbol,
-                'current_price': info.get('currentPrice', 0),
-                'previous_close': info.get('previousClose', 0),
-                'open': info.get('open', 0),
-                'day_high': info.get('dayHigh', 0),
-                'day_low': info.get('dayLow', 0),
-                'volume': info.get('volume', 0),
-                'market_cap': info.get('marketCap', 0),
-                'pe_ratio': info.get('forwardPE', 0),
+                'current_price': fast_info.last_price or 0,
+                'previous_close': fast_info.previous_close or 0,
+                'open': fast_info.open or 0,
+                'day_high': fast_info.day_high or 0,
+                'day_low': fast_info.day_low or 0,
+                'volume': fast_info.last_volume or 0,
                 'change': 0,
-                'change_percent': 0
+                'change_percent': 0,
+                'timestamp': time.time()
             }
-            
-            # Değişim hesapla
-            if current_data['previous_close'] > 0:
-                current_data['change'] = current_data['current_price'] - current_data['previous_close']
-                current_data['change_percent'] = (current_data['change'] / current_data['previous_close']) * 100
-            
-            return current_data
-            
-        except Exception as e:
-            print(f"Gerçek zamanlı veri hatası {symbol}: {str(e)}")
+        
+        result = self._call(symbol, fetch, "Anlık fiyat hatası")
+        if not result.ok:
             return None
+        quote = result.data
+        
+        if quote['previous_close'] > 0:
+            quote['change'] = quote['current_price'] - quote['previous_close']
+            quote['change_percent'] = (quote['change'] / quote['previous_close']) * 100
+        
+        return quote
     
     def get_multiple_stocks(self, symbols: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
         """
@@ -111,10 +404,13 @@ class BISTDataFetcher:
         results = {}
         
         for symbol in symbols:
-            df = self.get_stock_data(symbol, period)
+            # Yerel veriler beklemeden döner, sadece ağ istekleri sınırlanır
+            df = self._get_local(symbol, period, "1d")
+            if df is None:
+                df = self.get_stock_data(symbol, period)
+                time.sleep(0.1)  # Rate limiting
             if df is not None:
                 results[symbol] = df
-            time.sleep(0.1)  # Rate limiting
         
         return results
     
@@ -141,12 +437,27 @@ class BISTDataFetcher:
         Returns:
             bool: Geçerli ise True
         """
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            return 'symbol' in info or 'shortName' in info
-        except:
-            return False
+        return all(self.validate_symbols([symbol]).values())
+    
+    def validate_symbols(self, symbols: List[str]) -> Dict[str, bool]:
+        """
+        Hisse kodlarını toplu olarak doğrular
+        
+        Yerel hisse dizinindeki kodlar için ağ isteği yapılmaz; diğerleri
+        tek bir toplu istekle kontrol edilip diskte saklanır.
+        
+        Args:
+            symbols: Hisse kodları listesi
+            
+        Returns:
+            Dict: Hisse kodu -> geçerli ise True
+        """
+        from .symbols import get_registry, to_symbol
+        registry = get_registry()
+        # Çevrimdışı modda ve yerel kaynakta ağ isteği yapılmaz
+        if self.offline or self.source is not None:
+            return {to_symbol(symbol): symbol in registry for symbol in symbols}
+        return registry.validate(symbols)
     
     def get_company_info(self, symbol: str) -> Optional[Dict]:
         """
@@ -158,26 +469,23 @@ class BISTDataFetcher:
         Returns:
             Dict: Şirket bilgileri
         """
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            company_info = {
-                'name': info.get('longName', 'Bilinmiyor'),
-                'sector': info.get('sector', 'Bilinmiyor'),
-                'industry': info.get('industry', 'Bilinmiyor'),
-                'employees': info.get('fullTimeEmployees', 0),
-                'website': info.get('website', ''),
-                'summary': info.get('longBusinessSummary', ''),
-                'market_cap': info.get('marketCap', 0),
-                'enterprise_value': info.get('enterpriseValue', 0),
-                'pe_ratio': info.get('forwardPE', 0),
-                'pb_ratio': info.get('priceToBook', 0),
-                'dividend_yield': info.get('dividendYield', 0)
-            }
-            
-            return company_info
-            
-        except Exception as e:
-            print(f"Şirket bilgisi hatası {symbol}: {str(e)}")
-            return None 
\ No newline at end of file
+        result = self._call(symbol, lambda: self._ticker(symbol).info, "Şirket bilgisi hatası")
+        if not result.ok:
+            return None
+        info = result.data
+        
+        company_info = {
+            'name': info.get('longName', 'Bilinmiyor'),
+            'sector': info.get('sector', 'Bilinmiyor'),
+            'industry': info.get('industry', 'Bilinmiyor'),
+            'employees': info.get('fullTimeEmployees', 0),
+            'website': info.get('website', ''),
+            'summary': info.get('longBusinessSummary', ''),
+            'market_cap': info.get('marketCap', 0),
+            'enterprise_value': info.get('enterpriseValue', 0),
+            'pe_ratio': info.get('forwardPE', 0),
+            'pb_ratio': info.get('priceToBook', 0),
+            'dividend_yield': info.get('dividendYield', 0)
+        }
+        
+        return company_info
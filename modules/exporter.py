@@ -0,0 +1,375 @@
+import os
+import json
+import math
+from abc import ABC, abstractmethod
+from datetime import datetime, date
+from typing import Dict, List, Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Desteklenen rapor formatları: dosya uzantısı -> format adı
+FORMAT_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".xlsx": "excel",
+}
+
+def _clean_value(value):
+    """Değeri JSON/Excel uyumlu saf Python tipine çevirir"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+class ReportWriter(ABC):
+    """
+    Satırları parça parça diske yazan temel sınıf
+
+    Satırlar `chunk_size` kadar biriktirilir ve dolduğunda diske aktarılır,
+    böylece bellek kullanımı veri boyutundan bağımsız kalır.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000):
+        """
+        Args:
+            path: Çıktı dosyası
+            chunk_size: Bir seferde diske yazılacak satır sayısı
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._buffer = []
+
+    def write_row(self, row: Dict) -> None:
+        """Tek satır ekler"""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Birden fazla satır ekler"""
+        for row in rows:
+            self.write_row(row)
+
+    def write_frame(self, frame: pd.DataFrame) -> None:
+        """
+        DataFrame'i `chunk_size` satırlık parçalar halinde yazar
+
+        Satırlar sözlüğe çevrilmeden sütun halinde aktarılır. Bekleyen
+        `write_row` satırları önce yazılır.
+        """
+        self.flush()
+        for start in range(0, len(frame), self.chunk_size):
+            chunk = frame.iloc[start:start + self.chunk_size]
+            self._write_frame(chunk)
+            self.rows_written += len(chunk)
+
+    def flush(self) -> None:
+        """Bekleyen satırları diske yazar"""
+        if self._buffer:
+            self._write_chunk(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        """Bekleyen satırları yazar ve dosyayı kapatır"""
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _write_chunk(self, rows: List[Dict]) -> None:
+        """Satırları diske yazar (sütunlar ilk parçada sabitlenir)"""
+
+    def _write_frame(self, frame: pd.DataFrame) -> None:
+        self._write_chunk(frame.to_dict('records'))
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class JsonLinesWriter(ReportWriter):
+    """Her satırı bir JSON nesnesi olarak yazar"""
+
+    def __init__(self, path: str, chunk_size: int = 1000):
+        super().__init__(path, chunk_size)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write_chunk(self, rows: List[Dict]) -> None:
+        lines = []
+        for row in rows:
+            clean = {key: _clean_value(value) for key, value in row.items()}
+            lines.append(json.dumps(clean, ensure_ascii=False, default=_json_default))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+def _json_default(value):
+    """json.dumps'ın tanımadığı tipleri çevirir"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+class ParquetWriter(ReportWriter):
+    """
+    Satırları Parquet row group'ları olarak yazar
+
+    Şema ilk parçadan çıkarılır; sonraki parçalar aynı şemaya uydurulur.
+    İlk parçada tamamen boş olan sütunlar float64 kabul edilir.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet çıktısı için pyarrow gereklidir: pip install pyarrow")
+        super().__init__(path, chunk_size)
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+        self._schema = None
+
+    def _open(self, table):
+        """Boş (null tipli) sütunları float64 yaparak şemayı sabitler ve dosyayı açar"""
+        for position, field in enumerate(table.schema):
+            if self._pa.types.is_null(field.type):
+                table = table.set_column(position, field.with_type(self._pa.float64()),
+                                         table.column(position).cast(self._pa.float64()))
+        self._schema = table.schema
+        self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        return table
+
+    def _write_chunk(self, rows: List[Dict]) -> None:
+        rows = [{key: _clean_value(value) for key, value in row.items()} for row in rows]
+        if self._writer is None:
+            table = self._open(self._pa.Table.from_pylist(rows))
+        else:
+            table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table)
+
+    def _write_frame(self, frame: pd.DataFrame) -> None:
+        # Her parça tek row group olur; sonraki parçalar ilk parçanın şemasına uydurulur
+        if self._writer is None:
+            table = self._open(self._pa.Table.from_pandas(frame, preserve_index=False))
+        else:
+            table = self._pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+class ExcelWriter(ReportWriter):
+    """openpyxl write-only modunda satırları akış halinde yazar"""
+
+    def __init__(self, path: str, chunk_size: int = 1000, sheet_name: str = "Rapor"):
+        from openpyxl import Workbook
+        super().__init__(path, chunk_size)
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_name)
+        self._columns = None
+
+    def _write_chunk(self, rows: List[Dict]) -> None:
+        if self._columns is None:
+            self._columns = list(rows[0].keys())
+            self._sheet.append(self._columns)
+        for row in rows:
+            self._sheet.append([_excel_value(row.get(column)) for column in self._columns])
+
+    def _write_frame(self, frame: pd.DataFrame) -> None:
+        if self._columns is None:
+            self._columns = [str(column) for column in frame.columns]
+            self._sheet.append(self._columns)
+        for values in frame.itertuples(index=False, name=None):
+            self._sheet.append([_excel_value(value) for value in values])
+
+    def _close(self) -> None:
+        if self._columns is None:
+            self._sheet.append([])
+        self._workbook.save(self.path)
+
+def _excel_value(value):
+    """Değeri Excel hücresine yazılabilir hale getirir"""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    value = _clean_value(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False, default=_json_default)
+    return value
+
+WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "parquet": ParquetWriter,
+    "excel": ExcelWriter,
+}
+
+def open_writer(path: str, fmt: Optional[str] = None, chunk_size: int = 1000) -> ReportWriter:
+    """
+    Dosya uzantısına veya formata göre uygun yazıcıyı açar
+
+    Args:
+        path: Çıktı dosyası
+        fmt: Format adı (parquet, jsonl, excel). None ise uzantıdan belirlenir
+        chunk_size: Parça boyutu
+
+    Returns:
+        ReportWriter: Yazıcı nesnesi
+    """
+    if fmt is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Desteklenmeyen dosya uzantısı: {extension}")
+        fmt = FORMAT_EXTENSIONS[extension]
+
+    if fmt not in WRITERS:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+
+    return WRITERS[fmt](path, chunk_size=chunk_size)
+
+# İndikatör tablosunun sabit sütunları
+BAR_COLUMNS = ['symbol', 'date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+def _timestamp(value, index: pd.Index) -> Optional[pd.Timestamp]:
+    """Tarih filtresini indeksin saat dilimine uydurur"""
+    if value is None:
+        return None
+    value = pd.Timestamp(value)
+    tz = getattr(index, 'tz', None)
+    if tz is not None and value.tzinfo is None:
+        return value.tz_localize(tz)
+    if tz is None and value.tzinfo is not None:
+        return value.tz_convert(None)
+    return value
+
+def indicator_frames(symbol: str, analyzer, columns: Optional[List[str]] = None, start=None, end=None,
+                     chunk_size: int = 10000) -> Iterable[pd.DataFrame]:
+    """
+    Analizin bar bazlı indikatör tablosunu parçalar halinde üretir
+
+    Her parça sadece kendi bar aralığının verisinden oluşturulur; tüm
+    tablo bellekte birleştirilmez.
+
+    Args:
+        symbol: Hisse kodu
+        analyzer: TechnicalAnalyzer objesi
+        columns: Yazılacak sütunlar (None ise BAR_COLUMNS + tüm indikatörler).
+            Hesaplanmamış indikatörler boş (NaN) yazılır
+        start: Başlangıç tarihi (dahil)
+        end: Bitiş tarihi (dahil)
+        chunk_size: Parça başına satır sayısı
+
+    Yields:
+        DataFrame: symbol, date, OHLCV ve indikatör sütunları
+    """
+    data = analyzer.data
+    columns = list(columns) if columns else BAR_COLUMNS + list(analyzer.indicators)
+    first = 0 if start is None else data.index.searchsorted(_timestamp(start, data.index), side='left')
+    last = len(data) if end is None else data.index.searchsorted(_timestamp(end, data.index), side='right')
+
+    for position in range(first, last, chunk_size):
+        rows = slice(position, min(position + chunk_size, last))
+        index = data.index[rows]
+        chunk = {}
+        for column in columns:
+            if column == 'symbol':
+                chunk[column] = np.full(len(index), symbol, dtype=object)
+            elif column == 'date':
+                chunk[column] = index
+            elif column in data.columns:
+                chunk[column] = data[column].to_numpy()[rows]
+            elif column in analyzer.indicators:
+                chunk[column] = analyzer.indicators[column].to_numpy(dtype=np.float64)[rows]
+            else:
+                chunk[column] = np.full(len(index), np.nan)
+        yield pd.DataFrame(chunk, columns=columns)
+
+def flatten_summary(summary: Dict, prefix: str = "") -> Dict:
+    """
+    `generate_summary` çıktısını tek seviyeli satıra çevirir
+
+    İç içe sözlükler alt çizgiyle birleştirilir (örn. trend_strength_adx,
+    chart_patterns_flag, latest_indicators_rsi).
+    """
+    row = {}
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            row.update(flatten_summary(value, f"{prefix}{key}_"))
+        else:
+            row[f"{prefix}{key}"] = value
+    return row
+
+def export_indicators(analyses: Iterable, writer: ReportWriter, columns: Optional[List[str]] = None,
+                      start=None, end=None) -> int:
+    """
+    Hisselerin indikatör tablolarını yazıcıya akıtır
+
+    `analyses` bir üreteç olarak verilirse aynı anda sadece bir hissenin
+    analizi ve bir parça bellekte tutulur.
+
+    Args:
+        analyses: (hisse kodu, TechnicalAnalyzer) çiftleri
+        writer: ReportWriter objesi
+        columns: Yazılacak sütunlar (None ise ilk hissenin tüm sütunları)
+        start: Başlangıç tarihi (dahil)
+        end: Bitiş tarihi (dahil)
+
+    Returns:
+        int: Yazılan satır sayısı
+    """
+    count = 0
+    for symbol, analyzer in analyses:
+        if columns is None:
+            # Tüm hisselerde aynı şema kullanılır
+            columns = BAR_COLUMNS + list(analyzer.indicators)
+        for frame in indicator_frames(symbol, analyzer, columns, start, end, writer.chunk_size):
+            writer.write_frame(frame)
+            count += len(frame)
+    writer.flush()
+    return count
+
+def export_summaries(analyses: Iterable, writer: ReportWriter, columns: Optional[List[str]] = None) -> int:
+    """
+    Hisselerin analiz özetlerini (`generate_summary`) hisse başına bir satır olarak yazar
+
+    Yazıcılar sütunları ilk satırdan sabitler; bu yüzden son değeri NaN
+    olduğu için özette yer almayan indikatörler de (örn. kısa geçmişli
+    hissede sma_50) boş değerle yazılır ve tüm satırlar aynı sütunlara sahip
+    olur.
+
+    Args:
+        analyses: (hisse kodu, TechnicalAnalyzer) çiftleri
+        writer: ReportWriter objesi
+        columns: Yazılacak sütunlar (None ise ilk hissenin tüm sütunları)
+
+    Returns:
+        int: Yazılan satır sayısı
+    """
+    count = 0
+    for symbol, analyzer in analyses:
+        summary = analyzer.generate_summary()
+        latest = summary['latest_indicators']
+        summary['latest_indicators'] = {name: latest.get(name) for name in analyzer.indicators}
+        row = {'symbol': symbol, 'date': analyzer.data.index[-1]}
+        row.update(flatten_summary(summary))
+        if columns is None:
+            # Tüm hisselerde aynı şema kullanılır
+            columns = list(row)
+        row = {column: row.get(column) for column in columns}
+        writer.write_row(row)
+        count += 1
+    writer.flush()
+    return count
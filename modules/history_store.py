@@ -0,0 +1,416 @@
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+# Saklanan fiyat alanları; her alan ayrı bir float64 dosyasıdır
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+INDEX_FILE = "index.i8"
+META_FILE = "meta.json"
+
+# yfinance periyot kodları -> geriye doğru süre
+PERIOD_OFFSETS = {
+    'd': lambda n: pd.DateOffset(days=n),
+    'wk': lambda n: pd.DateOffset(weeks=n),
+    'mo': lambda n: pd.DateOffset(months=n),
+    'y': lambda n: pd.DateOffset(years=n),
+}
+
+def _field_file(field: str) -> str:
+    return f"{field}.f8"
+
+def period_start(end: pd.Timestamp, period: str) -> Optional[pd.Timestamp]:
+    """
+    yfinance periyot kodunu (5d, 3mo, 1y, ytd, max) başlangıç zamanına çevirir
+
+    Args:
+        end: Son barın zamanı
+        period: Periyot kodu
+
+    Returns:
+        Timestamp: Başlangıç zamanı, "max" için None
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return end.normalize().replace(month=1, day=1)
+
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+    if not match:
+        raise ValueError(f"Desteklenmeyen periyot: {period}")
+    return end - PERIOD_OFFSETS[match.group(2)](int(match.group(1)))
+
+class SymbolHistory:
+    """
+    Tek bir hissenin diskteki sütunlarına salt okunur memory-map görünümü
+
+    Dosyalar açılırken belleğe okunmaz; sadece erişilen sayfalar işletim
+    sisteminin sayfa önbelleğinden yüklenir. Aynı dosyaları açan tüm
+    süreçler bu önbelleği paylaşır.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Hisse klasörü
+        """
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.path = path
+        self.rows = self.meta['rows']
+        self.tz = self.meta.get('tz')
+        self.fields = self.meta['fields']
+        # Dosyada meta'dan fazla satır olabilir (yarım kalmış ekleme); fazlası yok sayılır
+        self.timestamps = self._map(INDEX_FILE, np.int64)
+        self.columns = {field: self._map(_field_file(field), np.float64) for field in self.fields}
+
+    def _map(self, filename: str, dtype) -> np.ndarray:
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, filename), dtype=dtype, mode='r', shape=(self.rows,))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def start(self) -> Optional[pd.Timestamp]:
+        """İlk barın zamanı"""
+        return self._timestamp(self.timestamps[0]) if self.rows else None
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+        """Son barın zamanı"""
+        return self._timestamp(self.timestamps[-1]) if self.rows else None
+
+    def _timestamp(self, value: int) -> pd.Timestamp:
+        timestamp = pd.Timestamp(int(value), unit='ns', tz='UTC')
+        return timestamp.tz_convert(self.tz) if self.tz else timestamp.tz_localize(None)
+
+    def _position(self, value, side: str) -> int:
+        """Zamanın satır numarasını ikili arama ile bulur"""
+        timestamp = pd.Timestamp(value)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(self.tz or 'UTC')
+        return int(np.searchsorted(self.timestamps, timestamp.value, side=side))
+
+    def slice(self, start=None, end=None, fields: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Tarih aralığındaki barları kopyalamadan döndürür
+
+        Sütunlar memory-map dizilerinin görünümleridir; sadece tarih indeksi
+        oluşturulur. Veri salt okunurdur, değişiklikler kopyada yapılır.
+
+        Args:
+            start: Başlangıç zamanı (dahil, None ise ilk bar)
+            end: Bitiş zamanı (dahil, None ise son bar)
+            fields: Döndürülecek alanlar (None ise hepsi)
+
+        Returns:
+            DataFrame: OHLCV verileri
+        """
+        first = self._position(start, 'left') if start is not None else 0
+        last = self._position(end, 'right') if end is not None else self.rows
+        return self.iloc(first, last, fields)
+
+    def tail(self, count: int, fields: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Son `count` barı kopyalamadan döndürür"""
+        return self.iloc(max(self.rows - count, 0), self.rows, fields)
+
+    def iloc(self, first: int, last: int, fields: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Satır aralığındaki barları kopyalamadan döndürür"""
+        fields = list(fields) if fields is not None else self.fields
+        index = pd.DatetimeIndex(self.timestamps[first:last].view('M8[ns]')).tz_localize('UTC')
+        index = index.tz_convert(self.tz) if self.tz else index.tz_localize(None)
+        index.name = self.meta.get('index_name')
+        columns = {field: self.columns[field][first:last] for field in fields}
+        df = pd.DataFrame(columns, index=index, copy=False)
+        # Ham (bölünme/temettü düzeltmesiz) barlar okuyucuya bildirilir
+        if self.meta.get('raw'):
+            df.attrs['raw'] = True
+        return df
+
+class HistoryStore:
+    """
+    Tüm piyasanın bar geçmişini hisse ve alan bazında sütunlu dosyalarda saklar
+
+    Klasör yapısı:
+        <root>/<aralık>/<HİSSE>/index.i8    (UTC nanosaniye zaman damgaları)
+        <root>/<aralık>/<HİSSE>/Close.f8    (her alan için bir dosya)
+        <root>/<aralık>/<HİSSE>/meta.json   (satır sayısı, alanlar, saat dilimi, boş boşluklar)
+
+    Yazma sırasında meta.json en son güncellenir; okuyucular her zaman
+    tamamlanmış satırları görür. Yazma tek süreçten yapılmalıdır.
+    """
+
+    def __init__(self, root: str = ".cache/history"):
+        """
+        Args:
+            root: Depo klasörü
+        """
+        self.root = root
+        self._open = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol: str, interval: str) -> str:
+        """Hisse klasörünün yolunu döndürür"""
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.root, interval, name)
+
+    def symbols(self, interval: str = "1d") -> List[str]:
+        """Depodaki hisse kodlarını döndürür"""
+        directory = os.path.join(self.root, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if os.path.exists(os.path.join(directory, name, META_FILE)))
+
+    def has(self, symbol: str, interval: str = "1d") -> bool:
+        """Hissenin depoda olup olmadığını kontrol eder"""
+        return os.path.exists(os.path.join(self._path(symbol, interval), META_FILE))
+
+    def open(self, symbol: str, interval: str = "1d") -> Optional[SymbolHistory]:
+        """
+        Hissenin geçmişini memory-map olarak açar
+
+        Açılan görünüm, hisse yeniden yazılana veya yeni bar eklenene kadar
+        saklanır ve tekrar kullanılır.
+
+        Args:
+            symbol: Hisse kodu
+            interval: Veri aralığı
+
+        Returns:
+            SymbolHistory: Hisse depoda yoksa None
+        """
+        path = self._path(symbol, interval)
+        try:
+            stat = os.stat(os.path.join(path, META_FILE))
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            return None
+
+        cached = self._open.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        history = SymbolHistory(path)
+        self._open[path] = (version, history)
+        return history
+
+    def read(self, symbol: str, interval: str = "1d", start=None, end=None,
+             fields: Optional[Iterable[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Hissenin tarih aralığındaki barlarını kopyalamadan döndürür
+
+        Args:
+            symbol: Hisse kodu
+            interval: Veri aralığı
+            start: Başlangıç zamanı (dahil)
+            end: Bitiş zamanı (dahil)
+            fields: Döndürülecek alanlar
+
+        Returns:
+            DataFrame: OHLCV verileri, hisse depoda yoksa None
+        """
+        history = self.open(symbol, interval)
+        if history is None:
+            return None
+        return history.slice(start, end, fields)
+
+    def read_period(self, symbol: str, period: str = "1y", interval: str = "1d") -> Optional[pd.DataFrame]:
+        """
+        Hissenin son bardan geriye `period` kadar barlarını döndürür
+
+        Args:
+            symbol: Hisse kodu
+            period: Zaman aralığı (1mo, 1y, max, vb.)
+            interval: Veri aralığı
+
+        Returns:
+            DataFrame: OHLCV verileri, hisse depoda yoksa veya boşsa None
+        """
+        history = self.open(symbol, interval)
+        if history is None or not len(history):
+            return None
+        start = period_start(history.end, period)
+        return history.slice(start + pd.Timedelta(1, 'ns') if start is not None else None)
+
+    def read_many(self, symbols: Iterable[str], interval: str = "1d", start=None,
+                  end=None) -> Dict[str, pd.DataFrame]:
+        """Birden fazla hissenin barlarını döndürür (depoda olmayanlar atlanır)"""
+        results = {}
+        for symbol in symbols:
+            df = self.read(symbol, interval, start, end)
+            if df is not None:
+                results[symbol] = df
+        return results
+
+    @staticmethod
+    def _timestamps(index: pd.DatetimeIndex) -> np.ndarray:
+        index = index.as_unit('ns')
+        if index.tz is not None:
+            index = index.tz_convert('UTC')
+        return index.asi8.astype(np.int64)
+
+    def write(self, symbol: str, df: pd.DataFrame, interval: str = "1d", raw: bool = False) -> None:
+        """
+        Hissenin geçmişini baştan yazar
+
+        Args:
+            symbol: Hisse kodu
+            df: OHLCV verileri (artan tarih sıralı)
+            interval: Veri aralığı
+            raw: Barlar bölünme/temettü düzeltmesiz ise True
+        """
+        path = self._path(symbol, interval)
+        os.makedirs(path, exist_ok=True)
+        df = df.sort_index()
+
+        # Açık memory-map'ler eski dosyayı görmeye devam eder; yeni dosyalar yerine taşınır
+        arrays = {INDEX_FILE: self._timestamps(df.index)}
+        for field in FIELDS:
+            arrays[_field_file(field)] = df[field].to_numpy(dtype=np.float64)
+        for filename, values in arrays.items():
+            tmp_path = os.path.join(path, f"{filename}.{os.getpid()}.tmp")
+            values.tofile(tmp_path)
+            os.replace(tmp_path, os.path.join(path, filename))
+
+        self._write_meta(path, {
+            'symbol': symbol,
+            'interval': interval,
+            'rows': len(df),
+            'fields': FIELDS,
+            'tz': str(df.index.tz) if df.index.tz is not None else None,
+            'index_name': df.index.name,
+            'raw': raw,
+        })
+
+    def append(self, symbol: str, df: pd.DataFrame, interval: str = "1d", raw: bool = False) -> int:
+        """
+        Hissenin geçmişine son bardan sonraki yeni barları ekler
+
+        Ham ve düzeltilmiş barlar karıştırılmaz: depodaki barların türü
+        farklıysa hissenin geçmişi verilen barlarla baştan yazılır.
+
+        Args:
+            symbol: Hisse kodu
+            df: OHLCV verileri; depodaki son bardan önceki barlar atlanır,
+                son barla aynı zamanlı bar onu günceller
+            interval: Veri aralığı
+            raw: Barlar bölünme/temettü düzeltmesiz ise True
+
+        Returns:
+            int: Yeni eklenen bar sayısı (güncellenen son bar hariç)
+        """
+        history = self.open(symbol, interval)
+        if history is None or bool(history.meta.get('raw')) != raw:
+            self.write(symbol, df, interval, raw)
+            return len(df)
+
+        df = df.sort_index()
+        timestamps = self._timestamps(df.index)
+        keep = history.rows
+        if history.rows:
+            last = history.timestamps[-1]
+            new = timestamps >= last
+            df, timestamps = df[new], timestamps[new]
+            # Son bar henüz kapanmamış olabilir; aynı zamanlı bar üzerine yazılır
+            if len(timestamps) and timestamps[0] == last:
+                keep -= 1
+        if df.empty:
+            return 0
+
+        path = history.path
+        arrays = {INDEX_FILE: timestamps}
+        for field in history.fields:
+            arrays[_field_file(field)] = df[field].to_numpy(dtype=np.float64)
+        for filename, values in arrays.items():
+            with open(os.path.join(path, filename), "r+b") as f:
+                # Yarım kalmış eski eklemeler silinir; açık memory-map'lerin
+                # gördüğü satırların altına asla kesilmez
+                f.truncate(history.rows * 8)
+                f.seek(keep * 8)
+                values.tofile(f)
+
+        self._write_meta(path, dict(history.meta, rows=keep + len(df)))
+        return keep + len(df) - history.rows
+
+    def merge(self, symbol: str, df: pd.DataFrame, interval: str = "1d", raw: bool = False) -> int:
+        """
+        Depoda olmayan barları geçmişin içine yerleştirir (boşluk doldurma)
+
+        Depodaki barlar değiştirilmez. Yeni barların hepsi son bardan
+        sonraysa `append` gibi dosyaların sonuna eklenir; aksi halde geçmiş
+        birleştirilip baştan yazılır.
+
+        Args:
+            symbol: Hisse kodu
+            df: OHLCV verileri
+            interval: Veri aralığı
+            raw: Barlar bölünme/temettü düzeltmesiz ise True
+
+        Returns:
+            int: Eklenen bar sayısı
+        """
+        history = self.open(symbol, interval)
+        if history is None or not len(history) or bool(history.meta.get('raw')) != raw:
+            return self.append(symbol, df, interval, raw)
+
+        df = df.sort_index()
+        timestamps = self._timestamps(df.index)
+        new = ~np.isin(timestamps, history.timestamps)
+        df, timestamps = df[new], timestamps[new]
+        if df.empty:
+            return 0
+        if timestamps[0] > history.timestamps[-1]:
+            return self.append(symbol, df, interval, raw)
+
+        # Saat dilimsiz zamanlar UTC sayılır (`_timestamps` gibi)
+        stored = history.slice()
+        index = df.index if df.index.tz is not None else df.index.tz_localize('UTC')
+        index = index.tz_convert(stored.index.tz) if stored.index.tz is not None else index.tz_convert('UTC').tz_localize(None)
+        df = df.set_axis(index.rename(stored.index.name))
+        merged = pd.concat([stored, df[history.fields]]).sort_index()
+        self.write(symbol, merged, interval, raw)
+        if history.meta.get('empty_gaps'):
+            self._write_meta(history.path, dict(self.open(symbol, interval).meta,
+                                                empty_gaps=history.meta['empty_gaps']))
+        return len(df)
+
+    def empty_gaps(self, symbol: str, interval: str = "1d") -> List[tuple]:
+        """
+        Kaynakta verisi olmadığı kaydedilen boşluklar (yeniden indirilmez)
+
+        Returns:
+            List: (ilk bar, son bar) zaman çiftleri
+        """
+        history = self.open(symbol, interval)
+        if history is None:
+            return []
+        return [(pd.Timestamp(first), pd.Timestamp(last)) for first, last in history.meta.get('empty_gaps', [])]
+
+    def mark_empty(self, symbol: str, first, last, interval: str = "1d") -> None:
+        """
+        Boşluğun kaynakta da boş olduğunu kaydeder
+
+        Args:
+            symbol: Hisse kodu
+            first: Boşluğun ilk barı
+            last: Boşluğun son barı
+            interval: Veri aralığı
+        """
+        history = self.open(symbol, interval)
+        if history is None:
+            return
+        gaps = history.meta.get('empty_gaps', []) + [[pd.Timestamp(first).isoformat(), pd.Timestamp(last).isoformat()]]
+        self._write_meta(history.path, dict(history.meta, empty_gaps=gaps))
+
+    @staticmethod
+    def _write_meta(path: str, meta: Dict) -> None:
+        tmp_path = os.path.join(path, f"{META_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(path, META_FILE))
@@ -0,0 +1,377 @@
+"""
+Diskte kalıcı indikatör önbelleği
+
+Hesaplanan indikatör serileri, girdi barlarının içeriği ile indikatör adı
+ve `INDICATORS_CONFIG` parametrelerine göre saklanır. Yeniden başlatma
+sonrası seriler hesaplanmadan memory-map ile okunur.
+
+Klasör yapısı:
+    <root>/<indikatör>-<parametre özeti>/<çapa bar özeti>/
+        meta.json           satır sayısı ve çıktılar
+        bars.<sürüm>.u8     her barın (zaman + OHLCV) özeti
+        <çıktı>.<sürüm>.f8  her çıktı serisi için float64 dosyası
+
+Kayıtlar ayın ilk barına (çapa) göre adlandırılır; her gün bir bar kayan
+pencereler ("1y" gibi) aylarca aynı çapayı içerdiği için aynı kayda düşer.
+Verinin barları kayıttaki barlarla bar özetleri üzerinden eşleştirilir:
+    - Veri kaydın içinde başlıyor ve örtüşen barlar aynıysa seriler
+      kayıttan okunur. Veri kaydın başından sonra başlıyorsa ilk barlar
+      (ısınma uzunluğu kadar) veri üzerinde yeniden hesaplanır.
+    - Veride kayıttan sonra yeni barlar varsa sadece yeni barlar, pencereyi
+      kapsayan bir kuyruk üzerinde hesaplanıp dosyaların sonuna eklenir.
+    - Örtüşen barlar farklıysa (örn. düzeltilmiş geçmiş fiyatlar) kayıt
+      bayattır, seriler baştan hesaplanıp üzerine yazılır.
+Isınma uzunluğu veriden uzun olan indikatörler (örn. 1e-10 toleransla
+RSI ve MACD, "1y" penceresinde) her seferinde veri üzerinde hesaplanır;
+kayıt bu durumda değiştirilmez. `max_age_days` gündür kullanılmayan
+kayıtlar `cleanup` ile silinir.
+"""
+
+import os
+import json
+import math
+import time
+import shutil
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+from .config import INDICATORS_CONFIG, INDICATOR_CACHE_CONFIG
+
+INPUT_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+META_FILE = "meta.json"
+BARS_FILE = "bars"
+# Dosya düzeni değişirse artırılır; eski kayıtlar kendiliğinden geçersiz olur
+FORMAT_VERSION = 2
+# Değeri hesaplamayı etkilemeyen konfigürasyon alanları
+LABEL_KEYS = ('name', 'default', 'overbought', 'oversold')
+# Pencere uzunluğu belirten konfigürasyon alanları
+WINDOW_KEYS = ('period', 'fast', 'slow', 'signal', 'k_period', 'd_period')
+# Kayıt aranırken denenen en fazla çapa sayısı
+MAX_ANCHORS = 36
+
+def params_key(name: str, backend: str) -> str:
+    """İndikatör adı, hesaplama parametreleri ve motorun özeti"""
+    params = {key: value for key, value in INDICATORS_CONFIG[name].items() if key not in LABEL_KEYS}
+    text = json.dumps({'name': name, 'params': params, 'backend': backend,
+                       'version': FORMAT_VERSION}, sort_keys=True)
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+def _index_keys(index: pd.Index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return np.ascontiguousarray(index.as_unit('ns').asi8)
+    return pd.util.hash_array(index.to_numpy())
+
+def fingerprint(data: pd.DataFrame, rows: int) -> str:
+    """
+    Verinin ilk `rows` barının içerik özeti
+
+    Args:
+        data: OHLCV verileri
+        rows: Özete katılan bar sayısı
+
+    Returns:
+        str: Zaman damgaları ve OHLCV değerlerinin blake2b özeti
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_index_keys(data.index[:rows]))
+    for column in INPUT_COLUMNS:
+        digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=np.float64)[:rows]))
+    return digest.hexdigest()
+
+def bar_hashes(data: pd.DataFrame) -> np.ndarray:
+    """Her barın zaman damgası ve OHLCV değerlerinden 64 bit özeti"""
+    values = pd.DataFrame({column: data[column].to_numpy(dtype=np.float64) for column in INPUT_COLUMNS},
+                          index=_index_keys(data.index))
+    return pd.util.hash_pandas_object(values, index=True).to_numpy(dtype=np.uint64)
+
+def anchors(data: pd.DataFrame) -> np.ndarray:
+    """
+    Kayıt adı olarak kullanılabilecek barların konumları (en yeniden eskiye)
+
+    Her takvim ayının verideki ilk barıdır; verinin ilk barı da dahildir.
+    """
+    if not isinstance(data.index, pd.DatetimeIndex):
+        return np.array([0])
+    months = data.index.year * 12 + data.index.month
+    positions = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    return positions[::-1][:MAX_ANCHORS]
+
+def _decays(name: str, config: Dict) -> List[float]:
+    """Üssel ortalama kullanan indikatörlerin zincirdeki yumuşatma katsayıları"""
+    if name.startswith('ema_'):
+        return [2 / (config['period'] + 1)]
+    if name == 'rsi':
+        return [1 / config['period']]
+    if name == 'macd':
+        # Sinyal çizgisi MACD çizgisinin ortalamasıdır; yavaş ortalama hızlıyı kapsar
+        return [2 / (config['slow'] + 1), 2 / (config['signal'] + 1)]
+    return []
+
+def warmup(name: str, tolerance: Optional[float] = None) -> int:
+    """
+    Bir barın değerini hesaplamak için gereken önceki bar sayısı
+
+    Pencereli indikatörlerde pencerelerin toplamıdır. Üssel ortalamalarda
+    kuyruğun başlangıç değerinin etkisi `tolerance` altına inecek kadar
+    bar eklenir.
+
+    Args:
+        name: İndikatör adı
+        tolerance: Kabul edilen başlangıç etkisi (None ise konfigürasyondaki)
+
+    Returns:
+        int: Bar sayısı
+    """
+    tolerance = tolerance or INDICATOR_CACHE_CONFIG['tolerance']
+    config = INDICATORS_CONFIG[name]
+    bars = sum(int(config[key]) for key in WINDOW_KEYS if key in config)
+    for alpha in _decays(name, config):
+        bars += math.ceil(math.log(tolerance) / math.log1p(-alpha))
+    return bars
+
+class IndicatorCache:
+    """
+    İndikatör serilerini diskte saklayan önbellek
+
+    Aynı klasörü kullanan süreçler kayıtları paylaşır; dosyalar sayfa
+    önbelleğinden okunur.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Önbellek klasörü (None ise konfigürasyondaki)
+        """
+        self.root = root or INDICATOR_CACHE_CONFIG['root']
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'extends': 0, 'misses': 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Okunan, uzatılan ve baştan hesaplanan kayıt sayıları"""
+        with self._lock:
+            return dict(self._stats)
+
+    @staticmethod
+    def _read_meta(path: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_meta(path: str, meta: Dict) -> None:
+        tmp_path = os.path.join(path, f"{META_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(path, META_FILE))
+
+    @staticmethod
+    def _file(path: str, meta: Dict, output: str) -> str:
+        return os.path.join(path, f"{output}.{meta['file']}.f8")
+
+    @staticmethod
+    def _bars_file(path: str, meta: Dict) -> str:
+        return os.path.join(path, f"{BARS_FILE}.{meta['file']}.u8")
+
+    def _map(self, path: str, meta: Dict) -> Dict[str, np.ndarray]:
+        """Kayıttaki serileri salt okunur memory-map olarak açar"""
+        # Dosyada meta'dan fazla satır olabilir (yarım kalmış ekleme); fazlası yok sayılır
+        return {output: np.memmap(self._file(path, meta, output), dtype=np.float64,
+                                  mode='r', shape=(meta['rows'],))
+                for output in meta['outputs']}
+
+    def _write(self, path: str, meta: Optional[Dict], data: pd.DataFrame, hashes: np.ndarray,
+               values: Dict[str, np.ndarray]) -> None:
+        """Serileri yeni sürüm dosyalarına yazar ve eski sürümü siler"""
+        new_meta = {'rows': len(data), 'outputs': list(values), 'start': str(data.index[0]),
+                    'end': str(data.index[-1]),
+                    'file': hashlib.blake2b(hashes.tobytes(), digest_size=6).hexdigest()}
+        os.makedirs(path, exist_ok=True)
+        hashes.tofile(self._bars_file(path, new_meta))
+        for output, array in values.items():
+            np.ascontiguousarray(array, dtype=np.float64).tofile(self._file(path, new_meta, output))
+        self._write_meta(path, new_meta)
+
+        # Açık memory-map'ler silinen dosyaları okumaya devam eder
+        if meta is not None and meta.get('file') != new_meta['file']:
+            for file_path in [self._bars_file(path, meta)] + [self._file(path, meta, output)
+                                                               for output in meta.get('outputs', [])]:
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+
+    def _append(self, path: str, meta: Dict, data: pd.DataFrame, hashes: np.ndarray,
+                values: Dict[str, np.ndarray]) -> None:
+        """Yeni barları ve değerlerini mevcut dosyaların sonuna ekler"""
+        files = [(self._bars_file(path, meta), hashes)] + [(self._file(path, meta, output), array)
+                                                           for output, array in values.items()]
+        for file_path, array in files:
+            with open(file_path, "r+b") as f:
+                f.seek(meta['rows'] * 8)
+                f.write(np.ascontiguousarray(array).tobytes())
+                f.truncate()
+        self._write_meta(path, dict(meta, rows=meta['rows'] + len(hashes), end=str(data.index[-1])))
+
+    def _find(self, base: str, hashes: np.ndarray, positions: np.ndarray):
+        """Çapalardan birine ait kaydı bulur; yoksa (None, None)"""
+        for position in positions:
+            path = os.path.join(base, f"{hashes[position]:016x}")
+            meta = self._read_meta(path)
+            if meta is not None:
+                return path, meta
+        return None, None
+
+    def get(self, name: str, data: pd.DataFrame,
+            compute: Callable[[pd.DataFrame], Dict[str, pd.Series]],
+            backend: str = "native") -> Dict[str, pd.Series]:
+        """
+        İndikatör serilerini önbellekten okur, gerekirse hesaplar
+
+        Args:
+            name: İndikatör adı (INDICATORS_CONFIG anahtarı)
+            data: OHLCV verileri
+            compute: Verilen barlar için çıktı serilerini hesaplayan fonksiyon
+            backend: İndikatör motoru (önbellek anahtarına dahildir)
+
+        Returns:
+            Dict: Çıktı adı -> veri indeksine sahip Series
+        """
+        rows = len(data)
+        if rows == 0:
+            return compute(data)
+
+        hashes = bar_hashes(data)
+        positions = anchors(data)
+        base = os.path.join(self.root, f"{name}-{params_key(name, backend)}")
+        path, meta = self._find(base, hashes, positions)
+        bars = warmup(name)
+        # Veri kaydın başından önce başlıyorsa (daha uzun geçmiş) veya kayıt bayatsa üzerine yazılır
+        writable = True
+
+        if meta is not None:
+            try:
+                stored = np.memmap(self._bars_file(path, meta), dtype=np.uint64, mode='r', shape=(meta['rows'],))
+                matches = np.flatnonzero(stored == hashes[0])
+                if len(matches):
+                    offset = int(matches[0])
+                    overlap = min(meta['rows'] - offset, rows)
+                    # Kayıttaki değerler daha uzun geçmişle hesaplanmış olabilir; veri
+                    # kaydın ortasında başlıyorsa ilk barlar verinin kendi başlangıcıyla hesaplanır
+                    head = 0 if offset == 0 else min(bars, rows)
+                    if not np.array_equal(stored[offset:offset + overlap], hashes[:overlap]):
+                        pass
+                    elif head >= overlap:
+                        # Veri ısınma uzunluğundan kısa; kayda dokunulmaz
+                        writable = False
+                    elif rows == overlap or overlap >= bars:
+                        return self._reuse(path, meta, data, hashes, offset, overlap, head, bars, compute)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"İndikatör önbelleği okuma hatası {name}: {str(e)}")
+
+        self._count('misses')
+        result = compute(data)
+        if writable:
+            target = os.path.join(base, f"{hashes[positions[0]]:016x}")
+            try:
+                self._write(target, meta if target == path else self._read_meta(target), data, hashes,
+                            {output: series.to_numpy(dtype=np.float64) for output, series in result.items()})
+                # Bayat veya daha kısa geçmişli eski kayıt yenisiyle değiştirildi
+                if path is not None and path != target:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError as e:
+                print(f"İndikatör önbelleği yazma hatası {name}: {str(e)}")
+        return result
+
+    def _reuse(self, path: str, meta: Dict, data: pd.DataFrame, hashes: np.ndarray, offset: int,
+               overlap: int, head: int, bars: int, compute) -> Dict[str, pd.Series]:
+        """
+        Kayıtla örtüşen barları kayıttan okur, yeni barları hesaplayıp ekler
+
+        Args:
+            offset: Verinin ilk barının kayıttaki konumu
+            overlap: Kayıtla örtüşen bar sayısı
+            head: Veri üzerinde yeniden hesaplanan ilk bar sayısı
+            bars: Isınma uzunluğu
+        """
+        rows = len(data)
+        cached = self._map(path, meta)
+        parts = {output: [] for output in meta['outputs']}
+        if head:
+            fresh = compute(data.iloc[:head])
+            for output in parts:
+                parts[output].append(fresh[output].to_numpy(dtype=np.float64))
+        for output in parts:
+            parts[output].append(cached[output][offset + head:offset + overlap])
+
+        if rows > overlap:
+            start = overlap - bars
+            tail = compute(data.iloc[start:])
+            new_values = {output: tail[output].to_numpy(dtype=np.float64)[overlap - start:] for output in parts}
+            self._append(path, meta, data, hashes[overlap:], new_values)
+            for output in parts:
+                parts[output].append(new_values[output])
+            self._count('extends')
+        else:
+            os.utime(os.path.join(path, META_FILE))
+            self._count('hits')
+
+        return {output: pd.Series(values[0] if len(values) == 1 else np.concatenate(values),
+                                  index=data.index, name=output)
+                for output, values in parts.items()}
+
+    def cleanup(self, max_age: Optional[float] = None) -> int:
+        """
+        Uzun süredir kullanılmayan kayıtları siler
+
+        Args:
+            max_age: Saniye (None ise konfigürasyondaki `max_age_days`)
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        max_age = INDICATOR_CACHE_CONFIG['max_age_days'] * 86400 if max_age is None else max_age
+        cutoff = time.time() - max_age
+        removed = 0
+        try:
+            groups = [os.path.join(self.root, name) for name in os.listdir(self.root)]
+        except OSError:
+            return 0
+        for group in groups:
+            if not os.path.isdir(group):
+                continue
+            for entry in os.listdir(group):
+                path = os.path.join(group, entry)
+                meta_path = os.path.join(path, META_FILE)
+                try:
+                    used = os.path.getmtime(meta_path if os.path.exists(meta_path) else path)
+                except OSError:
+                    continue
+                if used < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            try:
+                os.rmdir(group)  # Boş kaldıysa
+            except OSError:
+                pass
+        return removed
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_indicator_cache() -> IndicatorCache:
+    """Süreç genelinde paylaşılan indikatör önbelleği"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IndicatorCache()
+            _cache.cleanup()
+        return _cache
@@ -0,0 +1,370 @@
+"""
+NumPy ile vektörize edilmiş indikatör çekirdekleri
+
+Fonksiyonlar `ta` kütüphanesindeki karşılıklarıyla aynı sonucu üretir ama
+pandas rolling/apply zincirleri ve satır satır Python döngüleri yerine
+NumPy dizileri üzerinde çalışır. numba kuruluysa ardışık (özyinelemeli)
+hesaplamalar ilk kullanımda JIT ile derlenir; kurulu değilse blok halinde
+vektörize edilmiş NumPy sürümü kullanılır.
+
+Girdilerde NaN bulunan seriler için `ta` ile birebir aynı davranış garanti
+edilmez; bu durumda `supports` False döner ve çağıran taraf `ta`'ya düşer.
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# numba kuruluysa JIT kullanılsın mı? (False ise her zaman NumPy sürümü)
+USE_JIT = True
+
+# Bundan kısa serilerde derleme maliyetine değmez, NumPy sürümü kullanılır
+JIT_MIN_SIZE = 100_000
+
+# Derlenmiş çekirdekler; numba ağır bir modül olduğu için ilk kullanımda yüklenir
+_jit_cache = {}
+
+def supports(*arrays: np.ndarray, window: int) -> bool:
+    """
+    Çekirdeklerin verilen girdiler için kullanılabilir olup olmadığını döndürür
+
+    Args:
+        *arrays: Girdi dizileri
+        window: Pencere uzunluğu
+
+    Returns:
+        bool: Girdiler sonluysa ve pencereden uzunsa True
+    """
+    if window < 1:
+        return False
+    for array in arrays:
+        if len(array) <= window or not np.isfinite(array).all():
+            return False
+    return True
+
+def _pad(values: np.ndarray, window: int) -> np.ndarray:
+    """Pencere sonuçlarını başa NaN ekleyerek orijinal uzunluğa getirir"""
+    out = np.full(len(values) + window - 1, np.nan)
+    out[window - 1:] = values
+    return out
+
+def _rolling_extreme(x: np.ndarray, window: int, ufunc: np.ufunc) -> np.ndarray:
+    """
+    van Herk/Gil-Werman algoritmasıyla kayan pencere maksimum/minimumu
+
+    Seri pencere boyunda bloklara bölünür; her pencerenin sonucu bir
+    bloğun son ekinden ve sonraki bloğun ön ekinden bulunur. Pencere
+    uzunluğundan bağımsız olarak O(n) çalışır.
+    """
+    n = len(x)
+    blocks = -(-n // window)
+    padded = np.empty(blocks * window)
+    padded[:n] = x
+    padded[n:] = x[-1]
+    reshaped = padded.reshape(blocks, window)
+
+    prefix = ufunc.accumulate(reshaped, axis=1).ravel()
+    suffix = ufunc.accumulate(reshaped[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    count = n - window + 1
+    return _pad(ufunc(suffix[:count], prefix[window - 1:window - 1 + count]), window)
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Kayan pencere maksimumu (ilk window-1 değer NaN)"""
+    return _rolling_extreme(x, window, np.maximum)
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Kayan pencere minimumu (ilk window-1 değer NaN)"""
+    return _rolling_extreme(x, window, np.minimum)
+
+def _window_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Her pencerenin toplamını, kaydırılmış dilimleri toplayarak hesaplar
+
+    Kümülatif toplam farkı yerine kullanılır; uzun serilerde kümülatif
+    toplamın biriktirdiği yuvarlama hatası oluşmaz.
+    """
+    count = len(x) - window + 1
+    total = x[:count].copy()
+    for offset in range(1, window):
+        total += x[offset:offset + count]
+    return total
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Kayan pencere ortalaması (ilk window-1 değer NaN)"""
+    return _pad(_window_sum(x, window) / window, window)
+
+def _rolling_mad(x: np.ndarray, window: int, means: np.ndarray) -> np.ndarray:
+    """Pencere ortalamaları bilinen serinin ortalama mutlak sapması"""
+    count = len(means)
+    total = np.abs(x[:count] - means)
+    for offset in range(1, window):
+        total += np.abs(x[offset:offset + count] - means)
+    return total / window
+
+def _linear_recurrence_numpy(x: np.ndarray, a: float, y0: float) -> np.ndarray:
+    """
+    y[i] = a * y[i-1] + x[i] özyinelemesini bloklar halinde çözer
+
+    Blok içinde y[j] = a^j * (a * c + cumsum(x[k] / a^k)) formülü kullanılır;
+    blok uzunluğu a^-k katsayıları taşmayacak şekilde seçilir.
+    """
+    n = len(x)
+    y = np.empty(n)
+    if a == 0:
+        y[:] = x
+        return y
+
+    block = int(min(4096, max(1, np.floor(100 * np.log(10) / -np.log(a)))))
+    powers = a ** np.arange(block)
+    inverse_powers = 1.0 / powers
+
+    carry = y0
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        size = len(chunk)
+        values = powers[:size] * (a * carry + np.cumsum(chunk * inverse_powers[:size]))
+        y[start:start + size] = values
+        carry = values[-1]
+    return y
+
+def _linear_recurrence_loop(x, a, y0):
+    y = np.empty(len(x))
+    carry = y0
+    for i in range(len(x)):
+        carry = a * carry + x[i]
+        y[i] = carry
+    return y
+
+def _rolling_mean_mad_loop(x, window):
+    n = len(x) - window + 1
+    means = np.empty(n)
+    mads = np.empty(n)
+    for i in range(n):
+        mean = 0.0
+        for j in range(window):
+            mean += x[i + j]
+        mean /= window
+        total = 0.0
+        for j in range(window):
+            total += abs(x[i + j] - mean)
+        means[i] = mean
+        mads[i] = total / window
+    return means, mads
+
+def _jit(function, size: int):
+    """
+    Fonksiyonun numba ile derlenmiş halini döndürür
+
+    Args:
+        function: Derlenecek fonksiyon
+        size: İşlenecek dizi uzunluğu
+
+    Returns:
+        Callable: Derlenmiş fonksiyon; numba yoksa, USE_JIT False ise veya
+        dizi JIT_MIN_SIZE'dan kısaysa None
+    """
+    if not USE_JIT or size < JIT_MIN_SIZE:
+        return None
+    if function.__name__ not in _jit_cache:
+        try:
+            import numba
+            _jit_cache[function.__name__] = numba.njit(cache=True)(function)
+        except ImportError:
+            _jit_cache[function.__name__] = None
+    return _jit_cache[function.__name__]
+
+def linear_recurrence(x: np.ndarray, a: float, y0: float = 0.0) -> np.ndarray:
+    """
+    y[i] = a * y[i-1] + x[i] özyinelemesini hesaplar (y[-1] = y0)
+
+    Args:
+        x: Girdi dizisi
+        a: Katsayı (0 <= a < 1)
+        y0: Başlangıç değeri
+
+    Returns:
+        np.ndarray: y dizisi
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    compiled = _jit(_linear_recurrence_loop, len(x))
+    if compiled is not None:
+        return compiled(x, float(a), float(y0))
+    return _linear_recurrence_numpy(x, a, y0)
+
+def rolling_mean_mad(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kayan pencere ortalaması ve ortalama mutlak sapması
+
+    Sabit (tüm değerleri eşit) pencerelerde ortalama pencere değerine,
+    sapma tam sıfıra eşitlenir; toplamların yuvarlama artığı sapma sayılmaz.
+
+    Returns:
+        Tuple: (ortalama, ortalama mutlak sapma); ilk window-1 değer NaN
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    compiled = _jit(_rolling_mean_mad_loop, len(x))
+    if compiled is not None:
+        means, mads = compiled(x, window)
+    else:
+        means = _window_sum(x, window) / window
+        mads = _rolling_mad(x, window, means)
+    means, mads = _pad(means, window), _pad(mads, window)
+    flat = rolling_min(x, window) == rolling_max(x, window)
+    means[flat] = x[flat]
+    mads[flat] = 0.0
+    return means, mads
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+        window: int = 20, constant: float = 0.015) -> np.ndarray:
+    """Emtia Kanal Endeksi (ta.trend.cci ile aynı)"""
+    typical_price = (high + low + close) / 3.0
+    means, mads = rolling_mean_mad(typical_price, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = (typical_price - means) / (constant * mads)
+    # Sabit pencerede fiyat ortalamaya eşittir (ta ile aynı şekilde 0)
+    return np.where(mads == 0, 0.0, values)
+
+def stoch(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+          window: int = 14, smooth_window: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stokastik Osilatör
+
+    Returns:
+        Tuple: (%K, %D); %K ta.momentum.stoch ile aynıdır, %D onun
+        smooth_window periyotluk basit ortalamasıdır
+    """
+    lowest = rolling_min(low, window)
+    highest = rolling_max(high, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * (close - lowest) / (highest - lowest)
+
+    stoch_d = np.full(len(stoch_k), np.nan)
+    valid = stoch_k[window - 1:]
+    if len(valid) >= smooth_window:
+        stoch_d[window - 1:] = rolling_mean(valid, smooth_window)
+    return stoch_k, stoch_d
+
+def williams_r(high: np.ndarray, low: np.ndarray, close: np.ndarray, lbp: int = 14) -> np.ndarray:
+    """Williams %R (ta.momentum.williams_r ile aynı)"""
+    highest = rolling_max(high, lbp)
+    lowest = rolling_min(low, lbp)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -100 * (highest - close) / (highest - lowest)
+
+def _directional_movement(high: np.ndarray, low: np.ndarray, prev_high: np.ndarray,
+                          prev_low: np.ndarray, prev_close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gerçek aralık ile pozitif ve negatif yönlü hareketleri hesaplar"""
+    true_range = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    diff_up = high - prev_high
+    diff_down = prev_low - low
+    pos = np.where((diff_up > diff_down) & (diff_up > 0), diff_up, 0.0)
+    neg = np.where((diff_down > diff_up) & (diff_down > 0), diff_down, 0.0)
+    return true_range, pos, neg
+
+def _directional_index(trs: np.ndarray, dip_sum: np.ndarray, din_sum: np.ndarray) -> np.ndarray:
+    """Düzleştirilmiş serilerden yön endeksini (DX) hesaplar"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dip = np.where(trs != 0, 100 * dip_sum / trs, 0.0)
+        din = np.where(trs != 0, 100 * din_sum / trs, 0.0)
+        total = dip + din
+        return np.where(total != 0, 100 * np.abs((dip - din) / total), 0.0)
+
+def adx_with_state(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                   window: int = 14) -> Tuple[np.ndarray, Optional[Dict]]:
+    """
+    ADX'i hesaplar ve artımlı güncelleme için durum döndürür
+
+    Returns:
+        Tuple: (ADX dizisi, durum); seri ADX'in ısınma bölgesini aşmıyorsa
+        durum None'dır ve yeni barlarda tam hesaplama gerekir
+    """
+    n = len(close)
+    a = 1.0 - 1.0 / window
+
+    # İlk bar önceki kapanış olmadığı için hesaba katılmaz
+    true_range, pos, neg = _directional_movement(high[1:], low[1:], high[:-1], low[:-1], close[:-1])
+
+    length = n - (window - 1)
+    smoothed = []
+    for series in (true_range, pos, neg):
+        values = np.zeros(length)
+        values[0] = series[:window].sum()
+        # values[i] = values[i-1] * a + series[window + i - 1], i = 1 .. length-2
+        values[1:length - 1] = linear_recurrence(series[window:window + length - 2], a, values[0])
+        smoothed.append(values)
+    trs, dip_sum, din_sum = smoothed
+    directional_index = _directional_index(trs, dip_sum, din_sum)
+
+    adx_values = np.zeros(length)
+    state = None
+    if length > window:
+        adx_values[window] = directional_index[:window].mean()
+        # adx[i] = (adx[i-1] * (window-1) + dx[i-1]) / window, i = window+1 .. length-1
+        adx_values[window + 1:] = linear_recurrence(
+            directional_index[window:length - 1] / window, a, adx_values[window]
+        )
+        # Son gerçek düzleştirilmiş değerler length-2'dedir (ta'nın son elemanı 0'dır)
+        state = {
+            'window': window,
+            'trs': trs[length - 2],
+            'dip': dip_sum[length - 2],
+            'din': din_sum[length - 2],
+            'adx': adx_values[-1],
+            'high': high[-1],
+            'low': low[-1],
+            'close': close[-1],
+        }
+
+    return np.concatenate((np.zeros(window - 1), adx_values)), state
+
+def adx_update(state: Dict, high: np.ndarray, low: np.ndarray,
+               close: np.ndarray) -> Tuple[np.ndarray, Dict]:
+    """
+    Önceki durumdan devam ederek yeni barların ADX değerlerini hesaplar
+
+    Sonuç, tüm seri üzerinde yeniden `adx` çağrılmasıyla aynıdır.
+
+    Args:
+        state: adx_with_state veya adx_update'in döndürdüğü durum
+        high, low, close: Yeni barlar
+
+    Returns:
+        Tuple: (yeni barların ADX değerleri, yeni durum)
+    """
+    window = state['window']
+    a = 1.0 - 1.0 / window
+
+    prev_high = np.concatenate(([state['high']], high[:-1]))
+    prev_low = np.concatenate(([state['low']], low[:-1]))
+    prev_close = np.concatenate(([state['close']], close[:-1]))
+    true_range, pos, neg = _directional_movement(high, low, prev_high, prev_low, prev_close)
+
+    trs = linear_recurrence(true_range, a, state['trs'])
+    dip_sum = linear_recurrence(pos, a, state['dip'])
+    din_sum = linear_recurrence(neg, a, state['din'])
+
+    # Yeni ADX değerleri bir önceki barın DX'inden türetilir; önceki son
+    # barın DX'i ta'da hesaplanmadığı için burada ilk kez kullanılır
+    directional_index = _directional_index(trs, dip_sum, din_sum)
+    adx_values = linear_recurrence(directional_index / window, a, state['adx'])
+
+    new_state = {
+        'window': window,
+        'trs': trs[-1],
+        'dip': dip_sum[-1],
+        'din': din_sum[-1],
+        'adx': adx_values[-1],
+        'high': high[-1],
+        'low': low[-1],
+        'close': close[-1],
+    }
+    return adx_values, new_state
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Ortalama Yön Endeksi (ta.trend.adx ile aynı)
+
+    ta'nın davranışı birebir korunur: ısınma bölgesi NaN yerine 0'dır ve
+    düzleştirilmiş serilerin son elemanı hesaplanmaz.
+    """
+    return adx_with_state(high, low, close, window)[0]
@@ -0,0 +1,257 @@
+import heapq
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .quote_stream import QuoteSubscription
+
+# Sinyal gücü bileşenleri (AlertSystem.get_signal_strength anahtarları)
+STRENGTH_METRICS = ('overall', 'trend', 'momentum', 'volume')
+
+# Sıralama tarafları: en güçlü al adayları en yüksek, sat adayları en düşük skorlar
+BUY = "buy"
+SELL = "sell"
+
+class TopKIndex:
+    """
+    Skorları güncellenebilen, en yüksek/en düşük K sorgusu yapan indeks
+
+    Her skor bir max-heap ve bir min-heap'e eklenir. Güncellenen veya silinen
+    hissenin eski kayıtları heap'lerden hemen çıkarılmaz (tembel silme);
+    sorgu sırasında heap tepesine geldiklerinde atılırlar. Böylece güncelleme
+    O(log N), K elemanlı sorgu O(K log N) sürer. Eski kayıtlar geçerli
+    kayıtların iki katını aşınca heap'ler yeniden kurulur.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._versions = {}
+        self._high = []  # (-skor, sıra, hisse)
+        self._low = []  # (skor, sıra, hisse)
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._scores
+
+    def get(self, symbol: str) -> Optional[float]:
+        """Hissenin güncel skoru"""
+        return self._scores.get(symbol)
+
+    def update(self, symbol: str, score: float) -> bool:
+        """
+        Hissenin skorunu ekler veya günceller
+
+        Returns:
+            bool: Skor değiştiyse True
+        """
+        if self._scores.get(symbol) == score:
+            return False
+        self._counter += 1
+        self._scores[symbol] = score
+        self._versions[symbol] = self._counter
+        heapq.heappush(self._high, (-score, self._counter, symbol))
+        heapq.heappush(self._low, (score, self._counter, symbol))
+        self._compact()
+        return True
+
+    def remove(self, symbol: str) -> None:
+        """Hisseyi indeksten çıkarır"""
+        if self._scores.pop(symbol, None) is not None:
+            self._versions.pop(symbol)
+            self._compact()
+
+    def _compact(self) -> None:
+        """Eski kayıtlar çoğaldıysa heap'leri sadece geçerli kayıtlarla yeniden kurar"""
+        if len(self._high) > 2 * len(self._scores) + 64:
+            self._high = [(-score, self._versions[symbol], symbol) for symbol, score in self._scores.items()]
+            self._low = [(score, self._versions[symbol], symbol) for symbol, score in self._scores.items()]
+            heapq.heapify(self._high)
+            heapq.heapify(self._low)
+
+    def _take(self, heap: List, k: int, sign: int) -> List[Tuple[str, float]]:
+        """Heap'ten K geçerli kaydı çıkarır, eskileri atar, geçerlileri geri koyar"""
+        taken = []
+        while heap and len(taken) < k:
+            entry = heapq.heappop(heap)
+            _, version, symbol = entry
+            if self._versions.get(symbol) == version:
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [(symbol, sign * key) for key, _, symbol in taken]
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """En yüksek skorlu K hisse (azalan sırada)"""
+        return self._take(self._high, k, -1)
+
+    def bottom(self, k: int) -> List[Tuple[str, float]]:
+        """En düşük skorlu K hisse (artan sırada)"""
+        return self._take(self._low, k, 1)
+
+class SignalLeaderboard:
+    """
+    Sinyal gücüne göre canlı al/sat sıralaması
+
+    Her sinyal gücü bileşeni (genel, trend, momentum, hacim) için ayrı bir
+    `TopKIndex` tutulur. Sadece skoru değişen hisseler güncellenir; tüm evren
+    yeniden sıralanmaz. İlk K içindeki sıra değişiklikleri ("rank" olayları)
+    abonelere yayınlanır.
+    """
+
+    def __init__(self, k: int = 10, metrics: Iterable[str] = STRENGTH_METRICS):
+        """
+        Args:
+            k: İzlenen sıralama uzunluğu
+            metrics: Sıralanacak sinyal gücü bileşenleri
+        """
+        self.k = k
+        self.metrics = tuple(metrics)
+        self._indexes = {metric: TopKIndex() for metric in self.metrics}
+        self._rankings = {(metric, side): [] for metric in self.metrics for side in (BUY, SELL)}
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._indexes[self.metrics[0]]) if self.metrics else 0
+
+    def subscribe(self, name: str, **kwargs) -> QuoteSubscription:
+        """
+        Sıra değişikliği olaylarına abone olur
+
+        Args:
+            name: Abone adı
+            **kwargs: QuoteSubscription argümanları
+
+        Returns:
+            QuoteSubscription: "rank" olaylarını alan abonelik
+        """
+        kwargs.setdefault('event_types', ('rank',))
+        subscription = QuoteSubscription(name, **kwargs)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: QuoteSubscription) -> None:
+        """Aboneliği kaldırır"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def update(self, symbol: str, strength: Dict[str, float]) -> List[Dict]:
+        """
+        Hissenin sinyal gücünü günceller
+
+        Args:
+            symbol: Hisse kodu
+            strength: `AlertSystem.get_signal_strength` sonucu
+
+        Returns:
+            List[Dict]: Yayınlanan sıra değişikliği olayları
+        """
+        return self.update_many({symbol: strength})
+
+    def update_many(self, strengths: Dict[str, Dict[str, float]]) -> List[Dict]:
+        """
+        Birden fazla hissenin sinyal gücünü günceller; olaylar bir kez hesaplanır
+
+        Args:
+            strengths: Hisse kodu -> sinyal gücü
+
+        Returns:
+            List[Dict]: Yayınlanan sıra değişikliği olayları
+        """
+        with self._lock:
+            changed = set()
+            for symbol, strength in strengths.items():
+                for metric in self.metrics:
+                    score = strength.get(metric)
+                    if score is None or score != score:  # NaN skorlar sıralanmaz
+                        if symbol in self._indexes[metric]:
+                            self._indexes[metric].remove(symbol)
+                            changed.add(metric)
+                    elif self._indexes[metric].update(symbol, float(score)):
+                        changed.add(metric)
+            events = self._refresh([metric for metric in self.metrics if metric in changed])
+            subscribers = list(self._subscribers)
+
+        for event in events:
+            for subscription in subscribers:
+                subscription.publish(event)
+        return events
+
+    def remove(self, symbol: str) -> List[Dict]:
+        """Hisseyi sıralamadan çıkarır (örn. izleme listesinden çıktığında)"""
+        return self.update(symbol, {metric: None for metric in self.metrics})
+
+    def _refresh(self, metrics: Iterable[str]) -> List[Dict]:
+        """Değişen bileşenlerin ilk K listesini yeniler ve farkları olaya çevirir"""
+        events = []
+        for metric in metrics:
+            for side in (BUY, SELL):
+                ranking = self._query(metric, side, self.k)
+                previous = {symbol: rank for rank, (symbol, _) in enumerate(self._rankings[(metric, side)], 1)}
+                current = {symbol: rank for rank, (symbol, _) in enumerate(ranking, 1)}
+                scores = dict(ranking)
+
+                for symbol, rank in current.items():
+                    if previous.get(symbol) != rank:
+                        events.append(self._event(metric, side, symbol, rank, previous.get(symbol), scores[symbol]))
+                for symbol, rank in previous.items():
+                    if symbol not in current:
+                        events.append(self._event(metric, side, symbol, None, rank,
+                                                  self._indexes[metric].get(symbol)))
+                self._rankings[(metric, side)] = ranking
+        return events
+
+    @staticmethod
+    def _event(metric: str, side: str, symbol: str, rank: Optional[int], previous_rank: Optional[int],
+               score: Optional[float]) -> Dict:
+        return {'type': 'rank', 'metric': metric, 'side': side, 'symbol': symbol,
+                'rank': rank, 'previous_rank': previous_rank, 'score': score}
+
+    def _query(self, metric: str, side: str, k: int) -> List[Tuple[str, float]]:
+        index = self._indexes[metric]
+        return index.top(k) if side == BUY else index.bottom(k)
+
+    def top(self, k: Optional[int] = None, metric: str = 'overall') -> List[Tuple[str, float]]:
+        """
+        En güçlü al adayları
+
+        Args:
+            k: Sonuç sayısı (None ise sıralama uzunluğu)
+            metric: Sinyal gücü bileşeni
+
+        Returns:
+            List: (hisse, skor) çiftleri, azalan skor sırasında
+        """
+        with self._lock:
+            return self._query(metric, BUY, k or self.k)
+
+    def bottom(self, k: Optional[int] = None, metric: str = 'overall') -> List[Tuple[str, float]]:
+        """En güçlü sat adayları: (hisse, skor) çiftleri, artan skor sırasında"""
+        with self._lock:
+            return self._query(metric, SELL, k or self.k)
+
+    def consume(self, events: Iterable[Dict], score: Callable[[str, Dict], Optional[Dict[str, float]]]) -> List[Dict]:
+        """
+        Fiyat akışı olaylarıyla sıralamayı günceller
+
+        Aynı hissenin birden fazla olayı varsa sadece sonuncusu puanlanır.
+
+        Args:
+            events: QuotePoller olayları (örn. `subscription.drain()`)
+            score: Hisse kodu ve olay alıp sinyal gücü döndüren fonksiyon
+                (örn. yeni barı analize ekleyip get_signal_strength çağıran)
+
+        Returns:
+            List[Dict]: Yayınlanan sıra değişikliği olayları
+        """
+        latest = {event['symbol']: event for event in events}
+        strengths = {}
+        for symbol, event in latest.items():
+            strength = score(symbol, event)
+            if strength is not None:
+                strengths[symbol] = strength
+        return self.update_many(strengths) if strengths else []
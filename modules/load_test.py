@@ -0,0 +1,414 @@
+"""
+Çok kullanıcılı yük testi
+
+N eşzamanlı oturum, analistlerin tipik akışını (hisse değiştirme, zaman
+aralığı değiştirme, indikatör açıp kapama) ağ olmadan `OfflineSource`
+verisiyle tekrarlar. İki hedef desteklenir:
+    app: Streamlit sayfası, her oturum ayrı bir `AppTest` oturumudur
+        (gerçek sunucudaki gibi tüm oturumlar aynı süreçtedir ve
+        paylaşılan önbelleği kullanır)
+    service: Arayüzsüz analiz akışı (veri + `analyze_frame`)
+
+Sonuçta işlem hızı, p50/p95/p99 gecikme ve oturum başına bellek raporlanır.
+Sonuçlar JSON-lines dosyasına eklenir; aynı parametrelerle yapılmış
+önceki koşuyla karşılaştırılarak kapasite gerilemeleri görünür olur.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import BIST_SYMBOLS, INDICATORS_CONFIG, LOAD_TEST_CONFIG, MEMORY_CACHE_CONFIG
+
+# Arayüzdeki zaman aralığı seçenekleri
+PERIODS = ["1mo", "3mo", "6mo", "1y", "2y"]
+# Bir oturumdaki etkileşimlerin olasılıkları
+ACTION_WEIGHTS = {'symbol': 0.5, 'period': 0.25, 'indicator': 0.25}
+# Gerilemede karşılaştırılan parametreler; hepsi aynı olan koşular karşılaştırılır
+RUN_PARAMETERS = ('target', 'sessions', 'actions', 'think_time', 'latency', 'symbols')
+
+def make_workflow(rng: random.Random, actions: int, symbols: List[str]) -> List[Tuple[str, str]]:
+    """
+    Rastgele ama tekrarlanabilir bir oturum akışı üretir
+
+    Args:
+        rng: Oturumun rastgele sayı üreteci
+        actions: Etkileşim sayısı
+        symbols: Seçilebilecek hisseler
+
+    Returns:
+        List[Tuple]: (etkileşim, değer) listesi; indikatörde değer açılıp kapanan indikatördür
+    """
+    kinds = list(ACTION_WEIGHTS)
+    weights = list(ACTION_WEIGHTS.values())
+    workflow = []
+    for kind in rng.choices(kinds, weights=weights, k=actions):
+        if kind == 'symbol':
+            workflow.append((kind, rng.choice(symbols)))
+        elif kind == 'period':
+            workflow.append((kind, rng.choice(PERIODS)))
+        else:
+            workflow.append((kind, rng.choice(list(INDICATORS_CONFIG))))
+    return workflow
+
+class ServiceSession:
+    """Arayüzsüz analiz akışını yürüten oturum"""
+
+    def __init__(self, symbol: str, period: str):
+        from .alert_system import AlertSystem
+        from .batch_analysis import default_indicators
+        from .data_fetcher import BISTDataFetcher
+
+        self.fetcher = BISTDataFetcher()
+        self.alert_system = AlertSystem()
+        self.symbol = symbol
+        self.period = period
+        self.indicators = default_indicators()
+
+    def _analyze(self) -> None:
+        from .batch_analysis import analyze_frame
+        from .memory_cache import get_cache
+
+        df = get_cache().get_or_compute(('data', self.symbol, self.period, "1d"),
+                                        lambda: self.fetcher.get_stock_data(self.symbol, period=self.period),
+                                        ttl=MEMORY_CACHE_CONFIG['ttl'])
+        # Veri yoksa arayüzdeki gibi hata mesajı gösterilir; istek başarısız sayılmaz
+        if df is None or df.empty:
+            return
+        analyze_frame(self.symbol, df, self.indicators, self.alert_system)
+
+    def open(self) -> None:
+        self._analyze()
+
+    def apply(self, action: str, value: str) -> bool:
+        if action == 'symbol':
+            self.symbol = value
+        elif action == 'period':
+            self.period = value
+        elif value in self.indicators:
+            self.indicators = [name for name in self.indicators if name != value]
+        else:
+            self.indicators = self.indicators + [value]
+        self._analyze()
+        return True
+
+# AppTest süreç genelindeki Streamlit Runtime'ını her çalıştırmada kurup
+# kaldırır; eşzamanlı çalıştırmalar birbirini bozar
+_app_lock = threading.Lock()
+
+class AppSession:
+    """
+    Streamlit sayfasını `AppTest` ile yürüten oturum
+
+    Sayfa çalıştırmaları sırayla yapılır; ölçülen gecikme sırada bekleme
+    süresini de içerir. Gerçek sunucuda da oturumlar GIL nedeniyle CPU
+    işini paralel yürütemez, bu yüzden işlem hızı kapasiteyi yansıtır.
+    """
+
+    def __init__(self, symbol: str, period: str, app_path: Optional[str] = None,
+                 timeout: float = LOAD_TEST_CONFIG['timeout']):
+        from streamlit.testing.v1 import AppTest
+
+        app_path = app_path or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+        self.app = AppTest.from_file(app_path, default_timeout=timeout)
+        self.symbol = symbol
+        self.period = period
+
+    def _run(self, element=None) -> None:
+        with _app_lock:
+            (element or self.app).run()
+
+    def _check(self) -> None:
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].value)
+
+    def open(self) -> None:
+        self._run()
+        self._check()
+        # İlk seçimler akışın başlangıç durumuna getirilir (ölçüme dahil)
+        self._run(self.app.sidebar.selectbox[0].select(self.symbol))
+        self._run(self.app.sidebar.selectbox[1].select(self.period))
+        self._check()
+
+    def apply(self, action: str, value: str) -> bool:
+        """
+        Etkileşimi uygular
+
+        Returns:
+            bool: Sayfada etkileşim yapılamadıysa (örn. veri yokken grafik
+                seçimleri görünmez) False; bu etkileşimler ölçüme katılmaz
+        """
+        if action == 'symbol':
+            self._run(self.app.sidebar.selectbox[0].select(value))
+        elif action == 'period':
+            self._run(self.app.sidebar.selectbox[1].select(value))
+        else:
+            try:
+                checkbox = self.app.checkbox(key=f"indicator_{value}")
+            except KeyError:
+                return False
+            self._run(checkbox.set_value(not checkbox.value))
+        self._check()
+        return True
+
+def _preload(target: str) -> None:
+    """Hedefin ağır modüllerini ölçümden önce yükler; import belleği oturumlara yazılmaz"""
+    from . import batch_analysis, data_fetcher, offline_source
+    import ta
+    if target == "app":
+        import plotly.graph_objects
+        import plotly.subplots
+        from streamlit.testing.v1 import AppTest
+
+def _rss() -> int:
+    """Sürecin güncel yerleşik bellek kullanımı (bayt)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS bayt, Linux KB döndürür
+        return usage if sys.platform == "darwin" else usage * 1024
+
+def _version() -> str:
+    """Ölçülen kodun sürümü (git commit'i, yoksa "unknown")"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return "unknown"
+
+def _latency_stats(latencies: List[float]) -> Dict[str, float]:
+    """Gecikme dağılımı (milisaniye)"""
+    if not latencies:
+        return {'count': 0, 'mean': float('nan'), 'p50': float('nan'), 'p95': float('nan'),
+                'p99': float('nan'), 'max': float('nan')}
+    values = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'count': len(values), 'mean': float(values.mean()), 'p50': float(p50), 'p95': float(p95),
+            'p99': float(p99), 'max': float(values.max())}
+
+def run_load_test(target: str = "service", sessions: int = 8, actions: int = 20,
+                  symbols: Optional[List[str]] = None, think_time: float = 0.0,
+                  latency: float = 0.0, seed: int = 0, app_path: Optional[str] = None) -> Dict:
+    """
+    Eşzamanlı oturumlarla yük testi yapar
+
+    Args:
+        target: "app" (Streamlit sayfası) veya "service" (arayüzsüz analiz)
+        sessions: Eşzamanlı oturum sayısı
+        actions: Oturum başına etkileşim sayısı (ilk açılış hariç)
+        symbols: Oturumların seçtiği hisseler (None ise popüler hisseler)
+        think_time: Etkileşimler arasında beklenen süre (saniye)
+        latency: Yerel veri kaynağının çağrı başına gecikmesi (saniye)
+        seed: Akışları ve fiyatları belirleyen tohum
+        app_path: Streamlit sayfası (None ise app.py)
+
+    Returns:
+        Dict: Parametreler, işlem hızı, gecikme dağılımı ve bellek kullanımı
+    """
+    from .data_fetcher import default_source, set_default_source
+    from .offline_source import OfflineSource
+
+    if target not in ("app", "service"):
+        raise ValueError(f"Desteklenmeyen hedef: {target} (app veya service olmalı)")
+    if sessions < 1 or actions < 0:
+        raise ValueError("Oturum sayısı en az 1, etkileşim sayısı negatif olmayan bir sayı olmalı")
+    symbols = symbols or list(BIST_SYMBOLS)
+
+    records = []
+    errors = []
+    lock = threading.Lock()
+    # Tüm oturumlar aynı anda başlar
+    barrier = threading.Barrier(sessions)
+
+    def timed(session_id: int, action: str, function) -> None:
+        started = time.perf_counter()
+        try:
+            ok = function() is not False
+            if not ok:
+                return
+        except Exception as e:
+            ok = False
+            with lock:
+                errors.append(f"oturum {session_id} {action}: {str(e)}")
+        with lock:
+            records.append((action, time.perf_counter() - started, ok))
+
+    def run_session(session_id: int) -> None:
+        rng = random.Random(seed * 100003 + session_id)
+        symbol, period = rng.choice(symbols), rng.choice(PERIODS)
+        workflow = make_workflow(rng, actions, symbols)
+        try:
+            session = (AppSession(symbol, period, app_path) if target == "app"
+                       else ServiceSession(symbol, period))
+        except Exception as e:
+            with lock:
+                errors.append(f"oturum {session_id} başlatılamadı: {str(e)}")
+            barrier.abort()
+            return
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        timed(session_id, 'open', session.open)
+        for action, value in workflow:
+            if think_time > 0:
+                time.sleep(rng.uniform(0.5, 1.5) * think_time)
+            timed(session_id, action, lambda: session.apply(action, value))
+
+    _preload(target)
+    previous_source = default_source()
+    set_default_source(OfflineSource(seed=seed, latency=latency))
+    rss_before = _rss()
+    started = time.perf_counter()
+    try:
+        threads = [threading.Thread(target=run_session, args=(i,), name=f"load-session-{i}", daemon=True)
+                   for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        set_default_source(previous_source)
+    duration = time.perf_counter() - started
+    rss_after = _rss()
+
+    latencies = [seconds for _, seconds, ok in records if ok]
+    by_action = {action: _latency_stats([seconds for name, seconds, ok in records if name == action and ok])
+                 for action in ['open'] + list(ACTION_WEIGHTS)}
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'version': _version(),
+        'python': sys.version.split()[0],
+        'target': target,
+        'sessions': sessions,
+        'actions': actions,
+        'think_time': think_time,
+        'latency': latency,
+        'symbols': len(symbols),
+        'seed': seed,
+        'requests': len(records),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'duration': duration,
+        'throughput': len(latencies) / duration if duration > 0 else 0.0,
+        'latency_ms': _latency_stats(latencies),
+        'by_action': by_action,
+        'memory': {
+            'rss_before': rss_before,
+            'rss_after': rss_after,
+            'per_session': max(0, rss_after - rss_before) / sessions,
+        },
+    }
+
+def save_result(result: Dict, path: Optional[str] = None) -> str:
+    """
+    Sonucu JSON-lines dosyasına ekler
+
+    Returns:
+        str: Dosya yolu
+    """
+    path = path or LOAD_TEST_CONFIG['results']
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return path
+
+def load_results(path: Optional[str] = None) -> List[Dict]:
+    """Kaydedilmiş sonuçlar (eskiden yeniye)"""
+    path = path or LOAD_TEST_CONFIG['results']
+    results = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        results.append(json.loads(line))
+                    except ValueError:
+                        continue
+    except FileNotFoundError:
+        pass
+    return results
+
+def compare(result: Dict, history: List[Dict], threshold: Optional[float] = None) -> Optional[Dict]:
+    """
+    Sonucu aynı parametrelerle yapılmış son koşuyla karşılaştırır
+
+    Args:
+        result: Yeni sonuç
+        history: Önceki sonuçlar (eskiden yeniye)
+        threshold: Gerileme sayılan oran (None ise konfigürasyondaki)
+
+    Returns:
+        Dict: Önceki koşu, oransal değişimler ve gerilemeler; karşılaştırılacak koşu yoksa None
+    """
+    threshold = LOAD_TEST_CONFIG['regression_threshold'] if threshold is None else threshold
+    matches = [run for run in history
+               if all(run.get(key) == result.get(key) for key in RUN_PARAMETERS) and run is not result]
+    if not matches:
+        return None
+    baseline = matches[-1]
+
+    def change(new: float, old: float) -> float:
+        return (new - old) / old if old else float('nan')
+
+    changes = {
+        'throughput': change(result['throughput'], baseline['throughput']),
+        'p50': change(result['latency_ms']['p50'], baseline['latency_ms']['p50']),
+        'p95': change(result['latency_ms']['p95'], baseline['latency_ms']['p95']),
+        'p99': change(result['latency_ms']['p99'], baseline['latency_ms']['p99']),
+        'memory_per_session': change(result['memory']['per_session'], baseline['memory']['per_session']),
+    }
+    regressions = []
+    if changes['throughput'] < -threshold:
+        regressions.append('throughput')
+    regressions.extend(key for key in ('p95', 'p99') if changes[key] > threshold)
+    return {'baseline': baseline, 'changes': changes, 'regressions': regressions}
+
+def format_report(result: Dict, comparison: Optional[Dict] = None) -> str:
+    """Sonucun okunabilir raporu"""
+    stats = result['latency_ms']
+    lines = [
+        f"🧪 Yük testi: {result['target']} · {result['sessions']} oturum × {result['actions']} etkileşim "
+        f"(sürüm {result['version']})",
+        "=" * 60,
+        f"İstek: {result['requests']} · Hata: {result['errors']} · Süre: {result['duration']:.1f} sn",
+        f"İşlem hızı: {result['throughput']:.1f} istek/sn",
+        f"Gecikme: p50 {stats['p50']:.0f} ms · p95 {stats['p95']:.0f} ms · p99 {stats['p99']:.0f} ms "
+        f"· en fazla {stats['max']:.0f} ms",
+    ]
+    for action, action_stats in result['by_action'].items():
+        if action_stats['count']:
+            lines.append(f"  {action:<10} {action_stats['count']:>5} istek · p50 {action_stats['p50']:.0f} ms "
+                         f"· p95 {action_stats['p95']:.0f} ms")
+    memory = result['memory']
+    lines.append(f"Bellek: {memory['rss_after'] / 2**20:.0f} MB "
+                 f"(oturum başına {memory['per_session'] / 2**20:.1f} MB)")
+    for error in result['error_samples']:
+        lines.append(f"❌ {error}")
+
+    if comparison is not None:
+        changes = comparison['changes']
+        lines.append("-" * 60)
+        lines.append(f"Önceki koşu ({comparison['baseline']['version']}, {comparison['baseline']['timestamp']}): "
+                     f"işlem hızı {changes['throughput']:+.0%} · p95 {changes['p95']:+.0%} "
+                     f"· p99 {changes['p99']:+.0%}")
+        if comparison['regressions']:
+            lines.append(f"⚠️  Kapasite gerilemesi: {', '.join(comparison['regressions'])}")
+    return "\n".join(lines)
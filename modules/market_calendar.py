@@ -0,0 +1,309 @@
+"""
+Borsa İstanbul işlem takvimi
+
+Seans saatleri `MARKET_CALENDAR_CONFIG`, tatil ve yarım günler (arifeler)
+`modules/data/bist_holidays.csv` dosyasındadır. Takvim şunlar için kullanılır:
+    - Piyasa kapalıyken fiyat sorgulamayı durdurmak (QuotePoller)
+    - Kapalı piyasada çekilen verilerin önbellekte bir sonraki seans
+      açılışına kadar geçerli kalması
+    - Beklenen seanslara göre eksik barları bulmak; hafta sonu ve tatiller
+      eksik sayılmaz, sadece gerçek boşluklar yeniden indirilir
+"""
+
+import csv
+import os
+import time
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from .config import MARKET_CALENDAR_CONFIG
+
+DEFAULT_HOLIDAYS_PATH = os.path.join(os.path.dirname(__file__), "data", "bist_holidays.csv")
+
+# Gün içi veri aralıkları (yfinance kodu -> pandas frekansı); "1d" günlük seanstır
+INTRADAY_FREQUENCIES = {
+    '1m': '1min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min',
+    '60m': '60min', '1h': '60min', '90m': '90min',
+}
+
+# Bir sonraki seansı ararken bakılan en fazla gün (en uzun bayram tatili + hafta sonu)
+MAX_CLOSED_DAYS = 15
+
+def load_holidays(path: str = DEFAULT_HOLIDAYS_PATH) -> Dict[date, bool]:
+    """
+    Tatil dosyasını okur
+
+    Args:
+        path: `date;name;half_day` sütunlu CSV dosyası
+
+    Returns:
+        Dict: Tarih -> yarım gün ise True, tam gün tatilse False
+    """
+    holidays = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f, delimiter=";"):
+                holidays[date.fromisoformat(row['date'])] = row.get('half_day', '0').strip() == '1'
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Tatil takvimi okunamadı ({path}): {str(e)}")
+    return holidays
+
+class MarketCalendar:
+    """Seans günleri, açılış/kapanış saatleri ve eksik bar tespiti"""
+
+    def __init__(self, holidays: Optional[Dict[date, bool]] = None,
+                 timezone: str = MARKET_CALENDAR_CONFIG['timezone'],
+                 open_time: str = MARKET_CALENDAR_CONFIG['open'],
+                 close_time: str = MARKET_CALENDAR_CONFIG['close'],
+                 half_day_close: str = MARKET_CALENDAR_CONFIG['half_day_close']):
+        """
+        Args:
+            holidays: Tarih -> yarım gün mü (None ise varsayılan tatil dosyası)
+            timezone: Piyasa saat dilimi
+            open_time: Açılış saati (SS:DD)
+            close_time: Kapanış saati
+            half_day_close: Yarım günlerde kapanış saati
+        """
+        self.holidays = load_holidays() if holidays is None else dict(holidays)
+        self.timezone = timezone
+        self.open_time = pd.Timedelta(f"{open_time}:00")
+        self.close_time = pd.Timedelta(f"{close_time}:00")
+        self.half_day_close = pd.Timedelta(f"{half_day_close}:00")
+        self._closed = np.array(sorted(day for day, half in self.holidays.items() if not half),
+                                dtype='datetime64[D]')
+
+    @property
+    def last_holiday(self) -> Optional[date]:
+        """Takvimdeki son tatil; bu tarihten sonrası için tatil dosyası güncellenmelidir"""
+        return max(self.holidays) if self.holidays else None
+
+    @property
+    def coverage(self) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Tatil dosyasının kapsadığı aralık (ilk ve son tatilin yılları)
+
+        Bu aralığın dışındaki tatiller bilinmez; o günler seans sanılır.
+
+        Returns:
+            Tuple: (ilk gün, son günün sonu) yerel saatle; tatil yoksa None
+        """
+        if not self.holidays:
+            return None
+        first = pd.Timestamp(min(self.holidays).year, 1, 1).tz_localize(self.timezone)
+        last = pd.Timestamp(max(self.holidays).year + 1, 1, 1).tz_localize(self.timezone) - pd.Timedelta(1, 'ns')
+        return first, last
+
+    def _local(self, timestamp=None) -> pd.Timestamp:
+        """Zamanı piyasa saat dilimine çevirir (sayılar Unix zamanı, saat dilimsizler yerel saat)"""
+        if timestamp is None:
+            timestamp = time.time()
+        if isinstance(timestamp, (int, float)):
+            return pd.Timestamp(timestamp, unit='s', tz='UTC').tz_convert(self.timezone)
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tzinfo is None:
+            return timestamp.tz_localize(self.timezone)
+        return timestamp.tz_convert(self.timezone)
+
+    def is_session_day(self, day) -> bool:
+        """Günün işlem günü olup olmadığını kontrol eder (hafta içi ve tam gün tatil değil)"""
+        day = pd.Timestamp(day).date()
+        # Yarım günler (arifeler) işlem günüdür
+        return day.weekday() < 5 and self.holidays.get(day, True)
+
+    def session(self, day) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Günün seansı
+
+        Returns:
+            Tuple: (açılış, kapanış) zamanları; işlem günü değilse None
+        """
+        day = pd.Timestamp(pd.Timestamp(day).date())
+        if not self.is_session_day(day):
+            return None
+        midnight = day.tz_localize(self.timezone)
+        close = self.half_day_close if self.holidays.get(day.date()) else self.close_time
+        return midnight + self.open_time, midnight + close
+
+    def is_open(self, timestamp=None) -> bool:
+        """Piyasanın verilen anda (None ise şu an) açık olup olmadığı"""
+        now = self._local(timestamp)
+        session = self.session(now)
+        return session is not None and session[0] <= now < session[1]
+
+    def next_open(self, timestamp=None) -> pd.Timestamp:
+        """Verilen andan sonraki ilk seans açılışı"""
+        now = self._local(timestamp)
+        day = now.normalize().tz_localize(None)
+        for offset in range(MAX_CLOSED_DAYS + 1):
+            session = self.session(day + pd.Timedelta(days=offset))
+            if session is not None and session[0] > now:
+                return session[0]
+        raise ValueError(f"{MAX_CLOSED_DAYS} gün içinde seans bulunamadı: {now}")
+
+    def previous_close(self, timestamp=None) -> pd.Timestamp:
+        """Verilen andan önceki (veya o andaki) son seans kapanışı"""
+        now = self._local(timestamp)
+        day = now.normalize().tz_localize(None)
+        for offset in range(MAX_CLOSED_DAYS + 1):
+            session = self.session(day - pd.Timedelta(days=offset))
+            if session is not None and session[1] <= now:
+                return session[1]
+        raise ValueError(f"{MAX_CLOSED_DAYS} gün içinde seans bulunamadı: {now}")
+
+    def seconds_until_open(self, timestamp=None) -> float:
+        """Bir sonraki açılışa kalan süre (saniye); piyasa açıksa 0"""
+        now = self._local(timestamp)
+        if self.is_open(now):
+            return 0.0
+        return (self.next_open(now) - now).total_seconds()
+
+    def expires_at(self, written, ttl: Optional[float] = None) -> float:
+        """
+        Verilen anda çekilen verinin geçerliliğinin bittiği an
+
+        Seans içinde çekilen veri `ttl` saniye (None ise seans kapanışına
+        kadar), piyasa kapalıyken çekilen veri bir sonraki açılışa kadar
+        geçerlidir.
+
+        Returns:
+            float: Unix zamanı
+        """
+        written = self._local(written)
+        session = self.session(written)
+        if session is not None and session[0] <= written < session[1]:
+            if ttl is not None:
+                return written.timestamp() + ttl
+            return session[1].timestamp()
+        return self.next_open(written).timestamp()
+
+    def cache_ttl(self, ttl: Optional[float] = None, timestamp=None) -> float:
+        """Şu an çekilen veri için önbellek süresi (saniye), bkz. `expires_at`"""
+        now = self._local(timestamp)
+        return max(0.0, self.expires_at(now, ttl) - now.timestamp())
+
+    def sessions(self, start, end) -> pd.DataFrame:
+        """
+        Tarih aralığındaki seanslar
+
+        Returns:
+            DataFrame: Seans günü indeksli open ve close sütunları
+        """
+        start = self._local(start).normalize().tz_localize(None)
+        end = self._local(end).normalize().tz_localize(None)
+        days = pd.bdate_range(start, end, freq='C', holidays=self._closed)
+        half = np.array([self.holidays.get(day.date(), False) for day in days], dtype=bool)
+        midnight = days.tz_localize(self.timezone)
+        return pd.DataFrame({
+            'open': midnight + self.open_time,
+            'close': midnight + np.where(half, self.half_day_close.to_timedelta64(), self.close_time.to_timedelta64()),
+        }, index=days)
+
+    def expected_bars(self, start, end, interval: str = "1d") -> pd.DatetimeIndex:
+        """
+        Aralıkta başlaması beklenen barlar
+
+        Günlük barlar seans gününün yerel gece yarısıyla (Yahoo'daki gibi),
+        gün içi barlar seans içindeki başlangıç zamanlarıyla gösterilir.
+
+        Args:
+            start: Başlangıç zamanı (dahil)
+            end: Bitiş zamanı (dahil; bu andan sonra başlayan barlar beklenmez,
+                saatsiz tarih tüm günü kapsar)
+            interval: Veri aralığı ("1d" veya gün içi aralık)
+
+        Returns:
+            DatetimeIndex: Piyasa saat diliminde bar başlangıçları
+        """
+        start, end = self._local(start), self._local(end)
+        if end == end.normalize():
+            end = end + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+        sessions = self.sessions(start, end)
+        if interval == "1d":
+            bars = pd.DatetimeIndex(sessions.index.tz_localize(self.timezone))
+            return bars[(bars >= start.normalize()) & (sessions['open'].to_numpy() <= end)]
+
+        if interval not in INTRADAY_FREQUENCIES:
+            raise ValueError(f"Desteklenmeyen aralık: {interval}")
+        step = pd.Timedelta(INTRADAY_FREQUENCIES[interval]).value
+        opens = pd.DatetimeIndex(sessions['open']).as_unit('ns').asi8
+        closes = pd.DatetimeIndex(sessions['close']).as_unit('ns').asi8
+        if not len(opens):
+            return pd.DatetimeIndex([], tz=self.timezone)
+        # (seans, bar) ızgarası; kapanıştan sonra başlayanlar atılır
+        steps = np.arange(int((closes - opens).max() // step) + 1, dtype=np.int64) * step
+        grid = opens[:, None] + steps
+        starts = grid[grid < closes[:, None]]
+        starts = starts[(starts >= start.value) & (starts <= end.value)]
+        return pd.DatetimeIndex(starts.view('M8[ns]')).tz_localize('UTC').tz_convert(self.timezone)
+
+    def _normalize_index(self, index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+        """Bar indeksini `expected_bars` gösterimine çevirir"""
+        index = pd.DatetimeIndex(index)
+        index = index.tz_localize(self.timezone) if index.tz is None else index.tz_convert(self.timezone)
+        index = index.as_unit('ns')
+        return index.normalize() if interval == "1d" else index
+
+    def _compare(self, index: pd.DatetimeIndex, interval: str, start, end) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Beklenen barlar ve veride olmayanların maskesi"""
+        present = self._normalize_index(index, interval)
+        if start is None and not len(present):
+            return pd.DatetimeIndex([], tz=self.timezone), np.zeros(0, dtype=bool)
+        start = present[0] if start is None else start
+        end = present[-1] if end is None else end
+        expected = self.expected_bars(start, end, interval).as_unit('ns')
+        return expected, ~expected.isin(present)
+
+    def missing_bars(self, index: pd.DatetimeIndex, interval: str = "1d", start=None, end=None) -> pd.DatetimeIndex:
+        """
+        Beklenen ama veride olmayan barlar
+
+        Args:
+            index: Verinin bar zamanları
+            interval: Veri aralığı
+            start: Kontrol başlangıcı (None ise ilk bar)
+            end: Kontrol bitişi (None ise son bar; güncelliği kontrol için şu an)
+
+        Returns:
+            DatetimeIndex: Eksik bar başlangıçları
+        """
+        expected, missing = self._compare(index, interval, start, end)
+        return expected[missing]
+
+    def gaps(self, index: pd.DatetimeIndex, interval: str = "1d", start=None,
+             end=None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Eksik barları ardışık aralıklar halinde gruplar
+
+        Hafta sonu veya tatille ayrılan eksik seanslar tek aralık sayılır;
+        her aralık tek bir indirme isteğiyle doldurulabilir. Tatil dosyasının
+        kapsamadığı yıllara bakılmaz (`coverage`); oradaki tatiller boşluk
+        sanılıp her seferinde yeniden indirilirdi.
+
+        Returns:
+            List: (ilk eksik bar, son eksik bar) çiftleri
+        """
+        expected, missing = self._compare(index, interval, start, end)
+        if self.coverage is not None:
+            first, last = self.coverage
+            missing &= (expected >= first) & (expected <= last)
+        positions = np.flatnonzero(missing)
+        if not len(positions):
+            return []
+        breaks = np.flatnonzero(np.diff(positions) != 1)
+        firsts = np.concatenate([[positions[0]], positions[breaks + 1]])
+        lasts = np.concatenate([positions[breaks], [positions[-1]]])
+        return [(expected[first], expected[last]) for first, last in zip(firsts, lasts)]
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+def get_calendar() -> MarketCalendar:
+    """Süreç genelinde paylaşılan BIST takvimi"""
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = MarketCalendar()
+        return _calendar
@@ -0,0 +1,491 @@
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import MEMORY_CACHE_CONFIG
+from .singleflight import SingleFlight
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """
+    Nesnenin bellekte kapladığı yaklaşık bayt sayısı
+
+    DataFrame, Series ve NumPy dizileri veri tamponlarıyla; sözlük, liste ve
+    sıradan nesneler içerikleriyle birlikte sayılır. Aynı nesne bir kez
+    sayılır.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, seen) + estimate_size(v, seen)
+                                          for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, seen) for item in value)
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return sys.getsizeof(value) + estimate_size(vars(value), seen)
+    return sys.getsizeof(value)
+
+class LRUCache:
+    """
+    Bayt bütçeli, süreç genelinde paylaşılan LRU önbellek
+
+    Toplam boyut `max_bytes`'ı aşınca en uzun süredir kullanılmayan kayıtlar
+    atılır. Bütçeden büyük tek bir kayıt hiç saklanmaz. Kayıtların isteğe
+    bağlı bir geçerlilik süresi (TTL) vardır.
+
+    Streamlit'te tüm tarayıcı oturumları aynı süreçte çalıştığı için aynı
+    hissenin verisi ve indikatörleri tek kopya olarak tutulur.
+
+    Paylaşılan depo varsa bu sürecin oluşturduğu bloklar, kayıt atıldığında
+    veya süresi dolduğunda silinir; bloklar da bütçeye dahil olur.
+    """
+
+    def __init__(self, max_bytes: int = MEMORY_CACHE_CONFIG['max_bytes'],
+                 ttl: Optional[float] = MEMORY_CACHE_CONFIG['ttl'],
+                 shared: Optional['SharedFrameStore'] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_bytes: Bellek bütçesi (bayt)
+            ttl: Varsayılan kayıt geçerlilik süresi (saniye, None ise süresiz)
+            shared: Süreçler arası paylaşılan DataFrame deposu (isteğe bağlı)
+            clock: Zaman kaynağı
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.shared = shared
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key, count=False) is not None
+
+    def _lookup(self, key: Hashable, count: bool = True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and self.clock() >= entry[2]:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Kaydı döndürür ve en son kullanılan olarak işaretler
+
+        Args:
+            key: Kayıt anahtarı
+            default: Kayıt yoksa dönecek değer
+
+        Returns:
+            Any: Kayıtlı değer veya default
+        """
+        entry = self._lookup(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = -1,
+            size: Optional[int] = None) -> bool:
+        """
+        Kaydı ekler; gerekirse eski kayıtları atar
+
+        Args:
+            key: Kayıt anahtarı
+            value: Değer
+            ttl: Geçerlilik süresi (saniye). -1 ise varsayılan, None ise süresiz
+            size: Bayt cinsinden boyut (None ise tahmin edilir)
+
+        Returns:
+            bool: Kayıt saklandıysa True (bütçeden büyükse False)
+        """
+        size = estimate_size(value) if size is None else size
+        ttl = self.ttl if ttl == -1 else ttl
+        expires = self.clock() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                # Aynı anahtarın yeni değeri yazılıyor; paylaşılan blok korunur
+                self._remove(key, release=False)
+            if size > self.max_bytes:
+                return False
+
+            self._entries[key] = (value, size, expires)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: Hashable, release: bool = True) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+        if release and self.shared is not None:
+            self.shared.release(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Kaydı siler"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Tüm kayıtları siler"""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self.current_bytes = 0
+        if self.shared is not None:
+            for key in keys:
+                self.shared.release(key)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       ttl: Optional[float] = -1) -> Any:
+        """
+        Kayıt varsa döndürür, yoksa hesaplayıp saklar
+
+        Aynı anahtar için eşzamanlı kayıp (miss) olan çağrılar hesaplamayı
+        tekrarlamaz. None sonuçlar saklanmaz. Paylaşılan depo varsa
+        DataFrame sonuçları diğer süreçlerle de paylaşılır; blok kaydın
+        geçerlilik süresini taşır, süresi dolan blok okunmaz ve yenisiyle
+        değiştirilir.
+
+        Args:
+            key: Kayıt anahtarı
+            compute: Değeri üreten argümansız fonksiyon
+            ttl: Geçerlilik süresi (put ile aynı)
+
+        Returns:
+            Any: Değer
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[0]
+
+        def load():
+            value = self.shared.get(key) if self.shared is not None else None
+            if value is not None:
+                self.shared_hits += 1
+            else:
+                value = compute()
+                if value is not None and self.shared is not None:
+                    seconds = self.ttl if ttl == -1 else ttl
+                    expires = time.time() + seconds if seconds is not None else None
+                    if self.shared.put(key, value, expires=expires):
+                        # Süreç verinin tek kopyasını (paylaşılan bloğu) tutar
+                        value = self.shared.get(key)
+            if value is not None:
+                self.put(key, value, ttl=ttl)
+            return value
+
+        return self._flight.do(key, load)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Önbellek istatistikleri
+
+        Returns:
+            Dict: entries, bytes, max_bytes, usage, hits, misses, hit_rate, evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'usage': self.current_bytes / self.max_bytes if self.max_bytes else 0.0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'shared_hits': self.shared_hits,
+            }
+
+# Bağlanılan bloklar süreç boyunca açık tutulur: DataFrame görünümleri depo
+# nesnesinden uzun yaşayabilir ve eşleme kapanırsa geçersiz belleğe bakar
+_mapped_blocks = {}
+# Bu sürecin oluşturduğu blok adları
+_owned_blocks = set()
+# Silinmiş ama eşlemesi hâlâ kullanılıyor olabilecek bloklar
+_retired_blocks = []
+_blocks_lock = threading.Lock()
+
+class SharedFrameStore:
+    """
+    Sayısal DataFrame'leri süreçler arası paylaşılan bellekte saklar
+
+    Her kayıt anahtarın özetinden türetilen isimli bir paylaşılan bellek
+    bloğudur: başlık (JSON) + zaman damgaları + sütun verileri. Aynı
+    makinedeki diğer süreçler (örn. birden fazla Streamlit worker'ı) bloğa
+    isimle bağlanır ve sütunları kopyalamadan kullanır.
+
+    Başlıkta bloğun geçerlilik zamanı (duvar saati) saklanır; süresi
+    dolmuş blok okunmaz, `put` onu silip yenisini oluşturur.
+
+    Bloklar oluşturan süreç kapanınca silinir; `unlink`, `release` veya
+    `close` ile erken silinebilir.
+    Sadece datetime indeksli, tüm sütunları sayısal DataFrame'ler saklanır.
+    """
+
+    HEADER_SIZE = 8  # Başlık uzunluğu (uint64)
+
+    def __init__(self, prefix: str = "bist"):
+        """
+        Args:
+            prefix: Blok adı öneki (farklı uygulamalar çakışmasın diye)
+        """
+        self.prefix = prefix
+
+    def _name(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:20]
+        return f"{self.prefix}_{digest}"
+
+    @staticmethod
+    def supports(value: Any) -> bool:
+        """DataFrame'in paylaşılan bellekte saklanıp saklanamayacağı"""
+        return (isinstance(value, pd.DataFrame) and isinstance(value.index, pd.DatetimeIndex)
+                and all(np.issubdtype(dtype, np.number) for dtype in value.dtypes))
+
+    def put(self, key: Hashable, df: Any, expires: Optional[float] = None) -> bool:
+        """
+        DataFrame'i paylaşılan belleğe yazar
+
+        Args:
+            key: Kayıt anahtarı
+            df: DataFrame
+            expires: Geçerlilik bitişi (`time.time()` cinsinden, None ise süresiz)
+
+        Returns:
+            bool: Yazıldıysa True (desteklenmeyen tür veya geçerli blok zaten varsa False)
+        """
+        if not self.supports(df):
+            return False
+        from multiprocessing import shared_memory
+
+        self._drain()
+
+        index = df.index.as_unit('ns')
+        timestamps = (index.tz_convert('UTC') if index.tz is not None else index).asi8
+        header = json.dumps({
+            'rows': len(df),
+            'columns': [str(column) for column in df.columns],
+            'tz': str(index.tz) if index.tz is not None else None,
+            'index_name': df.index.name,
+            'expires': expires,
+        }).encode("utf-8")
+        offset = self.HEADER_SIZE + len(header)
+        offset += -offset % 8  # Veriler 8 bayta hizalanır
+        size = offset + 8 * len(df) * (len(df.columns) + 1)
+
+        name = self._name(key)
+        try:
+            block = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        except FileExistsError:
+            # Süresi dolmuş blok yenisiyle değiştirilir
+            if not self._replaceable(name):
+                return False
+            self.unlink(key)
+            try:
+                block = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+            except FileExistsError:
+                return False
+
+        block.buf[:self.HEADER_SIZE] = len(header).to_bytes(self.HEADER_SIZE, "little")
+        block.buf[self.HEADER_SIZE:self.HEADER_SIZE + len(header)] = header
+        data = np.ndarray((len(df.columns) + 1, len(df)), dtype=np.float64, buffer=block.buf, offset=offset)
+        data[0] = timestamps.view(np.float64)
+        data[1:] = df.to_numpy(dtype=np.float64).T
+
+        with _blocks_lock:
+            _mapped_blocks[block.name] = block
+            _owned_blocks.add(block.name)
+        return True
+
+    @classmethod
+    def _header(cls, block) -> Tuple[Dict, int]:
+        """Bloğun başlığı ve verilerin başladığı konum"""
+        length = int.from_bytes(bytes(block.buf[:cls.HEADER_SIZE]), "little")
+        meta = json.loads(bytes(block.buf[cls.HEADER_SIZE:cls.HEADER_SIZE + length]).decode("utf-8"))
+        offset = cls.HEADER_SIZE + length
+        return meta, offset + -offset % 8
+
+    @staticmethod
+    def _expired(meta: Dict) -> bool:
+        return meta.get('expires') is not None and time.time() >= meta['expires']
+
+    def _replaceable(self, name: str) -> bool:
+        """İsimdeki blok süresi dolduysa (veya okunamıyorsa) True"""
+        from multiprocessing import shared_memory
+
+        try:
+            block = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return True
+        try:
+            return self._expired(self._header(block)[0])
+        except ValueError:
+            return True
+        finally:
+            block.close()
+
+    @staticmethod
+    def _retire(name: str) -> None:
+        """Süreçteki eşlemeyi bırakır; blok sonraki okumada isimle yeniden bulunur"""
+        with _blocks_lock:
+            block = _mapped_blocks.pop(name, None)
+        if block is not None:
+            SharedFrameStore._close(block)
+
+    @staticmethod
+    def _close(block) -> None:
+        """Eşlemeyi kapatır; hâlâ kullanılıyorsa sonra yeniden denemek üzere saklar"""
+        try:
+            block.close()
+        except BufferError:
+            # Daha önce dönen DataFrame'ler eşlemeyi kullanıyor
+            with _blocks_lock:
+                _retired_blocks.append(block)
+
+    @staticmethod
+    def _drain() -> None:
+        """Artık kullanılmayan eski eşlemeleri kapatır"""
+        with _blocks_lock:
+            blocks = _retired_blocks[:]
+            _retired_blocks.clear()
+        for block in blocks:
+            SharedFrameStore._close(block)
+
+    def _attach(self, key: Hashable):
+        """Bloğa bağlanır; blok yoksa None döndürür"""
+        from multiprocessing import shared_memory
+
+        name = self._name(key)
+        with _blocks_lock:
+            block = _mapped_blocks.get(name)
+            if block is not None:
+                return block
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            except FileNotFoundError:
+                return None
+            # Bağlanan süreç kapanırken bloğu silmesin (sahibi oluşturan süreçtir)
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(block._name, "shared_memory")
+            except Exception:
+                pass
+            _mapped_blocks[name] = block
+            return block
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """
+        DataFrame'i paylaşılan bellekten kopyalamadan okur
+
+        Returns:
+            DataFrame: Kayıt yoksa None (sütunlar salt okunur görünümlerdir)
+        """
+        block = self._attach(key)
+        if block is None:
+            return None
+
+        meta, offset = self._header(block)
+        if self._expired(meta):
+            self._retire(block.name)
+            return None
+        data = np.ndarray((len(meta['columns']) + 1, meta['rows']), dtype=np.float64,
+                          buffer=block.buf, offset=offset)
+        data.flags.writeable = False
+
+        index = pd.DatetimeIndex(data[0].view(np.int64).view('M8[ns]'))
+        index = index.tz_localize('UTC').tz_convert(meta['tz']) if meta['tz'] else index
+        index.name = meta['index_name']
+        columns = {column: data[i + 1] for i, column in enumerate(meta['columns'])}
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def unlink(self, key: Hashable) -> None:
+        """
+        Bloğu tüm süreçler için siler
+
+        Eşleme bu süreçte açık kalır; daha önce dönen DataFrame'ler geçerliliğini
+        korur, yeni bağlanmalar bloğu bulamaz.
+        """
+        self._unlink_name(self._name(key))
+
+    @staticmethod
+    def _unlink_name(name: str) -> None:
+        with _blocks_lock:
+            block = _mapped_blocks.pop(name, None)
+            _owned_blocks.discard(name)
+        try:
+            if block is None:
+                from multiprocessing import shared_memory
+                block = shared_memory.SharedMemory(name=name)
+            block.unlink()
+        except FileNotFoundError:
+            pass
+        if block is not None:
+            SharedFrameStore._close(block)
+        SharedFrameStore._drain()
+
+    def release(self, key: Hashable) -> None:
+        """Blok bu süreçte oluşturulduysa siler (önbellekten atılan kayıtlar için)"""
+        name = self._name(key)
+        with _blocks_lock:
+            owned = name in _owned_blocks
+        if owned:
+            self._unlink_name(name)
+
+    def close(self) -> None:
+        """Bu deponun önekiyle bu süreçte oluşturulan blokları siler"""
+        with _blocks_lock:
+            names = [name for name in _owned_blocks if name.startswith(f"{self.prefix}_")]
+        for name in names:
+            self._unlink_name(name)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> LRUCache:
+    """
+    Süreç genelinde paylaşılan önbelleği döndürür
+
+    MEMORY_CACHE_CONFIG['shared'] True ise DataFrame'ler ayrıca paylaşılan
+    bellekte diğer süreçlerle paylaşılır.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                shared = SharedFrameStore() if MEMORY_CACHE_CONFIG['shared'] else None
+                _cache = LRUCache(shared=shared)
+    return _cache
@@ -0,0 +1,249 @@
+"""
+Ağ gerektirmeyen yerel veri kaynağı
+
+yfinance `Ticker` arayüzünün kullanılan kısmını (history, info,
+fast_info, actions) taklit eder; `BISTDataFetcher(source=OfflineSource())`
+ile önbellek, şirket işlemleri ve analiz katmanları gerçek akıştaki gibi
+çalışır. Yük testleri, API testleri ve geliştirme için kullanılır.
+
+Fiyatlar hisse kodu ve bar zamanından türetilen deterministik gürültüyle
+üretilir: aynı hisse ve bar her istekte, her süreçte aynı değeri alır;
+farklı periyotlarla yapılan istekler örtüşen barlarda aynı veriyi döndürür.
+Barlar BIST işlem takvimindeki seanslara göre oluşturulur.
+"""
+
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .history_store import period_start
+from .market_calendar import INTRADAY_FREQUENCIES, MarketCalendar, get_calendar
+
+# Günlük serilerin başlangıcı; daha eski barlar üretilmez ("max" periyodu)
+EPOCH = pd.Timestamp("2015-01-01")
+# Günlük getiri ve gün içi bar oynaklıkları
+DAILY_DRIFT = 0.0003
+DAILY_VOLATILITY = 0.02
+INTRADAY_VOLATILITY = 0.002
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+def _uniform(keys: np.ndarray) -> np.ndarray:
+    """64 bit anahtarları splitmix64 ile (0, 1) aralığına dağıtır"""
+    with np.errstate(over='ignore'):
+        z = keys + _GOLDEN
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return ((z >> np.uint64(11)).astype(np.float64) + 0.5) / float(1 << 53)
+
+def _normal(keys: np.ndarray, stream: int) -> np.ndarray:
+    """Anahtar başına standart normal değer (Box-Muller); `stream` bağımsız seriler üretir"""
+    with np.errstate(over='ignore'):
+        base = keys * np.uint64(2 * stream + 1)
+        u1 = _uniform(base)
+        u2 = _uniform(base ^ _GOLDEN)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+class OfflineTicker:
+    """Tek hisse için yfinance Ticker benzeri nesne"""
+
+    def __init__(self, source: 'OfflineSource', symbol: str):
+        self.source = source
+        self.symbol = symbol
+
+    def history(self, period: str = "1mo", interval: str = "1d", start=None, end=None,
+                auto_adjust: bool = True, actions: bool = True, **kwargs) -> pd.DataFrame:
+        """
+        OHLCV barları (yfinance `history` ile aynı sütunlar)
+
+        Args:
+            period: Zaman aralığı (start verilmezse)
+            interval: Veri aralığı ("1d" veya gün içi aralık)
+            start: Başlangıç zamanı
+            end: Bitiş zamanı (None ise şu an)
+            auto_adjust: False ise "Adj Close" sütunu eklenir
+            actions: True ise "Dividends" ve "Stock Splits" sütunları eklenir
+        """
+        self.source.wait()
+        bars = self.source.bars(self.symbol, period=period, interval=interval, start=start, end=end)
+        if not auto_adjust:
+            bars.insert(4, 'Adj Close', bars['Close'])
+        if actions:
+            bars['Dividends'] = 0.0
+            bars['Stock Splits'] = 0.0
+        return bars
+
+    @property
+    def actions(self) -> pd.DataFrame:
+        """Şirket işlemleri (yerel kaynakta bölünme ve temettü yoktur)"""
+        self.source.wait()
+        return pd.DataFrame({'Dividends': pd.Series(dtype=np.float64),
+                             'Stock Splits': pd.Series(dtype=np.float64)})
+
+    def _quote(self) -> Dict:
+        self.source.wait()
+        return self.source.quote(self.symbol)
+
+    @property
+    def info(self) -> Dict:
+        """`Ticker.info` alanları"""
+        quote = self._quote()
+        return {
+            'currentPrice': quote['last_price'],
+            'previousClose': quote['previous_close'],
+            'open': quote['open'],
+            'dayHigh': quote['day_high'],
+            'dayLow': quote['day_low'],
+            'volume': quote['last_volume'],
+            'marketCap': quote['last_price'] * 1e9,
+            'forwardPE': 10.0,
+        }
+
+    @property
+    def fast_info(self) -> SimpleNamespace:
+        """`Ticker.fast_info` alanları"""
+        return SimpleNamespace(**self._quote())
+
+class OfflineSource:
+    """
+    Deterministik sentetik fiyat kaynağı
+
+    `BISTDataFetcher(source=...)` Ticker fabrikası olarak kullanılır.
+    """
+
+    def __init__(self, seed: int = 0, latency: float = 0.0, symbols: Optional[Iterable[str]] = None,
+                 end=None, calendar: Optional[MarketCalendar] = None):
+        """
+        Args:
+            seed: Fiyat serilerini değiştiren tohum
+            latency: Her çağrıda beklenen süre (saniye), ağ gecikmesini taklit eder
+            symbols: Verilirse sadece bu hisseler için veri döner, diğerleri boştur
+            end: Sabit bitiş zamanı (None ise şu an; testlerde sabitlenir)
+            calendar: İşlem takvimi (None ise BIST takvimi)
+        """
+        self.seed = seed
+        self.latency = latency
+        self.symbols = set(symbols) if symbols is not None else None
+        self.end = end
+        self.calendar = calendar or get_calendar()
+
+    def __call__(self, symbol: str, session=None) -> OfflineTicker:
+        return OfflineTicker(self, symbol)
+
+    def wait(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _localize(self, ts) -> pd.Timestamp:
+        """Zamanı piyasa saat dilimine çevirir (saat dilimsiz zamanlar yerel kabul edilir)"""
+        ts = pd.Timestamp(ts)
+        if ts.tz is None:
+            return ts.tz_localize(self.calendar.timezone)
+        return ts.tz_convert(self.calendar.timezone)
+
+    def _now(self) -> pd.Timestamp:
+        return self._localize(self.end if self.end is not None else pd.Timestamp.now(tz='UTC'))
+
+    def _key(self, symbol: str) -> np.uint64:
+        return np.uint64(zlib.crc32(f"{self.seed}:{symbol}".encode()) << 32 | zlib.crc32(symbol.encode()))
+
+    def _keys(self, symbol: str, index: pd.DatetimeIndex) -> np.ndarray:
+        return index.as_unit('ns').asi8.view(np.uint64) ^ self._key(symbol)
+
+    def _daily(self, symbol: str, end: pd.Timestamp) -> pd.DataFrame:
+        """EPOCH'tan `end`'e kadar günlük barlar"""
+        index = self.calendar.expected_bars(EPOCH, end, "1d")
+        keys = self._keys(symbol, index)
+        profile = _uniform(np.array([self._key(symbol)]))[0]
+        base_price = 5.0 + 295.0 * profile
+        base_volume = 1e6 * (1.0 + 20.0 * _uniform(np.array([self._key(symbol) ^ _GOLDEN]))[0])
+
+        close = base_price * np.exp(np.cumsum(DAILY_DRIFT + DAILY_VOLATILITY * _normal(keys, 0)))
+        previous = np.concatenate([[base_price], close[:-1]])
+        open_ = previous * np.exp(0.005 * _normal(keys, 1))
+        high = np.maximum(open_, close) * np.exp(np.abs(0.01 * _normal(keys, 2)))
+        low = np.minimum(open_, close) * np.exp(-np.abs(0.01 * _normal(keys, 3)))
+        volume = np.round(base_volume * np.exp(0.5 * _normal(keys, 4)))
+        return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                            index=index.rename('Date'))
+
+    def _intraday(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        """Gün içi barlar; her seans günlük açılış fiyatından başlar"""
+        index = self.calendar.expected_bars(start, end, interval)
+        daily = self._daily(symbol, end)
+        if len(index) == 0 or daily.empty:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'],
+                                index=index.rename('Datetime'), dtype=np.float64)
+
+        days = index.normalize()
+        anchor = daily['Open'].reindex(days).to_numpy()
+        keys = self._keys(symbol, index)
+        steps = INTRADAY_VOLATILITY * _normal(keys, 0)
+        # Seans içi kümülatif toplam: her günün başında sıfırlanır
+        total = np.cumsum(steps)
+        first = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        offsets = np.repeat(total[first] - steps[first], np.diff(np.r_[first, len(index)]))
+        close = anchor * np.exp(total - offsets)
+        open_ = anchor * np.exp(total - offsets - steps)
+        high = np.maximum(open_, close) * np.exp(np.abs(0.001 * _normal(keys, 2)))
+        low = np.minimum(open_, close) * np.exp(-np.abs(0.001 * _normal(keys, 3)))
+        volume = np.round(1e4 * np.exp(0.5 * _normal(keys, 4)))
+        return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                            index=index.rename('Datetime'))
+
+    def bars(self, symbol: str, period: str = "1y", interval: str = "1d", start=None, end=None) -> pd.DataFrame:
+        """
+        Hissenin sentetik OHLCV barları
+
+        Args:
+            symbol: Hisse kodu
+            period: Zaman aralığı (start verilmezse)
+            interval: Veri aralığı
+            start: Başlangıç zamanı (dahil)
+            end: Bitiş zamanı (None ise kaynağın bitişi)
+
+        Returns:
+            DataFrame: Piyasa saat diliminde indeksli OHLCV verileri
+        """
+        if interval != "1d" and interval not in INTRADAY_FREQUENCIES:
+            raise ValueError(f"Desteklenmeyen aralık: {interval}")
+        end = self._localize(end) if end is not None else self._now()
+        start = self._localize(start) if start is not None else period_start(end, period)
+        start = max(start, EPOCH.tz_localize(end.tz)) if start is not None else EPOCH.tz_localize(end.tz)
+
+        if self.symbols is not None and symbol not in self.symbols:
+            return self._daily(symbol, end).iloc[:0]
+        if interval == "1d":
+            daily = self._daily(symbol, end)
+            return daily[daily.index >= start.normalize()].copy()
+        return self._intraday(symbol, start, end, interval)
+
+    def quote(self, symbol: str) -> Dict:
+        """
+        Anlık fiyat (fast_info alanları)
+
+        Fiyat son günlük kapanış etrafında zamanla değişir; aynı saniye
+        içindeki sorgular aynı değeri alır.
+        """
+        now = self._now()
+        daily = self._daily(symbol, now)
+        if daily.empty:
+            return {'last_price': 0.0, 'previous_close': 0.0, 'open': 0.0,
+                    'day_high': 0.0, 'day_low': 0.0, 'last_volume': 0}
+        last = daily.iloc[-1]
+        previous_close = float(daily['Close'].iloc[-2]) if len(daily) > 1 else float(last['Open'])
+        tick = np.array([int(time.time())], dtype=np.int64).view(np.uint64) ^ self._key(symbol)
+        price = float(last['Close'] * np.exp(0.001 * _normal(tick, 5)[0]))
+        return {
+            'last_price': price,
+            'previous_close': previous_close,
+            'open': float(last['Open']),
+            'day_high': max(float(last['High']), price),
+            'day_low': min(float(last['Low']), price),
+            'last_volume': int(last['Volume']),
+        }
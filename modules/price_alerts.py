@@ -0,0 +1,290 @@
+"""
+Fiyat seviyesi alert defteri
+
+Binlerce hedef fiyat ve stop loss seviyesi hisse bazında iki sıralı dizide
+tutulur: yukarı kesişimde tetiklenenler (hedef) ve aşağı kesişimde
+tetiklenenler (stop loss). Fiyat p0'dan p1'e hareket ettiğinde kesilen
+seviyeler ikili arama ile O(log n + k) sürede bulunur; her fiyatta tüm
+alertler dolaşılmaz.
+
+Kesişim kuralları:
+    above: p0 < seviye <= p1
+    below: p1 <= seviye < p0
+
+Tetiklenen alertler defterden silinir (tek seferlik). `path` verilirse
+seviyeler ve son görülen fiyatlar JSON dosyasında saklanır; yeniden
+başlatma sonrası kapalıyken kesilen seviyeler ilk fiyatta tetiklenir.
+Dosya her değişiklikte değil en fazla `save_interval` saniyede bir
+yazılır; kapanışta `save()` çağrılmalıdır.
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+DIRECTIONS = ('above', 'below')
+
+class _Levels:
+    """Tek hisse ve yön için seviyeye göre sıralı alertler"""
+
+    def __init__(self):
+        self.levels: List[float] = []
+        self.ids: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def insert(self, level: float, alert_id: int) -> None:
+        # Aynı seviyedeki alertler eklenme sırasını korur
+        position = bisect_right(self.levels, level)
+        self.levels.insert(position, level)
+        self.ids.insert(position, alert_id)
+
+    def remove(self, level: float, alert_id: int) -> bool:
+        start, end = bisect_left(self.levels, level), bisect_right(self.levels, level)
+        for position in range(start, end):
+            if self.ids[position] == alert_id:
+                del self.levels[position], self.ids[position]
+                return True
+        return False
+
+    def pop_range(self, start: int, end: int) -> List[int]:
+        """[start, end) aralığındaki alertleri çıkarır ve kimliklerini döndürür"""
+        ids = self.ids[start:end]
+        del self.levels[start:end], self.ids[start:end]
+        return ids
+
+class PriceAlertBook:
+    """
+    Hisse bazında sıralı fiyat seviyesi alertleri
+
+    Aynı defter birden fazla thread'den kullanılabilir.
+    """
+
+    def __init__(self, path: Optional[str] = None, save_interval: float = 5.0):
+        """
+        Args:
+            path: JSON dosyası (None ise sadece bellek)
+            save_interval: Değişikliklerin dosyaya yazılma aralığı (saniye, 0 ise her değişiklikte)
+        """
+        self.path = path
+        self.save_interval = save_interval
+        self._dirty = False
+        self._saved_at = 0.0
+        self._books: Dict[str, Dict[str, _Levels]] = {}
+        self._alerts: Dict[int, Dict] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+        # Yazmalar sıralanır; eski bir anlık görüntü yenisinin üzerine yazılamaz
+        self._save_lock = threading.Lock()
+        if path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def _insert(self, alert: Dict) -> None:
+        self._alerts[alert['id']] = alert
+        book = self._books.setdefault(alert['symbol'], {direction: _Levels() for direction in DIRECTIONS})
+        book[alert['direction']].insert(alert['level'], alert['id'])
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Fiyat alertleri okuma hatası: {str(e)}")
+            return
+
+        for alert in state.get('alerts', []):
+            self._insert(alert)
+        self._last_prices = state.get('last_prices', {})
+        self._next_id = max(state.get('next_id', 1), max(self._alerts, default=0) + 1)
+
+    def save(self) -> bool:
+        """
+        Defteri dosyaya yazar
+
+        Returns:
+            bool: Başarılı ise True
+        """
+        if self.path is None:
+            return False
+        with self._save_lock:
+            with self._lock:
+                state = {'next_id': self._next_id, 'alerts': list(self._alerts.values()),
+                         'last_prices': dict(self._last_prices)}
+                self._dirty = False
+                self._saved_at = time.monotonic()
+            directory = os.path.dirname(self.path)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                return True
+            except OSError as e:
+                print(f"Fiyat alertleri yazma hatası: {str(e)}")
+                self._dirty = True
+                return False
+
+    def _changed(self) -> None:
+        """Değişikliği işaretler; yazma aralığı dolduysa dosyaya yazar"""
+        self._dirty = True
+        if self.path is not None and time.monotonic() - self._saved_at >= self.save_interval:
+            self.save()
+
+    @property
+    def dirty(self) -> bool:
+        """Dosyaya yazılmamış değişiklik varsa True"""
+        return self._dirty
+
+    def add(self, symbol: str, level: float, direction: str, note: str = "", save: bool = True) -> int:
+        """
+        Fiyat seviyesi alerti ekler
+
+        Args:
+            symbol: Hisse kodu
+            level: Fiyat seviyesi
+            direction: "above" (hedef fiyat) veya "below" (stop loss)
+            note: Alert açıklaması
+            save: False ise değişiklik işaretlenmez (toplu eklemede `add_many` kullanın)
+
+        Hisse için daha önce fiyat görüldüyse alert bir sonraki kesişimde
+        tetiklenir; fiyatın zaten geçtiği seviye hemen tetiklenmez.
+
+        Returns:
+            int: Alert kimliği
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Desteklenmeyen yön: {direction} (above veya below olmalı)")
+        level = float(level)
+        if not level > 0:
+            raise ValueError(f"Geçersiz fiyat seviyesi: {level}")
+
+        with self._lock:
+            alert_id = self._next_id
+            self._next_id += 1
+            self._insert({'id': alert_id, 'symbol': symbol, 'level': level,
+                          'direction': direction, 'note': note})
+        if save:
+            self._changed()
+        return alert_id
+
+    def add_many(self, alerts: Iterable[Dict]) -> List[int]:
+        """
+        Birden fazla alerti ekler
+
+        Args:
+            alerts: symbol, level, direction ve isteğe bağlı note anahtarlı sözlükler
+
+        Returns:
+            List[int]: Alert kimlikleri
+        """
+        ids = [self.add(alert['symbol'], alert['level'], alert['direction'],
+                        alert.get('note', ""), save=False) for alert in alerts]
+        self._changed()
+        return ids
+
+    def remove(self, alert_id: int) -> bool:
+        """
+        Alerti siler
+
+        Returns:
+            bool: Alert bulunduysa True
+        """
+        with self._lock:
+            alert = self._alerts.pop(alert_id, None)
+            if alert is None:
+                return False
+            self._books[alert['symbol']][alert['direction']].remove(alert['level'], alert_id)
+        self._changed()
+        return True
+
+    def alerts(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Bekleyen alertler (hisse ve seviyeye göre sıralı)"""
+        with self._lock:
+            symbols = [symbol] if symbol is not None else sorted(self._books)
+            return [dict(self._alerts[alert_id])
+                    for name in symbols for levels in self._books.get(name, {}).values()
+                    for alert_id in levels.ids]
+
+    def symbols(self) -> List[str]:
+        """Bekleyen alerti olan hisseler"""
+        with self._lock:
+            return [symbol for symbol, book in self._books.items() if any(book.values())]
+
+    def crossed(self, symbol: str, previous: Optional[float], price: float, remove: bool = False) -> List[Dict]:
+        """
+        Fiyat `previous`'tan `price`'a giderken kesilen seviyeler
+
+        Args:
+            symbol: Hisse kodu
+            previous: Önceki fiyat (None ise fiyatın zaten geçtiği tüm seviyeler)
+            price: Yeni fiyat
+            remove: True ise kesilen alertler defterden çıkarılır
+
+        Returns:
+            List[Dict]: Kesilen alertler (kesilme sırasına göre)
+        """
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None:
+                return []
+
+            up, down = book['above'], book['below']
+            if previous is None:
+                # İlk fiyatta yön bilinmez; fiyatın zaten geçtiği seviyeler tetiklenir
+                up_range = (0, bisect_right(up.levels, price))
+                down_range = (bisect_left(down.levels, price), len(down))
+            else:
+                up_range = (bisect_right(up.levels, previous), bisect_right(up.levels, price))
+                down_range = (bisect_left(down.levels, price), bisect_left(down.levels, previous))
+
+            matches = []
+            for levels, (start, end), ascending in ((up, up_range, True), (down, down_range, False)):
+                if start >= end:
+                    continue
+                ids = levels.pop_range(start, end) if remove else levels.ids[start:end]
+                # Aşağı harekette önce en yüksek seviye kesilir
+                matches.extend(ids if ascending else reversed(ids))
+
+            alerts = [self._alerts.pop(alert_id) if remove else dict(self._alerts[alert_id])
+                      for alert_id in matches]
+        return alerts
+
+    def update(self, symbol: str, price: float) -> List[Dict]:
+        """
+        Yeni fiyatı işler, kesilen alertleri tetikler ve siler
+
+        Args:
+            symbol: Hisse kodu
+            price: Güncel fiyat
+
+        Pozitif ve sonlu olmayan fiyatlar (örn. eksik sorgudan gelen 0)
+        yok sayılır; son fiyat değişmez, alert tetiklenmez.
+
+        Returns:
+            List[Dict]: Tetiklenen alertler (önceki ve güncel fiyatla)
+        """
+        price = float(price) if price is not None else math.nan
+        if not (math.isfinite(price) and price > 0):
+            return []
+        with self._lock:
+            previous = self._last_prices.get(symbol)
+            self._last_prices[symbol] = price
+            triggered = self.crossed(symbol, previous, price, remove=True)
+        for alert in triggered:
+            alert['previous'] = previous
+            alert['price'] = price
+        self._changed()
+        return triggered
@@ -0,0 +1,341 @@
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Iterable
+
+import pandas as pd
+
+from .config import QUOTE_STREAM_CONFIG
+
+# Değişim tespitinde karşılaştırılan alanlar
+QUOTE_FIELDS = ('current_price', 'open', 'day_high', 'day_low', 'volume', 'previous_close')
+
+class QuoteSubscription:
+    """
+    Bir abonenin sınırlı kapasiteli olay kuyruğu
+
+    Kuyruk dolduğunda `policy` belirleyicidir:
+        - "drop_oldest": En eski olay atılır, yayıncı hiç beklemez
+        - "block": Yayıncı `put_timeout` kadar bekler, sonra olay atılır
+    """
+
+    def __init__(self, name: str, maxsize: int = QUOTE_STREAM_CONFIG['queue_size'],
+                 policy: str = "drop_oldest", put_timeout: float = 1.0,
+                 event_types: Iterable[str] = ('quote', 'bar')):
+        """
+        Args:
+            name: Abone adı
+            maxsize: Kuyruk kapasitesi
+            policy: Kuyruk dolunca uygulanacak politika
+            put_timeout: "block" politikasında en fazla bekleme süresi (saniye)
+            event_types: Dinlenecek olay türleri
+        """
+        if policy not in ("drop_oldest", "block"):
+            raise ValueError(f"Desteklenmeyen kuyruk politikası: {policy}")
+
+        self.name = name
+        self.policy = policy
+        self.put_timeout = put_timeout
+        self.event_types = set(event_types)
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def publish(self, event: Dict) -> bool:
+        """
+        Olayı kuyruğa ekler
+
+        Returns:
+            bool: Olay kuyruğa girdiyse True
+        """
+        if event['type'] not in self.event_types:
+            return False
+
+        if self.policy == "block":
+            try:
+                self.queue.put(event, timeout=self.put_timeout)
+                return True
+            except queue.Full:
+                self.dropped += 1
+                return False
+
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return True
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Sıradaki olayı döndürür
+
+        Args:
+            timeout: Bekleme süresi (saniye). None ise olay gelene kadar bekler
+
+        Returns:
+            Dict: Olay, süre dolduysa None
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self) -> List[Dict]:
+        """Kuyruktaki tüm olayları beklemeden döndürür"""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+class BarBuilder:
+    """Anlık fiyat akışından intraday OHLCV barları üretir"""
+
+    def __init__(self, interval: int = QUOTE_STREAM_CONFIG['bar_interval'],
+                 max_bars: int = QUOTE_STREAM_CONFIG['max_bars']):
+        """
+        Args:
+            interval: Bar süresi (saniye)
+            max_bars: Hisse başına saklanan tamamlanmış bar sayısı
+        """
+        self.interval = interval
+        self.max_bars = max_bars
+        self._current = {}
+        self._last_volume = {}
+        self._bars = {}
+
+    def update(self, quote: Dict) -> Optional[Dict]:
+        """
+        Yeni fiyatı işler
+
+        Args:
+            quote: Anlık fiyat verisi
+
+        Returns:
+            Dict: Bu fiyatla kapanan bar, yoksa None
+        """
+        symbol = quote['symbol']
+        price = quote['current_price']
+        bar_start = int(quote['timestamp'] // self.interval * self.interval)
+
+        # Kümülatif gün hacminden bar hacmi; hacim düşerse yeni gün başlamıştır
+        volume = quote.get('volume', 0) or 0
+        last_volume = self._last_volume.get(symbol)
+        volume_delta = volume if last_volume is None or volume < last_volume else volume - last_volume
+        self._last_volume[symbol] = volume
+
+        completed = None
+        current = self._current.get(symbol)
+        if current is not None and current['start'] != bar_start:
+            completed = current
+            self._bars.setdefault(symbol, deque(maxlen=self.max_bars)).append(completed)
+            current = None
+
+        if current is None:
+            # Yeni barın ilk hacmi önceki barın sonrasına aittir
+            self._current[symbol] = {
+                'symbol': symbol,
+                'start': bar_start,
+                'Open': price,
+                'High': price,
+                'Low': price,
+                'Close': price,
+                'Volume': volume_delta if last_volume is not None else 0,
+            }
+        else:
+            current['High'] = max(current['High'], price)
+            current['Low'] = min(current['Low'], price)
+            current['Close'] = price
+            current['Volume'] += volume_delta
+
+        return completed
+
+    def get_bars(self, symbol: str, include_current: bool = False) -> pd.DataFrame:
+        """
+        Hissenin tamamlanmış barlarını döndürür
+
+        Args:
+            symbol: Hisse kodu
+            include_current: True ise henüz kapanmamış bar da eklenir
+
+        Returns:
+            DataFrame: OHLCV barları
+        """
+        bars = list(self._bars.get(symbol, []))
+        if include_current and symbol in self._current:
+            bars.append(self._current[symbol])
+
+        columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        if not bars:
+            return pd.DataFrame(columns=columns)
+
+        index = pd.to_datetime([bar['start'] for bar in bars], unit='s', utc=True)
+        return pd.DataFrame([[bar[c] for c in columns] for bar in bars], index=index, columns=columns)
+
+class QuotePoller:
+    """
+    İzlenen hisseleri sınırlı bir worker havuzu ile periyodik olarak sorgular
+
+    Her turda sadece bir önceki sorguya göre değişen fiyatlar abonelere
+    yayınlanır; böylece alt katmanlardaki iş evren büyüklüğüyle değil piyasa
+    hareketliliğiyle orantılı kalır. Kapanan intraday barlar da "bar"
+    olayı olarak yayınlanır.
+    """
+
+    def __init__(self, symbols: Iterable[str], fetch_quote: Optional[Callable[[str], Optional[Dict]]] = None,
+                 poll_interval: float = QUOTE_STREAM_CONFIG['poll_interval'],
+                 max_workers: int = QUOTE_STREAM_CONFIG['max_workers'],
+                 bar_builder: Optional[BarBuilder] = None, calendar=None):
+        """
+        Args:
+            symbols: İzlenecek hisse kodları
+            fetch_quote: Hisse kodu alıp fiyat sözlüğü döndüren fonksiyon
+                (None ise BISTDataFetcher.get_quote kullanılır)
+            poll_interval: Sorgu turları arasındaki süre (saniye)
+            max_workers: Eşzamanlı sorgu sayısı
+            bar_builder: Intraday bar üretici
+            calendar: İşlem takvimi (MarketCalendar, None ise BIST takvimi).
+                Arka plan sorgulaması piyasa kapalıyken bir sonraki açılışa
+                kadar bekler; False ise takvime bakılmadan sürekli sorgulanır
+        """
+        from .market_calendar import get_calendar
+
+        if fetch_quote is None:
+            from .data_fetcher import BISTDataFetcher
+            fetch_quote = BISTDataFetcher().get_quote
+
+        self.fetch_quote = fetch_quote
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.bar_builder = bar_builder or BarBuilder()
+        self.calendar = None if calendar is False else calendar or get_calendar()
+        self.snapshots = {}
+
+        self._symbols = list(dict.fromkeys(symbols))
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def watch(self, symbols: Iterable[str]) -> None:
+        """İzleme listesine hisse ekler"""
+        with self._lock:
+            for symbol in symbols:
+                if symbol not in self._symbols:
+                    self._symbols.append(symbol)
+
+    def unwatch(self, symbols: Iterable[str]) -> None:
+        """İzleme listesinden hisse çıkarır"""
+        with self._lock:
+            removed = set(symbols)
+            self._symbols = [symbol for symbol in self._symbols if symbol not in removed]
+            for symbol in removed:
+                self.snapshots.pop(symbol, None)
+
+    def subscribe(self, name: str, **kwargs) -> QuoteSubscription:
+        """
+        Yeni abone ekler
+
+        Args:
+            name: Abone adı
+            **kwargs: QuoteSubscription argümanları
+
+        Returns:
+            QuoteSubscription: Abonelik
+        """
+        subscription = QuoteSubscription(name, **kwargs)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: QuoteSubscription) -> None:
+        """Aboneliği kaldırır"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def _publish(self, event: Dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.publish(event)
+
+    def _has_changed(self, quote: Dict) -> bool:
+        """Fiyatın önceki sorguya göre değişip değişmediğini kontrol eder"""
+        previous = self.snapshots.get(quote['symbol'])
+        if previous is None:
+            return True
+        return any(previous.get(field) != quote.get(field) for field in QUOTE_FIELDS)
+
+    def _safe_fetch(self, symbol: str) -> Optional[Dict]:
+        try:
+            return self.fetch_quote(symbol)
+        except Exception as e:
+            print(f"Anlık fiyat hatası {symbol}: {str(e)}")
+            return None
+
+    def poll_once(self) -> List[Dict]:
+        """
+        Tüm izlenen hisseleri bir kez sorgular
+
+        Returns:
+            List[Dict]: Değişen fiyatlar
+        """
+        with self._lock:
+            symbols = list(self._symbols)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="quote-poller")
+
+        changed = []
+        for quote in self._executor.map(self._safe_fetch, symbols):
+            if quote is None or not self._has_changed(quote):
+                continue
+
+            self.snapshots[quote['symbol']] = quote
+            changed.append(quote)
+            self._publish({'type': 'quote', 'symbol': quote['symbol'], 'data': quote})
+
+            bar = self.bar_builder.update(quote)
+            if bar is not None:
+                self._publish({'type': 'bar', 'symbol': bar['symbol'], 'data': bar})
+
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            # Kapalı piyasada fiyat değişmez; açılışa kadar sorgu yapılmaz
+            if self.calendar is not None and not self.calendar.is_open():
+                self._stop_event.wait(self.calendar.seconds_until_open())
+                continue
+            started = time.monotonic()
+            self.poll_once()
+            # Sorgu süresi bekleme süresinden düşülür, turlar kaymaz
+            self._stop_event.wait(max(0.0, self.poll_interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Arka planda sorgulamayı başlatır"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="quote-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Sorgulamayı durdurur"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
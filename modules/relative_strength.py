@@ -0,0 +1,187 @@
+import time
+import threading
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple, Union
+
+# Endeks serileri: (endeks, periyot, aralık) -> IndexBenchmark
+_benchmarks = {}
+_benchmarks_lock = threading.Lock()
+
+PriceData = Union[pd.Series, pd.DataFrame]
+
+def _as_frame(prices: PriceData) -> Tuple[pd.DataFrame, bool]:
+    """Series'i tek sütunlu DataFrame'e çevirir"""
+    if isinstance(prices, pd.Series):
+        return prices.to_frame(prices.name or 'Close'), True
+    return prices, False
+
+def _restore(result: pd.DataFrame, was_series: bool) -> PriceData:
+    return result.iloc[:, 0] if was_series else result
+
+class IndexBenchmark:
+    """
+    Endeks serisini bir kez çekip tüm hisselerle paylaşan karşılaştırma ölçütü
+
+    Göreceli güç, beta ve alfa hesapları tek bir hisse (Series) veya tüm
+    evren (satırlar tarih, sütunlar hisse olan DataFrame) için aynı
+    vektörize işlemlerle yapılır.
+    """
+
+    def __init__(self, index: str = "XU100.IS", period: str = "1y", interval: str = "1d",
+                 fetcher=None, data: Optional[pd.DataFrame] = None,
+                 max_age: Optional[float] = None):
+        """
+        Args:
+            index: Endeks kodu (XU100.IS, XU030.IS, vb.)
+            period: Zaman aralığı
+            interval: Veri aralığı
+            fetcher: BISTDataFetcher objesi (None ise ilk kullanımda oluşturulur)
+            data: Hazır endeks verisi (verilirse hiç veri çekilmez)
+            max_age: Endeks verisinin yeniden çekilme süresi (saniye, None ise süresiz)
+        """
+        self.index = index
+        self.period = period
+        self.interval = interval
+        self.fetcher = fetcher
+        self.max_age = max_age
+        self._data = data
+        self._fetched_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, index: str = "XU100.IS", period: str = "1y", interval: str = "1d",
+               fetcher=None, max_age: Optional[float] = None) -> 'IndexBenchmark':
+        """
+        Süreç genelinde paylaşılan endeks nesnesini döndürür
+
+        Aynı (endeks, periyot, aralık) için tüm analizler tek bir seriyi
+        kullanır; endeks verisi sadece bir kez çekilir.
+        """
+        key = (index, period, interval)
+        with _benchmarks_lock:
+            if key not in _benchmarks:
+                _benchmarks[key] = cls(index, period, interval, fetcher=fetcher, max_age=max_age)
+            return _benchmarks[key]
+
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        """Endeks OHLCV verileri (ilk erişimde bir kez çekilir)"""
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    if self.fetcher is None:
+                        from .data_fetcher import BISTDataFetcher
+                        self.fetcher = BISTDataFetcher()
+                    self._data = self.fetcher.get_stock_data(self.index, period=self.period,
+                                                             interval=self.interval)
+                    self._fetched_at = time.monotonic()
+        return self._data
+
+    def _is_stale(self) -> bool:
+        if self._data is None:
+            return True
+        return self.max_age is not None and time.monotonic() - self._fetched_at > self.max_age
+
+    @property
+    def close(self) -> Optional[pd.Series]:
+        """Endeks kapanış serisi"""
+        data = self.data
+        return None if data is None else data['Close'].rename(self.index)
+
+    def align(self, index: pd.Index) -> pd.Series:
+        """
+        Endeks kapanışını verilen tarih indeksine hizalar
+
+        Endeksin işlem görmediği tarihlerde son bilinen değer kullanılır.
+
+        Args:
+            index: Hedef tarih indeksi
+
+        Returns:
+            Series: Hizalanmış endeks kapanışı
+        """
+        close = self.close
+        if close is None:
+            raise ValueError(f"Endeks verisi yüklenemedi: {self.index}")
+        return close.reindex(close.index.union(index)).ffill().reindex(index)
+
+    def relative_strength(self, prices: PriceData) -> PriceData:
+        """
+        Göreceli güç çizgisi: fiyat / endeks, ilk geçerli değer 100 olacak şekilde
+
+        100'ün üstü hissenin dönem başından beri endeksten iyi performans
+        gösterdiğini belirtir.
+
+        Args:
+            prices: Kapanış fiyatları (Series veya hisse sütunlu DataFrame)
+
+        Returns:
+            Series veya DataFrame: Göreceli güç
+        """
+        frame, was_series = _as_frame(prices)
+        ratio = frame.div(self.align(frame.index), axis=0)
+        first_valid = ratio.bfill().iloc[0]
+        return _restore(ratio.div(first_valid) * 100, was_series)
+
+    def rolling_beta_alpha(self, prices: PriceData, window: int = 60,
+                           min_periods: Optional[int] = None) -> Tuple[PriceData, PriceData]:
+        """
+        Kayan pencere beta ve alfa (bar başına Jensen alfası)
+
+        Getiriler r = α + β·m modeline göre her pencerede en küçük
+        kareler ile bulunur; eksik getiriler hisse bazında dışlanır.
+
+        Args:
+            prices: Kapanış fiyatları (Series veya hisse sütunlu DataFrame)
+            window: Pencere uzunluğu
+            min_periods: Gereken en az gözlem (None ise window)
+
+        Returns:
+            Tuple: (beta, alfa)
+        """
+        frame, was_series = _as_frame(prices)
+        min_periods = min_periods or window
+
+        returns = frame.pct_change(fill_method=None)
+        market = self.align(frame.index).pct_change(fill_method=None)
+
+        # Endeks getirisi her hisse için o hissenin geçerli olduğu barlarla sınırlanır
+        valid = returns.notna() & market.notna().to_numpy()[:, None]
+        r = returns.where(valid)
+        m = pd.DataFrame(np.where(valid, market.to_numpy()[:, None], np.nan),
+                         index=frame.index, columns=frame.columns)
+
+        rolling = dict(window=window, min_periods=min_periods)
+        mean_r = r.rolling(**rolling).mean()
+        mean_m = m.rolling(**rolling).mean()
+        mean_rm = (r * m).rolling(**rolling).mean()
+        mean_mm = (m * m).rolling(**rolling).mean()
+
+        variance = mean_mm - mean_m ** 2
+        beta = (mean_rm - mean_r * mean_m) / variance.where(variance > 0)
+        alpha = mean_r - beta * mean_m
+
+        return _restore(beta, was_series), _restore(alpha, was_series)
+
+    def metrics(self, prices: PriceData, window: int = 60) -> pd.DataFrame:
+        """
+        Her hisse için son göreceli güç, beta ve alfa değerleri
+
+        Args:
+            prices: Kapanış fiyatları (Series veya hisse sütunlu DataFrame)
+            window: Beta/alfa penceresi
+
+        Returns:
+            DataFrame: Satırlar hisse; sütunlar rs, beta, alpha
+        """
+        frame, _ = _as_frame(prices)
+        rs = self.relative_strength(frame)
+        # Kısa serilerde de değer üretilsin diye pencerenin en az yarısı yeterlidir
+        min_periods = min(window, max(len(frame) // 2, 2))
+        beta, alpha = self.rolling_beta_alpha(frame, window=window, min_periods=min_periods)
+        return pd.DataFrame({
+            'rs': rs.ffill().iloc[-1],
+            'beta': beta.ffill().iloc[-1],
+            'alpha': alpha.ffill().iloc[-1],
+        })
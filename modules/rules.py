@@ -0,0 +1,440 @@
+"""
+Bildirimsel alert kuralları
+
+Kurallar "rsi < 30 and volume > 2 * sma(volume, 20)" gibi metinlerdir.
+Her kural eklenirken bir kez ayrıştırılır ve ifade düğümlerine çevrilir.
+Aynı alt ifadeler (örn. birçok kuraldaki `sma(volume, 20)`) tek düğüm olarak
+saklanır; tüm kurallar her turda (zaman x hisse) panelinde NumPy dizi
+işlemleriyle birlikte değerlendirilir ve her düğüm bir kez hesaplanır.
+
+Dil:
+    - Alanlar: open, high, low, close, volume ve hesaplanmış indikatörler
+      (rsi, macd, macd_signal, sma_20, bb_upper, ...); büyük/küçük harf duyarsız
+    - Aritmetik: + - * / ve parantez
+    - Karşılaştırma: < <= > >= == != (zincirleme: 30 < rsi < 70)
+    - Mantık: and, or, not
+    - Fonksiyonlar: sma(x, n), ema(x, n), highest(x, n), lowest(x, n),
+      prev(x, n=1), change(x, n=1) (yüzde), abs(x), min(a, b), max(a, b),
+      crosses_above(a, b), crosses_below(a, b)
+
+Eksik alanlar ve NaN değerlerle yapılan karşılaştırmaların sonucu bilinmezdir
+(NaN); `not` bilinmezi bilinmez bırakır, and/or üç değerli mantıkla birleştirir
+ve kuralın sonunda bilinmez yanlış (False) sayılır. Böylece ne `rsi != 50` ne de
+`not rsi < 30`, RSI henüz hesaplanmamışken tetiklenir.
+"""
+
+import ast
+import math
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Iterable, List, Optional, Union
+
+# OHLCV alanlarının kurallardaki adları
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Pencere argümanı alan fonksiyonlar: ad -> (pencere varsayılanı, geçmiş ihtiyacı)
+# Geçmiş ihtiyacı, son n satır için girdinin kaç satırına bakıldığıdır
+WINDOW_FUNCTIONS = {
+    'sma': (None, lambda n: n - 1),
+    'highest': (None, lambda n: n - 1),
+    'lowest': (None, lambda n: n - 1),
+    'prev': (1, lambda n: n),
+    'change': (1, lambda n: n),
+    'ema': (None, lambda n: math.inf),  # Özyinelemeli, tüm geçmiş gerekir
+}
+ELEMENT_FUNCTIONS = {'abs': 1, 'min': 2, 'max': 2, 'crosses_above': 2, 'crosses_below': 2}
+
+_BINARY_OPERATORS = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div'}
+_COMPARISONS = {ast.Lt: 'lt', ast.LtE: 'le', ast.Gt: 'gt', ast.GtE: 'ge', ast.Eq: 'eq', ast.NotEq: 'ne'}
+# a > b, b < a ile aynı düğümü paylaşsın diye yön çevrilir
+_MIRRORED = {'gt': 'lt', 'ge': 'le'}
+_COMMUTATIVE = {'add', 'mul', 'eq', 'ne', 'and', 'or', 'min', 'max'}
+# Karşılaştırmalar 1.0/0.0 döner; işlenenlerden biri NaN ise sonuç NaN (bilinmez)
+_NUMPY_COMPARISONS = {'lt': np.less, 'le': np.less_equal, 'eq': np.equal, 'ne': np.not_equal}
+
+_NUMPY_OPERATIONS = {
+    'add': np.add, 'sub': np.subtract, 'mul': np.multiply, 'div': np.divide,
+    'min': np.fmin, 'max': np.fmax,
+}
+
+class Panel:
+    """
+    Evrenin (zaman x hisse) alan dizileri
+
+    Her alan, satırları ortak tarih indeksine hizalanmış (tarih, hisse)
+    boyutunda bir dizidir; eksik barlar NaN'dır.
+    """
+
+    def __init__(self, fields: Dict[str, np.ndarray], symbols: List[str], index: pd.Index):
+        """
+        Args:
+            fields: Alan adı -> (tarih, hisse) dizisi
+            symbols: Sütunlardaki hisse kodları
+            index: Satırlardaki tarihler
+        """
+        self.fields = fields
+        self.symbols = list(symbols)
+        self.index = index
+        self._names = {name.lower(): name for name in fields}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @classmethod
+    def from_series(cls, series: Dict[str, Dict[str, pd.Series]]) -> 'Panel':
+        """
+        Hisse bazlı serilerden panel oluşturur
+
+        Args:
+            series: Hisse kodu -> (alan adı -> Series)
+        """
+        symbols = list(series)
+        index = pd.Index([])
+        for columns in series.values():
+            for values in columns.values():
+                index = index.union(values.index)
+                break
+        names = list(dict.fromkeys(name for columns in series.values() for name in columns))
+
+        fields = {name: np.full((len(index), len(symbols)), np.nan) for name in names}
+        for column, symbol in enumerate(symbols):
+            for name, values in series[symbol].items():
+                aligned = values if values.index.equals(index) else values.reindex(index)
+                fields[name][:, column] = aligned.to_numpy(dtype=np.float64)
+        return cls(fields, symbols, index)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'Panel':
+        """OHLCV verilerinden panel oluşturur"""
+        return cls.from_series({symbol: {column: df[column] for column in df.columns}
+                                for symbol, df in frames.items() if df is not None and not df.empty})
+
+    @classmethod
+    def from_analyzers(cls, analyzers: Dict[str, object]) -> 'Panel':
+        """TechnicalAnalyzer verileri ve hesaplanmış indikatörlerinden panel oluşturur"""
+        series = {}
+        for symbol, analyzer in analyzers.items():
+            columns = {column: analyzer.data[column] for column in PRICE_FIELDS}
+            columns.update(analyzer.indicators)
+            series[symbol] = columns
+        return cls.from_series(series)
+
+    def field(self, name: str) -> Optional[np.ndarray]:
+        """Alanın dizisi (büyük/küçük harf duyarsız); alan yoksa None"""
+        name = self._names.get(name.lower())
+        return None if name is None else self.fields[name]
+
+class RuleSet:
+    """
+    Ortak alt ifadeleri paylaşan, vektörize değerlendirilen kural kümesi
+
+    Kurallar eklenirken ayrıştırılır (sözdizimi hatası ValueError fırlatır).
+    Değerlendirme planı kural kümesi değişince bir kez yeniden kurulur: her
+    benzersiz alt ifade tek düğümdür, düğümler bağımlılık sırasıyla ve sadece
+    ihtiyaç duyulan son satırlar üzerinde hesaplanır (örn. `rsi < 30` için
+    son satır, `sma(volume, 20)` için son 20 satır).
+    """
+
+    def __init__(self, rules: Union[Dict[str, str], Iterable[str], None] = None):
+        """
+        Args:
+            rules: Kural adı -> kural metni (veya adı metni olan kurallar)
+        """
+        self._rules = {}
+        self._plan = None
+        if isinstance(rules, dict):
+            for name, text in rules.items():
+                self.add(name, text)
+        elif rules is not None:
+            for text in rules:
+                self.add(text, text)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rules
+
+    @property
+    def rules(self) -> Dict[str, str]:
+        """Kural adı -> kural metni"""
+        return {name: text for name, (text, _) in self._rules.items()}
+
+    def add(self, name: str, text: str) -> None:
+        """
+        Kural ekler veya değiştirir
+
+        Args:
+            name: Kural adı
+            text: Kural metni
+
+        Raises:
+            ValueError: Kural ayrıştırılamazsa
+        """
+        self._rules[name] = (text, parse_rule(text))
+        self._plan = None
+
+    def remove(self, name: str) -> None:
+        """Kuralı siler"""
+        if self._rules.pop(name, None) is not None:
+            self._plan = None
+
+    @property
+    def node_count(self) -> int:
+        """Değerlendirme planındaki benzersiz düğüm sayısı"""
+        return len(self._compile()['nodes'])
+
+    def _compile(self) -> Dict:
+        """Kuralları ortak düğümlü değerlendirme planına çevirir"""
+        if self._plan is not None:
+            return self._plan
+
+        nodes, ids = [], {}
+
+        def intern(tree) -> int:
+            op = tree[0]
+            if op in ('const', 'field'):
+                key = tree
+            else:
+                children = [intern(child) for child in tree[1]]
+                if op in _MIRRORED:
+                    op, children = _MIRRORED[op], children[::-1]
+                if op in _COMMUTATIVE:
+                    children = sorted(children)
+                key = (op, tuple(children)) + tuple(tree[2:])
+                # Sabit girdili düğümler derleme anında hesaplanır
+                if all(nodes[child][0] == 'const' for child in children) and op not in WINDOW_FUNCTIONS:
+                    values = [nodes[child][1] for child in children]
+                    with np.errstate(all='ignore'):
+                        key = ('const', float(_apply(op, values, tree[2:], 1)))
+            if key not in ids:
+                ids[key] = len(nodes)
+                nodes.append(key)
+            return ids[key]
+
+        roots = {name: intern(tree) for name, (_, tree) in self._rules.items()}
+
+        # Her düğümün kaç son satırının gerektiği, kökten yapraklara yayılır
+        need = [0] * len(nodes)
+        for root in roots.values():
+            need[root] = max(need[root], 1)
+        for position in range(len(nodes) - 1, -1, -1):
+            op = nodes[position][0]
+            if op in ('const', 'field') or need[position] == 0:
+                continue
+            extra = 0
+            if op in WINDOW_FUNCTIONS:
+                extra = WINDOW_FUNCTIONS[op][1](nodes[position][2])
+            elif op in ('crosses_above', 'crosses_below'):
+                extra = 1
+            for child in nodes[position][1]:
+                need[child] = max(need[child], need[position] + extra)
+
+        self._plan = {'nodes': nodes, 'roots': roots, 'need': need}
+        return self._plan
+
+    def evaluate(self, panel: Panel) -> pd.DataFrame:
+        """
+        Tüm kuralları panelin son barında değerlendirir
+
+        Args:
+            panel: Evren paneli
+
+        Returns:
+            DataFrame: Satırlar hisse, sütunlar kural; tetiklenen kural True
+        """
+        plan = self._compile()
+        nodes, need = plan['nodes'], plan['need']
+        length = len(panel)
+        values = [None] * len(nodes)
+
+        with np.errstate(all='ignore'):
+            for position, node in enumerate(nodes):
+                rows = min(need[position], length)
+                if rows == 0 and node[0] != 'const':
+                    continue
+                if node[0] == 'const':
+                    values[position] = node[1]
+                elif node[0] == 'field':
+                    array = panel.field(node[1])
+                    values[position] = (array if array is not None else np.full((length, len(panel.symbols)), np.nan))[length - rows:]
+                else:
+                    inputs = [values[child] for child in node[1]]
+                    values[position] = _apply(node[0], inputs, node[2:], rows)
+
+        # Aynı köke çıkan kurallar sonucu paylaşır
+        roots = plan['roots']
+        unique = {root: None for root in roots.values()}
+        for root in unique:
+            value = values[root]
+            last = value[-1] if np.ndim(value) and len(value) else np.full(len(panel.symbols), value, dtype=np.float64)
+            unique[root] = _truth(last) if np.ndim(value) or length else np.zeros(len(panel.symbols), dtype=bool)
+        matrix = np.empty((len(panel.symbols), len(roots)), dtype=bool)
+        for column, root in enumerate(roots.values()):
+            matrix[:, column] = unique[root]
+        return pd.DataFrame(matrix, index=pd.Index(panel.symbols, name='symbol'), columns=list(roots))
+
+    def triggered(self, panel: Panel) -> List[Dict]:
+        """
+        Tetiklenen (kural, hisse) çiftleri
+
+        Returns:
+            List[Dict]: rule, text, symbol alanlarıyla tetiklenen kurallar
+        """
+        matrix = self.evaluate(panel)
+        rows, columns = np.nonzero(matrix.to_numpy())
+        return [{'rule': matrix.columns[column], 'text': self._rules[matrix.columns[column]][0],
+                 'symbol': matrix.index[row]} for row, column in zip(rows, columns)]
+
+def _truth(value) -> np.ndarray:
+    """Değerin mantıksal karşılığı; NaN yanlış sayılır"""
+    value = np.asarray(value)
+    if value.dtype == bool:
+        return value
+    return (value != 0) & ~np.isnan(value)
+
+def _logical(value) -> np.ndarray:
+    """Üç değerli mantık karşılığı: 1.0 doğru, 0.0 yanlış, NaN bilinmez"""
+    value = np.asarray(value, dtype=np.float64)
+    return np.where(np.isnan(value), np.nan, value != 0)
+
+def _known(*values) -> np.ndarray:
+    """Hiçbir işleneni NaN olmayan hücreler"""
+    known = True
+    for value in values:
+        known = known & ~np.isnan(np.asarray(value, dtype=np.float64))
+    return known
+
+def _tail(value, rows: int):
+    """Dizinin son `rows` satırı (sabitler olduğu gibi döner)"""
+    return value[-rows:] if np.ndim(value) else value
+
+def _pad(values: np.ndarray, rows: int, like: np.ndarray) -> np.ndarray:
+    """Kısa sonucu başına NaN ekleyerek `rows` satıra tamamlar"""
+    missing = rows - len(values)
+    if missing <= 0:
+        return values[-rows:]
+    return np.concatenate([np.full((missing,) + like.shape[1:], np.nan), values])
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """NaN içeren pencereleri NaN bırakan kayan toplam"""
+    finite = np.isfinite(values)
+    zero = np.zeros((1,) + values.shape[1:])
+    sums = np.concatenate([zero, np.cumsum(np.where(finite, values, 0.0), axis=0)])
+    counts = np.concatenate([zero, np.cumsum(finite, axis=0)])
+    window_sums = sums[window:] - sums[:-window]
+    return np.where(counts[window:] - counts[:-window] == window, window_sums, np.nan)
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    return _pad(values[:-periods] if periods else values, len(values), values)
+
+def _apply(op: str, inputs: List, arguments: tuple, rows: int):
+    """Düğüm işlemini girdilerin son satırları üzerinde uygular"""
+    if op in WINDOW_FUNCTIONS:
+        (values,) = inputs
+        window = arguments[0]
+        if not np.ndim(values):
+            return values if op in ('sma', 'highest', 'lowest', 'prev', 'ema') else 0.0
+        if op == 'sma':
+            result = _pad(_rolling_sum(values, window) / window, len(values), values) if window <= len(values) \
+                else np.full_like(values, np.nan)
+        elif op in ('highest', 'lowest'):
+            if window > len(values):
+                result = np.full_like(values, np.nan)
+            else:
+                windows = sliding_window_view(values, window, axis=0)
+                result = _pad(windows.max(axis=-1) if op == 'highest' else windows.min(axis=-1), len(values), values)
+        elif op == 'prev':
+            result = _shift(values, window)
+        elif op == 'change':
+            previous = _shift(values, window)
+            result = (values - previous) / previous * 100
+        else:  # ema
+            result = pd.DataFrame(values).ewm(span=window, adjust=False, min_periods=window).mean().to_numpy()
+        return result[-rows:]
+
+    if op == 'neg':
+        return -_tail(inputs[0], rows)
+    if op == 'abs':
+        return np.abs(_tail(inputs[0], rows))
+    if op == 'not':
+        return 1.0 - _logical(_tail(inputs[0], rows))
+    if op in ('and', 'or'):
+        # Kleene mantığı: tek bir yanlış (and) ya da doğru (or) sonucu belirler,
+        # yoksa bilinmez işlenen sonucu bilinmez yapar
+        values = np.broadcast_arrays(*[_logical(_tail(value, rows)) for value in inputs])
+        decisive = 0.0 if op == 'and' else 1.0
+        decided = np.logical_or.reduce([value == decisive for value in values])
+        unknown = np.logical_or.reduce([np.isnan(value) for value in values])
+        return np.where(decided, decisive, np.where(unknown, np.nan, 1.0 - decisive))
+    if op in ('crosses_above', 'crosses_below'):
+        first, second = (_tail(value, rows + 1) for value in inputs)
+        above = np.greater(first, second) if op == 'crosses_above' else np.less(first, second)
+        before = np.less_equal(first, second) if op == 'crosses_above' else np.greater_equal(first, second)
+        if not np.ndim(above):
+            return False
+        known = _known(first, second)
+        result = np.where(known[1:] & known[:-1], above[1:] & before[:-1], np.nan)
+        return _pad(result.astype(np.float64), rows, np.atleast_2d(result)) if len(result) < rows else result[-rows:]
+
+    first, second = (_tail(value, rows) for value in inputs)
+    if op in _NUMPY_COMPARISONS:
+        return np.where(_known(first, second), _NUMPY_COMPARISONS[op](first, second), np.nan)
+    return _NUMPY_OPERATIONS[op](first, second)
+
+def parse_rule(text: str) -> tuple:
+    """
+    Kural metnini ifade ağacına çevirir
+
+    Args:
+        text: Kural metni
+
+    Returns:
+        tuple: (işlem, [alt ifadeler], *argümanlar) biçiminde ağaç
+
+    Raises:
+        ValueError: Sözdizimi hatası veya desteklenmeyen ifade
+    """
+    try:
+        tree = ast.parse(text.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Kural ayrıştırılamadı: {text!r} ({e.msg})")
+    return _convert(tree.body, text)
+
+def _window_argument(node: ast.AST, text: str) -> int:
+    if isinstance(node, ast.Constant) and isinstance(node.value, int) and node.value > 0:
+        return node.value
+    raise ValueError(f"Pencere pozitif tam sayı olmalıdır: {text!r}")
+
+def _convert(node: ast.AST, text: str) -> tuple:
+    """Python ifade ağacını desteklenen işlemlerle sınırlı kural ağacına çevirir"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return ('const', float(node.value))
+    if isinstance(node, ast.Name):
+        return ('field', node.id.lower())
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Not)):
+        operand = _convert(node.operand, text)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return ('neg' if isinstance(node.op, ast.USub) else 'not', [operand])
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        return (_BINARY_OPERATORS[type(node.op)], [_convert(node.left, text), _convert(node.right, text)])
+    if isinstance(node, ast.BoolOp):
+        return ('and' if isinstance(node.op, ast.And) else 'or', [_convert(value, text) for value in node.values])
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARISONS for op in node.ops):
+        operands = [_convert(value, text) for value in [node.left] + node.comparators]
+        parts = [(_COMPARISONS[type(op)], [operands[i], operands[i + 1]]) for i, op in enumerate(node.ops)]
+        return parts[0] if len(parts) == 1 else ('and', parts)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        name = node.func.id.lower()
+        if name in WINDOW_FUNCTIONS:
+            default = WINDOW_FUNCTIONS[name][0]
+            if len(node.args) == 1 and default is not None:
+                return (name, [_convert(node.args[0], text)], default)
+            if len(node.args) == 2:
+                return (name, [_convert(node.args[0], text)], _window_argument(node.args[1], text))
+        elif name in ELEMENT_FUNCTIONS and len(node.args) == ELEMENT_FUNCTIONS[name]:
+            return (name, [_convert(arg, text) for arg in node.args])
+        raise ValueError(f"Desteklenmeyen fonksiyon veya argüman sayısı: {name} ({text!r})")
+    raise ValueError(f"Desteklenmeyen ifade: {ast.dump(node)[:60]} ({text!r})")
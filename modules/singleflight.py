@@ -0,0 +1,83 @@
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+class _Call:
+    """Devam eden tek bir çağrının sonucu"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı çağrıları tek bir çağrıda birleştirir
+
+    Bir anahtar için ilk gelen çağrı işi yapar; o sürerken aynı anahtarla
+    gelen çağrılar yeni iş başlatmaz, ilk çağrının sonucunu (veya
+    hatasını) bekleyip aynısını alır. Sonuç saklanmaz: iş bittikten sonra
+    gelen çağrı yeniden çalıştırılır.
+
+    Dönen nesne tüm bekleyenlerle paylaşılır; çağıranlar onu yerinde
+    değiştirmemelidir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Anahtar için işi çalıştırır veya devam eden işin sonucunu bekler
+
+        Args:
+            key: Çağrı anahtarı (örn: (hisse, periyot, aralık))
+            function: İşi yapan argümansız fonksiyon
+
+        Returns:
+            Any: İşin sonucu (hata olduysa aynı hata tüm bekleyenlerde fırlatılır)
+        """
+        result, _ = self.do_shared(key, function)
+        return result
+
+    def do_shared(self, key: Hashable, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        `do` ile aynıdır; ayrıca sonucun başka bir çağrıdan gelip gelmediğini döndürür
+
+        Returns:
+            Tuple: (sonuç, başka çağrının sonucu ise True)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Devam eden çağrı sayısı"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,297 @@
+import os
+import csv
+import json
+import time
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Hisse kodu, ad, sektör ve endeks üyeliklerini içeren yerel dizin
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(__file__), "data", "bist_symbols.csv")
+DEFAULT_VALIDATION_PATH = os.path.join(".cache", "bist", "symbol_validation.json")
+SYMBOL_SUFFIX = ".IS"
+
+# Türkçe büyük/küçük harf dönüşümü (str.lower "I" ve "İ" için yanlış sonuç verir)
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+# Aramada "turk" yazan kullanıcı "Türk" ile eşleşsin diye harfler sadeleştirilir
+_ASCII_FOLD = str.maketrans("çğıöşü", "cgiosu")
+
+def normalize(text: str) -> str:
+    """Arama için metni Türkçe kurallarla küçük harfe çevirir ve sadeleştirir"""
+    return text.translate(_TURKISH_LOWER).lower().translate(_ASCII_FOLD).strip()
+
+def to_symbol(code: str) -> str:
+    """Borsa kodunu yfinance sembolüne çevirir (THYAO -> THYAO.IS)"""
+    code = code.strip().upper()
+    return code if code.endswith(SYMBOL_SUFFIX) else f"{code}{SYMBOL_SUFFIX}"
+
+class SymbolRegistry:
+    """
+    BIST hisse evreninin yerel dizini
+
+    Dizin ilk erişimde bir kez okunur. Kodlar ve adlar sıralı listelerde
+    tutulur; önek araması ikili arama (bisect) ile yapılır, böylece her
+    tuş vuruşunda tüm liste taranmaz.
+
+    Dizinde olmayan hisselerin geçerliliği toplu olarak kontrol edilir ve
+    sonuçlar diskte saklanır; aynı hisse için tekrar ağ isteği yapılmaz.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, validation_path: str = DEFAULT_VALIDATION_PATH,
+                 validation_max_age: float = 7 * 24 * 3600):
+        """
+        Args:
+            path: Hisse dizini dosyası (noktalı virgülle ayrılmış CSV)
+            validation_path: Doğrulama sonuçlarının saklandığı dosya
+            validation_max_age: Doğrulama sonuçlarının geçerlilik süresi (saniye)
+        """
+        self.path = path
+        self.validation_path = validation_path
+        self.validation_max_age = validation_max_age
+        self._lock = threading.Lock()
+        self._records = None
+        self._codes = []
+        self._names = []
+        self._validation = None
+
+    def _load(self) -> Dict[str, Dict]:
+        """Dizini ilk erişimde okur"""
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    records = {}
+                    with open(self.path, encoding="utf-8", newline="") as f:
+                        for row in csv.DictReader(f, delimiter=";"):
+                            symbol = to_symbol(row['code'])
+                            records[symbol] = {
+                                'symbol': symbol,
+                                'name': row['name'],
+                                'sector': row['sector'],
+                                'indices': [index for index in row['indices'].split("|") if index],
+                            }
+                    self._build_search(records)
+                    self._records = records
+        return self._records
+
+    def _build_search(self, records: Dict[str, Dict]) -> None:
+        """Önek araması için sıralı kod ve ad listelerini oluşturur"""
+        self._codes = sorted((symbol, symbol) for symbol in records)
+        self._names = sorted((normalize(record['name']), symbol) for symbol, record in records.items())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, symbol: str) -> bool:
+        return to_symbol(symbol) in self._load()
+
+    def symbols(self, index: Optional[str] = None, sector: Optional[str] = None) -> List[str]:
+        """
+        Hisse kodlarını sıralı döndürür
+
+        Args:
+            index: Sadece bu endeksteki hisseler (örn: "XU030")
+            sector: Sadece bu sektördeki hisseler
+
+        Returns:
+            List[str]: Hisse kodları
+        """
+        records = self._load()
+        return [symbol for _, symbol in self._codes
+                if (index is None or index in records[symbol]['indices'])
+                and (sector is None or records[symbol]['sector'] == sector)]
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Hissenin dizin kaydını döndürür (ad, sektör, endeksler)"""
+        return self._load().get(to_symbol(symbol))
+
+    def name(self, symbol: str) -> str:
+        """Hissenin adını döndürür; dizinde yoksa kodu döndürür"""
+        record = self.get(symbol)
+        return record['name'] if record else symbol
+
+    def sectors(self) -> List[str]:
+        """Dizindeki sektörleri döndürür"""
+        return sorted({record['sector'] for record in self._load().values()})
+
+    def indices(self) -> List[str]:
+        """Dizindeki endeksleri döndürür"""
+        return sorted({index for record in self._load().values() for index in record['indices']})
+
+    def options(self) -> Dict[str, str]:
+        """Seçim kutuları için hisse kodu -> ad eşlemesi"""
+        records = self._load()
+        return {symbol: records[symbol]['name'] for _, symbol in self._codes}
+
+    @staticmethod
+    def _prefix_matches(entries: List, prefix: str, limit: int) -> List[str]:
+        """Sıralı listede öneki taşıyan kayıtları ikili arama ile bulur"""
+        matches = []
+        position = bisect.bisect_left(entries, (prefix,))
+        while position < len(entries) and entries[position][0].startswith(prefix) and len(matches) < limit:
+            matches.append(entries[position][1])
+            position += 1
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Kod veya ad önekine göre hisse arar
+
+        Kod eşleşmeleri önce gelir; ardından adı sorguyla başlayan hisseler
+        eklenir.
+
+        Args:
+            query: Arama metni (örn: "thy", "türk")
+            limit: En fazla sonuç sayısı
+
+        Returns:
+            List[str]: Hisse kodları
+        """
+        self._load()
+        if not query.strip():
+            return [symbol for _, symbol in self._codes[:limit]]
+
+        results = self._prefix_matches(self._codes, query.strip().upper(), limit)
+        for symbol in self._prefix_matches(self._names, normalize(query), limit):
+            if len(results) >= limit:
+                break
+            if symbol not in results:
+                results.append(symbol)
+        return results
+
+    def add(self, symbol: str, name: str, sector: str = "", indices: Iterable[str] = ()) -> None:
+        """
+        Dizine hisse ekler veya kaydını günceller
+
+        Args:
+            symbol: Hisse kodu
+            name: Şirket adı
+            sector: Sektör
+            indices: Endeks üyelikleri
+        """
+        records = self._load()
+        with self._lock:
+            symbol = to_symbol(symbol)
+            records[symbol] = {'symbol': symbol, 'name': name, 'sector': sector, 'indices': list(indices)}
+            self._build_search(records)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Dizini CSV dosyasına yazar"""
+        records = self._load()
+        path = path or self.path
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter=";", lineterminator="\n")
+            writer.writerow(['code', 'name', 'sector', 'indices'])
+            for _, symbol in self._codes:
+                record = records[symbol]
+                writer.writerow([symbol[:-len(SYMBOL_SUFFIX)], record['name'], record['sector'],
+                                 "|".join(record['indices'])])
+        os.replace(tmp_path, path)
+
+    def _load_validation(self) -> Dict[str, Dict]:
+        if self._validation is None:
+            try:
+                with open(self.validation_path, encoding="utf-8") as f:
+                    self._validation = json.load(f)
+            except (OSError, ValueError):
+                self._validation = {}
+        return self._validation
+
+    def _save_validation(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.validation_path) or ".", exist_ok=True)
+            tmp_path = f"{self.validation_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._validation, f)
+            os.replace(tmp_path, self.validation_path)
+        except OSError as e:
+            print(f"Doğrulama önbelleği yazılamadı: {str(e)}")
+
+    def validate(self, symbols: Iterable[str], check=None) -> Dict[str, bool]:
+        """
+        Hisse kodlarının geçerliliğini toplu olarak kontrol eder
+
+        Dizindeki hisseler ağ isteği yapılmadan geçerli sayılır. Diğerleri
+        önce diskteki doğrulama önbelleğinde aranır; kalanlar tek bir toplu
+        istekle kontrol edilip önbelleğe yazılır.
+
+        Args:
+            symbols: Hisse kodları
+            check: Hisse listesi alıp geçerli olanları döndüren fonksiyon
+                (None ise yfinance ile toplu fiyat sorgusu yapılır)
+
+        Returns:
+            Dict: Hisse kodu -> geçerli ise True
+        """
+        records = self._load()
+        validation = self._load_validation()
+        now = time.time()
+
+        results = {}
+        unknown = []
+        for symbol in dict.fromkeys(to_symbol(symbol) for symbol in symbols):
+            cached = validation.get(symbol)
+            if symbol in records:
+                results[symbol] = True
+            elif cached is not None and now - cached['checked_at'] < self.validation_max_age:
+                results[symbol] = cached['valid']
+            else:
+                unknown.append(symbol)
+
+        if unknown:
+            from .upstream import call_upstream
+            result = call_upstream(lambda: (check or batch_check_symbols)(unknown))
+            if not result.ok:
+                # Hata durumunda sonuç önbelleğe yazılmaz, sonraki çağrıda tekrar denenir
+                print(f"Hisse doğrulama hatası: [{result.status}] {result.error}")
+                results.update({symbol: False for symbol in unknown})
+                return results
+            valid = set(result.data)
+
+            for symbol in unknown:
+                results[symbol] = symbol in valid
+                validation[symbol] = {'valid': symbol in valid, 'checked_at': now}
+            self._save_validation()
+
+        return results
+
+def batch_check_symbols(symbols: List[str]) -> List[str]:
+    """
+    Hisselerin son günlerde fiyatı olup olmadığını tek istekle kontrol eder
+
+    Args:
+        symbols: Hisse kodları
+
+    Returns:
+        List[str]: Fiyat verisi bulunan hisseler
+    """
+    import yfinance as yf
+    from .upstream import shared_session
+
+    data = yf.download(symbols, period="5d", interval="1d", group_by="ticker", progress=False,
+                       threads=True, auto_adjust=False, session=shared_session())
+    if data is None or data.empty:
+        return []
+
+    valid = []
+    for symbol in symbols:
+        try:
+            close = data[symbol]['Close']
+        except KeyError:
+            # Tek hissede bazı sürümler sütunları hisse koduyla gruplamaz
+            if len(symbols) > 1 or 'Close' not in data:
+                continue
+            close = data['Close']
+        if close.notna().to_numpy().any():
+            valid.append(symbol)
+    return valid
+
+# Süreç genelinde paylaşılan dizin; dosya ilk kullanımda okunur
+_registry = None
+
+def get_registry() -> SymbolRegistry:
+    """Paylaşılan hisse dizinini döndürür"""
+    global _registry
+    if _registry is None:
+        _registry = SymbolRegistry()
+    return _registry
@@ -1,24 +1,68 @@
 import pandas as pd
 import numpy as np
-import ta
 from typing import Dict, List, Optional, Tuple
-from .config import INDICATORS_CONFIG
+from .config import INDICATORS_CONFIG, INDICATOR_BACKEND, PATTERN_CONFIG, TIMEFRAMES, VOLUME_PROFILE_CONFIG
+from . import chart_patterns, kernels
+from .volume_profile import VolumeProfile
+from .singleflight import SingleFlight
+
+# Birden fazla seri üreten indikatörlerin çıktı adları
+INDICATOR_OUTPUTS = {
+    'macd': ['macd', 'macd_signal', 'macd_histogram'],
+    'bollinger': ['bb_upper', 'bb_middle', 'bb_lower'],
+    'stoch': ['stoch_k', 'stoch_d'],
+}
+
+def indicator_outputs(indicators: List[str]) -> List[str]:
+    """İndikatörlerin `TechnicalAnalyzer.indicators` içindeki seri adlarını döndürür"""
+    outputs = []
+    for indicator in indicators:
+        outputs.extend(INDICATOR_OUTPUTS.get(indicator, [indicator]))
+    return outputs
+
+def _ta():
+    """ta kütüphanesini ilk kullanımda yükler"""
+    import ta
+    return ta
 
 class TechnicalAnalyzer:
     """Teknik analiz hesaplamaları yapan sınıf"""
     
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, backend: Optional[str] = None, base_timeframe: str = "1d",
+                 indicator_cache=None):
         """
         Args:
             data: OHLCV verileri içeren DataFrame
+            backend: İndikatör motoru ("native" veya "ta"). None ise
+                konfigürasyondaki INDICATOR_BACKEND kullanılır
+            base_timeframe: Verinin zaman dilimi (çoklu zaman dilimi analizi için)
+            indicator_cache: IndicatorCache objesi. Verilirse indikatörler
+                diskten okunur, yeni barlar için sadece devam ettirilir
         """
-        self.data = data.copy()
+        # Veri yerinde değiştirilmediği için sığ kopya yeterlidir; memory-map
+        # dilimleri (HistoryStore) belleğe kopyalanmadan kullanılır
+        self.data = data.copy(deep=False)
+        self.backend = backend or INDICATOR_BACKEND
+        self.base_timeframe = base_timeframe
+        self.indicator_cache = indicator_cache
+        self._timeframes = {}
         self.indicators = {}
         self.signals = {}
         
+        # Özet, sinyal ve alert hesaplarının ortak kullandığı metrikler
+        # (ADX, hacim ortalaması, fiyat trendi) bir kez hesaplanıp saklanır
+        self._memo = {}
+        self._adx_states = {}
+        self._active_indicators = []
+        
         # Veri kontrolü
+        self._validate_columns(self.data)
+    
+    @staticmethod
+    def _validate_columns(data: pd.DataFrame) -> None:
+        """Verinin OHLCV sütunlarını içerdiğini kontrol eder"""
         required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-        if not all(col in self.data.columns for col in required_columns):
+        if not all(col in data.columns for col in required_columns):
             raise ValueError("Veri OHLCV formatında olmalıdır")
     
     def add_indicator(self, indicator_name: str) -> None:
@@ -45,7 +89,233 @@ class TechnicalAnalyzer:
         }
         
         if indicator_name in method_map:
-            method_map[indicator_name](indicator_name)
+            if self.indicator_cache is not None:
+                self.indicators.update(self.indicator_cache.get(
+                    indicator_name, self.data, lambda data: self._compute_indicator(indicator_name, data),
+                    backend=self.backend
+                ))
+            else:
+                method_map[indicator_name](indicator_name)
+            if indicator_name not in self._active_indicators:
+                self._active_indicators.append(indicator_name)
+    
+    def _compute_indicator(self, indicator_name: str, data: pd.DataFrame) -> Dict[str, pd.Series]:
+        """İndikatörü önbelleğe bakmadan verilen barlar üzerinde hesaplar"""
+        analyzer = TechnicalAnalyzer(data, backend=self.backend)
+        analyzer.add_indicator(indicator_name)
+        return analyzer.indicators
+    
+    def append_data(self, new_data: pd.DataFrame) -> None:
+        """
+        Analize yeni barlar ekler
+        
+        Memoize edilmiş ADX, hacim ortalamaları ve hacim profilleri baştan
+        hesaplanmaz, sadece yeni barlar için devam ettirilir; eklenmiş
+        indikatörler yeniden hesaplanır (önbellek verildiyse sadece yeni
+        barlar için).
+        
+        Args:
+            new_data: Yeni OHLCV barları
+        """
+        self._validate_columns(new_data)
+        if new_data.empty:
+            return
+        
+        old_length = len(self.data)
+        self.data = pd.concat([self.data, new_data])
+        
+        memo, self._memo = self._memo, {}
+        adx_states, self._adx_states = self._adx_states, {}
+        self._timeframes = {}
+        
+        for key, values in memo.items():
+            name, window = key
+            if name == 'adx' and window in adx_states:
+                high = new_data['High'].to_numpy(dtype=np.float64)
+                low = new_data['Low'].to_numpy(dtype=np.float64)
+                close = new_data['Close'].to_numpy(dtype=np.float64)
+                if np.isfinite(high).all() and np.isfinite(low).all() and np.isfinite(close).all():
+                    new_values, self._adx_states[window] = kernels.adx_update(adx_states[window], high, low, close)
+                    self._memo[key] = pd.concat([values, pd.Series(new_values, index=new_data.index, name='adx')])
+            elif name == 'volume_sma':
+                # Yeni barların penceresini kapsayan kuyruk yeterlidir
+                tail = self.data['Volume'].iloc[max(0, old_length - window + 1):]
+                new_values = tail.rolling(window=window, min_periods=1).mean().iloc[-len(new_data):]
+                self._memo[key] = pd.concat([values, new_values])
+            elif name == 'volume_profile':
+                values.update(new_data)
+                self._memo[key] = values
+        
+        for indicator_name in self._active_indicators:
+            self.add_indicator(indicator_name)
+    
+    def resample(self, timeframe: str) -> pd.DataFrame:
+        """
+        Temel seriyi daha yüksek bir zaman dilimine çevirir
+        
+        Her yüksek zaman dilimi barı, grubundaki son temel barın zamanıyla
+        etiketlenir; böylece bir bar ancak verisinin tamamı oluştuğunda
+        (ya da son grupta, eldeki son barda) görünür hale gelir.
+        
+        Args:
+            timeframe: Hedef zaman dilimi (TIMEFRAMES anahtarı)
+            
+        Returns:
+            DataFrame: Yeniden örneklenmiş OHLCV verileri
+        """
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Desteklenmeyen zaman dilimi: {timeframe}")
+        
+        index = self.data.index
+        if getattr(index, 'tz', None) is not None:
+            # Periyotlar yerel saate göre belirlenir
+            index = index.tz_localize(None)
+        periods = index.to_period(TIMEFRAMES[timeframe]['period'])
+        
+        grouped = self.data.groupby(periods, sort=False)
+        resampled = grouped.agg({
+            'Open': 'first',
+            'High': 'max',
+            'Low': 'min',
+            'Close': 'last',
+            'Volume': 'sum'
+        })
+        last_positions = pd.Series(np.arange(len(self.data))).groupby(periods, sort=False).max()
+        resampled.index = self.data.index[last_positions.to_numpy()]
+        
+        return resampled
+    
+    def timeframe(self, timeframe: str) -> 'TechnicalAnalyzer':
+        """
+        Zaman dilimine ait analizörü döndürür
+        
+        Her zaman dilimi kendi analizörüyle bir kez oluşturulur ve
+        indikatörleri ayrı ayrı saklanır.
+        
+        Args:
+            timeframe: Zaman dilimi (TIMEFRAMES anahtarı)
+            
+        Returns:
+            TechnicalAnalyzer: Zaman dilimi analizörü
+        """
+        if timeframe == self.base_timeframe:
+            return self
+        
+        if timeframe not in self._timeframes:
+            self._timeframes[timeframe] = TechnicalAnalyzer(
+                self.resample(timeframe), backend=self.backend, base_timeframe=timeframe
+            )
+        return self._timeframes[timeframe]
+    
+    def multi_timeframe(self, indicators: List[str], timeframes: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        İndikatörleri birden fazla zaman diliminde hesaplar ve temel indekse hizalar
+        
+        Yüksek zaman dilimi değerleri ileriye doğru taşınır; bir temel bar
+        sadece o ana kadar oluşmuş yüksek zaman dilimi barlarını görür.
+        
+        Args:
+            indicators: Hesaplanacak indikatörler
+            timeframes: Zaman dilimleri (None ise tüm TIMEFRAMES)
+            
+        Returns:
+            Dict: Zaman dilimi -> temel indekse hizalanmış indikatör tablosu
+        """
+        timeframes = timeframes or list(TIMEFRAMES.keys())
+        results = {}
+        
+        for timeframe in timeframes:
+            analyzer = self.timeframe(timeframe)
+            for indicator_name in indicators:
+                if indicator_name not in analyzer._active_indicators:
+                    analyzer.add_indicator(indicator_name)
+            
+            table = pd.DataFrame(
+                {name: analyzer.indicators[name] for name in indicator_outputs(indicators)},
+                index=analyzer.data.index
+            )
+            if analyzer is not self:
+                table = table.reindex(self.data.index, method='ffill')
+            results[timeframe] = table
+        
+        return results
+    
+    def timeframe_summary(self, indicators: List[str], timeframes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Zaman dilimlerinin son indikatör değerlerini yan yana döndürür
+        
+        Args:
+            indicators: İndikatörler
+            timeframes: Zaman dilimleri (None ise tüm TIMEFRAMES)
+            
+        Returns:
+            DataFrame: Satırlar indikatör, sütunlar zaman dilimi
+        """
+        tables = self.multi_timeframe(indicators, timeframes)
+        return pd.DataFrame({
+            timeframe: table.iloc[-1] if not table.empty else pd.Series(dtype=float)
+            for timeframe, table in tables.items()
+        })
+    
+    def adx(self, window: int = 14) -> pd.Series:
+        """
+        Memoize edilmiş ADX serisi
+        
+        Args:
+            window: ADX periyodu
+            
+        Returns:
+            Series: ADX değerleri
+        """
+        key = ('adx', window)
+        if key not in self._memo:
+            arrays = self._native_hlc(window)
+            if arrays is not None:
+                values, state = kernels.adx_with_state(*arrays, window=window)
+                self._memo[key] = self._series(values, 'adx')
+                if state is not None:
+                    self._adx_states[window] = state
+            else:
+                self._memo[key] = _ta().trend.adx(self.data['High'], self.data['Low'], self.data['Close'], window=window)
+        return self._memo[key]
+    
+    def volume_sma(self, window: int = 20) -> pd.Series:
+        """
+        Memoize edilmiş hacim hareketli ortalaması
+        
+        Seri başında pencere dolmamışsa mevcut barların ortalaması alınır;
+        böylece son değer `Volume.tail(window).mean()` ile aynıdır.
+        
+        Args:
+            window: Ortalama periyodu
+            
+        Returns:
+            Series: Hacim ortalaması
+        """
+        key = ('volume_sma', window)
+        if key not in self._memo:
+            self._memo[key] = self.data['Volume'].rolling(window=window, min_periods=1).mean()
+        return self._memo[key]
+    
+    def average_volume(self, window: int = 20) -> float:
+        """Son `window` barın ortalama hacmi"""
+        return self.volume_sma(window).iloc[-1]
+    
+    def price_trend(self, lookback: int = 20) -> float:
+        """
+        Memoize edilmiş fiyat trendi
+        
+        Args:
+            lookback: Geriye bakış periyodu
+            
+        Returns:
+            float: Son `lookback` bardaki yüzde fiyat değişimi
+        """
+        key = ('price_trend', lookback)
+        if key not in self._memo:
+            close = self.data['Close']
+            self._memo[key] = (close.iloc[-1] - close.iloc[-lookback]) / close.iloc[-lookback] * 100
+        return self._memo[key]
     
     def _calculate_sma(self, indicator_name: str) -> None:
         """Basit Hareketli Ortalama hesaplar"""
@@ -60,7 +330,7 @@ class TechnicalAnalyzer:
     def _calculate_rsi(self, indicator_name: str) -> None:
         """RSI hesaplar"""
         period = INDICATORS_CONFIG[indicator_name]['period']
-        self.indicators['rsi'] = ta.momentum.rsi(self.data['Close'], window=period)
+        self.indicators['rsi'] = _ta().momentum.rsi(self.data['Close'], window=period)
     
     def _calculate_macd(self, indicator_name: str) -> None:
         """MACD hesaplar"""
@@ -69,9 +339,9 @@ class TechnicalAnalyzer:
         slow = config['slow']
         signal = config['signal']
         
-        macd_line = ta.trend.macd(self.data['Close'], window_fast=fast, window_slow=slow)
-        macd_signal = ta.trend.macd_signal(self.data['Close'], window_fast=fast, window_slow=slow, window_sign=signal)
-        macd_histogram = ta.trend.macd_diff(self.data['Close'], window_fast=fast, window_slow=slow, window_sign=signal)
+        macd_line = _ta().trend.macd(self.data['Close'], window_fast=fast, window_slow=slow)
+        macd_signal = _ta().trend.macd_signal(self.data['Close'], window_fast=fast, window_slow=slow, window_sign=signal)
+        macd_histogram = _ta().trend.macd_diff(self.data['Close'], window_fast=fast, window_slow=slow, window_sign=signal)
         
         self.indicators['macd'] = macd_line
         self.indicators['macd_signal'] = macd_signal
@@ -83,9 +353,34 @@ class TechnicalAnalyzer:
         period = config['period']
         std = config['std']
         
-        self.indicators['bb_upper'] = ta.volatility.bollinger_hband(self.data['Close'], window=period, window_dev=std)
-        self.indicators['bb_middle'] = ta.volatility.bollinger_mavg(self.data['Close'], window=period)
-        self.indicators['bb_lower'] = ta.volatility.bollinger_lband(self.data['Close'], window=period, window_dev=std)
+        self.indicators['bb_upper'] = _ta().volatility.bollinger_hband(self.data['Close'], window=period, window_dev=std)
+        self.indicators['bb_middle'] = _ta().volatility.bollinger_mavg(self.data['Close'], window=period)
+        self.indicators['bb_lower'] = _ta().volatility.bollinger_lband(self.data['Close'], window=period, window_dev=std)
+    
+    def _native_hlc(self, window: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        NumPy çekirdekleri kullanılabiliyorsa High, Low, Close dizilerini döndürür
+        
+        Args:
+            window: İndikatör penceresi
+            
+        Returns:
+            Tuple: (high, low, close) dizileri; ta kullanılacaksa None
+        """
+        if self.backend != 'native':
+            return None
+        
+        high = self.data['High'].to_numpy(dtype=np.float64)
+        low = self.data['Low'].to_numpy(dtype=np.float64)
+        close = self.data['Close'].to_numpy(dtype=np.float64)
+        if not kernels.supports(high, low, close, window=window):
+            return None
+        
+        return high, low, close
+    
+    def _series(self, values: np.ndarray, name: str) -> pd.Series:
+        """Çekirdek çıktısını veri indeksine sahip Series'e çevirir"""
+        return pd.Series(values, index=self.data.index, name=name)
     
     def _calculate_stochastic(self, indicator_name: str) -> None:
         """Stokastik Osilatör hesaplar"""
@@ -93,7 +388,14 @@ class TechnicalAnalyzer:
         k_period = config['k_period']
         d_period = config['d_period']
         
-        self.indicators['stoch_k'] = ta.momentum.stoch(
+        arrays = self._native_hlc(k_period)
+        if arrays is not None:
+            stoch_k, stoch_d = kernels.stoch(*arrays, window=k_period, smooth_window=d_period)
+            self.indicators['stoch_k'] = self._series(stoch_k, 'stoch_k')
+            self.indicators['stoch_d'] = self._series(stoch_d, 'stoch_d')
+            return
+        
+        self.indicators['stoch_k'] = _ta().momentum.stoch(
             self.data['High'], self.data['Low'], self.data['Close'], window=k_period
         )
         self.indicators['stoch_d'] = self.indicators['stoch_k'].rolling(window=d_period).mean()
@@ -101,81 +403,100 @@ class TechnicalAnalyzer:
     def _calculate_williams_r(self, indicator_name: str) -> None:
         """Williams %R hesaplar"""
         period = INDICATORS_CONFIG[indicator_name]['period']
-        self.indicators['williams_r'] = ta.momentum.williams_r(
+        
+        arrays = self._native_hlc(period)
+        if arrays is not None:
+            self.indicators['williams_r'] = self._series(kernels.williams_r(*arrays, lbp=period), 'wr')
+            return
+        
+        self.indicators['williams_r'] = _ta().momentum.williams_r(
             self.data['High'], self.data['Low'], self.data['Close'], lbp=period
         )
     
     def _calculate_cci(self, indicator_name: str) -> None:
         """Emtia Kanal Endeksi hesaplar"""
         period = INDICATORS_CONFIG[indicator_name]['period']
-        self.indicators['cci'] = ta.trend.cci(
+        
+        arrays = self._native_hlc(period)
+        if arrays is not None:
+            self.indicators['cci'] = self._series(kernels.cci(*arrays, window=period), 'cci')
+            return
+        
+        self.indicators['cci'] = _ta().trend.cci(
             self.data['High'], self.data['Low'], self.data['Close'], window=period
         )
     
+    def volume_profile(self, bins: int = VOLUME_PROFILE_CONFIG['bins'],
+                       window: Optional[int] = VOLUME_PROFILE_CONFIG['window']) -> VolumeProfile:
+        """
+        Memoize edilmiş hacim profili
+        
+        Args:
+            bins: Fiyat kutusu sayısı
+            window: Profildeki bar sayısı (None ise tüm geçmiş)
+            
+        Returns:
+            VolumeProfile: Yeni barlarla artımlı güncellenen profil
+        """
+        key = ('volume_profile', (bins, window))
+        if key not in self._memo:
+            self._memo[key] = VolumeProfile.from_frame(self.data, bins=bins, window=window)
+        return self._memo[key]
+    
     def calculate_support_resistance(self, lookback: int = 20) -> Tuple[float, float]:
         """
         Destek ve direnç seviyelerini hesaplar
         
+        Seviyeler hacim profilinin fiyata en yakın yüksek hacim düğümleridir.
+        Fiyatın altında (üstünde) düğüm yoksa son `lookback` barın en düşüğü
+        (en yükseği) kullanılır.
+        
         Args:
-            lookback: Geriye bakış periyodu
+            lookback: Düğüm bulunamazsa geriye bakış periyodu
             
         Returns:
             Tuple: (destek, direnç)
         """
+        support, resistance = self.volume_profile().levels(self.data['Close'].iloc[-1])
+        
         recent_data = self.data.tail(lookback)
-        support = recent_data['Low'].min()
-        resistance = recent_data['High'].max()
+        if np.isnan(support):
+            support = recent_data['Low'].min()
+        if np.isnan(resistance):
+            resistance = recent_data['High'].max()
         
         return support, resistance
     
-    def detect_chart_patterns(self) -> Dict[str, bool]:
+    def find_chart_patterns(self, order: int = PATTERN_CONFIG['order']) -> pd.DataFrame:
+        """
+        Tüm geçmişteki grafik desenlerini bulur (memoize edilir)
+        
+        Args:
+            order: Pivotun her iki yanında bakılan bar sayısı
+            
+        Returns:
+            DataFrame: Her desen için pattern, direction, start, end, level,
+                start_date ve end_date (bkz. `chart_patterns.find_patterns`)
+        """
+        key = ('chart_patterns', order)
+        if key not in self._memo:
+            self._memo[key] = chart_patterns.find_patterns(
+                self.data['High'].to_numpy(dtype=np.float64), self.data['Low'].to_numpy(dtype=np.float64),
+                order=order, index=self.data.index
+            )
+        return self._memo[key]
+    
+    def detect_chart_patterns(self, lookback: int = PATTERN_CONFIG['lookback']) -> Dict[str, bool]:
         """
         Grafik desenlerini tespit eder
         
+        Args:
+            lookback: Son kaç barda tamamlanan desenlerin dikkate alınacağı
+            
         Returns:
             Dict: Tespit edilen desenler
         """
-        patterns = {
-            'double_top': False,
-            'double_bottom': False,
-            'head_shoulders': False,
-            'triangle': False,
-            'flag': False
-        }
-        
-        # Basit desen tespiti (geliştirilmeye açık)
-        recent_highs = self.data['High'].tail(50)
-        recent_lows = self.data['Low'].tail(50)
-        
-        # Double Top tespiti
-        highs_peaks = self._find_peaks(recent_highs.values)
-        if len(highs_peaks) >= 2:
-            patterns['double_top'] = abs(recent_highs.iloc[highs_peaks[-1]] - recent_highs.iloc[highs_peaks[-2]]) < recent_highs.mean() * 0.02
-        
-        # Double Bottom tespiti  
-        lows_valleys = self._find_valleys(recent_lows.values)
-        if len(lows_valleys) >= 2:
-            patterns['double_bottom'] = abs(recent_lows.iloc[lows_valleys[-1]] - recent_lows.iloc[lows_valleys[-2]]) < recent_lows.mean() * 0.02
-        
-        return patterns
-    
-    def _find_peaks(self, data: np.ndarray, min_distance: int = 5) -> List[int]:
-        """Tepe noktalarını bulur"""
-        peaks = []
-        for i in range(min_distance, len(data) - min_distance):
-            if all(data[i] > data[i-j] for j in range(1, min_distance + 1)) and \
-               all(data[i] > data[i+j] for j in range(1, min_distance + 1)):
-                peaks.append(i)
-        return peaks
-    
-    def _find_valleys(self, data: np.ndarray, min_distance: int = 5) -> List[int]:
-        """Dip noktalarını bulur"""
-        valleys = []
-        for i in range(min_distance, len(data) - min_distance):
-            if all(data[i] < data[i-j] for j in range(1, min_distance + 1)) and \
-               all(data[i] < data[i+j] for j in range(1, min_distance + 1)):
-                valleys.append(i)
-        return valleys
+        return chart_patterns.recent_patterns(self.find_chart_patterns(), len(self.data), lookback)
     
     def calculate_trend_strength(self) -> Dict[str, float]:
         """
@@ -185,13 +506,13 @@ class TechnicalAnalyzer:
             Dict: Trend bilgileri
         """
         # ADX hesapla
-        adx = ta.trend.adx(self.data['High'], self.data['Low'], self.data['Close'], window=14)
+        adx = self.adx(14)
         
         # Fiyat trendi
-        price_trend = (self.data['Close'].iloc[-1] - self.data['Close'].iloc[-20]) / self.data['Close'].iloc[-20] * 100
+        price_trend = self.price_trend(20)
         
         # Volume trendi
-        volume_trend = (self.data['Volume'].tail(5).mean() - self.data['Volume'].tail(20).mean()) / self.data['Volume'].tail(20).mean() * 100
+        volume_trend = (self.average_volume(5) - self.average_volume(20)) / self.average_volume(20) * 100
         
         return {
             'adx': adx.iloc[-1] if not pd.isna(adx.iloc[-1]) else 0,
@@ -237,10 +558,48 @@ class TechnicalAnalyzer:
             'price_change': price_change,
             'support_level': support,
             'resistance_level': resistance,
+            'volume_nodes': self.volume_profile().nodes().tolist(),
+            'point_of_control': self.volume_profile().poc(),
             'trend_strength': trend_info,
             'chart_patterns': patterns,
             'latest_indicators': self.get_latest_indicators(),
-            'volume_spike': self.data['Volume'].iloc[-1] > self.data['Volume'].tail(20).mean() * 1.5
+            'volume_spike': self.data['Volume'].iloc[-1] > self.average_volume(20) * 1.5
         }
         
-        return summary 
\ No newline at end of file
+        return summary 
+
+# Aynı veri ve indikatörler için eşzamanlı analizler süreç genelinde birleştirilir
+_analysis_flight = SingleFlight()
+
+def build_analyzer(data: pd.DataFrame, indicators: List[str], key: Optional[Tuple] = None,
+                   indicator_cache=None) -> TechnicalAnalyzer:
+    """
+    İndikatörleri ve trend metrikleri hesaplanmış analiz nesnesi oluşturur
+
+    `key` verildiğinde aynı veri ve indikatörlerle eşzamanlı gelen
+    çağrılar (örn. aynı hisseyi açan Streamlit oturumları) hesaplamayı
+    tekrarlamaz, ilk çağrının analiz nesnesini paylaşır.
+
+    Args:
+        data: OHLCV verileri
+        indicators: Hesaplanacak indikatörler
+        key: Verinin kimliği (örn: (hisse, periyot, aralık)). None ise birleştirme yapılmaz
+        indicator_cache: Diskteki indikatör önbelleği (IndicatorCache)
+
+    Returns:
+        TechnicalAnalyzer: Analiz nesnesi
+    """
+    def compute():
+        analyzer = TechnicalAnalyzer(data, indicator_cache=indicator_cache)
+        for indicator in indicators:
+            analyzer.add_indicator(indicator)
+        # Sinyal ve alert hesaplarının ortak metrikleri paylaşılmadan önce doldurulur
+        analyzer.calculate_trend_strength()
+        return analyzer
+
+    if key is None:
+        return compute()
+
+    # Aynı anahtarın farklı sürümdeki verisi (yeni bar) ayrı hesaplanır
+    flight_key = (key, len(data), data.index[-1] if len(data) else None, tuple(indicators))
+    return _analysis_flight.do(flight_key, compute)
@@ -0,0 +1,238 @@
+import time
+import random
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .config import UPSTREAM_CONFIG
+
+# Yahoo Finance isteklerinin devre kesici anahtarı
+YAHOO_HOST = "finance.yahoo.com"
+
+# Sonuç durumları
+STATUS_OK = "ok"
+STATUS_NO_DATA = "no_data"  # Kaynak çalışıyor ama hisse için veri yok
+STATUS_UPSTREAM_DOWN = "upstream_down"  # Ağ hatası, zaman aşımı, istek sınırı
+STATUS_CIRCUIT_OPEN = "circuit_open"  # Devre açık, istek hiç gönderilmedi
+STATUS_ERROR = "error"  # Beklenmeyen hata (veri işleme, vb.)
+
+# yfinance'in "veri yok" anlamına gelen hataları (yfinance import edilmeden isimle eşleşir)
+NO_DATA_ERRORS = {'YFPricesMissingError', 'YFTickerMissingError', 'YFTzMissingError', 'YFInvalidPeriodError'}
+UPSTREAM_ERRORS = {'YFRateLimitError'}
+
+class FetchResult:
+    """
+    Dış kaynak çağrısının sonucu
+
+    `status` ile "veri yok" ve "kaynak erişilemez" durumları ayırt edilir.
+    """
+
+    def __init__(self, data: Any = None, status: str = STATUS_OK, error: Optional[str] = None,
+                 attempts: int = 0, symbol: Optional[str] = None):
+        """
+        Args:
+            data: Dönen veri (başarısızsa None)
+            status: Sonuç durumu (STATUS_* sabitleri)
+            error: Hata mesajı
+            attempts: Yapılan deneme sayısı
+            symbol: İlgili hisse kodu
+        """
+        self.data = data
+        self.status = status
+        self.error = error
+        self.attempts = attempts
+        self.symbol = symbol
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    @property
+    def retryable(self) -> bool:
+        """Hatanın geçici olup olmadığı (kaynak tekrar denenebilir)"""
+        return self.status in (STATUS_UPSTREAM_DOWN, STATUS_CIRCUIT_OPEN)
+
+    def to_dict(self) -> Dict:
+        return {'symbol': self.symbol, 'status': self.status, 'error': self.error, 'attempts': self.attempts}
+
+    def __repr__(self) -> str:
+        return f"FetchResult(symbol={self.symbol!r}, status={self.status!r}, error={self.error!r})"
+
+class CircuitBreaker:
+    """
+    Sunucu bazlı devre kesici
+
+    Art arda `failure_threshold` hata olunca devre açılır ve `reset_timeout`
+    boyunca istekler hiç gönderilmeden reddedilir. Süre dolunca tek bir
+    deneme isteğine izin verilir (yarı açık); başarılı olursa devre kapanır,
+    başarısız olursa tekrar açılır.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = UPSTREAM_CONFIG['failure_threshold'],
+                 reset_timeout: float = UPSTREAM_CONFIG['reset_timeout'],
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold: Devreyi açan art arda hata sayısı
+            reset_timeout: Açık devrenin deneme isteğine izin vermeden önce beklediği süre
+            clock: Zaman kaynağı
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """İsteğin gönderilip gönderilemeyeceğini döndürür"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                # Sadece bir deneme isteği geçer; diğerleri sonucu beklemeden reddedilir
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """Açık devrenin deneme isteğine izin vermesine kalan süre (saniye)"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(host: str = YAHOO_HOST) -> CircuitBreaker:
+    """Sunucunun süreç genelinde paylaşılan devre kesicisini döndürür"""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+_session = None
+_session_lock = threading.Lock()
+
+def shared_session():
+    """
+    Tüm dış istekler için süreç genelinde tek, kalıcı bağlantılı oturum
+
+    yfinance'in Yahoo için önerdiği curl_cffi oturumu varsa o kullanılır;
+    yoksa bağlantı havuzlu bir requests oturumu oluşturulur. Tekrar denemeler
+    `call_upstream` tarafından yapıldığı için oturumun kendi tekrar
+    mekanizması kapalıdır.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                try:
+                    from curl_cffi import requests as curl_requests
+                    # Her thread kendi curl bağlantısını tekrar kullanır
+                    _session = curl_requests.Session(impersonate="chrome")
+                except ImportError:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=UPSTREAM_CONFIG['pool_size'],
+                                          pool_maxsize=UPSTREAM_CONFIG['pool_size'], max_retries=0)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                    })
+                    _session = session
+    return _session
+
+def classify_error(error: Exception) -> str:
+    """
+    Hatayı sonuç durumuna çevirir
+
+    Returns:
+        str: STATUS_NO_DATA, STATUS_UPSTREAM_DOWN veya STATUS_ERROR
+    """
+    name = type(error).__name__
+    if name in NO_DATA_ERRORS:
+        return STATUS_NO_DATA
+    # requests ve curl_cffi bağlantı/zaman aşımı hataları OSError türevidir
+    if name in UPSTREAM_ERRORS or isinstance(error, (OSError, TimeoutError)):
+        return STATUS_UPSTREAM_DOWN
+    return STATUS_ERROR
+
+def backoff_delay(attempt: int, base: float = UPSTREAM_CONFIG['backoff_base'],
+                  maximum: float = UPSTREAM_CONFIG['backoff_max']) -> float:
+    """
+    Tam rastgele (full jitter) üstel bekleme süresi
+
+    Aynı anda hata alan istemciler aynı anda tekrar denemesin diye süre
+    [0, min(maximum, base * 2^attempt)] aralığından rastgele seçilir.
+    """
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+def call_upstream(function: Callable[[], Any], host: str = YAHOO_HOST, symbol: Optional[str] = None,
+                  retries: int = UPSTREAM_CONFIG['retries'],
+                  sleep: Callable[[float], None] = time.sleep) -> FetchResult:
+    """
+    Dış kaynak çağrısını devre kesici ve tekrar denemelerle yapar
+
+    Sadece geçici hatalar (ağ, zaman aşımı, istek sınırı) tekrar denenir ve
+    devre kesiciye işlenir; "veri yok" hataları hemen döner.
+
+    Args:
+        function: Çağrıyı yapan argümansız fonksiyon
+        host: Devre kesici anahtarı
+        symbol: İlgili hisse kodu (sonuçta raporlanır)
+        retries: İlk denemeden sonraki en fazla tekrar sayısı
+        sleep: Bekleme fonksiyonu
+
+    Returns:
+        FetchResult: Çağrının sonucu; istisna fırlatılmaz
+    """
+    breaker = get_breaker(host)
+    attempts = 0
+    result = None
+
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            if result is not None:
+                return result
+            return FetchResult(status=STATUS_CIRCUIT_OPEN, symbol=symbol, attempts=attempts,
+                               error=f"{host} geçici olarak devre dışı ({breaker.retry_after():.0f} sn)")
+
+        attempts += 1
+        try:
+            data = function()
+        except Exception as e:
+            status = classify_error(e)
+            result = FetchResult(status=status, error=str(e), attempts=attempts, symbol=symbol)
+            if status != STATUS_UPSTREAM_DOWN:
+                # Kaynak yanıt verdi; devre açısından başarılı sayılır
+                breaker.record_success()
+                return result
+            breaker.record_failure()
+            if attempt < retries:
+                sleep(backoff_delay(attempt))
+            continue
+
+        breaker.record_success()
+        return FetchResult(data=data, attempts=attempts, symbol=symbol)
+
+    return result
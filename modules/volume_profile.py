@@ -0,0 +1,268 @@
+"""
+Hacim profili (volume-at-price) ile destek ve direnç seviyeleri
+
+Her barın hacmi, barın düşük-yüksek aralığının kapladığı fiyat kutularına
+örtüşme oranında dağıtılır. Hacmin yoğunlaştığı kutular (yüksek hacim
+düğümleri) destek ve direnç seviyesi olarak kullanılır: fiyatın altındaki
+en yakın düğüm destek, üstündeki en yakın düğüm dirençtir.
+
+Hesaplar NumPy yayınlama (broadcasting) ile yapılır; aynı fonksiyonlar tek
+hisse için (bar, kutu) ve tüm evren için (hisse, bar, kutu) boyutlarında
+çalışır.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from .config import VOLUME_PROFILE_CONFIG
+
+# Toplu hesapta (hisse x bar x kutu) ara dizisinin en fazla eleman sayısı
+BATCH_CELLS = 4_000_000
+
+def bin_edges(low: np.ndarray, high: np.ndarray, bins: int = VOLUME_PROFILE_CONFIG['bins'],
+              margin: float = VOLUME_PROFILE_CONFIG['margin']) -> np.ndarray:
+    """
+    Fiyat aralığını kapsayan eşit genişlikte kutu sınırları
+
+    Aralık her iki yönde `margin` oranında genişletilir; böylece küçük
+    taşmalarda profil yeniden kurulmaz. Son eksen barlar üzerindedir, önceki
+    eksenler (örn. hisse) korunur.
+
+    Returns:
+        ndarray: (..., bins + 1) boyutunda kutu sınırları
+    """
+    lowest = np.nanmin(low, axis=-1)
+    highest = np.nanmax(high, axis=-1)
+    pad = np.maximum((highest - lowest) * margin, np.abs(highest) * 1e-6 + 1e-12)
+    steps = np.linspace(0.0, 1.0, bins + 1)
+    return (lowest - pad)[..., None] + ((highest - lowest) + 2 * pad)[..., None] * steps
+
+def bar_volumes(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                edges: np.ndarray) -> np.ndarray:
+    """
+    Her barın hacminin fiyat kutularına dağılımı
+
+    Hacim, barın aralığıyla kutunun örtüştüğü uzunluk oranında paylaştırılır.
+    Aralığı sıfır olan barların hacmi kapanışın kutusuna yazılır. NaN barlar
+    (örn. toplu hesaptaki dolgu) hacim taşımaz.
+
+    Args:
+        high, low, close, volume: (..., bar) boyutunda diziler
+        edges: (..., kutu + 1) boyutunda kutu sınırları
+
+    Returns:
+        ndarray: (..., bar, kutu) boyutunda hacimler
+    """
+    lower = edges[..., None, :-1]
+    upper = edges[..., None, 1:]
+    high = high[..., None]
+    low = low[..., None]
+    span = high - low
+
+    overlap = np.clip(np.minimum(high, upper) - np.maximum(low, lower), 0.0, None)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(span > 0, overlap / span, 0.0)
+    # Aralığı olmayan barlar kapanışın bulunduğu kutuya
+    point = (span <= 0) & (close[..., None] >= lower) & (close[..., None] < upper)
+    share = np.where(point, 1.0, share)
+
+    contribution = share * volume[..., None]
+    return np.nan_to_num(contribution, nan=0.0, posinf=0.0, neginf=0.0)
+
+def high_volume_nodes(histogram: np.ndarray,
+                      threshold: float = VOLUME_PROFILE_CONFIG['node_threshold']) -> np.ndarray:
+    """
+    Yüksek hacim düğümlerini işaretler
+
+    Düğüm, hacmi iki komşusundan büyük (soldakine eşit olabilir) ve ortalama
+    kutu hacminin `threshold` katından fazla olan kutudur.
+
+    Returns:
+        ndarray: histogram ile aynı boyutta bool maske
+    """
+    padded = np.pad(histogram, [(0, 0)] * (histogram.ndim - 1) + [(1, 1)])
+    left, center, right = padded[..., :-2], padded[..., 1:-1], padded[..., 2:]
+    mean = histogram.mean(axis=-1, keepdims=True)
+    return (center >= left) & (center > right) & (center > threshold * mean) & (center > 0)
+
+def nearest_levels(centers: np.ndarray, nodes: np.ndarray, price) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fiyatın altındaki ve üstündeki en yakın düğümler
+
+    Returns:
+        Tuple: (destek, direnç); o yönde düğüm yoksa NaN
+    """
+    price = np.asarray(price, dtype=np.float64)[..., None]
+    below = np.where(nodes & (centers < price), centers, -np.inf).max(axis=-1)
+    above = np.where(nodes & (centers > price), centers, np.inf).min(axis=-1)
+    return np.where(np.isfinite(below), below, np.nan), np.where(np.isfinite(above), above, np.nan)
+
+class VolumeProfile:
+    """
+    Artımlı güncellenen hacim profili
+
+    `window` verilirse son `window` bar (kayan profil), verilmezse tüm barlar
+    (sabitlenmiş profil) kullanılır. Yeni barlar geldiğinde sadece onların
+    katkısı eklenir, pencereden çıkan barların katkısı çıkarılır. Fiyat kutu
+    aralığının dışına taşarsa veya aralığın yarısından azını kullanırsa
+    profil eldeki barlardan yeniden kurulur.
+    """
+
+    def __init__(self, bins: int = VOLUME_PROFILE_CONFIG['bins'],
+                 window: Optional[int] = VOLUME_PROFILE_CONFIG['window'],
+                 threshold: float = VOLUME_PROFILE_CONFIG['node_threshold'],
+                 margin: float = VOLUME_PROFILE_CONFIG['margin']):
+        """
+        Args:
+            bins: Fiyat kutusu sayısı
+            window: Profildeki bar sayısı (None ise tüm barlar)
+            threshold: Düğüm eşiği (ortalama kutu hacminin katı)
+            margin: Kutu aralığının fiyat aralığına göre genişletme oranı
+        """
+        self.bins = bins
+        self.window = window
+        self.threshold = threshold
+        self.margin = margin
+        self.edges = None
+        self.histogram = np.zeros(bins)
+        self._bars = np.empty((4, 0))  # high, low, close, volume
+        self._contributions = np.empty((0, bins))
+        self.rebuilds = 0
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, **kwargs) -> 'VolumeProfile':
+        """OHLCV verisinden profil oluşturur"""
+        profile = cls(**kwargs)
+        profile.update(data)
+        return profile
+
+    @property
+    def centers(self) -> np.ndarray:
+        """Kutu orta noktaları"""
+        if self.edges is None:
+            return np.empty(0)
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    @staticmethod
+    def _arrays(data: pd.DataFrame) -> np.ndarray:
+        return np.vstack([data[column].to_numpy(dtype=np.float64) for column in ['High', 'Low', 'Close', 'Volume']])
+
+    def _rebuild(self) -> None:
+        """Kutuları eldeki barlara göre yeniden kurar"""
+        high, low, close, volume = self._bars
+        self.edges = bin_edges(low, high, self.bins, self.margin)
+        self._contributions = bar_volumes(high, low, close, volume, self.edges)
+        self.histogram = self._contributions.sum(axis=0)
+        self.rebuilds += 1
+
+    def update(self, data: pd.DataFrame) -> None:
+        """
+        Profile yeni barları ekler
+
+        Args:
+            data: Yeni OHLCV barları
+        """
+        bars = self._arrays(data)
+        bars = bars[:, np.isfinite(bars[:2]).all(axis=0)]
+        if bars.shape[1] == 0:
+            return
+
+        self._bars = np.hstack([self._bars, bars])
+        excess = 0 if self.window is None else max(0, self._bars.shape[1] - self.window)
+        if excess:
+            self._bars = self._bars[:, excess:]
+
+        high, low = self._bars[0], self._bars[1]
+        if self.edges is not None:
+            lowest, highest = np.min(low), np.max(high)
+            used = (highest - lowest) / (self.edges[-1] - self.edges[0])
+            if lowest >= self.edges[0] and highest <= self.edges[-1] and used >= 0.5:
+                new = bar_volumes(*bars[:, -self._bars.shape[1]:], self.edges)
+                dropped = min(excess, len(self._contributions))
+                self.histogram = self.histogram + new.sum(axis=0) - self._contributions[:dropped].sum(axis=0)
+                # Çıkarma sonrası kayan nokta hatalarıyla oluşan küçük negatifler sıfırlanır
+                np.clip(self.histogram, 0.0, None, out=self.histogram)
+                self._contributions = np.vstack([self._contributions[dropped:], new])[-self._bars.shape[1]:]
+                return
+        self._rebuild()
+
+    def nodes(self) -> np.ndarray:
+        """Yüksek hacim düğümlerinin fiyatları (artan sırada)"""
+        if self.edges is None:
+            return np.empty(0)
+        return self.centers[high_volume_nodes(self.histogram, self.threshold)]
+
+    def poc(self) -> float:
+        """En yüksek hacimli fiyat seviyesi (point of control)"""
+        if self.edges is None or not self.histogram.any():
+            return np.nan
+        return float(self.centers[np.argmax(self.histogram)])
+
+    def levels(self, price: float) -> Tuple[float, float]:
+        """
+        Fiyata en yakın destek ve direnç düğümleri
+
+        Returns:
+            Tuple: (destek, direnç); o yönde düğüm yoksa NaN
+        """
+        if self.edges is None:
+            return np.nan, np.nan
+        nodes = high_volume_nodes(self.histogram, self.threshold)
+        support, resistance = nearest_levels(self.centers, nodes, price)
+        return float(support), float(resistance)
+
+def universe_levels(frames: Dict[str, pd.DataFrame], bins: int = VOLUME_PROFILE_CONFIG['bins'],
+                    window: int = VOLUME_PROFILE_CONFIG['window'],
+                    threshold: float = VOLUME_PROFILE_CONFIG['node_threshold'],
+                    margin: float = VOLUME_PROFILE_CONFIG['margin']) -> pd.DataFrame:
+    """
+    Tüm hisselerin hacim profili seviyelerini toplu hesaplar
+
+    Hisselerin yüksek/düşük değeri geçerli son `window` barı (hisse, bar)
+    matrisine dizilir (kısa geçmişlerde baştaki boşluklar NaN) ve profiller hisse döngüsü olmadan, bellek sınırı için parçalar
+    halinde hesaplanır. Sonuç, her hisse için `VolumeProfile` ile aynıdır.
+
+    Args:
+        frames: Hisse kodu -> OHLCV verisi
+        bins: Fiyat kutusu sayısı
+        window: Profildeki bar sayısı
+        threshold: Düğüm eşiği
+        margin: Kutu aralığı genişletme oranı
+
+    Returns:
+        DataFrame: Hisse bazında price, poc, support, resistance
+    """
+    symbols = [symbol for symbol, df in frames.items() if df is not None and not df.empty]
+    columns = ['price', 'poc', 'support', 'resistance']
+    if not symbols:
+        return pd.DataFrame(columns=columns)
+
+    # Yüksek/düşük eksik barlar `VolumeProfile.update` gibi pencereden önce atılır;
+    # her hissenin profili son `window` geçerli bardan oluşur
+    tails = []
+    for symbol in symbols:
+        arrays = VolumeProfile._arrays(frames[symbol])
+        tails.append(arrays[:, np.isfinite(arrays[:2]).all(axis=0)][:, -window:])
+    length = max(1, max(tail.shape[1] for tail in tails))
+    bars = np.full((4, len(symbols), length), np.nan)
+    for row, tail in enumerate(tails):
+        bars[:, row, length - tail.shape[1]:] = tail
+    high, low, close, volume = bars
+
+    edges = bin_edges(low, high, bins, margin)
+    histogram = np.empty((len(symbols), bins))
+    step = max(1, BATCH_CELLS // (length * bins))
+    for start in range(0, len(symbols), step):
+        chunk = slice(start, start + step)
+        histogram[chunk] = bar_volumes(high[chunk], low[chunk], close[chunk], volume[chunk],
+                                       edges[chunk]).sum(axis=-2)
+
+    centers = (edges[:, :-1] + edges[:, 1:]) / 2
+    nodes = high_volume_nodes(histogram, threshold)
+    price = np.array([frames[symbol]['Close'].iloc[-1] for symbol in symbols], dtype=np.float64)
+    support, resistance = nearest_levels(centers, nodes, price)
+    poc = np.where(histogram.any(axis=1), centers[np.arange(len(symbols)), histogram.argmax(axis=1)], np.nan)
+
+    return pd.DataFrame({'price': price, 'poc': poc, 'support': support, 'resistance': resistance},
+                        index=pd.Index(symbols, name='symbol'))
@@ -5,26 +5,507 @@ BIST Teknik Analiz Uygulaması Çalıştırma Script'i
 
 import os
 import sys
-import subprocess
 import time
+import argparse
+import subprocess
+import importlib.util
+
+# Kontrol edilecek paketler: pip paket adı -> import adı
+REQUIRED_PACKAGES = {
+    "streamlit": "streamlit",
+    "pandas": "pandas",
+    "plotly": "plotly",
+    "yfinance": "yfinance",
+    "ta": "ta",
+}
+
+# Başlangıç raporunda varsayılan olarak ölçülen modüller
+STARTUP_MODULES = [
+    "modules.config",
+    "modules.data_fetcher",
+    "modules.technical_analysis",
+    "modules.alert_system",
+]
+
+def find_missing_packages(packages=None):
+    """
+    Paketleri import etmeden, sadece import metadata'sına bakarak
+    eksik olanları bulur
+    
+    Args:
+        packages: pip paket adı -> import adı eşlemesi
+        
+    Returns:
+        List[str]: Eksik paketlerin pip adları
+    """
+    packages = packages or REQUIRED_PACKAGES
+    return [
+        package for package, module in packages.items()
+        if importlib.util.find_spec(module) is None
+    ]
 
 def check_requirements():
     """Gerekli paketlerin yüklü olup olmadığını kontrol eder"""
+    missing = find_missing_packages()
+    if missing:
+        print(f"❌ Eksik paket: {', '.join(missing)}")
+        print("📦 Gerekli paketleri yüklemek için: pip install -r requirements.txt")
+        return False
+    
+    print("✅ Tüm gerekli paketler yüklü!")
+    return True
+
+def parse_importtime(stderr):
+    """
+    `python -X importtime` çıktısını ayrıştırır
+    
+    Args:
+        stderr: Alt sürecin stderr çıktısı
+        
+    Returns:
+        List[Tuple]: (modül, kendi süresi µs, kümülatif süre µs) listesi
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Başlık satırı
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+def startup_report(modules=None, top=15):
+    """
+    Modüllerin soğuk başlangıç import sürelerini raporlar
+    
+    Args:
+        modules: Ölçülecek modüller
+        top: Listelenecek en yavaş modül sayısı
+        
+    Returns:
+        bool: Başarılı ise True
+    """
+    modules = modules or STARTUP_MODULES
+    code = "; ".join(f"import {module}" for module in modules)
+    
+    # Ölçüm temiz bir süreçte yapılır, böylece önbellekteki modüller sonucu etkilemez
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        print(f"❌ Import hatası:\n{result.stderr.splitlines()[-1]}")
+        return False
+    
+    rows = parse_importtime(result.stderr)
+    top_level = [row for row in rows if row[0] in modules]
+    
+    print("⏱️  Başlangıç süresi raporu")
+    print("=" * 50)
+    for name, _, cumulative in top_level:
+        print(f"{name:<40} {cumulative / 1000:>8.1f} ms")
+    
+    print(f"\n🐢 En yavaş {top} modül (kendi süresi):")
+    for name, self_time, cumulative in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"{name:<40} {self_time / 1000:>8.1f} ms  (kümülatif {cumulative / 1000:.1f} ms)")
+    
+    total = sum(row[1] for row in rows)
+    print("=" * 50)
+    print(f"Toplam import süresi: {total / 1000:.1f} ms ({len(rows)} modül)")
+    return True
+
+def run_load_test(args):
+    """
+    Eşzamanlı oturumlarla yük testi yapar ve sonucu kaydeder
+    
+    Args:
+        args: Ayrıştırılmış komut satırı argümanları
+        
+    Returns:
+        bool: Hata ve (istenirse) gerileme yoksa True
+    """
+    from modules.load_test import compare, format_report, load_results, run_load_test as load_test, save_result
+    
+    symbols = resolve_symbols(args) if (args.symbols or args.all or args.index) else None
+    if symbols == []:
+        return False
+    
+    try:
+        result = load_test(args.target, sessions=args.sessions, actions=args.actions, symbols=symbols,
+                           think_time=args.think_time, latency=args.latency, seed=args.seed)
+    except (ValueError, ImportError) as e:
+        print(f"❌ Yük testi başlatılamadı: {str(e)}")
+        return False
+    
+    comparison = compare(result, load_results(args.output))
+    print(format_report(result, comparison))
+    if not args.no_save:
+        print(f"💾 Sonuç kaydedildi -> {save_result(result, args.output)}")
+    
+    if result['errors']:
+        return False
+    return not (args.fail_on_regression and comparison is not None and comparison['regressions'])
+
+def run_api(args):
+    """
+    JSON API servisini başlatır
+    
+    Args:
+        args: Ayrıştırılmış komut satırı argümanları
+        
+    Returns:
+        bool: Servis başlatılabildiyse True
+    """
     try:
-        import streamlit
-        import pandas
-        import plotly
-        import yfinance
-        import ta
-        print("✅ Tüm gerekli paketler yüklü!")
-        return True
+        import uvicorn
+        from modules.api import create_app
     except ImportError as e:
-        print(f"❌ Eksik paket: {e}")
-        print("📦 Gerekli paketleri yüklemek için: pip install -r requirements.txt")
+        print(f"❌ API için starlette ve uvicorn gereklidir: pip install starlette uvicorn ({str(e)})")
+        return False
+    from modules.config import API_CONFIG
+    
+    source = None
+    if args.offline_source:
+        from modules.offline_source import OfflineSource
+        source = OfflineSource()
+    
+    host = args.host or API_CONFIG['host']
+    port = args.port or API_CONFIG['port']
+    print(f"🌐 API: http://{host}:{port}")
+    uvicorn.run(create_app(source=source), host=host, port=port)
+    return True
+
+def parse_args(argv=None):
+    """Komut satırı argümanlarını ayrıştırır"""
+    parser = argparse.ArgumentParser(description="BIST Teknik Analiz Uygulaması")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    subparsers.add_parser("app", help="Streamlit web uygulamasını başlatır (varsayılan)")
+    
+    importtime_parser = subparsers.add_parser("importtime", help="Başlangıç import sürelerini raporlar")
+    importtime_parser.add_argument("modules", nargs="*", help="Ölçülecek modüller")
+    importtime_parser.add_argument("--top", type=int, default=15, help="Listelenecek modül sayısı")
+    
+    batch_parser = subparsers.add_parser("batch", help="Arayüz olmadan toplu analiz raporu üretir")
+    batch_parser.add_argument("symbols", nargs="*", help="Hisse kodları (örn: THYAO.IS GARAN.IS)")
+    batch_parser.add_argument("--all", action="store_true", help="Hisse dizinindeki tüm hisseleri analiz et")
+    batch_parser.add_argument("--index", help="Sadece bu endeksteki hisseler (örn: XU030, XU100)")
+    batch_parser.add_argument("--period", default="1y", help="Zaman aralığı (varsayılan: 1y)")
+    batch_parser.add_argument("--interval", default="1d", help="Veri aralığı (varsayılan: 1d)")
+    batch_parser.add_argument("--indicators", help="Virgülle ayrılmış indikatörler (varsayılan: konfigürasyondakiler)")
+    batch_parser.add_argument("--output", "-o", required=True, help="Çıktı dosyası (.parquet, .jsonl, .xlsx)")
+    batch_parser.add_argument("--format", choices=["parquet", "jsonl", "excel"], help="Çıktı formatı")
+    batch_parser.add_argument("--workers", type=int, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    batch_parser.add_argument("--cache-dir", default=".cache/bist", help="Veri önbelleği klasörü")
+    batch_parser.add_argument("--offline", action="store_true", help="Sadece önbellekteki verileri kullan")
+    batch_parser.add_argument("--cache-max-age", type=float,
+                              help="Seans içinde çekilen verilerin önbellek süresi, saniye (varsayılan: 900)")
+    batch_parser.add_argument("--history", help="Memory-map geçmiş deposu klasörü (varsa veriler buradan okunur)")
+    batch_parser.add_argument("--indicator-cache", help="Diskteki indikatör önbelleği klasörü (örn: .cache/indicators)")
+    batch_parser.add_argument("--benchmark", help="Göreceli güç, beta ve alfa için endeks (örn: XU100.IS)")
+    batch_parser.add_argument("--chunk-size", type=int, default=500, help="Diske yazma parça boyutu")
+    
+    export_parser = subparsers.add_parser("export", help="Bar bazlı indikatör tablolarını veya özetleri dosyaya aktarır")
+    export_parser.add_argument("symbols", nargs="*", help="Hisse kodları (örn: THYAO.IS GARAN.IS)")
+    export_parser.add_argument("--all", action="store_true", help="Hisse dizinindeki tüm hisseleri aktar")
+    export_parser.add_argument("--index", help="Sadece bu endeksteki hisseler (örn: XU030, XU100)")
+    export_parser.add_argument("--period", default="1y", help="Zaman aralığı (varsayılan: 1y)")
+    export_parser.add_argument("--interval", default="1d", help="Veri aralığı (varsayılan: 1d)")
+    export_parser.add_argument("--indicators", help="Virgülle ayrılmış indikatörler (varsayılan: konfigürasyondakiler)")
+    export_parser.add_argument("--columns", help="Virgülle ayrılmış sütunlar (örn: symbol,date,Close,rsi)")
+    export_parser.add_argument("--start", help="Başlangıç tarihi (dahil, örn: 2024-01-01)")
+    export_parser.add_argument("--end", help="Bitiş tarihi (dahil)")
+    export_parser.add_argument("--summary", action="store_true", help="Bar tablosu yerine hisse başına analiz özeti yaz")
+    export_parser.add_argument("--output", "-o", required=True, help="Çıktı dosyası (.parquet, .jsonl, .xlsx)")
+    export_parser.add_argument("--format", choices=["parquet", "jsonl", "excel"], help="Çıktı formatı")
+    export_parser.add_argument("--cache-dir", default=".cache/bist", help="Veri önbelleği klasörü")
+    export_parser.add_argument("--offline", action="store_true", help="Sadece önbellekteki verileri kullan")
+    export_parser.add_argument("--cache-max-age", type=float,
+                              help="Seans içinde çekilen verilerin önbellek süresi, saniye (varsayılan: 900)")
+    export_parser.add_argument("--history", help="Memory-map geçmiş deposu klasörü (varsa veriler buradan okunur)")
+    export_parser.add_argument("--indicator-cache", help="Diskteki indikatör önbelleği klasörü (örn: .cache/indicators)")
+    export_parser.add_argument("--chunk-size", type=int, default=10000, help="Parça (row group) boyutu")
+    
+    loadtest_parser = subparsers.add_parser("loadtest", help="Eşzamanlı oturumlarla yük testi yapar (ağ gerekmez)")
+    loadtest_parser.add_argument("symbols", nargs="*", help="Oturumların seçtiği hisseler (varsayılan: popüler hisseler)")
+    loadtest_parser.add_argument("--all", action="store_true", help="Hisse dizinindeki tüm hisseler")
+    loadtest_parser.add_argument("--index", help="Sadece bu endeksteki hisseler (örn: XU030)")
+    loadtest_parser.add_argument("--target", choices=["service", "app"], default="service",
+                                 help="service: arayüzsüz analiz, app: Streamlit sayfası (varsayılan: service)")
+    loadtest_parser.add_argument("--sessions", type=int, default=8, help="Eşzamanlı oturum sayısı")
+    loadtest_parser.add_argument("--actions", type=int, default=20, help="Oturum başına etkileşim sayısı")
+    loadtest_parser.add_argument("--think-time", type=float, default=0.0, help="Etkileşimler arası bekleme (saniye)")
+    loadtest_parser.add_argument("--latency", type=float, default=0.0, help="Yerel veri kaynağının gecikmesi (saniye)")
+    loadtest_parser.add_argument("--seed", type=int, default=0, help="Akışları ve fiyatları belirleyen tohum")
+    loadtest_parser.add_argument("--output", help="Sonuç dosyası (varsayılan: .cache/loadtest/results.jsonl)")
+    loadtest_parser.add_argument("--no-save", action="store_true", help="Sonucu kaydetme")
+    loadtest_parser.add_argument("--fail-on-regression", action="store_true",
+                                 help="Önceki koşuya göre gerileme varsa hata koduyla çık")
+    
+    api_parser = subparsers.add_parser("api", help="Analiz sonuçlarını sunan JSON API servisini başlatır")
+    api_parser.add_argument("--host", help="Dinlenen adres (varsayılan: 127.0.0.1)")
+    api_parser.add_argument("--port", type=int, help="Dinlenen port (varsayılan: 8000)")
+    api_parser.add_argument("--offline-source", action="store_true",
+                            help="Ağ yerine sentetik yerel veri kaynağını kullan")
+    
+    history_parser = subparsers.add_parser("history", help="Geçmiş verileri memory-map deposuna indirir")
+    history_parser.add_argument("symbols", nargs="*", help="Hisse kodları (örn: THYAO.IS GARAN.IS)")
+    history_parser.add_argument("--all", action="store_true", help="Hisse dizinindeki tüm hisseleri indir")
+    history_parser.add_argument("--index", help="Sadece bu endeksteki hisseler (örn: XU030, XU100)")
+    history_parser.add_argument("--period", default="5y", help="Zaman aralığı (varsayılan: 5y)")
+    history_parser.add_argument("--interval", default="1d", help="Veri aralığı (varsayılan: 1d)")
+    history_parser.add_argument("--store", default=".cache/history", help="Depo klasörü")
+    
+    return parser.parse_args(argv)
+
+def resolve_symbols(args):
+    """
+    Komut satırındaki hisse seçimini hisse koduna çevirir
+    
+    Args:
+        args: Ayrıştırılmış komut satırı argümanları (symbols, all, index)
+        
+    Returns:
+        list: Hisse kodları, seçim geçersizse boş liste
+    """
+    from modules.symbols import get_registry, to_symbol
+    
+    registry = get_registry()
+    if args.all or args.index:
+        symbols = registry.symbols(index=args.index)
+        if not symbols:
+            print(f"❌ Endekste hisse bulunamadı: {args.index} (mevcut: {', '.join(registry.indices())})")
+        return symbols
+    
+    if not args.symbols:
+        print("❌ Hisse kodu verin veya --all / --index kullanın")
+        return []
+    return [to_symbol(symbol) for symbol in args.symbols]
+
+def run_batch(args):
+    """
+    Toplu analizi çalıştırır
+    
+    Args:
+        args: Ayrıştırılmış komut satırı argümanları
+        
+    Returns:
+        bool: Başarılı ise True
+    """
+    from modules.config import INDICATORS_CONFIG
+    from modules.batch_analysis import iter_batch, default_indicators
+    from modules.exporter import open_writer
+    
+    symbols = resolve_symbols(args)
+    if not symbols:
+        return False
+    
+    indicators = args.indicators.split(",") if args.indicators else default_indicators()
+    unknown = [name for name in indicators if name not in INDICATORS_CONFIG]
+    if unknown:
+        print(f"❌ Desteklenmeyen indikatör: {', '.join(unknown)}")
         return False
+    
+    start = time.perf_counter()
+    count = 0
+    with open_writer(args.output, args.format, chunk_size=args.chunk_size) as writer:
+        for row in iter_batch(symbols, period=args.period, interval=args.interval,
+                              indicators=indicators, workers=args.workers,
+                              cache_dir=args.cache_dir, offline=args.offline,
+                              benchmark=args.benchmark, history_dir=args.history,
+                              indicator_dir=args.indicator_cache, cache_max_age=args.cache_max_age):
+            writer.write_row(row)
+            count += 1
+    
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count}/{len(symbols)} hisse analiz edildi ({elapsed:.1f} sn) -> {args.output}")
+    return True
 
-def main():
+def run_export(args):
+    """
+    İndikatör tablolarını veya analiz özetlerini dosyaya aktarır
+    
+    Hisseler sırayla yüklenip analiz edilir; aynı anda bellekte tek hissenin
+    analizi ve bir parça bulunur.
+    
+    Args:
+        args: Ayrıştırılmış komut satırı argümanları
+        
+    Returns:
+        bool: Başarılı ise True
+    """
+    from modules.config import INDICATORS_CONFIG
+    from modules.batch_analysis import default_indicators
+    from modules.data_cache import open_cache
+    from modules.data_fetcher import BISTDataFetcher
+    from modules.exporter import export_indicators, export_summaries, open_writer
+    from modules.history_store import HistoryStore
+    from modules.technical_analysis import build_analyzer
+    from modules.indicator_cache import IndicatorCache
+    
+    symbols = resolve_symbols(args)
+    if not symbols:
+        return False
+    
+    indicators = args.indicators.split(",") if args.indicators else default_indicators()
+    unknown = [name for name in indicators if name not in INDICATORS_CONFIG]
+    if unknown:
+        print(f"❌ Desteklenmeyen indikatör: {', '.join(unknown)}")
+        return False
+    columns = args.columns.split(",") if args.columns else None
+    
+    cache = open_cache(args.cache_dir, args.offline, args.cache_max_age) if args.cache_dir else None
+    fetcher = BISTDataFetcher(cache=cache, offline=args.offline,
+                              history=HistoryStore(args.history) if args.history else None)
+    indicator_cache = IndicatorCache(args.indicator_cache) if args.indicator_cache else None
+    
+    def analyses():
+        for symbol in symbols:
+            df = fetcher.get_stock_data(symbol, period=args.period, interval=args.interval)
+            if df is None or df.empty:
+                print(f"⚠️  {symbol}: veri yok, atlandı")
+                continue
+            yield symbol, build_analyzer(df, indicators, indicator_cache=indicator_cache)
+    
+    start = time.perf_counter()
+    with open_writer(args.output, args.format, chunk_size=args.chunk_size) as writer:
+        if args.summary:
+            count = export_summaries(analyses(), writer, columns)
+        else:
+            count = export_indicators(analyses(), writer, columns, args.start, args.end)
+    
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count} satır yazıldı ({elapsed:.1f} sn) -> {args.output}")
+    return True
+
+def fill_gaps(fetcher, store, symbol: str, interval: str, gaps) -> int:
+    """
+    Geçmişteki eksik seans aralıklarını indirip depoya yerleştirir
+    
+    Kaynakta da verisi olmayan aralıklar (örn. takvimde olmayan tatiller,
+    işlem durdurma) depoya kaydedilir ve sonraki çalıştırmalarda istenmez.
+    
+    Args:
+        fetcher: Ham barları çeken BISTDataFetcher
+        store: HistoryStore
+        symbol: Hisse kodu
+        interval: Veri aralığı
+        gaps: `MarketCalendar.gaps` aralıkları (ilk ve son eksik bar)
+        
+    Returns:
+        int: Eklenen bar sayısı
+    """
+    import pandas as pd
+    from modules.upstream import STATUS_NO_DATA
+    
+    empty = store.empty_gaps(symbol, interval)
+    added = 0
+    for first, last in gaps:
+        if any(start <= first and last <= end for start, end in empty):
+            continue
+        # Bitiş hariç tutulur; son eksik barın günü tamamen kapsanır
+        df = fetcher.get_raw_data(symbol, interval=interval, start=first,
+                                  end=last.normalize() + pd.Timedelta(days=1))
+        if df is None:
+            error = fetcher.last_error
+            if error is not None and error.status == STATUS_NO_DATA:
+                store.mark_empty(symbol, first, last, interval)
+            else:
+                print(f"⚠️  {symbol}: {first} - {last} boşluğu indirilemedi")
+            continue
+        count = store.merge(symbol, df, interval, raw=True)
+        if count == 0:
+            store.mark_empty(symbol, first, last, interval)
+        added += count
+    return added
+
+def update_history(args):
+    """
+    Hisselerin geçmiş verilerini memory-map deposuna indirir
+    
+    Depoda olan hisselere sadece yeni barlar eklenir; BIST takvimine göre
+    eksik seans yoksa hisse için istek yapılmaz. Geçmişin içindeki
+    boşluklar (eksik seans aralıkları) ayrı isteklerle indirilip depoya
+    yerleştirilir. Barlar ham
+    (düzeltilmemiş) saklanır; bölünme ve temettüler deponun `actions/`
+    klasöründeki tablolara yazılır ve okuma sırasında uygulanır.
+    
+    Args:
+        args: Ayrıştırılmış komut satırı argümanları
+        
+    Returns:
+        bool: Başarılı ise True
+    """
+    from modules.data_fetcher import BISTDataFetcher
+    from modules.corporate_actions import ActionBook
+    from modules.history_store import HistoryStore
+    
+    symbols = resolve_symbols(args)
+    if not symbols:
+        return False
+    
+    store = HistoryStore(args.store)
+    fetcher = BISTDataFetcher(actions=ActionBook(os.path.join(store.root, "actions")))
+    failed = []
+    calendar = fetcher.calendar
+    for symbol in symbols:
+        # Depodaki hisseler için sadece beklenen seanslardaki eksik barlar indirilir;
+        # gece, hafta sonu ve tatillerde istek yapılmaz
+        start = None
+        history = store.open(symbol, args.interval)
+        if history is not None and len(history) and history.meta.get('raw'):
+            stored = history.slice()
+            missing = calendar.missing_bars(stored.index, args.interval, start=history.end, end=time.time())
+            gaps = calendar.gaps(stored.index, args.interval)
+            if gaps:
+                filled = fill_gaps(fetcher, store, symbol, args.interval, gaps)
+                print(f"🩹 {symbol}: geçmişteki {len(gaps)} boşluğa {filled} bar eklendi")
+            if missing.empty and not calendar.is_open():
+                print(f"✅ {symbol}: güncel ({len(history)} bar)")
+                continue
+            # Seans sürerken son bar tamamlanmamış olabilir; o bardan itibaren çekilir
+            start = missing[0] if not missing.empty else history.end
+        
+        df = fetcher.get_raw_data(symbol, period=args.period, interval=args.interval, start=start)
+        if df is None:
+            failed.append(symbol)
+            continue
+        added = store.append(symbol, df, args.interval, raw=True)
+        print(f"✅ {symbol}: {added} yeni bar ({len(store.open(symbol, args.interval))} toplam)")
+        time.sleep(0.1)  # Rate limiting
+    
+    if failed:
+        print(f"⚠️  İndirilemeyen hisseler: {', '.join(failed)}")
+    return len(failed) < len(symbols)
+
+def main(argv=None):
     """Ana fonksiyon"""
+    args = parse_args(argv)
+    
+    if args.command == "importtime":
+        sys.exit(0 if startup_report(args.modules, args.top) else 1)
+    
+    if args.command == "batch":
+        sys.exit(0 if run_batch(args) else 1)
+    
+    if args.command == "export":
+        sys.exit(0 if run_export(args) else 1)
+    
+    if args.command == "history":
+        sys.exit(0 if update_history(args) else 1)
+    
+    if args.command == "loadtest":
+        sys.exit(0 if run_load_test(args) else 1)
+    
+    if args.command == "api":
+        sys.exit(0 if run_api(args) else 1)
+    
+    run_app()
+
+def run_app():
+    """Streamlit uygulamasını başlatır"""
     print("🚀 BIST Teknik Analiz Uygulaması başlatılıyor...")
     print("=" * 50)
     
@@ -92,32 +92,1341 @@ def test_modules():
     print("🎉 Tüm testler başarıyla tamamlandı!")
     return True
 
+def _make_test_data(periods=120, seed=42):
+    """Rastgele yürüyüşle test için OHLCV verisi üretir"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start='2024-01-01', periods=periods)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, periods)),
+        'High': close * (1 + np.abs(rng.normal(0, 0.01, periods))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.01, periods))),
+        'Close': close,
+        'Volume': rng.integers(1000000, 5000000, periods).astype(float)
+    }, index=dates)
+
+def test_batch_analysis():
+    """Toplu analiz ve rapor yazıcılarını test eder"""
+    import json
+    import tempfile
+    
+    print("📋 Toplu analiz testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.data_cache import DataCache
+        from modules.batch_analysis import iter_batch
+        from modules.exporter import open_writer
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = DataCache(os.path.join(tmp_dir, 'cache'))
+            for i, symbol in enumerate(['AAA.IS', 'BBB.IS']):
+                cache.set(symbol, '1y', '1d', _make_test_data(seed=i))
+            
+            output = os.path.join(tmp_dir, 'rapor.jsonl')
+            with open_writer(output, chunk_size=1) as writer:
+                for row in iter_batch(['AAA.IS', 'BBB.IS', 'YOK.IS'], indicators=['rsi', 'macd'],
+                                      workers=1, cache_dir=cache.cache_dir, offline=True):
+                    writer.write_row(row)
+            
+            with open(output, encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f]
+        
+        assert sorted(row['symbol'] for row in rows) == ['AAA.IS', 'BBB.IS']
+        assert all('macd_signal' in row and row['signal'] in ('AL', 'SAT', 'BEKLE') for row in rows)
+        print(f"✅ Toplu analiz: {len(rows)} satır yazıldı")
+        
+    except Exception as e:
+        print(f"❌ Toplu analiz: {e}")
+        return False
+    
+    return True
+
+def test_quote_stream():
+    """Anlık fiyat akışını sahte bir veri kaynağıyla test eder"""
+    print("📡 Fiyat akışı testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.quote_stream import QuotePoller
+        
+        prices = {'AAA.IS': [10.0, 10.0, 10.5], 'BBB.IS': [20.0, 20.0, 20.0]}
+        clock = {'tick': 0}
+        
+        def fake_quote(symbol):
+            tick = clock['tick']
+            return {'symbol': symbol, 'current_price': prices[symbol][tick],
+                    'volume': 1000, 'timestamp': 60.0 * tick}
+        
+        poller = QuotePoller(prices.keys(), fetch_quote=fake_quote, max_workers=2)
+        quotes = poller.subscribe('alerts', maxsize=2, event_types=['quote'])
+        bars = poller.subscribe('ui', event_types=['bar'])
+        
+        changed = []
+        for tick in range(3):
+            clock['tick'] = tick
+            changed.append(len(poller.poll_once()))
+        poller.stop()
+        
+        # Sadece fiyatı değişen hisseler yayınlanır
+        assert changed == [2, 0, 1]
+        # Kapasite 2 olduğu için en eski olay atılmış olmalı
+        assert quotes.dropped == 1 and len(quotes.drain()) == 2
+        assert len(bars.drain()) == 1
+        assert len(poller.bar_builder.get_bars('AAA.IS', include_current=True)) == 2
+        print("✅ Fiyat akışı: değişim tespiti, geri basınç ve bar üretimi çalışıyor")
+        
+    except Exception as e:
+        print(f"❌ Fiyat akışı: {e}")
+        return False
+    
+    return True
+
+def test_native_kernels():
+    """NumPy çekirdeklerinin ta ile aynı sonucu verdiğini test eder"""
+    print("⚡ Native çekirdek testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.technical_analysis import TechnicalAnalyzer
+        
+        data = _make_test_data(periods=300)
+        results = {}
+        for backend in ['native', 'ta']:
+            analyzer = TechnicalAnalyzer(data, backend=backend)
+            for indicator in ['stoch', 'williams_r', 'cci']:
+                analyzer.add_indicator(indicator)
+            results[backend] = dict(analyzer.indicators)
+            results[backend]['adx'] = analyzer.calculate_trend_strength()['adx']
+        
+        for name, expected in results['ta'].items():
+            assert np.allclose(np.asarray(results['native'][name], dtype=float),
+                               np.asarray(expected, dtype=float), rtol=1e-9, equal_nan=True), name
+        print(f"✅ Native çekirdekler: {len(results['ta'])} seri ta ile aynı")
+        
+        # Sabit fiyatlı bölümde CCI yuvarlama artığı yerine 0 olmalı
+        import ta
+        from modules import kernels
+        flat = np.full(60, 101.37)
+        flat[:5] = [100, 102, 99, 101, 103]
+        series = pd.Series(flat)
+        expected = ta.trend.cci(series, series, series, 20).to_numpy()
+        assert np.allclose(kernels.cci(flat, flat, flat, 20), expected, equal_nan=True)
+        assert (kernels.cci(flat, flat, flat, 20)[24:] == 0).all()
+        print("✅ Sabit fiyatlı pencerelerde CCI ta ile aynı (0)")
+        
+    except Exception as e:
+        print(f"❌ Native çekirdekler: {e}")
+        return False
+    
+    return True
+
+def test_incremental_metrics():
+    """Memoize edilmiş metriklerin artımlı güncellemesini test eder"""
+    print("🔁 Artımlı metrik testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.technical_analysis import TechnicalAnalyzer
+        
+        data = _make_test_data(periods=300)
+        full = TechnicalAnalyzer(data)
+        
+        incremental = TechnicalAnalyzer(data.iloc[:250])
+        incremental.add_indicator('rsi')
+        incremental.generate_summary()
+        incremental.append_data(data.iloc[250:251])
+        incremental.append_data(data.iloc[251:])
+        
+        assert np.allclose(full.adx(), incremental.adx(), rtol=1e-10)
+        assert np.allclose(full.volume_sma(20), incremental.volume_sma(20))
+        assert np.isclose(incremental.average_volume(20), data['Volume'].tail(20).mean())
+        assert len(incremental.indicators['rsi']) == len(data)
+        print("✅ Artımlı metrikler: ADX ve hacim ortalaması tam hesaplamayla aynı")
+        
+    except Exception as e:
+        print(f"❌ Artımlı metrikler: {e}")
+        return False
+    
+    return True
+
+def test_multi_timeframe():
+    """Çoklu zaman dilimi analizini test eder"""
+    print("⏱️ Çoklu zaman dilimi testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.technical_analysis import TechnicalAnalyzer
+        
+        data = _make_test_data(periods=300)
+        analyzer = TechnicalAnalyzer(data)
+        tables = analyzer.multi_timeframe(['rsi', 'sma_20'])
+        
+        weekly = analyzer.timeframe('1wk')
+        assert weekly is analyzer.timeframe('1wk')
+        assert len(weekly.data) == len(data.index.to_period('W-FRI').unique())
+        assert all(len(table) == len(data) for table in tables.values())
+        
+        # Haftalık değer ancak haftanın son barında görünür (ileriye bakış yok)
+        weekly_rsi = weekly.indicators['rsi'].dropna()
+        first_close = weekly_rsi.index[0]
+        assert tables['1wk']['rsi'].loc[first_close] == weekly_rsi.iloc[0]
+        assert tables['1wk']['rsi'].loc[:first_close].iloc[:-1].isna().all()
+        print(f"✅ Çoklu zaman dilimi: {len(tables)} zaman dilimi hizalandı")
+        
+    except Exception as e:
+        print(f"❌ Çoklu zaman dilimi: {e}")
+        return False
+    
+    return True
+
+def test_rolling_correlation():
+    """Artımlı korelasyon motorunu pandas ile karşılaştırır"""
+    print("🔗 Korelasyon testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.correlation import RollingCorrelation, close_panel
+        
+        frames = {f'S{i}.IS': _make_test_data(periods=200, seed=i) for i in range(5)}
+        prices = close_panel(frames)
+        prices.iloc[120:125, 2] = np.nan
+        
+        engine = RollingCorrelation.from_prices(prices.iloc[:100], window=40, min_periods=10)
+        for _, row in prices.iloc[100:].iterrows():
+            engine.update_prices(row)
+        
+        expected = prices.pct_change(fill_method=None).iloc[-40:]
+        assert np.allclose(engine.correlation(), expected.corr(min_periods=10), atol=1e-10, equal_nan=True)
+        assert np.allclose(engine.covariance(), expected.cov(min_periods=10), atol=1e-12, equal_nan=True)
+        print("✅ Korelasyon: artımlı matris tam hesaplamayla aynı")
+        
+    except Exception as e:
+        print(f"❌ Korelasyon: {e}")
+        return False
+    
+    return True
+
+def test_relative_strength():
+    """Endekse göre göreceli güç, beta ve alfa hesaplarını test eder"""
+    print("📉 Göreceli güç testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.relative_strength import IndexBenchmark
+        from modules.batch_analysis import analyze_frame
+        
+        index_data = _make_test_data(periods=200, seed=7)
+        benchmark = IndexBenchmark("XU100.IS", data=index_data)
+        market = index_data['Close'].pct_change()
+        
+        # r = 0.001 + 1.5·m ilişkisindeki hisse: beta 1.5, alfa 0.001 olmalı
+        stock = index_data['Close'].iloc[0] * (1 + (0.001 + 1.5 * market).fillna(0)).cumprod()
+        prices = pd.DataFrame({'A.IS': stock, 'B.IS': _make_test_data(periods=200, seed=8)['Close']})
+        prices.iloc[50:55, 1] = np.nan
+        
+        beta, alpha = benchmark.rolling_beta_alpha(prices, window=30)
+        assert np.allclose(beta['A.IS'].dropna(), 1.5) and np.allclose(alpha['A.IS'].dropna(), 0.001)
+        
+        returns = prices['B.IS'].pct_change(fill_method=None)
+        expected = returns.rolling(30).cov(market) / market.where(returns.notna()).rolling(30).var()
+        assert np.allclose(beta['B.IS'], expected, equal_nan=True)
+        
+        rs = benchmark.relative_strength(prices)
+        assert rs.iloc[0].eq(100).all()
+        single = benchmark.relative_strength(prices['B.IS'])
+        assert np.allclose(single, rs['B.IS'], equal_nan=True)
+        print("✅ Göreceli güç: panel ve tek hisse sonuçları tutarlı")
+        
+        row = analyze_frame('A.IS', index_data.assign(Close=stock), ['rsi'], benchmark=benchmark)
+        assert abs(row['beta'] - 1.5) < 1e-9 and 'rs' in row and 'alpha' in row
+        print("✅ Göreceli güç: toplu analiz satırında rs, beta ve alpha var")
+        
+    except Exception as e:
+        print(f"❌ Göreceli güç: {e}")
+        return False
+    
+    return True
+
+def test_history_store():
+    """Memory-map geçmiş deposunu test eder"""
+    print("🗄️ Geçmiş deposu testleri...")
+    print("=" * 30)
+    
+    try:
+        import tempfile
+        from modules.history_store import HistoryStore
+        from modules.data_fetcher import BISTDataFetcher
+        from modules.technical_analysis import TechnicalAnalyzer
+        
+        df = _make_test_data(periods=300).tz_localize('Europe/Istanbul')
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = HistoryStore(root)
+            store.write('TEST.IS', df.iloc[:200])
+            
+            # Son bar güncellenir, yeni barlar eklenir
+            changed = df.iloc[199:].copy()
+            changed.iloc[0, changed.columns.get_loc('Close')] += 1
+            assert store.append('TEST.IS', changed) == 100
+            expected = pd.concat([df.iloc[:199], changed])
+            expected.index = expected.index.as_unit('ns')
+            
+            history = store.open('TEST.IS')
+            assert len(history) == 300 and store.symbols() == ['TEST.IS']
+            pd.testing.assert_frame_equal(history.slice(), expected, check_freq=False)
+            
+            part = store.read('TEST.IS', start=df.index[50], end=df.index[99])
+            assert len(part) == 50 and part.index[0] == df.index[50]
+            assert np.shares_memory(part['Close'].to_numpy(), history.columns['Close'])
+            print("✅ Geçmiş deposu: aralıklar kopyalanmadan okunuyor")
+            
+            analyzer = TechnicalAnalyzer(part)
+            analyzer.add_indicator('rsi')
+            assert np.shares_memory(analyzer.data['Close'].to_numpy(), history.columns['Close'])
+            
+            fetcher = BISTDataFetcher(offline=True, history=store)
+            recent = fetcher.get_stock_data('TEST.IS', period='3mo')
+            assert recent is not None and recent.index[-1] == df.index[-1]
+            assert recent.index[0] > df.index[-1] - pd.DateOffset(months=3)
+            print("✅ Geçmiş deposu: analiz ve veri çekici dilimleri doğrudan kullanıyor")
+
+            # İç boşluklar indirilip yerine yerleştirilir; depodaki barlar değişmez
+            from run import fill_gaps
+
+            from modules.upstream import FetchResult, STATUS_NO_DATA
+
+            class GapFetcher:
+                def __init__(self):
+                    self.last_error = None
+                    self.requests = []
+
+                def get_raw_data(self, symbol, interval="1d", start=None, end=None, **kwargs):
+                    self.requests.append(start)
+                    bars = df[(df.index >= start) & (df.index < end)]
+                    self.last_error = None if len(bars) else FetchResult(status=STATUS_NO_DATA)
+                    return bars if len(bars) else None
+
+            store.write('GAP.IS', pd.concat([df.iloc[:100], df.iloc[120:150], df.iloc[160:]]), raw=True)
+            gaps = [(df.index[100], df.index[119]), (df.index[150], df.index[159])]
+            assert fill_gaps(GapFetcher(), store, 'GAP.IS', "1d", gaps) == 30
+            filled = store.open('GAP.IS')
+            assert len(filled) == 300 and filled.meta['raw']
+            pd.testing.assert_frame_equal(filled.slice(), df.set_axis(df.index.as_unit('ns')),
+                                          check_freq=False, check_index_type=False)
+            assert store.merge('GAP.IS', df.iloc[:50], raw=True) == 0
+
+            # Kaynakta da boş olan aralık kaydedilir, bir daha istenmez
+            fetcher = GapFetcher()
+            future = (df.index[-1] + pd.Timedelta(days=10), df.index[-1] + pd.Timedelta(days=12))
+            assert fill_gaps(fetcher, store, 'GAP.IS', "1d", [future]) == 0
+            assert store.empty_gaps('GAP.IS') == [future]
+            assert fill_gaps(fetcher, store, 'GAP.IS', "1d", [future]) == 0 and len(fetcher.requests) == 1
+            store.merge('GAP.IS', df.iloc[:1].set_axis(df.index[:1] - pd.Timedelta(days=1)), raw=True)
+            assert len(store.open('GAP.IS')) == 301 and store.empty_gaps('GAP.IS') == [future]
+            print("✅ Geçmiş deposu: iç boşluklar dolduruluyor")
+
+    except Exception as e:
+        print(f"❌ Geçmiş deposu: {e}")
+        return False
+    
+    return True
+
+def test_symbol_registry():
+    """Hisse dizini, arama ve toplu doğrulamayı test eder"""
+    print("🔎 Hisse dizini testleri...")
+    print("=" * 30)
+    
+    try:
+        import tempfile
+        from modules.symbols import SymbolRegistry
+        from modules.config import BIST_SYMBOLS
+        
+        with tempfile.TemporaryDirectory() as root:
+            registry = SymbolRegistry(validation_path=os.path.join(root, "validation.json"))
+            assert registry._records is None
+            
+            assert all(symbol in registry for symbol in BIST_SYMBOLS)
+            assert registry.name('KOZAL') == "Koza Altın İşletmeleri"
+            assert registry.search('koz') == ['KOZAA.IS', 'KOZAL.IS']
+            assert registry.search('turk hava', 3) == ['THYAO.IS']
+            assert 'GARAN.IS' in registry.symbols(index='XBANK')
+            print(f"✅ Hisse dizini: {len(registry)} hisse, önek araması çalışıyor")
+            
+            calls = []
+            def check(symbols):
+                calls.append(list(symbols))
+                return ['YENI.IS']
+            
+            first = registry.validate(['THYAO', 'YENI', 'YOK.IS'], check=check)
+            assert first == {'THYAO.IS': True, 'YENI.IS': True, 'YOK.IS': False}
+            assert calls == [['YENI.IS', 'YOK.IS']]
+            
+            # Sonuçlar diskten okunur, tekrar sorgu yapılmaz
+            reloaded = SymbolRegistry(validation_path=os.path.join(root, "validation.json"))
+            assert reloaded.validate(['YENI', 'YOK'], check=check) == {'YENI.IS': True, 'YOK.IS': False}
+            assert len(calls) == 1
+            print("✅ Hisse dizini: doğrulama toplu yapılıp önbelleğe alınıyor")
+        
+    except Exception as e:
+        print(f"❌ Hisse dizini: {e}")
+        return False
+    
+    return True
+
+def test_upstream_resilience():
+    """Tekrar deneme, devre kesici ve yapılandırılmış hataları test eder"""
+    print("🔌 Dış kaynak testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.upstream import CircuitBreaker, call_upstream, get_breaker
+        from modules.data_fetcher import BISTDataFetcher
+        
+        calls = []
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError("bağlantı koptu")
+            return "veri"
+        
+        result = call_upstream(flaky, host="test-flaky", sleep=lambda _: None)
+        assert result.ok and result.data == "veri" and result.attempts == 3
+        
+        class YFPricesMissingError(Exception):
+            pass
+        def missing():
+            raise YFPricesMissingError("fiyat yok")
+        result = call_upstream(missing, host="test-missing", sleep=lambda _: None)
+        assert result.status == "no_data" and result.attempts == 1
+        print("✅ Dış kaynak: geçici hatalar tekrar deneniyor, 'veri yok' hemen dönüyor")
+        
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        for _ in range(2):
+            breaker.record_failure()
+        assert not breaker.allow()
+        now[0] = 11
+        assert breaker.allow() and not breaker.allow()  # Yarı açık: tek deneme
+        breaker.record_success()
+        assert breaker.allow()
+        
+        def down():
+            raise TimeoutError("zaman aşımı")
+        results = [call_upstream(down, host="test-down", retries=1, sleep=lambda _: None) for _ in range(5)]
+        assert results[0].status == "upstream_down" and results[-1].status == "circuit_open"
+        assert results[-1].attempts == 0 and get_breaker("test-down").state == "open"
+        print("✅ Dış kaynak: devre kesici açıkken istek gönderilmiyor")
+        
+        fetcher = BISTDataFetcher(offline=True)
+        assert fetcher.get_stock_data("YOK.IS") is None
+        assert fetcher.last_error.status == "no_data" and not fetcher.last_error.retryable
+        print("✅ Dış kaynak: None dönen çağrılarda hata nedeni okunabiliyor")
+        
+    except Exception as e:
+        print(f"❌ Dış kaynak: {e}")
+        return False
+    
+    return True
+
+def test_single_flight():
+    """Eşzamanlı aynı isteklerin birleştirilmesini test eder"""
+    print("🛫 Tek uçuş testleri...")
+    print("=" * 30)
+    
+    try:
+        import time
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from modules.singleflight import SingleFlight
+        from modules.data_fetcher import BISTDataFetcher
+        from modules.technical_analysis import build_analyzer
+        from modules.upstream import FetchResult
+        
+        flight = SingleFlight()
+        start = threading.Barrier(8)
+        def slow():
+            time.sleep(0.2)
+            return object()
+        def call(_):
+            start.wait()
+            return flight.do('THYAO.IS', slow)
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(call, range(8)))
+        assert flight.executed == 1 and flight.shared == 7
+        assert all(result is results[0] for result in results) and flight.in_flight() == 0
+        
+        def failing():
+            raise ValueError("hata")
+        try:
+            flight.do('X', failing)
+            assert False, "hata fırlatılmadı"
+        except ValueError:
+            pass
+        print("✅ Tek uçuş: eşzamanlı çağrılar tek çalıştırmayı paylaşıyor")
+        
+        df = _make_test_data()
+        downloads = []
+        class CountingFetcher(BISTDataFetcher):
+            def _fetch_stock_data(self, symbol, period, interval):
+                downloads.append(symbol)
+                time.sleep(0.2)
+                return FetchResult(df, symbol=symbol)
+        
+        start = threading.Barrier(6)
+        def session(index):
+            start.wait()
+            fetcher = CountingFetcher()
+            data = fetcher.get_stock_data('GARAN.IS' if index % 2 else 'AKBNK.IS')
+            return build_analyzer(data, ['rsi', 'macd'], key=('X.IS', '1y', '1d'))
+        with ThreadPoolExecutor(6) as executor:
+            analyzers = list(executor.map(session, range(6)))
+        assert sorted(downloads) == ['AKBNK.IS', 'GARAN.IS']
+        assert len({id(analyzer) for analyzer in analyzers}) <= 2
+        assert 'macd' in analyzers[0].indicators
+        print("✅ Tek uçuş: indirme ve analiz sayısı benzersiz anahtar sayısıyla sınırlı")
+        
+    except Exception as e:
+        print(f"❌ Tek uçuş: {e}")
+        return False
+    
+    return True
+
+def test_memory_cache():
+    """Bayt bütçeli paylaşılan önbelleği test eder"""
+    print("🧠 Bellek önbelleği testleri...")
+    print("=" * 30)
+    
+    try:
+        import uuid
+        from modules.memory_cache import LRUCache, SharedFrameStore, estimate_size
+        
+        df = _make_test_data()
+        size = estimate_size(df)
+        assert size >= df.to_numpy().nbytes
+        
+        now = [0.0]
+        cache = LRUCache(max_bytes=int(size * 2.5), ttl=60, clock=lambda: now[0])
+        cache.put('A', df)
+        cache.put('B', df.copy())
+        assert cache.get('A') is df  # A en son kullanılan olur
+        cache.put('C', df.copy())
+        assert 'B' not in cache and 'A' in cache and 'C' in cache
+        assert cache.stats()['evictions'] == 1 and cache.stats()['bytes'] <= cache.max_bytes
+        assert not cache.put('büyük', np.zeros(size * 3, dtype=np.uint8))
+        
+        now[0] = 61.0
+        assert cache.get('A') is None and 'C' not in cache and len(cache) == 0
+        
+        calls = []
+        compute = lambda: calls.append(1) or df
+        assert cache.get_or_compute('D', compute) is df and cache.get_or_compute('D', compute) is df
+        assert len(calls) == 1 and cache.get_or_compute('yok', lambda: None) is None and 'yok' not in cache
+        stats = cache.stats()
+        assert stats['hits'] >= 2 and 0 < stats['hit_rate'] < 1
+        print(f"✅ LRU önbellek: bütçe, sıra ve süre doğru (isabet %{stats['hit_rate'] * 100:.0f})")
+        
+        writer = SharedFrameStore(prefix=f"test_{uuid.uuid4().hex[:8]}")
+        reader = SharedFrameStore(prefix=writer.prefix)
+        try:
+            assert writer.put(('data', 'THYAO.IS'), df)
+            shared = reader.get(('data', 'THYAO.IS'))
+            pd.testing.assert_frame_equal(shared, df.astype(float), check_freq=False, check_index_type=False)
+            assert not shared['Close'].to_numpy().flags.writeable
+            assert reader.get(('data', 'yok')) is None
+            
+            cache = LRUCache(shared=reader)
+            assert cache.get_or_compute(('data', 'THYAO.IS'), lambda: None) is not None
+            assert cache.stats()['shared_hits'] == 1
+            
+            # Süresi dolan blok okunmaz; yenisi eskisinin yerine yazılır
+            import time
+            newer = df * 2
+            assert writer.put(('data', 'GARAN.IS'), df, expires=time.time() - 1)
+            assert reader.get(('data', 'GARAN.IS')) is None
+            assert writer.put(('data', 'GARAN.IS'), newer, expires=time.time() + 60)
+            assert np.allclose(reader.get(('data', 'GARAN.IS'))['Close'], newer['Close'])
+            
+            # Önbellekten atılan kaydın bu süreçte oluşturulan bloğu silinir
+            small = LRUCache(max_bytes=int(size * 1.5), shared=writer)
+            small.get_or_compute(('data', 'AKBNK.IS'), lambda: df.copy())
+            assert reader.get(('data', 'AKBNK.IS')) is not None
+            small.get_or_compute(('data', 'ISCTR.IS'), lambda: df.copy())
+            assert ('data', 'AKBNK.IS') not in small and reader.get(('data', 'AKBNK.IS')) is None
+
+            # Atılan blokların eşlemeleri kapatılır; bellek bütçesi paylaşımda da geçerli
+            from modules import memory_cache
+            for i in range(30):
+                small.get_or_compute(('data', f"S{i}"), lambda: df.copy())
+            assert len(small) <= 1 and len(memory_cache._retired_blocks) <= 1
+            names = {writer._name(('data', f"S{i}")) for i in range(30)}
+            assert len(names & set(memory_cache._mapped_blocks)) == 1
+        finally:
+            reader.close()
+            writer.close()
+        print("✅ Paylaşılan bellek: süreçler arası DataFrame kopyasız okunuyor")
+        
+    except Exception as e:
+        print(f"❌ Bellek önbelleği: {e}")
+        return False
+    
+    return True
+
+def test_chart_patterns():
+    """Vektörize grafik deseni tespitini test eder"""
+    print("🔺 Grafik deseni testleri...")
+    print("=" * 30)
+    
+    try:
+        import time
+        from modules.chart_patterns import find_patterns, swing_points
+        from modules.technical_analysis import TechnicalAnalyzer
+        
+        def path(points):
+            """Köşe noktalarından doğrusal fiyat yolu (yüksek, düşük)"""
+            x, y = zip(*points)
+            close = np.interp(np.arange(x[-1] + 1), x, y)
+            return close * 1.002, close * 0.998
+        
+        cases = {
+            'double_top': ([(0, 80), (20, 100), (35, 92), (50, 100.5), (70, 85)], 'bearish', (20, 50)),
+            'double_bottom': ([(0, 120), (20, 100), (35, 108), (50, 99.5), (70, 115)], 'bullish', (20, 50)),
+            'head_shoulders': ([(0, 80), (15, 100), (25, 92), (40, 110), (55, 92.5), (70, 99), (85, 80)],
+                               'bearish', (15, 70)),
+            'triangle': ([(0, 80), (10, 110), (20, 90), (30, 107), (40, 94), (50, 104), (60, 97), (70, 102)],
+                         'neutral', (10, 60)),
+            'flag': ([(0, 105), (10, 100), (20, 125), (28, 119), (36, 122), (44, 116), (52, 119), (60, 135)],
+                     'bullish', (10, 44)),
+        }
+        for name, (points, direction, bars) in cases.items():
+            high, low = path(points)
+            found = find_patterns(high, low)
+            match = found[found['pattern'] == name]
+            assert len(match) == 1, f"{name} bulunamadı: {found.to_dict('records')}"
+            assert match['direction'].iloc[0] == direction
+            assert (match['start'].iloc[0], match['end'].iloc[0]) == bars
+        
+        high, low = path(cases['double_top'][0])
+        index, price, kind = swing_points(high, low)
+        assert list(index) == [20, 35, 50] and list(kind) == [1, -1, 1]
+        print("✅ Desenler: çift tepe/dip, OBO, üçgen ve bayrak bar aralıklarıyla bulunuyor")
+        
+        df = _make_test_data()
+        high, low = path(cases['head_shoulders'][0])
+        df = df.iloc[:len(high)].assign(High=high, Low=low)
+        analyzer = TechnicalAnalyzer(df)
+        assert analyzer.find_chart_patterns()['end_date'].iloc[-1] == df.index[70]
+        patterns = analyzer.detect_chart_patterns()
+        assert patterns['head_shoulders'] and not patterns['flag']
+        assert not analyzer.detect_chart_patterns(lookback=10)['head_shoulders']
+        
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 2500)))
+        start = time.perf_counter()
+        for _ in range(100):
+            find_patterns(close * 1.01, close * 0.99)
+        elapsed = time.perf_counter() - start
+        print(f"✅ Tarama: 100 hisse x 2500 bar {elapsed:.2f} sn")
+        
+    except Exception as e:
+        print(f"❌ Grafik desenleri: {e}")
+        return False
+    
+    return True
+
+def test_volume_profile():
+    """Hacim profili destek/direnç seviyelerini test eder"""
+    print("📊 Hacim profili testleri...")
+    print("=" * 30)
+    
+    try:
+        from modules.volume_profile import VolumeProfile, bar_volumes, bin_edges, universe_levels
+        from modules.technical_analysis import TechnicalAnalyzer
+        
+        df = _make_test_data(periods=300)
+        high, low, close, volume = (df[column].to_numpy() for column in ['High', 'Low', 'Close', 'Volume'])
+        contributions = bar_volumes(high, low, close, volume, bin_edges(low, high))
+        assert np.allclose(contributions.sum(axis=1), volume)
+        
+        # Hacmin 100 ve 110 civarında yoğunlaştığı seri: fiyat 105'te
+        dates = pd.bdate_range('2024-01-01', periods=60)
+        prices = np.r_[np.full(25, 100.0), np.linspace(100, 110, 10), np.full(24, 110.0), [105.0]]
+        levels_df = pd.DataFrame({'Open': prices, 'High': prices + 0.5, 'Low': prices - 0.5, 'Close': prices,
+                                  'Volume': 1e6}, index=dates)
+        support, resistance = VolumeProfile.from_frame(levels_df, bins=20).levels(105.0)
+        assert abs(support - 100) < 1.5 and abs(resistance - 110) < 1.5, (support, resistance)
+        print(f"✅ Profil: destek {support:.1f}, direnç {resistance:.1f}")
+        
+        profile = VolumeProfile.from_frame(df.iloc[:200], window=120)
+        for start in range(200, 300, 7):
+            profile.update(df.iloc[start:start + 7])
+        retained = df.iloc[-120:]
+        expected = bar_volumes(*(retained[column].to_numpy() for column in ['High', 'Low', 'Close', 'Volume']),
+                               profile.edges).sum(axis=0)
+        assert np.allclose(profile.histogram, expected)
+        
+        analyzer = TechnicalAnalyzer(df.iloc[:250])
+        cached = analyzer.volume_profile()
+        analyzer.append_data(df.iloc[250:])
+        assert analyzer.volume_profile() is cached
+        assert np.allclose(cached.histogram, bar_volumes(*(retained[column].to_numpy() for column in
+                                                           ['High', 'Low', 'Close', 'Volume']), cached.edges).sum(axis=0))
+        summary = analyzer.generate_summary()
+        assert summary['support_level'] <= summary['current_price'] <= summary['resistance_level']
+        print("✅ Profil: yeni barlarla artımlı güncelleniyor")
+        
+        frames = {f"H{i}.IS": _make_test_data(periods=200 + i * 10, seed=i) for i in range(12)}
+        # Eksik barlı hisse: geçersiz barlar pencereden önce atılır
+        gapped = _make_test_data(periods=300, seed=20)
+        gapped.iloc[290:295, gapped.columns.get_loc('High')] = np.nan
+        gapped.iloc[175:180, gapped.columns.get_loc('Volume')] *= 50  # Sadece geçerli bar penceresinde
+        frames['BOSLUK.IS'] = gapped
+        frames['BOS.IS'] = None
+        table = universe_levels(frames)
+        assert list(table.index) == [f"H{i}.IS" for i in range(12)] + ['BOSLUK.IS']
+        for symbol in ['H0.IS', 'H7.IS', 'BOSLUK.IS']:
+            single = VolumeProfile.from_frame(frames[symbol])
+            expected = single.levels(frames[symbol]['Close'].iloc[-1])
+            assert np.allclose(table.loc[symbol, ['support', 'resistance']].to_numpy(dtype=float), expected,
+                               equal_nan=True)
+            assert np.isclose(table.loc[symbol, 'poc'], single.poc())
+        print("✅ Toplu profil: tüm evren tek geçişte, hisse bazlı sonuçla aynı")
+        
+    except Exception as e:
+        print(f"❌ Hacim profili: {e}")
+        return False
+    
+    return True
+
+def test_signal_leaderboard():
+    """Sinyal gücü sıralamasını test eder"""
+    print("🏆 Sıralama testleri...")
+    print("=" * 30)
+    
+    try:
+        import random
+        from modules.leaderboard import SignalLeaderboard, TopKIndex
+        
+        rng = random.Random(7)
+        index = TopKIndex()
+        scores = {}
+        for step in range(5000):
+            symbol = f"H{rng.randrange(300)}.IS"
+            if step % 97 == 0 and symbol in scores:
+                index.remove(symbol)
+                del scores[symbol]
+            else:
+                scores[symbol] = round(rng.uniform(-1, 1), 3)
+                index.update(symbol, scores[symbol])
+        expected = sorted(scores.items(), key=lambda item: -item[1])[:10]
+        assert [score for _, score in index.top(10)] == [score for _, score in expected]
+        assert [score for _, score in index.bottom(5)] == sorted(scores.values())[:5]
+        assert len(index._high) <= 2 * len(index) + 65
+        print("✅ Top-K: tembel silmeli heap'ler tam sıralamayla aynı")
+        
+        board = SignalLeaderboard(k=3, metrics=('overall', 'trend'))
+        subscription = board.subscribe("test")
+        board.update_many({s: {'overall': v, 'trend': 0.0} for s, v in [('A', 0.5), ('B', 0.3), ('C', 0.1), ('D', -0.4)]})
+        assert [symbol for symbol, _ in board.top()] == ['A', 'B', 'C']
+        assert [symbol for symbol, _ in board.bottom()] == ['D', 'C', 'B']
+        subscription.drain()
+        
+        events = board.update('D', {'overall': 0.9, 'trend': 0.0})
+        moves = {(e['side'], e['symbol']): (e['previous_rank'], e['rank']) for e in events if e['metric'] == 'overall'}
+        assert moves[('buy', 'D')] == (None, 1) and moves[('buy', 'C')] == (3, None)
+        assert moves[('sell', 'D')] == (1, None) and moves[('sell', 'C')] == (2, 1)
+        assert all(e['metric'] == 'overall' for e in events)  # trend değişmedi
+        assert len(subscription.drain()) == len(events)
+        assert board.update('D', {'overall': 0.9, 'trend': 0.0}) == []
+        
+        events = board.consume([{'type': 'bar', 'symbol': 'B'}, {'type': 'bar', 'symbol': 'B'}],
+                               lambda symbol, event: {'overall': 1.0, 'trend': 0.2})
+        assert board.top(1)[0] == ('B', 1.0) and board.top(1, metric='trend')[0][0] == 'B'
+        print("✅ Sıralama: sadece değişen hisseler güncelleniyor, sıra olayları yayınlanıyor")
+        
+    except Exception as e:
+        print(f"❌ Sıralama: {e}")
+        return False
+    
+    return True
+
+def test_indicator_export():
+    """İndikatör tablolarının parça parça aktarımını test eder"""
+    import json
+    import tempfile
+    
+    print("📤 İndikatör aktarımı testleri...")
+    print("=" * 30)
+    
+    try:
+        import pyarrow.parquet as pq
+        from openpyxl import load_workbook
+        from modules.exporter import export_indicators, export_summaries, open_writer
+        from modules.technical_analysis import build_analyzer
+        
+        frames = {f"H{i}.IS": _make_test_data(periods=600, seed=i) for i in range(3)}
+        
+        def analyses():
+            for symbol, df in frames.items():
+                yield symbol, build_analyzer(df, ['rsi', 'macd', 'sma_20'])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tablo.parquet")
+            with open_writer(path, chunk_size=128) as writer:
+                count = export_indicators(analyses(), writer)
+            parquet = pq.ParquetFile(path)
+            assert count == 1800 and parquet.metadata.num_rows == 1800
+            assert parquet.metadata.num_row_groups == 3 * 5  # 600 satır / 128 -> 5 parça
+            table = parquet.read().to_pandas()
+            assert {'symbol', 'date', 'Close', 'rsi', 'macd_signal', 'sma_20'} <= set(table.columns)
+            expected = build_analyzer(frames['H1.IS'], ['rsi']).indicators['rsi'].to_numpy()
+            assert np.allclose(table.loc[table['symbol'] == 'H1.IS', 'rsi'].to_numpy(), expected, equal_nan=True)
+            print(f"✅ Parquet: {count} satır, {parquet.metadata.num_row_groups} row group")
+            
+            # İlk parçada boş olan sütun sonraki parçalarda değer alabilir
+            path = os.path.join(tmp, "bos.parquet")
+            with open_writer(path, chunk_size=1) as writer:
+                for value in [np.nan, 1.5, None]:
+                    writer.write_row({'symbol': 'H0.IS', 'beta': value})
+            assert pq.read_table(path).column('beta').to_pylist() == [None, 1.5, None]
+            
+            start, end = frames['H0.IS'].index[100], frames['H0.IS'].index[149]
+            columns = ['symbol', 'date', 'Close', 'rsi', 'yok']
+            path = os.path.join(tmp, "tablo.xlsx")
+            with open_writer(path, chunk_size=16) as writer:
+                count = export_indicators(analyses(), writer, columns, start=start, end=end.strftime('%Y-%m-%d'))
+            rows = list(load_workbook(path, read_only=True).active.iter_rows(values_only=True))
+            assert count == 150 and len(rows) == 151 and list(rows[0]) == columns
+            assert rows[1][1] == start.to_pydatetime() and rows[50][1] == end.to_pydatetime()
+            assert all(len(row) < 5 or row[4] is None for row in rows[1:])  # Boş hücreler okunmayabilir
+            print("✅ Excel: sütun seçimi ve tarih filtresi uygulanıyor")
+            
+            path = os.path.join(tmp, "ozet.jsonl")
+            with open_writer(path) as writer:
+                count = export_summaries(analyses(), writer)
+            with open(path, encoding="utf-8") as f:
+                summaries = [json.loads(line) for line in f]
+            assert count == 3 and 'trend_strength_adx' in summaries[0]
+            assert 'chart_patterns_flag' in summaries[0] and 'latest_indicators_rsi' in summaries[0]
+
+            # Kısa geçmişli ilk hissede NaN olan indikatör sonraki hisselerde kaybolmaz
+            def mixed():
+                for symbol, periods in [('KISA.IS', 40), ('UZUN.IS', 250)]:
+                    yield symbol, build_analyzer(_make_test_data(periods=periods), ['rsi', 'sma_50'])
+            for name in ["ozet.parquet", "ozet.xlsx"]:
+                path = os.path.join(tmp, name)
+                with open_writer(path, chunk_size=1) as writer:
+                    export_summaries(mixed(), writer)
+                if name.endswith(".parquet"):
+                    values = pq.read_table(path).column('latest_indicators_sma_50').to_pylist()
+                else:
+                    rows = list(load_workbook(path, read_only=True).active.iter_rows(values_only=True))
+                    values = [row[rows[0].index('latest_indicators_sma_50')] for row in rows[1:]]
+                assert values[0] is None and values[1] is not None, name
+            print("✅ Özet: generate_summary tek satıra açılıyor, sütunlar tüm hisselerde aynı")
+        
+    except Exception as e:
+        print(f"❌ İndikatör aktarımı: {e}")
+        return False
+    
+    return True
+
+def test_rule_engine():
+    """Kural dilinin ayrıştırılmasını ve vektörize değerlendirmesini test eder"""
+    import time
+    from modules.rules import RuleSet, Panel
+    from modules.alert_system import AlertSystem
+    
+    print("📐 Kural motoru testleri...")
+    print("=" * 30)
+    
+    try:
+        frames = {f"S{i}": _make_test_data(periods=250, seed=i) for i in range(200)}
+        frames['S0'] = frames['S0'].iloc[:-5]  # Eksik son barlar
+        panel = Panel.from_frames(frames)
+        
+        rules = RuleSet({
+            'hacim': "close > sma(close, 20) and volume > 1.2 * sma(volume, 20)",
+            'kesisim': "crosses_above(close, ema(close, 10))",
+            'kirilim': "highest(High, 30) < close * 1.01 or change(close, 5) > 3",
+        })
+        result = rules.evaluate(panel)
+        for symbol in ['S0', 'S1', 'S2', 'S3']:
+            data = frames[symbol].reindex(panel.index)
+            close, volume = data['Close'], data['Volume']
+            ema = close.ewm(span=10, adjust=False, min_periods=10).mean()
+            expected = [
+                (close > close.rolling(20).mean()) & (volume > 1.2 * volume.rolling(20).mean()),
+                (close > ema) & (close.shift(1) <= ema.shift(1)),
+                (data['High'].rolling(30).max() < close * 1.01) | (close.pct_change(5) * 100 > 3),
+            ]
+            assert list(result.loc[symbol]) == [bool(series.iloc[-1]) for series in expected]
+        assert not result.loc['S0'].any()
+        print("✅ Sonuçlar pandas hesabıyla aynı")
+
+        unknown = RuleSet({
+            'eksik_ne': "rsii != 50",
+            'eksik_not': "not rsii < 30",
+            'nan_ne': "sma(close, 1000) != close",
+            'nan_not': "not (sma(close, 1000) > close)",
+            'nan_or': "sma(close, 1000) > close or close > 0",
+            'nan_and': "not (sma(close, 1000) > close and close < 0)",
+        }).evaluate(panel)
+        assert not unknown[['eksik_ne', 'eksik_not', 'nan_ne', 'nan_not']].to_numpy().any()
+        assert unknown[['nan_or', 'nan_and']].loc[['S1', 'S2']].to_numpy().all()
+        print("✅ Eksik alan ve NaN ile != ve not tetiklenmiyor")
+
+        shared = RuleSet(["close > sma(close, 20)", "sma(close, 20) < close", "sma(close, 20) > open"])
+        assert shared.node_count == 5  # close, open, sma, iki karşılaştırma
+        for text in ["close >", "__import__('os')", "sma(close)", "sma(close, 0) > 1"]:
+            try:
+                RuleSet([text])
+                assert False, text
+            except ValueError:
+                pass
+        print("✅ Ortak alt ifadeler paylaşılıyor, hatalı kurallar reddediliyor")
+        
+        many = RuleSet({f"k{i}": f"close > {80 + i * 0.02:.2f} and volume > {1 + i % 10 / 10} * sma(volume, 20)"
+                        f" or crosses_below(close, sma(close, {5 + i % 40}))" for i in range(2000)})
+        many.evaluate(panel)
+        start = time.perf_counter()
+        matrix = many.evaluate(panel)
+        elapsed = time.perf_counter() - start
+        assert matrix.shape == (200, 2000)
+        print(f"✅ 2000 kural x 200 hisse: {elapsed * 1000:.1f} ms")
+        
+        alerts = AlertSystem().check_rule_alerts(rules, panel)
+        assert len(alerts) == int(result.to_numpy().sum())
+        assert all(alert['type'] == 'rule' and alert['rule'] in rules for alert in alerts)
+        print("✅ Tetiklenen kurallar alert olarak dönüyor")
+        
+    except Exception as e:
+        print(f"❌ Kural motoru: {e}")
+        return False
+    
+    return True
+
+def test_corporate_actions():
+    """Ham barların bölünme ve temettü düzeltmesini test eder"""
+    import tempfile
+    from modules.corporate_actions import adjust, from_yahoo
+    from modules.data_cache import DataCache
+    from modules.data_fetcher import BISTDataFetcher
+    
+    print("✂️ Bölünme/temettü düzeltme testleri...")
+    print("=" * 30)
+    
+    try:
+        raw = _make_test_data(periods=200).tz_localize('Europe/Istanbul')
+        raw.loc[raw.index[100]:, ['Open', 'High', 'Low', 'Close']] /= 2  # 2:1 bölünme
+        split_date, dividend_date = raw.index[100], raw.index[150]
+        
+        # Yahoo biçimi: fiyatlar ve temettü bölünmeye göre düzeltilmiş, işlem sütunları ek
+        yahoo = raw.copy()
+        yahoo.loc[:raw.index[99], ['Open', 'High', 'Low', 'Close']] /= 2
+        yahoo.loc[:raw.index[99], 'Volume'] *= 2
+        yahoo['Dividends'] = 0.0
+        yahoo['Stock Splits'] = 0.0
+        yahoo.loc[split_date, 'Stock Splits'] = 2.0
+        yahoo.loc[dividend_date, 'Dividends'] = 1.5
+        yahoo.loc[raw.index[20], 'Dividends'] = 1.0  # Bölünme öncesi: ham tutar 2.0
+        
+        # Beklenen: Yahoo "Adj Close" hesabı
+        factor = pd.Series(1.0, index=raw.index)
+        factor[:raw.index[99]] *= 0.5
+        factor[:raw.index[149]] *= 1 - 1.5 / raw['Close'].iloc[149]
+        factor[:raw.index[19]] *= 1 - 2.0 / raw['Close'].iloc[19]
+        
+        actions = from_yahoo(yahoo)
+        assert list(actions['dividend']) == [2.0, 0.0, 1.5] and list(actions['split']) == [1.0, 2.0, 1.0]
+        adjusted = adjust(raw, actions)
+        np.testing.assert_allclose(adjusted['Close'], raw['Close'] * factor)
+        np.testing.assert_allclose(adjusted['Volume'].iloc[:100], raw['Volume'].iloc[:100] * 2)
+        print("✅ Kümülatif çarpanlar Yahoo düzeltmesiyle aynı")
+        
+        class Ticker:
+            calls = []
+            actions = yahoo[['Dividends', 'Stock Splits']].iloc[:0]
+            
+            def history(self, **kwargs):
+                Ticker.calls.append(kwargs)
+                return yahoo.copy()
+        
+        class Fetcher(BISTDataFetcher):
+            def _ticker(self, symbol):
+                return Ticker()
+        
+        with tempfile.TemporaryDirectory() as root:
+            fetcher = Fetcher(cache=DataCache(root))
+            df = fetcher.get_stock_data('TEST.IS')
+            assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+            np.testing.assert_allclose(df['Close'], raw['Close'] * factor)
+            cached = fetcher.cache.get('TEST.IS', '1y', '1d')
+            assert cached.attrs.get('raw') and np.allclose(cached['Close'], raw['Close'])
+            print("✅ Ham barlar önbellekte, işlem sütunları ayrı tabloda")
+            
+            # Yeni bölünme: sadece işlem listesi indirilir, barlar yeniden çekilmez
+            Ticker.actions = pd.DataFrame({'Dividends': [0.0], 'Stock Splits': [4.0]}, index=[raw.index[180]])
+            assert fetcher.update_actions('TEST.IS') and not fetcher.update_actions('TEST.IS')
+            offline = Fetcher(cache=DataCache(root), offline=True)
+            updated = offline.get_stock_data('TEST.IS')
+            np.testing.assert_allclose(updated['Close'].iloc[:180], df['Close'].iloc[:180] / 4)
+            np.testing.assert_allclose(updated['Close'].iloc[180:], raw['Close'].iloc[180:])
+            assert len(Ticker.calls) == 1
+            print("✅ Yeni bölünme için geçmiş yeniden indirilmiyor")
+        
+    except Exception as e:
+        print(f"❌ Bölünme/temettü düzeltme: {e}")
+        return False
+    
+    return True
+
+def test_market_calendar():
+    """BIST işlem takvimini, önbellek sürelerini ve eksik bar tespitini test eder"""
+    import os
+    import tempfile
+    import time
+    from datetime import date
+    from modules.market_calendar import MarketCalendar, get_calendar
+    from modules.data_cache import DataCache
+    from modules.quote_stream import QuotePoller
+    
+    print("📅 İşlem takvimi testleri...")
+    print("=" * 30)
+    
+    try:
+        calendar = get_calendar()
+        assert calendar.is_open('2026-10-19 10:00') and not calendar.is_open('2026-10-19 18:00')
+        assert not calendar.is_open('2026-10-24 12:00')  # Cumartesi
+        assert not calendar.is_open('2026-10-29 12:00')  # Cumhuriyet Bayramı
+        assert calendar.is_open('2026-10-28 12:00') and not calendar.is_open('2026-10-28 13:00')  # Arife
+        assert calendar.next_open('2026-05-26 13:00') == pd.Timestamp('2026-06-01 10:00', tz='Europe/Istanbul')
+        assert calendar.previous_close('2026-06-01 09:00') == pd.Timestamp('2026-05-26 12:30', tz='Europe/Istanbul')
+        print("✅ Seanslar, yarım günler ve tatiller doğru")
+        
+        assert calendar.cache_ttl(300, '2026-10-19 11:00') == 300
+        assert calendar.cache_ttl(300, '2026-10-23 19:00') == 63 * 3600  # Pazartesi açılışına kadar
+        with tempfile.TemporaryDirectory() as root:
+            cache = DataCache(root, max_age=300, calendar=calendar)
+            df = _make_test_data(periods=60)
+            cache.set('TEST.IS', '1y', '1d', df)
+            path = cache._path('TEST.IS', '1y', '1d')
+            friday_close = pd.Timestamp('2026-10-23 19:00', tz='Europe/Istanbul').timestamp()
+            os.utime(path, (friday_close, friday_close))
+            expected = calendar.expires_at(friday_close, 300)
+            assert expected == pd.Timestamp('2026-10-26 10:00', tz='Europe/Istanbul').timestamp()
+            assert (cache.get('TEST.IS', '1y', '1d') is None) == (time.time() >= expected)
+            
+            # Komut satırı önbelleği takvime bağlı; sadece çevrimdışı modda süresiz
+            from modules.data_cache import open_cache
+            batch_cache = open_cache(root)
+            assert batch_cache.calendar is calendar and batch_cache.max_age == 900
+            assert open_cache(root, max_age=60).max_age == 60
+            offline_cache = open_cache(root, offline=True)
+            assert offline_cache.calendar is None and offline_cache.get('TEST.IS', '1y', '1d') is not None
+            assert DataCache(root).calendar is calendar
+        print("✅ Kapalı piyasada önbellek bir sonraki açılışa kadar geçerli")
+        
+        # Hafta sonu ve bayram eksik sayılmaz; sadece gerçek boşluk bulunur
+        sessions = calendar.expected_bars('2026-05-18', '2026-06-05')  # 19 Mayıs ve Kurban Bayramı hariç
+        assert len(sessions) == 11 and pd.Timestamp('2026-05-27', tz='Europe/Istanbul') not in sessions
+        stored = sessions.delete([2, 3]).tz_localize(None)
+        assert calendar.gaps(stored) == [(sessions[2], sessions[3])]
+        # Tatil dosyasının kapsamadığı yıllarda tatiller boşluk sayılmaz
+        old_sessions = pd.bdate_range('2022-01-03', '2023-12-29').delete([100])  # Tatiller bilinmez
+        assert calendar.coverage[0] == pd.Timestamp('2024-01-01', tz='Europe/Istanbul')
+        assert calendar.gaps(old_sessions) == []
+        assert len(calendar.missing_bars(stored, end='2026-06-08 09:00')) == 2
+        assert len(calendar.missing_bars(stored, end='2026-06-08 10:00')) == 3
+        hourly = calendar.expected_bars('2026-10-28', '2026-10-30 23:59', '1h')
+        assert len(hourly) == 3 + 8  # Arife 10-12:30, 29 Ekim tatil, 30 Ekim tam gün
+        print("✅ Eksik barlar beklenen seanslara göre bulunuyor")
+        
+        today = pd.Timestamp.now(tz='Europe/Istanbul').date()
+        closed = MarketCalendar(holidays={today: False})
+        calls = []
+        poller = QuotePoller(['TEST.IS'], fetch_quote=lambda symbol: calls.append(symbol), calendar=closed)
+        poller.start()
+        time.sleep(0.2)
+        poller.stop(timeout=1)
+        assert calls == [] and closed.seconds_until_open() > 0
+        assert QuotePoller([], fetch_quote=calls.append).calendar is calendar
+        assert QuotePoller([], fetch_quote=calls.append, calendar=False).calendar is None
+        print("✅ Piyasa kapalıyken fiyat sorgulanmıyor")
+        
+    except Exception as e:
+        print(f"❌ İşlem takvimi: {e}")
+        return False
+    
+    return True
+
+def test_indicator_cache():
+    """Diskteki indikatör önbelleğinin okunmasını, uzatılmasını ve yenilenmesini test eder"""
+    import tempfile
+    from modules.technical_analysis import TechnicalAnalyzer
+    from modules.indicator_cache import IndicatorCache
+    
+    print("💾 İndikatör önbelleği testleri...")
+    print("=" * 30)
+    
+    try:
+        rng = np.random.default_rng(7)
+        n = 800
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        df = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1000, 5000, n)
+        }, index=pd.date_range('2022-01-03', periods=n, freq='B'))
+        names = ['sma_20', 'ema_12', 'rsi', 'macd', 'bollinger', 'stoch', 'cci']
+        
+        reference = TechnicalAnalyzer(df)
+        for name in names:
+            reference.add_indicator(name)
+        
+        root = tempfile.mkdtemp()
+        cache = IndicatorCache(root)
+        analyzer = TechnicalAnalyzer(df.iloc[:780], indicator_cache=cache)
+        for name in names:
+            analyzer.add_indicator(name)
+        
+        # Yeniden başlatma: yeni nesne aynı kayıtları diskten okur
+        restarted = IndicatorCache(root)
+        cached = TechnicalAnalyzer(df.iloc[:780], indicator_cache=restarted)
+        cached.add_indicator('macd')
+        assert restarted.stats() == {'hits': 1, 'extends': 0, 'misses': 0}
+        assert isinstance(cached.indicators['macd'].values, np.memmap)
+        print("✅ Seriler yeniden hesaplanmadan memory-map ile okunuyor")
+        
+        analyzer.append_data(df.iloc[780:])
+        assert cache.stats()['extends'] == len(names)
+        for column, values in reference.indicators.items():
+            assert np.allclose(analyzer.indicators[column], values, rtol=1e-9, equal_nan=True), column
+        print("✅ Yeni barlar kayıtların sonuna ekleniyor, sonuçlar aynı")
+        
+        revised = df.copy()
+        revised.iloc[:100, :4] *= 0.9  # Geçmişe temettü düzeltmesi
+        fresh = TechnicalAnalyzer(revised, indicator_cache=cache)
+        fresh.add_indicator('sma_20')
+        assert cache.stats()['misses'] == len(names) + 1
+        assert np.allclose(fresh.indicators['sma_20'], revised['Close'].rolling(20).mean(), equal_nan=True)
+        print("✅ Geçmişi değişen veride bayat kayıt yenileniyor")
+        
+        # Her gün bir bar kayan pencere ("1y") aynı kaydı kullanır
+        sliding = IndicatorCache(tempfile.mkdtemp())
+        for day in range(5):
+            window = df.iloc[500 + day:750 + day]
+            expected = TechnicalAnalyzer(window)
+            result = TechnicalAnalyzer(window, indicator_cache=sliding)
+            for name in ['ema_12', 'macd', 'cci']:
+                expected.add_indicator(name)
+                result.add_indicator(name)
+            for column, values in expected.indicators.items():
+                assert np.allclose(result.indicators[column], values, rtol=1e-8, equal_nan=True), column
+        # MACD'nin ısınması (~450 bar) pencereden uzun; her gün pencere üzerinde hesaplanır
+        assert sliding.stats() == {'hits': 0, 'extends': 8, 'misses': 3 + 4}
+        groups = os.listdir(sliding.root)
+        assert all(len(os.listdir(os.path.join(sliding.root, group))) == 1 for group in groups)
+        
+        entry = os.path.join(sliding.root, groups[0])
+        entry = os.path.join(entry, os.listdir(entry)[0])
+        os.utime(os.path.join(entry, 'meta.json'), (0, 0))
+        assert sliding.cleanup() == 1 and not os.path.exists(entry)
+        print("✅ Kayan pencereler kaydı uzatıyor, kullanılmayan kayıtlar siliniyor")
+        
+    except Exception as e:
+        print(f"❌ İndikatör önbelleği: {e}")
+        return False
+    
+    return True
+
+def test_price_alert_book():
+    """Sıralı fiyat seviyesi alertlerinin kesişim sorgularını ve saklanmasını test eder"""
+    import tempfile
+    from modules.price_alerts import PriceAlertBook
+    from modules.alert_system import AlertSystem
+    
+    print("🎯 Fiyat seviyesi alert testleri...")
+    print("=" * 30)
+    
+    try:
+        path = os.path.join(tempfile.mkdtemp(), "price_alerts.json")
+        book = PriceAlertBook(path, save_interval=3600)
+        rng = np.random.default_rng(3)
+        levels = rng.uniform(50, 150, 2000).round(2)
+        book.add_many({'symbol': 'THYAO.IS', 'level': level, 'direction': 'above' if i % 2 else 'below'}
+                      for i, level in enumerate(levels))
+        assert len(book) == 2000
+        
+        # İlk fiyatta zaten geçilmiş hedef ve stoplar tetiklenir
+        first = book.update('THYAO.IS', 100.0)
+        expected = sum(1 for i, level in enumerate(levels) if (level <= 100 if i % 2 else level >= 100))
+        assert len(first) == expected
+        
+        prices = [100.0, 104.0, 97.5, 120.0, 80.0]
+        for previous, price in zip(prices, prices[1:]):
+            low, high = min(previous, price), max(previous, price)
+            pending = book.alerts('THYAO.IS')
+            if price > previous:
+                brute = [a['id'] for a in pending if a['direction'] == 'above' and previous < a['level'] <= price]
+            else:
+                brute = [a['id'] for a in pending if a['direction'] == 'below' and price <= a['level'] < previous]
+            triggered = book.update('THYAO.IS', price)
+            assert sorted(a['id'] for a in triggered) == sorted(brute)
+            assert all(low <= a['level'] <= high for a in triggered)
+        print("✅ Kesilen seviyeler tüm alertler taranmadan bulunuyor")
+        
+        assert book.dirty
+        book.save()
+        restored = PriceAlertBook(path)
+        assert len(restored) == len(book) and restored.alerts() == book.alerts()
+        target = restored.add('THYAO.IS', 85.0, 'above', note='geri dönüş')
+        alerts = AlertSystem().check_level_alerts(restored, [{'symbol': 'THYAO.IS', 'current_price': 86.0}])
+        assert [a['alert_id'] for a in alerts if a['type'] == 'price_target'] == [target]
+        assert restored.remove(target) is False
+
+        # Eşzamanlı kayıtlar aynı geçici dosyayı paylaşmaz
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(8) as pool:
+            assert all(pool.map(lambda _: book.save(), range(64)))
+        assert PriceAlertBook(path).alerts() == book.alerts()
+        assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')]
+
+        # Eksik sorgu (fiyat 0) stop loss'ları tetiklemez, son fiyatı bozmaz
+        stops = [restored.add('GARAN.IS', level, 'below') for level in (90.0, 80.0)]
+        restored.update('GARAN.IS', 95.0)
+        for price in (0.0, float('nan'), None):
+            assert AlertSystem().check_level_alerts(restored, [{'symbol': 'GARAN.IS', 'current_price': price}]) == []
+            assert restored.update('GARAN.IS', price) == []
+        assert [a['id'] for a in restored.update('GARAN.IS', 85.0)] == stops[:1]
+        print("✅ Seviyeler ve son fiyatlar yeniden başlatmada korunuyor")
+        
+    except Exception as e:
+        print(f"❌ Fiyat seviyesi alertleri: {e}")
+        return False
+    
+    return True
+
+def test_load_test():
+    """Yerel veri kaynağını ve yük testi ölçümlerini test eder"""
+    import tempfile
+    from modules.data_fetcher import BISTDataFetcher
+    from modules.offline_source import OfflineSource
+    from modules.load_test import run_load_test, save_result, load_results, compare
+    
+    print("🧪 Yük testi testleri...")
+    print("=" * 30)
+    
+    try:
+        source = OfflineSource(end="2025-06-30 18:00")
+        yearly = source.bars('THYAO.IS', period="1y")
+        monthly = source.bars('THYAO.IS', period="3mo")
+        assert len(yearly) > len(monthly) > 50
+        pd.testing.assert_frame_equal(yearly.loc[monthly.index], monthly)
+        pd.testing.assert_frame_equal(OfflineSource(end="2025-06-30 18:00").bars('THYAO.IS', period="1y"), yearly)
+        assert not yearly.index.dayofweek.isin([5, 6]).any()
+        assert (yearly['High'] >= yearly[['Open', 'Close']].max(axis=1)).all()
+        assert (yearly['Low'] <= yearly[['Open', 'Close']].min(axis=1)).all()
+        
+        fetcher = BISTDataFetcher(source=source)
+        data = fetcher.get_stock_data('THYAO.IS', period="6mo")
+        assert data is not None and len(data) > 100
+        print("✅ Yerel veri kaynağı deterministik ve ağ gerektirmiyor")
+        
+        result = run_load_test(target="service", sessions=3, actions=4, symbols=['THYAO.IS', 'GARAN.IS'])
+        assert result['errors'] == 0, result['error_samples']
+        assert result['requests'] == 3 * 5 and result['latency_ms']['p95'] > 0
+        
+        path = os.path.join(tempfile.mkdtemp(), "results.jsonl")
+        assert compare(result, load_results(path)) is None
+        save_result(result, path)
+        slower = dict(result, throughput=result['throughput'] / 2)
+        comparison = compare(slower, load_results(path))
+        assert comparison is not None and 'throughput' in comparison['regressions']
+        print(f"✅ {result['requests']} istek ölçüldü, gerileme karşılaştırması çalışıyor")
+        
+    except Exception as e:
+        print(f"❌ Yük testi: {e}")
+        return False
+    
+    return True
+
+def test_api():
+    """JSON API uç noktalarını, ETag doğrulamasını ve seri akışını test eder"""
+    import tempfile
+    from starlette.testclient import TestClient
+    from modules.api import create_app
+    from modules.memory_cache import LRUCache
+    from modules.indicator_cache import IndicatorCache
+    from modules.offline_source import OfflineSource
+    
+    print("🌐 JSON API testleri...")
+    print("=" * 30)
+    
+    try:
+        source = OfflineSource(end="2025-06-30 18:00", symbols=['THYAO.IS', 'GARAN.IS'])
+        client = TestClient(create_app(source, LRUCache(), IndicatorCache(tempfile.mkdtemp())))
+        
+        response = client.get("/symbols/THYAO/summary")
+        assert response.status_code == 200
+        body = response.json()
+        assert body['symbol'] == 'THYAO.IS' and body['signal'] in ("AL", "SAT", "BEKLE")
+        assert 'latest_indicators' in body['summary']
+        etag = response.headers['etag']
+        assert client.get("/symbols/THYAO/summary", headers={'If-None-Match': etag}).status_code == 304
+        assert client.get("/symbols/THYAO/summary?period=6mo", headers={'If-None-Match': etag}).status_code == 200
+        print("✅ Değişmeyen veri için 304 dönüyor")
+        
+        response = client.get("/symbols/GARAN/indicators?names=rsi,macd&period=max")
+        series = response.json()
+        data = source.bars('GARAN.IS', period="max")
+        assert series['rows'] == len(data) == len(series['index']) > 2000
+        assert set(series['series']) == {'rsi', 'macd', 'macd_signal', 'macd_histogram'}
+        assert series['series']['rsi'][0] is None and len(series['series']['macd']) == len(data)
+        print(f"✅ {series['rows']} satırlık seriler gönderiliyor")
+        
+        response = client.get("/universe?symbols=THYAO,GARAN,YOKBOYLE")
+        universe = response.json()
+        assert [row['symbol'] for row in universe['rows']] == ['THYAO.IS', 'GARAN.IS']
+        assert universe['missing'] == ['YOKBOYLE.IS']
+        assert client.get("/universe?symbols=THYAO,GARAN,YOKBOYLE",
+                          headers={'If-None-Match': response.headers['etag']}).status_code == 304
+        assert client.get("/symbols/THYAO/summary?period=7y").status_code == 400
+        assert client.get("/symbols/THYAO/indicators?names=yok").status_code == 400
+        print("✅ Evren uç noktası ve hata yanıtları çalışıyor")
+        
+    except Exception as e:
+        print(f"❌ JSON API: {e}")
+        return False
+    
+    return True
+
 def test_dependencies():
     """Gerekli kütüphanelerin yüklü olup olmadığını kontrol eder"""
     
     print("📦 Bağımlılık testleri...")
     print("=" * 30)
     
-    dependencies = [
-        'streamlit',
-        'pandas', 
-        'numpy',
-        'plotly',
-        'yfinance',
-        'ta',
-        'requests',
-        'beautifulsoup4'
-    ]
+    # pip paket adı -> import adı
+    dependencies = {
+        'streamlit': 'streamlit',
+        'pandas': 'pandas',
+        'numpy': 'numpy',
+        'plotly': 'plotly',
+        'yfinance': 'yfinance',
+        'ta': 'ta',
+        'requests': 'requests',
+        'beautifulsoup4': 'bs4'
+    }
     
-    missing_deps = []
+    # Paketler import edilmeden sadece metadata ile kontrol edilir
+    from run import find_missing_packages
+    missing_deps = find_missing_packages(dependencies)
     
     for dep in dependencies:
-        try:
-            __import__(dep)
-            print(f"✅ {dep}")
-        except ImportError:
+        if dep in missing_deps:
             print(f"❌ {dep} (eksik)")
-            missing_deps.append(dep)
+        else:
+            print(f"✅ {dep}")
     
     if missing_deps:
         print(f"\n⚠️  Eksik bağımlılıklar: {', '.join(missing_deps)}")
@@ -142,6 +1451,77 @@ def main():
     if not test_modules():
         sys.exit(1)
     
+    print("\n")
+    
+    if not test_batch_analysis():
+        sys.exit(1)
+    
+    if not test_quote_stream():
+        sys.exit(1)
+    
+    if not test_native_kernels():
+        sys.exit(1)
+    
+    if not test_incremental_metrics():
+        sys.exit(1)
+    
+    if not test_multi_timeframe():
+        sys.exit(1)
+    
+    if not test_rolling_correlation():
+        sys.exit(1)
+    
+    if not test_relative_strength():
+        sys.exit(1)
+    
+    if not test_history_store():
+        sys.exit(1)
+    
+    if not test_symbol_registry():
+        sys.exit(1)
+    
+    if not test_upstream_resilience():
+        sys.exit(1)
+    
+    if not test_single_flight():
+        sys.exit(1)
+    
+    if not test_memory_cache():
+        sys.exit(1)
+    
+    if not test_chart_patterns():
+        sys.exit(1)
+    
+    if not test_volume_profile():
+        sys.exit(1)
+    
+    if not test_signal_leaderboard():
+        sys.exit(1)
+    
+    if not test_indicator_export():
+        sys.exit(1)
+    
+    if not test_rule_engine():
+        sys.exit(1)
+    
+    if not test_corporate_actions():
+        sys.exit(1)
+    
+    if not test_market_calendar():
+        sys.exit(1)
+    
+    if not test_indicator_cache():
+        sys.exit(1)
+    
+    if not test_price_alert_book():
+        sys.exit(1)
+    
+    if not test_load_test():
+        sys.exit(1)
+    
+    if not test_api():
+        sys.exit(1)
+    
     print("\n" + "=" * 60)
     print("🎯 Test Sonucu: BAŞARILI")
     print("✨ Uygulama kullanıma hazır!")